@@ -0,0 +1,155 @@
+"""
+Estratégias de contagem para listagens paginadas por offset.
+
+- exact: `COUNT(*)` do filtro.
+- cached: `COUNT(*)` guardado no cache por filtro, com TTL.
+- estimated: estatísticas do planejador no PostgreSQL; contagem por
+  amostragem no SQLite.
+- none: sem total, apenas `has_next`.
+
+Em todas elas a página é lida com `limit + 1` linhas, o que dá `has_next`
+sem contar. Quando a página vem incompleta, o total sai dela mesma e
+nenhuma contagem é feita.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.models import QuerySet, Subquery
+
+from core.domain.repositories.pagination import (
+    COUNT_CACHED,
+    COUNT_ESTIMATED,
+    COUNT_EXACT,
+    COUNT_NONE,
+    OffsetPage,
+    validate_count_strategy,
+)
+
+DEFAULT_LIST_COUNT = {
+    "DEFAULT_STRATEGY": COUNT_EXACT,
+    "CACHE_ALIAS": "default",
+    "CACHE_TTL_SECONDS": 60,
+    "SAMPLE_SIZE": 10_000,
+}
+
+
+def get_list_count_settings() -> dict:
+    return {**DEFAULT_LIST_COUNT, **getattr(settings, "LIST_COUNT", {})}
+
+
+def paginate_queryset(queryset: QuerySet, offset: int, limit: int,
+                      strategy: str | None = None) -> OffsetPage:
+    """Lê uma página do queryset e calcula o total conforme a estratégia.
+
+    Os itens retornados são instâncias do modelo; a conversão para o domínio
+    fica com o repositório.
+    """
+    config = get_list_count_settings()
+    strategy = validate_count_strategy(strategy or config["DEFAULT_STRATEGY"])
+
+    rows = list(queryset[offset:offset + limit + 1])
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+
+    if not has_next and (rows or offset == 0):
+        return OffsetPage(items=rows, total_items=offset + len(rows), has_next=False)
+    if strategy == COUNT_NONE:
+        return OffsetPage(items=rows, total_items=None, has_next=has_next, count_strategy=COUNT_NONE)
+    if strategy == COUNT_CACHED:
+        total = cached_count(queryset, config["CACHE_ALIAS"], config["CACHE_TTL_SECONDS"])
+        return OffsetPage(items=rows, total_items=total, has_next=has_next, count_strategy=COUNT_CACHED)
+    if strategy == COUNT_ESTIMATED:
+        total, used = estimated_count(queryset, config["SAMPLE_SIZE"])
+        return OffsetPage(items=rows, total_items=total, has_next=has_next, count_strategy=used)
+    return OffsetPage(items=rows, total_items=queryset.count(), has_next=has_next)
+
+
+def set_pagination_headers(response, total_items: int | None, has_next: bool, count_strategy: str):
+    """Expõe os metadados da página em cabeçalhos, sem mudar o corpo (uma lista)."""
+    if total_items is not None:
+        response["X-Total-Count"] = str(total_items)
+    response["X-Has-Next"] = "true" if has_next else "false"
+    response["X-Count-Strategy"] = count_strategy
+    return response
+
+
+def _count_cache_key(queryset: QuerySet) -> str:
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.sha1(json.dumps([queryset.db, sql, [str(p) for p in params]]).encode()).hexdigest()
+    return f"list-count:{queryset.model._meta.label_lower}:{digest}"
+
+
+def cached_count(queryset: QuerySet, cache_alias: str, ttl: int) -> int:
+    """`COUNT(*)` reaproveitado por `ttl` segundos para o mesmo filtro."""
+    cache = caches[cache_alias]
+    key = _count_cache_key(queryset)
+    total = cache.get(key)
+    if total is None:
+        total = queryset.count()
+        cache.set(key, total, timeout=ttl)
+    return total
+
+
+def estimated_count(queryset: QuerySet, sample_size: int) -> tuple[int, str]:
+    """Retorna (total, estratégia usada).
+
+    Cai para a contagem exata quando o banco não oferece uma estimativa ou
+    quando o resultado é pequeno o bastante para ser contado por inteiro.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        total, used = _postgres_estimate(queryset), COUNT_ESTIMATED
+    elif vendor == "sqlite":
+        total, used = _sqlite_estimate(queryset, sample_size)
+    else:
+        total = None
+    if total is None:
+        return queryset.count(), COUNT_EXACT
+    return total, used
+
+
+def _postgres_estimate(queryset: QuerySet) -> int | None:
+    """`reltuples` sem filtro; com filtro, as linhas previstas pelo `EXPLAIN`."""
+    queryset = queryset.order_by()
+    with connections[queryset.db].cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # reltuples é -1 (ou 0 em versões antigas) antes do primeiro ANALYZE.
+            return row[0] if row and row[0] > 0 else None
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _sqlite_estimate(queryset: QuerySet, sample_size: int) -> tuple[int, str]:
+    """Conta até `sample_size` linhas; acima disso, extrapola de uma amostra.
+
+    O tamanho da tabela vem de `MAX(rowid)` (busca direta na árvore). Com
+    filtro, a seletividade é medida nas primeiras `sample_size` linhas da tabela.
+    """
+    queryset = queryset.order_by()
+    bounded = queryset[:sample_size].count()
+    if bounded < sample_size:
+        return bounded, COUNT_EXACT
+
+    model = queryset.model
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT MAX(rowid) FROM {connection.ops.quote_name(model._meta.db_table)}")
+        table_rows = cursor.fetchone()[0] or 0
+    if not queryset.query.where:
+        return max(table_rows, sample_size), COUNT_ESTIMATED
+
+    sample = model._default_manager.using(queryset.db).order_by().values("pk")[:sample_size]
+    matched = queryset.filter(pk__in=Subquery(sample)).count()
+    return max(round(matched / sample_size * table_rows), sample_size), COUNT_ESTIMATED
@@ -0,0 +1,101 @@
+"""
+Checkout assíncrono: configuração e workers que consomem a fila.
+
+Cada worker é um processo que repete `process_checkout_batch` - uma
+transação por lote, com a retirada, a criação dos pedidos e o registro dos
+resultados. Sem jobs na fila, o worker espera `POLL_INTERVAL_SECONDS`.
+"""
+import logging
+import multiprocessing
+import os
+import time
+
+from django.conf import settings
+from django.db import OperationalError, connections
+
+from api.products.repository import get_product_repository
+from api.transactions import immediate_atomic
+from core.interfaces.usecase.checkout_usecase import ProcessCheckoutBatchResponse, ProcessCheckoutBatchUseCase
+from .repository import DjangoCheckoutJobRepository, DjangoOrderRepository
+from .reservations import get_order_stock_reserver
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKOUT = {
+    "ASYNC": False,
+    "BATCH_SIZE": 100,
+    "POLL_INTERVAL_SECONDS": 0.2,
+}
+
+
+def get_checkout_settings() -> dict:
+    return {**DEFAULT_CHECKOUT, **getattr(settings, "CHECKOUT", {})}
+
+
+def async_checkout_requested(request) -> bool:
+    """Modo assíncrono ligado nas configurações ou pedido com `Prefer: respond-async`."""
+    prefer = request.headers.get("Prefer", "")
+    return get_checkout_settings()["ASYNC"] or "respond-async" in prefer.lower()
+
+
+def process_checkout_batch(batch_size: int | None = None) -> ProcessCheckoutBatchResponse:
+    """Processa um lote da fila em uma única transação (`BEGIN IMMEDIATE` no SQLite)."""
+    batch_size = batch_size or get_checkout_settings()["BATCH_SIZE"]
+    use_case = ProcessCheckoutBatchUseCase(
+        DjangoCheckoutJobRepository(), DjangoOrderRepository(), get_product_repository(),
+        get_order_stock_reserver(),
+    )
+    with immediate_atomic():
+        return use_case.execute(batch_size)
+
+
+def run_worker(batch_size: int | None = None, poll_interval: float | None = None, drain: bool = False,
+               stop_event=None) -> int:
+    """Consome a fila até `stop_event` (ou, com `drain`, até esvaziá-la). Retorna os jobs processados.
+
+    Contenção de escrita (p.ex. "database is locked" no SQLite) desfaz o
+    lote, que volta à fila e é tentado de novo.
+    """
+    config = get_checkout_settings()
+    poll_interval = config["POLL_INTERVAL_SECONDS"] if poll_interval is None else poll_interval
+    processed = 0
+    while stop_event is None or not stop_event.is_set():
+        try:
+            result = process_checkout_batch(batch_size)
+        except OperationalError as e:
+            logger.warning("checkout worker %s: lote desfeito (%s)", os.getpid(), e)
+            time.sleep(poll_interval)
+            continue
+        processed += result.claimed
+        if not result.claimed:
+            if drain:
+                break
+            time.sleep(poll_interval)
+    return processed
+
+
+def _worker_main(batch_size, poll_interval, drain, stop_event, counter):
+    processed = run_worker(batch_size, poll_interval, drain, stop_event)
+    with counter.get_lock():
+        counter.value += processed
+    connections.close_all()
+
+
+def start_workers(count: int, batch_size: int | None = None, poll_interval: float | None = None,
+                  drain: bool = False):
+    """Inicia `count` processos worker (fork). Retorna (processos, stop_event, contador de jobs).
+
+    As conexões abertas são fechadas antes do fork para que cada processo
+    abra as suas.
+    """
+    context = multiprocessing.get_context("fork")
+    stop_event = context.Event()
+    counter = context.Value("i", 0)
+    connections.close_all()
+    processes = [
+        context.Process(target=_worker_main, args=(batch_size, poll_interval, drain, stop_event, counter))
+        for _ in range(count)
+    ]
+    for process in processes:
+        process.start()
+    return processes, stop_event, counter
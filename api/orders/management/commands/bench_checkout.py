@@ -0,0 +1,69 @@
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from api.orders.checkout import start_workers
+from api.orders.models import CheckoutJobModel, OrderItemModel, OrderModel
+from api.products.models import ProductModel
+from api.users.models import UserModel
+from core.domain.entities.checkout import CHECKOUT_DONE
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede a vazão sustentada (pedidos/s) dos workers de checkout assíncrono. "
+        "Usa um usuário e produtos sintéticos, removidos ao final de cada rodada."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=5000)
+        parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--products", type=int, default=50)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'workers':>8} {'pedidos':>8} {'tempo (s)':>10} {'pedidos/s':>10}")
+        for workers in options["workers"]:
+            user, products = self._setup(options["products"])
+            try:
+                self._enqueue(user, products, options["orders"])
+                started = time.perf_counter()
+                processes, _, counter = start_workers(workers, options["batch_size"], poll_interval=0.05, drain=True)
+                for process in processes:
+                    process.join()
+                elapsed = time.perf_counter() - started
+
+                done = CheckoutJobModel.objects.filter(owner=user, status=CHECKOUT_DONE).count()
+                self.stdout.write(f"{workers:>8} {done:>8} {elapsed:>10.2f} {done / elapsed:>10.0f}")
+                if counter.value != options["orders"] or done != options["orders"]:
+                    self.stderr.write(f"  atenção: {counter.value} processados, {done} concluídos")
+            finally:
+                self._cleanup(user, products)
+
+    def _setup(self, product_count):
+        tag = uuid.uuid4().hex[:8]
+        user = UserModel.objects.create_user(
+            email=f"bench-checkout-{tag}@example.com", password=None, first_name="Bench", last_name="Checkout"
+        )
+        products = ProductModel.objects.bulk_create([
+            ProductModel(name=f"bench checkout {tag} {index}", price=Decimal("10.00"), stock=1_000_000)
+            for index in range(product_count)
+        ])
+        return user, products
+
+    def _enqueue(self, user, products, count):
+        CheckoutJobModel.objects.bulk_create([
+            CheckoutJobModel(owner=user, product_id=products[index % len(products)].id, quantity=1)
+            for index in range(count)
+        ], batch_size=1000)
+
+    def _cleanup(self, user, products):
+        CheckoutJobModel.objects.filter(owner=user).delete()
+        OrderItemModel.objects.filter(order__owner=user).delete()
+        OrderModel.objects.filter(owner=user).delete()
+        ProductModel.objects.filter(pk__in=[product.pk for product in products]).delete()
+        user.delete()
+        connections.close_all()
@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand
+
+from api.orders.repository import DjangoIdempotencyStore
+
+
+class Command(BaseCommand):
+    help = "Remove as chaves de idempotência expiradas (rodar periodicamente, p.ex. via cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DjangoIdempotencyStore.PURGE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        store = DjangoIdempotencyStore()
+        store.PURGE_BATCH_SIZE = options["batch_size"]
+        removed = store.purge_expired(datetime.now(timezone.utc))
+        self.stdout.write(f"{removed} chaves expiradas removidas")
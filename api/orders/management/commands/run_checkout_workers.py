@@ -0,0 +1,35 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from api.orders.checkout import get_checkout_settings, run_worker, start_workers
+
+
+class Command(BaseCommand):
+    help = "Inicia workers que consomem a fila de checkout assíncrono."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--poll-interval", type=float, default=None)
+        parser.add_argument("--drain", action="store_true", help="Encerra quando a fila esvaziar.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or get_checkout_settings()["BATCH_SIZE"]
+        if options["workers"] <= 1:
+            processed = run_worker(batch_size, options["poll_interval"], options["drain"])
+            self.stdout.write(f"{processed} jobs processados")
+            return
+
+        processes, stop_event, counter = start_workers(
+            options["workers"], batch_size, options["poll_interval"], options["drain"]
+        )
+        signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            stop_event.set()
+            for process in processes:
+                process.join()
+        self.stdout.write(f"{counter.value} jobs processados por {len(processes)} workers")
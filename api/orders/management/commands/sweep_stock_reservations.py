@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from api.orders.reservations import run_sweeper, sweep_expired_reservations
+
+
+class Command(BaseCommand):
+    help = (
+        "Devolve o estoque das reservas expiradas e marca os pedidos pendentes como expirados. "
+        "Roda continuamente a cada SWEEP_INTERVAL_SECONDS, ou uma vez com --once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=None)
+        parser.add_argument("--once", action="store_true")
+
+    def handle(self, *args, **options):
+        if not options["once"]:
+            run_sweeper(options["interval"])
+            return
+        result = sweep_expired_reservations()
+        self.stdout.write(
+            f"{result.processed} reservas processadas em {result.batches} lotes, "
+            f"{result.released} unidades devolvidas, {result.expired_orders} pedidos expirados, "
+            f"backlog {result.backlog}"
+        )
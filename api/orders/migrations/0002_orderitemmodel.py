@@ -0,0 +1,69 @@
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+def copy_products_to_items(apps, schema_editor):
+    """Cada produto do antigo M2M vira uma linha com a quantidade do pedido."""
+    OrderModel = apps.get_model('orders', 'OrderModel')
+    OrderItemModel = apps.get_model('orders', 'OrderItemModel')
+    items = []
+    for order in OrderModel.objects.prefetch_related('product').iterator(chunk_size=1000):
+        products = list(order.product.all())
+        for product in products:
+            if order.quantity:
+                unit_price = (order.subtotal / order.quantity / len(products)).quantize(Decimal('0.01'))
+            else:
+                unit_price = product.price
+            items.append(OrderItemModel(
+                order_id=order.order_id, product_id=product.id,
+                quantity=order.quantity, unit_price=unit_price,
+            ))
+        if len(items) >= 1000:
+            OrderItemModel.objects.bulk_create(items)
+            items = []
+    OrderItemModel.objects.bulk_create(items)
+
+
+def copy_items_to_products(apps, schema_editor):
+    OrderModel = apps.get_model('orders', 'OrderModel')
+    for order in OrderModel.objects.prefetch_related('items').iterator(chunk_size=1000):
+        items = list(order.items.all())
+        order.quantity = sum(item.quantity for item in items)
+        order.save(update_fields=['quantity'])
+        order.product.set([item.product_id for item in items])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+        ('products', '0004_product_version_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderItemModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField()),
+                ('unit_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='orders.ordermodel')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='order_items', to='products.productmodel')),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='ordermodel',
+            name='quantity',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(copy_products_to_items, copy_items_to_products),
+        migrations.RemoveField(
+            model_name='ordermodel',
+            name='product',
+        ),
+        migrations.RemoveField(
+            model_name='ordermodel',
+            name='quantity',
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:37
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_idempotencykeymodel'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckoutJobModel',
+            fields=[
+                ('job_id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('product_id', models.UUIDField()),
+                ('quantity', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('q', 'Na fila'), ('r', 'Em processamento'), ('d', 'Concluído'), ('f', 'Rejeitado')], default='q', max_length=1)),
+                ('claim_token', models.UUIDField(null=True)),
+                ('error', models.CharField(max_length=255, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(null=True)),
+                ('order', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='orders.ordermodel')),
+                ('owner', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='checkout_status_created'), models.Index(fields=['claim_token'], name='checkout_claim_token')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_checkoutjobmodel'),
+        ('products', '0006_inventory_ledger'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ordermodel',
+            name='status',
+            field=models.CharField(choices=[('p', 'Pendente'), ('F', 'Finalizado'), ('c', 'Concluído'), ('e', 'Expirado')], default='p', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='StockReservationModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_id', models.UUIDField()),
+                ('quantity', models.PositiveIntegerField()),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('product', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='products.productmodel')),
+            ],
+        ),
+    ]
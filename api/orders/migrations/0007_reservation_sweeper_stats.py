@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-17 22:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_stock_reservations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservationSweeperStatsModel',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, primary_key=True, serialize=False)),
+                ('runs', models.PositiveIntegerField(default=0)),
+                ('processed_total', models.BigIntegerField(default=0)),
+                ('released_total', models.BigIntegerField(default=0)),
+                ('last_run_at', models.DateTimeField(null=True)),
+                ('last_duration_ms', models.FloatField(null=True)),
+                ('last_processed', models.PositiveIntegerField(default=0)),
+                ('last_batches', models.PositiveIntegerField(default=0)),
+                ('last_expired_orders', models.PositiveIntegerField(default=0)),
+                ('last_backlog', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
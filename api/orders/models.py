@@ -1,30 +1,185 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 import uuid
-from core.domain.entities.order import Order as DomainOrder
+from core.domain.entities.order import Order as DomainOrder, OrderItem as DomainOrderItem
 from api.users.models import UserModel
 from api.products.models import ProductModel
+from core.domain.entities.checkout import (
+    CHECKOUT_DONE,
+    CHECKOUT_FAILED,
+    CHECKOUT_PROCESSING,
+    CHECKOUT_QUEUED,
+    CheckoutJob as DomainCheckoutJob,
+)
+from core.interfaces.usecase.gateways import IdempotencyRecord
 # Create your models here.
 
 class OrderModel(models.Model):
     STATUS_CHOICE =(
         ('p', 'Pendente'),
         ('F', 'Finalizado'),
-        ('c', 'Concluído')
+        ('c', 'Concluído'),
+        ('e', 'Expirado'),
     )
     
     order_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    owner= models.ForeignKey(UserModel, on_delete=models.PROTECT)
-    product = models.ManyToManyField(ProductModel, related_name='orders_item')
-    quantity = models.IntegerField()
+    # Coberto pelos índices compostos que começam por `owner`.
+    owner= models.ForeignKey(UserModel, on_delete=models.PROTECT, db_index=False)
     subtotal = models.DecimalField(max_digits=10, decimal_places=2)
     status = models.CharField(max_length=10, choices=STATUS_CHOICE, default="p")
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    # `jti` da cotação usada no checkout; o índice único recusa um segundo pedido com o mesmo token.
+    quote_id = models.CharField(max_length=32, null=True, blank=True, unique=True, editable=False)
+
+    class Meta:
+        # Listagens keyset ordenam por (created_at, order_id) dentro do filtro:
+        # os índices cobrem filtro e ordenação, sem ordenar em memória.
+        indexes = [
+            models.Index(fields=["owner", "status", "created_at", "order_id"], name="order_owner_status_created"),
+            models.Index(fields=["owner", "created_at", "order_id"], name="order_owner_created"),
+            models.Index(fields=["status", "created_at", "order_id"], name="order_status_created"),
+            models.Index(fields=["created_at", "order_id"], name="order_created"),
+        ]
     
     def to_domain(self) -> DomainOrder:
+        """Converte para o domínio.
+
+        Espera `owner` carregado com `select_related` e `items__product` com
+        `prefetch_related`; sem isso, cada pedido dispara consultas extras.
+        """
+        items = [item.to_domain() for item in self.items.all()]
         return DomainOrder(
-            order_id=(self.order_id),
-            owner= self.owner,
-            product= self.product,
-            quantity=self.quantity,
+            order_id=str(self.order_id),
+            owner=self.owner.to_domain(),
+            quantity=sum(item.quantity for item in items),
             subtotal=self.subtotal,
-            status= self.status
-        )
\ No newline at end of file
+            status= self.status,
+            items=items,
+            created_at=self.created_at,
+            quote_id=self.quote_id,
+        )
+
+
+class OrderItemModel(models.Model):
+    order = models.ForeignKey(OrderModel, on_delete=models.CASCADE, related_name='items')
+    product = models.ForeignKey(ProductModel, on_delete=models.PROTECT, related_name='order_items')
+    quantity = models.PositiveIntegerField()
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
+
+    def to_domain(self) -> DomainOrderItem:
+        return DomainOrderItem(
+            product_id=str(self.product_id),
+            quantity=self.quantity,
+            unit_price=self.unit_price,
+            product_name=self.product.name
+        )
+
+
+class IdempotencyKeyModel(models.Model):
+    """Chave de idempotência: hash de tamanho fixo, resultado guardado e expiração.
+
+    `status_code` nulo indica execução em andamento.
+    """
+    key = models.CharField(max_length=64, primary_key=True)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    body = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    locked_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    def to_domain(self) -> IdempotencyRecord:
+        return IdempotencyRecord(
+            key=self.key,
+            fingerprint=self.fingerprint,
+            locked_at=self.locked_at,
+            expires_at=self.expires_at,
+            status_code=self.status_code,
+            body=self.body,
+        )
+
+
+class CheckoutJobModel(models.Model):
+    """Fila de checkout assíncrono; os workers a consomem pelo índice (status, created_at)."""
+    STATUS_CHOICE = (
+        (CHECKOUT_QUEUED, 'Na fila'),
+        (CHECKOUT_PROCESSING, 'Em processamento'),
+        (CHECKOUT_DONE, 'Concluído'),
+        (CHECKOUT_FAILED, 'Rejeitado'),
+    )
+
+    job_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(UserModel, on_delete=models.CASCADE, db_index=False)
+    product_id = models.UUIDField()
+    quantity = models.PositiveIntegerField()
+    status = models.CharField(max_length=1, choices=STATUS_CHOICE, default=CHECKOUT_QUEUED)
+    claim_token = models.UUIDField(null=True)
+    order = models.ForeignKey(OrderModel, on_delete=models.SET_NULL, null=True, db_index=False)
+    error = models.CharField(max_length=255, null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="checkout_status_created"),
+            models.Index(fields=["claim_token"], name="checkout_claim_token"),
+        ]
+
+    def to_domain(self) -> DomainCheckoutJob:
+        return DomainCheckoutJob(
+            job_id=str(self.job_id),
+            owner_id=str(self.owner_id),
+            product_id=str(self.product_id),
+            quantity=self.quantity,
+            status=self.status,
+            order_id=str(self.order_id) if self.order_id else None,
+            error=self.error,
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+        )
+
+
+class StockReservationModel(models.Model):
+    """Estoque retido por um pedido pendente até `expires_at`.
+
+    `order_id` não é chave estrangeira: a reserva é gravada antes do pedido, e
+    uma reserva sem pedido só expira e tem o estoque devolvido pelo sweeper.
+    """
+    order_id = models.UUIDField()
+    product = models.ForeignKey(ProductModel, on_delete=models.CASCADE, db_index=False)
+    quantity = models.PositiveIntegerField()
+    # O sweeper lê as expiradas pela ordem deste índice, em lotes com LIMIT.
+    expires_at = models.DateTimeField(db_index=True)
+
+
+class ReservationSweeperStatsModel(models.Model):
+    """Totais e última execução do sweeper de reservas: uma única linha (id=1).
+
+    Fica no banco porque o sweeper roda em outro processo
+    (`manage.py sweep_stock_reservations`) e a API precisa ler o que ele gravou.
+    """
+    SINGLETON_ID = 1
+
+    id = models.PositiveSmallIntegerField(primary_key=True, default=SINGLETON_ID)
+    runs = models.PositiveIntegerField(default=0)
+    processed_total = models.BigIntegerField(default=0)
+    released_total = models.BigIntegerField(default=0)
+    last_run_at = models.DateTimeField(null=True)
+    last_duration_ms = models.FloatField(null=True)
+    last_processed = models.PositiveIntegerField(default=0)
+    last_batches = models.PositiveIntegerField(default=0)
+    last_expired_orders = models.PositiveIntegerField(default=0)
+    last_backlog = models.PositiveIntegerField(default=0)
+
+    def to_metrics(self) -> dict:
+        return {
+            "runs": self.runs,
+            "processed_total": self.processed_total,
+            "released_total": self.released_total,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_duration_ms": self.last_duration_ms,
+            "last_processed": self.last_processed,
+            "last_batches": self.last_batches,
+            "last_expired_orders": self.last_expired_orders,
+            "last_backlog": self.last_backlog,
+        }
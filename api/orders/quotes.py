@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core import signing
+
+from core.interfaces.usecase.gateways import TokenSigner
+
+DEFAULT_ORDER_QUOTE = {
+    "TTL_SECONDS": 900,
+}
+
+
+def get_order_quote_settings() -> dict:
+    return {**DEFAULT_ORDER_QUOTE, **getattr(settings, "ORDER_QUOTE", {})}
+
+
+class DjangoTokenSigner(TokenSigner):
+    """Tokens com `django.core.signing` (HMAC com a SECRET_KEY), comprimidos."""
+
+    def __init__(self, salt: str = "api.orders.quote"):
+        self.salt = salt
+
+    def sign(self, payload: dict) -> str:
+        return signing.dumps(payload, salt=self.salt, compress=True)
+
+    def unsign(self, token: str) -> dict:
+        try:
+            return signing.loads(token, salt=self.salt)
+        except signing.BadSignature:
+            raise ValueError("Token de cotação inválido")
@@ -1,32 +1,412 @@
-from core.domain.entities.order import Order
-from core.domain.repositories.order_repository import OrderRepository
-from .models import OrderModel
+import uuid
+from collections import Counter
+from core.domain.entities.checkout import CHECKOUT_PROCESSING, CHECKOUT_QUEUED, CheckoutJob
+from core.domain.entities.order import ORDER_CONCLUDED, ORDER_EXPIRED, ORDER_FINISHED, ORDER_PENDING, Order
+from datetime import datetime
+from core.domain.repositories.checkout_repository import CheckoutJobRepository
+from core.domain.repositories.order_repository import OrderFilter, OrderRepository, StatusTransitionResult
+from core.domain.repositories.pagination import (
+    CURSOR_NEXT,
+    CURSOR_PREV,
+    CursorPage,
+    decode_cursor,
+    encode_cursor,
+)
+from core.domain.repositories.product_repository import ProductRepository
+from core.domain.repositories.stock_reservation_repository import ReservationSweepResult, StockReservationRepository
+from core.interfaces.usecase.gateways import IdempotencyRecord, IdempotencyStore
+from core.interfaces.usecase.idempotency import IdempotencyGuard
+from api.products.repository import get_product_repository
+from api.transactions import immediate_atomic
+from .models import CheckoutJobModel, IdempotencyKeyModel, OrderItemModel, OrderModel, StockReservationModel
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Prefetch, Q
+from django.utils import timezone
 
 class DjangoOrderRepository(OrderRepository):
-    def create(self, order: Order) -> Order:
-        order_model = OrderModel.objects.create(
+    STATUS_TRANSITION_CHUNK_SIZE = 1000
+
+    def _queryset(self):
+        """Dono via JOIN e linhas (com produto) em uma consulta extra por página."""
+        return OrderModel.objects.select_related("owner").prefetch_related(
+            Prefetch("items", queryset=OrderItemModel.objects.select_related("product"))
+        )
+
+    def _to_model(self, order: Order) -> OrderModel:
+        if order.created_at is None:
+            order.created_at = timezone.now()
+        return OrderModel(
             order_id = order.order_id,
-            owner = order.owner,
-            product = order.product,
-            quantity = order.quantity,
+            owner_id = order.owner_id,
             subtotal = order.subtotal,
             status = order.status,
+            created_at = order.created_at,
+            quote_id = order.quote_id,
         )
-        return order_model.to_domain()
+
+    def _item_models(self, order: Order) -> list[OrderItemModel]:
+        return [
+            OrderItemModel(
+                order_id=order.order_id,
+                product_id=item.product_id,
+                quantity=item.quantity,
+                unit_price=item.unit_price,
+            )
+            for item in order.items
+        ]
+
+    def create(self, order: Order, reserve=None) -> Order:
+        try:
+            with transaction.atomic():
+                if reserve is not None:
+                    reserve(order)
+                self._to_model(order).save(force_insert=True)
+                OrderItemModel.objects.bulk_create(self._item_models(order))
+        except IntegrityError:
+            if order.quote_id and OrderModel.objects.filter(quote_id=order.quote_id).exists():
+                raise ValueError("Cotação já utilizada")
+            raise
+        return order
+
+    def create_many(self, orders: list[Order], reserve=None) -> list[Order]:
+        """Reserva (opcional) e dois INSERTs em lote (pedidos e linhas) em uma transação."""
+        with transaction.atomic():
+            if reserve is not None:
+                failed = reserve(orders)
+                orders = [order for order in orders if order.order_id not in failed]
+            OrderModel.objects.bulk_create([self._to_model(order) for order in orders])
+            OrderItemModel.objects.bulk_create([
+                item for order in orders for item in self._item_models(order)
+            ])
+        return orders
 
     def get_by_order_id(self, order_id: str)-> Order:
         try:
-            order_model = OrderModel.objects.get(id=order_id)
+            order_model = self._queryset().get(order_id=order_id)
             return order_model.to_domain()
-        except:
+        except OrderModel.DoesNotExist:
             raise ValueError("Pedido não encontrado")
         
     def get_all(self)-> list[Order]:
-        return [order_model.to_domain() for order_model in OrderModel.objects.all()]
+        return [order_model.to_domain() for order_model in self._queryset()]
     
-    def get_by_owner_id(self, owner_id: str)-> Order:
-        try:
-            order_model = OrderModel.objects.get(id=owner_id)
-            return order_model.to_domain()
-        except:
-            raise ValueError("Usuário não possui pedidos feito")
\ No newline at end of file
+    def get_by_owner_id(self, owner_id: str)-> list[Order]:
+        queryset = self._queryset().filter(owner_id=owner_id).order_by("-created_at", "-order_id")
+        return [order_model.to_domain() for order_model in queryset]
+
+    def get_all_paginated_filtered(self, offset: int, limit: int, search_query: str | None = None,
+                                   owner_id: str | None = None, status: str | None = None
+                                   ) -> tuple[list[Order], int]:
+        """Número constante de consultas por página: contagem, pedidos e linhas."""
+        queryset = self._filtered(owner_id, status)
+        if search_query:
+            queryset = queryset.filter(
+                order_id__in=OrderItemModel.objects.filter(
+                    product__name__icontains=search_query
+                ).values("order_id")
+            )
+
+        total_items = queryset.count()
+        paginated = self._queryset().filter(pk__in=queryset.values("pk")).order_by("-created_at", "-order_id")
+        return [order_model.to_domain() for order_model in paginated[offset:offset + limit]], total_items
+
+    def get_all_cursor_paginated(self, limit: int, cursor: str | None = None, owner_id: str | None = None,
+                                 status: str | None = None) -> CursorPage[Order]:
+        """Paginação keyset do mais recente ao mais antigo, por (created_at, order_id).
+
+        Com dono e/ou status, o filtro e a ordenação são resolvidos pelos
+        índices compostos; cada página lê só `limit + 1` entradas do índice,
+        não importa quantos pedidos o cliente tenha.
+        """
+        queryset = self._filtered(owner_id, status, self._queryset())
+
+        direction = CURSOR_NEXT
+        if cursor:
+            key, direction = decode_cursor(cursor)
+            if len(key) != 2 or not all(isinstance(part, str) for part in key):
+                raise ValueError("Cursor inválido")
+            try:
+                created_at = datetime.fromisoformat(key[0])
+            except ValueError:
+                raise ValueError("Cursor inválido")
+            order_id = key[1]
+            # O intervalo em `created_at` fica separado do OR para que o banco
+            # faça uma busca por faixa no índice em vez de percorrê-lo.
+            try:
+                if direction == CURSOR_NEXT:
+                    queryset = queryset.filter(
+                        Q(created_at__lt=created_at) | Q(created_at=created_at, order_id__lt=order_id),
+                        created_at__lte=created_at,
+                    )
+                else:
+                    queryset = queryset.filter(
+                        Q(created_at__gt=created_at) | Q(created_at=created_at, order_id__gt=order_id),
+                        created_at__gte=created_at,
+                    )
+            except ValidationError:
+                raise ValueError("Cursor inválido")
+
+        if direction == CURSOR_NEXT:
+            queryset = queryset.order_by("-created_at", "-order_id")
+        else:
+            queryset = queryset.order_by("created_at", "order_id")
+
+        rows = list(queryset[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if direction == CURSOR_PREV:
+            rows.reverse()
+
+        next_cursor = prev_cursor = None
+        if rows:
+            first_key = [rows[0].created_at.isoformat(), str(rows[0].order_id)]
+            last_key = [rows[-1].created_at.isoformat(), str(rows[-1].order_id)]
+            if direction == CURSOR_NEXT:
+                next_cursor = encode_cursor(last_key, CURSOR_NEXT) if has_more else None
+                prev_cursor = encode_cursor(first_key, CURSOR_PREV) if cursor else None
+            else:
+                next_cursor = encode_cursor(last_key, CURSOR_NEXT)
+                prev_cursor = encode_cursor(first_key, CURSOR_PREV) if has_more else None
+
+        return CursorPage(
+            items=[order_model.to_domain() for order_model in rows],
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
+
+    def bulk_transition_status(self, order_filter: OrderFilter, from_status: str,
+                               to_status: str) -> StatusTransitionResult:
+        """Repete `UPDATE ... SET status = to WHERE status = from AND pk IN (próximo lote)`.
+
+        Cada instrução roda na própria transação (autocommit), então os locks
+        de linha de um lote são liberados antes do próximo. Linhas já movidas
+        deixam de casar com `status = from`, e o subselect avança sozinho,
+        sem cursor. Chamado dentro de um `atomic`, tudo vira uma transação só.
+        """
+        selected = self._filtered(order_filter.owner_id, from_status)
+        if order_filter.order_ids is not None:
+            selected = selected.filter(order_id__in=order_filter.order_ids)
+        if order_filter.created_after is not None:
+            selected = selected.filter(created_at__gte=order_filter.created_after)
+        if order_filter.created_before is not None:
+            selected = selected.filter(created_at__lt=order_filter.created_before)
+        next_chunk = selected.order_by("created_at", "order_id").values("pk")[:self.STATUS_TRANSITION_CHUNK_SIZE]
+
+        # Para só quando um UPDATE não move nada: um lote curto não prova que
+        # acabou, pois linhas do lote podem ter sido alteradas por outra transação.
+        result = StatusTransitionResult()
+        while True:
+            updated = OrderModel.objects.filter(pk__in=next_chunk, status=from_status).update(status=to_status)
+            result.chunks += 1
+            if not updated:
+                return result
+            result.updated += updated
+
+    @staticmethod
+    def _filtered(owner_id: str | None, status: str | None, queryset=None):
+        if queryset is None:
+            queryset = OrderModel.objects.all()
+        if owner_id:
+            queryset = queryset.filter(owner_id=owner_id)
+        if status:
+            queryset = queryset.filter(status=status)
+        return queryset
+
+
+class DjangoIdempotencyStore(IdempotencyStore):
+    PURGE_BATCH_SIZE = 1000
+
+    def acquire(self, key: str, fingerprint: str, now: datetime, expires_at: datetime,
+                stale_before: datetime) -> IdempotencyRecord | None:
+        """Leitura pela chave primária; só escreve quando a chave é nova ou pode ser tomada.
+
+        Repetições custam um SELECT. Entre concorrentes, a chave primária
+        (INSERT) ou o UPDATE condicional a `locked_at` garantem um único vencedor.
+        """
+        for _ in range(3):
+            model = IdempotencyKeyModel.objects.filter(key=key).first()
+            if model is None:
+                try:
+                    with transaction.atomic():
+                        IdempotencyKeyModel.objects.create(
+                            key=key, fingerprint=fingerprint, locked_at=now, expires_at=expires_at
+                        )
+                    return None
+                except IntegrityError:
+                    continue
+            if model.expires_at <= now or (model.status_code is None and model.locked_at < stale_before):
+                taken = IdempotencyKeyModel.objects.filter(key=key, locked_at=model.locked_at).update(
+                    fingerprint=fingerprint, locked_at=now, expires_at=expires_at, status_code=None, body=None
+                )
+                if taken:
+                    return None
+                continue
+            return model.to_domain()
+        return self.get(key)
+
+    def get(self, key: str) -> IdempotencyRecord | None:
+        model = IdempotencyKeyModel.objects.filter(key=key).first()
+        return model.to_domain() if model else None
+
+    def run_and_complete(self, key: str, action):
+        with transaction.atomic():
+            status_code, body = action()
+            IdempotencyKeyModel.objects.filter(key=key).update(status_code=status_code, body=body)
+        return status_code, body
+
+    def release(self, key: str) -> None:
+        IdempotencyKeyModel.objects.filter(key=key, status_code__isnull=True).delete()
+
+    def purge_expired(self, now: datetime) -> int:
+        """Remove em lotes pelo índice de `expires_at`, sem transações longas."""
+        removed = 0
+        while True:
+            keys = list(
+                IdempotencyKeyModel.objects.filter(expires_at__lte=now)
+                .values_list("key", flat=True)[:self.PURGE_BATCH_SIZE]
+            )
+            if not keys:
+                return removed
+            removed += IdempotencyKeyModel.objects.filter(key__in=keys, expires_at__lte=now).delete()[0]
+
+
+DEFAULT_IDEMPOTENCY = {
+    "TTL_SECONDS": 86_400,
+    "LOCK_TIMEOUT_SECONDS": 60,
+}
+
+
+def get_idempotency_guard() -> IdempotencyGuard:
+    """`IdempotencyGuard` sobre o `DjangoIdempotencyStore`, configurado por `settings.IDEMPOTENCY`."""
+    config = {**DEFAULT_IDEMPOTENCY, **getattr(settings, "IDEMPOTENCY", {})}
+    return IdempotencyGuard(
+        DjangoIdempotencyStore(),
+        ttl_seconds=config["TTL_SECONDS"],
+        lock_timeout_seconds=config["LOCK_TIMEOUT_SECONDS"],
+    )
+
+
+class DjangoCheckoutJobRepository(CheckoutJobRepository):
+    def enqueue(self, job: CheckoutJob) -> CheckoutJob:
+        model = CheckoutJobModel.objects.create(
+            job_id=job.job_id,
+            owner_id=job.owner_id,
+            product_id=job.product_id,
+            quantity=job.quantity,
+            status=job.status,
+        )
+        job.created_at = model.created_at
+        return job
+
+    def claim_batch(self, limit: int) -> list[CheckoutJob]:
+        """Retira o lote dentro da transação do chamador (que deve estar aberta).
+
+        PostgreSQL: `SELECT ... FOR UPDATE SKIP LOCKED` - workers concorrentes
+        pegam lotes disjuntos sem esperar uns pelos outros.
+        SQLite (sem `FOR UPDATE`): um `UPDATE` marca o lote com um token e o
+        lote é lido por ele. O chamador abre a transação com `BEGIN IMMEDIATE`
+        (`immediate_atomic`), então o lock de escrita já é dele e dois workers
+        nunca marcam o mesmo job.
+
+        Como o processamento e `finish` rodam na mesma transação, um worker
+        que morre no meio devolve o lote à fila no rollback.
+        """
+        queued = CheckoutJobModel.objects.filter(status=CHECKOUT_QUEUED).order_by("created_at")
+        if connection.features.has_select_for_update_skip_locked:
+            models = list(queued.select_for_update(skip_locked=True)[:limit])
+            CheckoutJobModel.objects.filter(pk__in=[model.pk for model in models]).update(
+                status=CHECKOUT_PROCESSING
+            )
+        else:
+            token = uuid.uuid4()
+            CheckoutJobModel.objects.filter(pk__in=queued.values("pk")[:limit]).update(
+                status=CHECKOUT_PROCESSING, claim_token=token
+            )
+            models = list(CheckoutJobModel.objects.filter(claim_token=token).order_by("created_at"))
+        jobs = [model.to_domain() for model in models]
+        for job in jobs:
+            job.status = CHECKOUT_PROCESSING
+        return jobs
+
+    def finish(self, jobs: list[CheckoutJob]) -> None:
+        finished_at = timezone.now()
+        CheckoutJobModel.objects.bulk_update([
+            CheckoutJobModel(
+                job_id=job.job_id, status=job.status, order_id=job.order_id, error=job.error,
+                finished_at=finished_at, claim_token=None,
+            )
+            for job in jobs
+        ], fields=["status", "order_id", "error", "finished_at", "claim_token"])
+        for job in jobs:
+            job.finished_at = finished_at
+
+    def get_by_id(self, job_id: str) -> CheckoutJob | None:
+        model = CheckoutJobModel.objects.filter(job_id=job_id).first()
+        return model.to_domain() if model else None
+
+
+class DjangoStockReservationRepository(StockReservationRepository):
+    def __init__(self, product_repository: ProductRepository | None = None):
+        self.product_repository = product_repository or get_product_repository()
+
+    def hold(self, order_id: str, quantities: dict[str, int], expires_at: datetime) -> None:
+        """`reserve_stock_bulk` e o INSERT das reservas na mesma transação."""
+        self.hold_many({order_id: quantities}, expires_at)
+
+    def hold_many(self, holds: dict[str, dict[str, int]], expires_at: datetime) -> None:
+        """Um `reserve_stock_bulk` com a soma por produto e um INSERT em lote das reservas."""
+        total = Counter()
+        for quantities in holds.values():
+            total.update(quantities)
+        with transaction.atomic():
+            self.product_repository.reserve_stock_bulk(dict(total))
+            StockReservationModel.objects.bulk_create([
+                StockReservationModel(order_id=order_id, product_id=product_id, quantity=quantity,
+                                      expires_at=expires_at)
+                for order_id, quantities in holds.items()
+                for product_id, quantity in quantities.items()
+            ])
+
+    def sweep_expired(self, now: datetime, limit: int) -> ReservationSweepResult:
+        """Um lote pela ordem do índice de `expires_at`, em uma transação.
+
+        PostgreSQL: `FOR UPDATE SKIP LOCKED` - sweepers concorrentes pegam
+        lotes disjuntos. SQLite: a transação (`BEGIN IMMEDIATE`) já é exclusiva.
+        O UPDATE de status é condicional a `status = 'p'`, então um pedido
+        finalizado ao mesmo tempo não é expirado nem tem o estoque devolvido.
+        """
+        with immediate_atomic():
+            expired = StockReservationModel.objects.filter(expires_at__lte=now).order_by("expires_at")
+            if connection.features.has_select_for_update_skip_locked:
+                expired = expired.select_for_update(skip_locked=True)
+            elif connection.features.has_select_for_update:
+                expired = expired.select_for_update()
+            rows = list(expired.values_list("pk", "order_id", "product_id", "quantity")[:limit])
+            if not rows:
+                return ReservationSweepResult()
+
+            order_ids = list({order_id for _, order_id, _, _ in rows})
+            expired_orders = OrderModel.objects.filter(
+                order_id__in=order_ids, status=ORDER_PENDING
+            ).update(status=ORDER_EXPIRED)
+            sold = set(OrderModel.objects.filter(
+                order_id__in=order_ids, status__in=(ORDER_FINISHED, ORDER_CONCLUDED)
+            ).values_list("order_id", flat=True))
+
+            # Uma devolução por produto; ordem fixa dos ids, como em `reserve_stock_bulk`.
+            to_release = Counter()
+            for _, order_id, product_id, quantity in rows:
+                if order_id not in sold:
+                    to_release[str(product_id)] += quantity
+            for product_id in sorted(to_release):
+                self.product_repository.release_stock(product_id, to_release[product_id])
+            StockReservationModel.objects.filter(pk__in=[pk for pk, _, _, _ in rows]).delete()
+
+        return ReservationSweepResult(
+            processed=len(rows), released=sum(to_release.values()), expired_orders=expired_orders, batches=1,
+        )
+
+    def count_expired(self, now: datetime) -> int:
+        return StockReservationModel.objects.filter(expires_at__lte=now).count()
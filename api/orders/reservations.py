@@ -0,0 +1,122 @@
+"""
+Reservas de estoque de pedidos pendentes e o sweeper que devolve as expiradas.
+
+Com `STOCK_RESERVATIONS["ENABLED"]`, todo pedido criado como pendente baixa o
+estoque e grava uma reserva com `expires_at = agora + TTL_SECONDS`. O sweeper
+(`manage.py sweep_stock_reservations`) roda a cada `SWEEP_INTERVAL_SECONDS`,
+marca como expirados os pedidos que continuam pendentes e devolve o estoque.
+
+As métricas da última execução (duração, processadas, backlog) e os totais
+ficam em uma linha de `ReservationSweeperStatsModel`, que a API lê de
+qualquer processo.
+"""
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import F, Min
+
+from core.domain.repositories.stock_reservation_repository import ReservationSweepResult
+from core.interfaces.usecase.reservation_usecase import OrderStockReserver, SweepExpiredReservationsUseCase
+from .models import ReservationSweeperStatsModel, StockReservationModel
+from .repository import DjangoStockReservationRepository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STOCK_RESERVATIONS = {
+    "ENABLED": True,
+    "TTL_SECONDS": 900,
+    "SWEEP_INTERVAL_SECONDS": 5,
+    "SWEEP_BATCH_SIZE": 500,
+    "SWEEP_MAX_BATCHES": 20,
+}
+
+
+def get_stock_reservation_settings() -> dict:
+    return {**DEFAULT_STOCK_RESERVATIONS, **getattr(settings, "STOCK_RESERVATIONS", {})}
+
+
+def get_order_stock_reserver() -> OrderStockReserver | None:
+    """Reserva de estoque para os casos de uso de criação de pedidos; None se desligada."""
+    config = get_stock_reservation_settings()
+    if not config["ENABLED"]:
+        return None
+    return OrderStockReserver(DjangoStockReservationRepository(), timedelta(seconds=config["TTL_SECONDS"]))
+
+
+def sweep_expired_reservations() -> ReservationSweepResult:
+    """Uma execução do sweeper (no máximo SWEEP_MAX_BATCHES lotes); grava as métricas."""
+    config = get_stock_reservation_settings()
+    use_case = SweepExpiredReservationsUseCase(
+        DjangoStockReservationRepository(),
+        batch_size=config["SWEEP_BATCH_SIZE"],
+        max_batches=config["SWEEP_MAX_BATCHES"],
+    )
+    started = time.perf_counter()
+    result = use_case.execute()
+    duration_ms = round((time.perf_counter() - started) * 1000, 2)
+    _record_run(result, duration_ms)
+    return result
+
+
+def _record_run(result: ReservationSweepResult, duration_ms: float) -> None:
+    """Soma a execução aos totais com um UPDATE; cria a linha na primeira execução."""
+    last_run = dict(
+        last_run_at=datetime.now(timezone.utc),
+        last_duration_ms=duration_ms,
+        last_processed=result.processed,
+        last_batches=result.batches,
+        last_expired_orders=result.expired_orders,
+        last_backlog=result.backlog,
+    )
+    stats = ReservationSweeperStatsModel.objects.filter(id=ReservationSweeperStatsModel.SINGLETON_ID)
+    totals = dict(
+        runs=F("runs") + 1,
+        processed_total=F("processed_total") + result.processed,
+        released_total=F("released_total") + result.released,
+    )
+    if stats.update(**totals, **last_run):
+        return
+    try:
+        with transaction.atomic():
+            ReservationSweeperStatsModel.objects.create(
+                runs=1, processed_total=result.processed, released_total=result.released, **last_run
+            )
+    except IntegrityError:
+        # Outro sweeper criou a linha ao mesmo tempo.
+        stats.update(**totals, **last_run)
+
+
+def get_reservation_metrics() -> dict:
+    """Backlog atual (lido do banco) e as métricas da última execução do sweeper."""
+    now = datetime.now(timezone.utc)
+    expired = StockReservationModel.objects.filter(expires_at__lte=now)
+    oldest = expired.aggregate(oldest=Min("expires_at"))["oldest"]
+    stats = ReservationSweeperStatsModel.objects.filter(id=ReservationSweeperStatsModel.SINGLETON_ID).first()
+    return {
+        "backlog": expired.count(),
+        "oldest_expired_age_seconds": round((now - oldest).total_seconds(), 3) if oldest else 0,
+        "active": StockReservationModel.objects.filter(expires_at__gt=now).count(),
+        "sweeper": stats.to_metrics() if stats else None,
+    }
+
+
+def run_sweeper(interval: float | None = None, once: bool = False) -> None:
+    """Repete `sweep_expired_reservations` a cada `interval` segundos.
+
+    Com backlog depois de uma execução (limite de lotes atingido), a próxima
+    começa sem esperar.
+    """
+    interval = get_stock_reservation_settings()["SWEEP_INTERVAL_SECONDS"] if interval is None else interval
+    while True:
+        try:
+            result = sweep_expired_reservations()
+        except OperationalError as e:
+            logger.warning("sweeper de reservas: execução desfeita (%s)", e)
+            result = None
+        if once:
+            return
+        if result is None or not result.backlog:
+            time.sleep(interval)
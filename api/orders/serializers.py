@@ -1,2 +1,133 @@
+from django.urls import reverse
 from rest_framework import serializers
-from .models import OrderModel
\ No newline at end of file
+
+from core.domain.entities.checkout import CHECKOUT_DONE, CHECKOUT_FAILED, CHECKOUT_PROCESSING, CHECKOUT_QUEUED
+from .models import OrderModel
+
+CHECKOUT_STATUS_NAMES = {
+    CHECKOUT_QUEUED: "queued",
+    CHECKOUT_PROCESSING: "processing",
+    CHECKOUT_DONE: "done",
+    CHECKOUT_FAILED: "failed",
+}
+
+
+class OrderCreateSerializer(serializers.Serializer):
+    product_id = serializers.UUIDField()
+    quantity = serializers.IntegerField(min_value=1)
+
+
+class QuoteRequestSerializer(serializers.Serializer):
+    items = OrderCreateSerializer(many=True, allow_empty=False, max_length=500)
+
+
+class QuoteSerializer(serializers.Serializer):
+    """Representação de uma cotação (`CartQuote`)."""
+
+    def to_representation(self, instance):
+        return {
+            "quote_token": instance.token,
+            "expires_at": instance.expires_at.isoformat(),
+            "total": str(instance.total),
+            "lines": [
+                {
+                    "product_id": line.product_id,
+                    "product_name": line.product_name,
+                    "quantity": line.quantity,
+                    "unit_price": str(line.unit_price),
+                    "line_total": str(line.line_total),
+                }
+                for line in instance.lines
+            ],
+        }
+
+
+class OrderBatchItemSerializer(OrderCreateSerializer):
+    owner_id = serializers.UUIDField(required=False)
+
+
+class OrderFilterSerializer(serializers.Serializer):
+    owner_id = serializers.UUIDField(required=False)
+    order_ids = serializers.ListField(child=serializers.UUIDField(), required=False, max_length=10_000)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+
+
+class OrderStatusTransitionSerializer(serializers.Serializer):
+    from_status = serializers.ChoiceField(choices=[choice for choice, _ in OrderModel.STATUS_CHOICE])
+    to_status = serializers.ChoiceField(choices=[choice for choice, _ in OrderModel.STATUS_CHOICE])
+    filter = OrderFilterSerializer(required=False)
+
+
+class OrderItemReadSerializer(serializers.Serializer):
+    """Representação de uma linha do pedido (`OrderItem`)."""
+
+    def to_representation(self, instance):
+        return {
+            "product_id": instance.product_id,
+            "product_name": instance.product_name,
+            "quantity": instance.quantity,
+            "unit_price": str(instance.unit_price),
+        }
+
+
+def _order_fields(order_id, owner_id, quantity, subtotal, status, created_at, **product) -> dict:
+    """Campos comuns às representações de um pedido (detalhe, criação e listagem)."""
+    return {
+        "order_id": str(order_id),
+        "owner_id": owner_id,
+        **product,
+        "quantity": quantity,
+        "subtotal": str(subtotal),
+        "status": status,
+        "created_at": created_at.isoformat() if created_at else None,
+    }
+
+
+class OrderReadSerializer(serializers.Serializer):
+    """Representação de um pedido do domínio (`Order`).
+
+    `product_id`/`product_name` repetem a primeira linha, para clientes que
+    ainda tratam o pedido como de um único produto.
+    """
+
+    def to_representation(self, instance):
+        items = instance.items
+        first = items[0] if items else None
+        return {
+            **_order_fields(
+                instance.order_id, instance.owner_id, sum(item.quantity for item in items),
+                instance.subtotal, instance.status, instance.created_at,
+                product_id=first.product_id if first else None,
+                product_name=first.product_name if first else None,
+            ),
+            "items": OrderItemReadSerializer(items, many=True).data,
+        }
+
+
+class OrderListItemSerializer(serializers.Serializer):
+    """Representação de um pedido na listagem (`CreateOrderResponse`).
+
+    Mesmos campos de `OrderReadSerializer`, sem `product_id` e `items`;
+    `product_name` junta os nomes de todas as linhas.
+    """
+
+    def to_representation(self, instance):
+        return _order_fields(
+            instance.order_id, instance.owner, instance.quantity, instance.subtotal,
+            instance.status, instance.created_at, product_name=instance.product,
+        )
+
+
+class CheckoutJobSerializer(serializers.Serializer):
+    """Representação de um job de checkout assíncrono (`CheckoutJob`)."""
+
+    def to_representation(self, instance):
+        return {
+            "job_id": instance.job_id,
+            "status": CHECKOUT_STATUS_NAMES[instance.status],
+            "status_url": reverse("order-checkout-status", kwargs={"pk": instance.job_id}),
+            "order_id": instance.order_id,
+            "order_url": reverse("order-retrieve", kwargs={"pk": instance.order_id}) if instance.order_id else None,
+            "error": instance.error,
+        }
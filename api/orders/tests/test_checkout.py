@@ -0,0 +1,123 @@
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.orders.checkout import process_checkout_batch, run_worker
+from api.orders.models import CheckoutJobModel, OrderModel
+from api.orders.repository import DjangoCheckoutJobRepository
+from api.products.models import ProductModel
+from api.users.models import UserModel
+
+
+class AsyncCheckoutTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserModel.objects.create_user(
+            email='user@example.com', password='password', first_name='User', last_name='Test'
+        )
+        self.other = UserModel.objects.create_user(
+            email='other@example.com', password='password', first_name='Other', last_name='Test'
+        )
+        self.product = ProductModel.objects.create(name='Caneca', price=Decimal('9.90'), stock=100)
+        self.client.force_authenticate(user=self.user)
+
+    def _checkout(self, quantity=2, product_id=None, **headers):
+        return self.client.post(reverse('order-create'), {
+            'product_id': str(product_id or self.product.id), 'quantity': quantity,
+        }, format='json', HTTP_PREFER='respond-async', **headers)
+
+    def test_accepts_with_202_and_worker_creates_order(self):
+        response = self._checkout(quantity=3)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], 'queued')
+        self.assertEqual(response['Location'], response.data['status_url'])
+        self.assertEqual(OrderModel.objects.count(), 0)
+
+        result = process_checkout_batch()
+        self.assertEqual((result.claimed, result.created, result.failed), (1, 1, 0))
+
+        job = self.client.get(response.data['status_url']).data
+        self.assertEqual(job['status'], 'done')
+        order = self.client.get(job['order_url']).data
+        self.assertEqual(order['subtotal'], '29.70')
+        self.assertEqual(order['owner_id'], str(self.user.id))
+
+    def test_invalid_product_is_rejected_before_enqueue(self):
+        self.product.is_active = False
+        self.product.save()
+        self.assertEqual(self._checkout().status_code, 400)
+        self.assertEqual(CheckoutJobModel.objects.count(), 0)
+
+    def test_product_deactivated_while_queued_fails_job(self):
+        status_url = self._checkout().data['status_url']
+        ProductModel.objects.filter(pk=self.product.pk).update(is_active=False)
+
+        process_checkout_batch()
+
+        job = self.client.get(status_url).data
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual(job['error'], 'Produto inativo')
+        self.assertIsNone(job['order_id'])
+
+    def test_status_is_visible_only_to_owner(self):
+        status_url = self._checkout().data['status_url']
+        self.client.force_authenticate(user=self.other)
+        self.assertEqual(self.client.get(status_url).status_code, 403)
+
+    def test_sync_mode_is_default(self):
+        response = self.client.post(reverse('order-create'), {
+            'product_id': str(self.product.id), 'quantity': 1,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    @override_settings(CHECKOUT={'ASYNC': True})
+    def test_async_mode_from_settings(self):
+        response = self.client.post(reverse('order-create'), {
+            'product_id': str(self.product.id), 'quantity': 1,
+        }, format='json')
+        self.assertEqual(response.status_code, 202)
+
+    def test_idempotent_retry_returns_same_job(self):
+        first = self._checkout(HTTP_IDEMPOTENCY_KEY='k1')
+        second = self._checkout(HTTP_IDEMPOTENCY_KEY='k1')
+        self.assertEqual(first.data['job_id'], second.data['job_id'])
+        self.assertEqual(CheckoutJobModel.objects.count(), 1)
+
+    def test_claims_are_disjoint_and_in_arrival_order(self):
+        job_ids = [self._checkout().data['job_id'] for _ in range(5)]
+        repository = DjangoCheckoutJobRepository()
+
+        with transaction.atomic():
+            first = repository.claim_batch(2)
+        with transaction.atomic():
+            second = repository.claim_batch(10)
+
+        self.assertEqual([job.job_id for job in first], job_ids[:2])
+        self.assertEqual([job.job_id for job in second], job_ids[2:])
+
+    def test_worker_drains_queue_in_batches(self):
+        for _ in range(7):
+            self._checkout(quantity=1)
+
+        processed = run_worker(batch_size=3, poll_interval=0, drain=True)
+
+        self.assertEqual(processed, 7)
+        self.assertEqual(OrderModel.objects.filter(owner=self.user).count(), 7)
+        self.assertFalse(CheckoutJobModel.objects.exclude(status='d').exists())
+
+
+class CheckoutTransactionModeTestCase(TransactionTestCase):
+    def test_only_the_claim_takes_the_write_lock_up_front(self):
+        with CaptureQueriesContext(connection) as queries:
+            process_checkout_batch()
+        self.assertEqual(queries.captured_queries[0]['sql'], 'BEGIN IMMEDIATE')
+
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                ProductModel.objects.exists()
+        self.assertEqual(queries.captured_queries[0]['sql'], 'BEGIN')
@@ -0,0 +1,140 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.orders.models import IdempotencyKeyModel, OrderModel
+from api.orders.repository import DjangoIdempotencyStore
+from api.products.models import ProductModel
+from api.users.models import UserModel
+from core.interfaces.usecase.idempotency import IdempotencyGuard, fingerprint
+
+
+class OrderIdempotencyTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserModel.objects.create_user(
+            email='user@example.com', password='password', first_name='User', last_name='Test'
+        )
+        self.other = UserModel.objects.create_user(
+            email='other@example.com', password='password', first_name='Other', last_name='Test'
+        )
+        self.product = ProductModel.objects.create(name='Caneca', price=Decimal('9.90'), stock=100)
+        self.client.force_authenticate(user=self.user)
+
+    def _post(self, key, quantity=2, **extra):
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key is not None else {}
+        return self.client.post(reverse('order-create'), {
+            'product_id': str(self.product.id), 'quantity': quantity
+        }, format='json', **headers, **extra)
+
+    def test_retry_returns_original_order(self):
+        first = self._post('retry-1')
+        with self.assertNumQueries(1):
+            second = self._post('retry-1')
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertFalse(first.has_header('Idempotent-Replayed'))
+        self.assertEqual(OrderModel.objects.count(), 1)
+
+    def test_without_header_every_request_creates(self):
+        self._post(None)
+        self._post(None)
+        self.assertEqual(OrderModel.objects.count(), 2)
+        self.assertEqual(IdempotencyKeyModel.objects.count(), 0)
+
+    def test_key_reused_with_other_body_is_rejected(self):
+        self._post('retry-2')
+        response = self._post('retry-2', quantity=5)
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(OrderModel.objects.count(), 1)
+
+    def test_keys_are_scoped_per_user(self):
+        self._post('shared')
+        self.client.force_authenticate(user=self.other)
+        response = self._post('shared')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(OrderModel.objects.count(), 2)
+
+    def test_rejection_is_replayed_too(self):
+        self.product.is_active = False
+        self.product.save()
+        first = self._post('inactive')
+        self.product.is_active = True
+        self.product.save()
+        second = self._post('inactive')
+
+        self.assertEqual(first.status_code, 400)
+        self.assertEqual(second.status_code, 400)
+        self.assertEqual(OrderModel.objects.count(), 0)
+
+    def _scoped_key(self, key):
+        return IdempotencyGuard.scoped_key(f'orders:create:{self.user.pk}', key)
+
+    def test_in_flight_duplicate_gets_conflict_immediately(self):
+        # Simula a primeira requisição ainda em execução.
+        now = timezone.now()
+        payload = {'product_id': str(self.product.id), 'quantity': 2}
+        acquired = DjangoIdempotencyStore().acquire(
+            self._scoped_key('busy'), fingerprint(payload), now, now + timedelta(hours=1),
+            now - timedelta(minutes=1),
+        )
+        self.assertIsNone(acquired)
+
+        with self.assertNumQueries(1):
+            response = self._post('busy')
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(OrderModel.objects.count(), 0)
+
+    def test_order_and_stored_response_commit_together(self):
+        update = QuerySet.update
+
+        def failing_update(queryset, **kwargs):
+            if queryset.model is IdempotencyKeyModel and kwargs.get('status_code') is not None:
+                raise DatabaseError('falha ao gravar o resultado')
+            return update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', failing_update):
+            with self.assertRaises(DatabaseError):
+                self._post('crash')
+
+        # O pedido foi desfeito com o resultado; a repetição cria um só pedido.
+        self.assertFalse(OrderModel.objects.exists())
+        self.assertFalse(IdempotencyKeyModel.objects.exists())
+        self.assertEqual(self._post('crash').status_code, 201)
+        self.assertEqual(self._post('crash')['Idempotent-Replayed'], 'true')
+        self.assertEqual(OrderModel.objects.count(), 1)
+
+    def test_expired_key_runs_again(self):
+        self._post('old')
+        IdempotencyKeyModel.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self._post('old').status_code, 201)
+        self.assertEqual(OrderModel.objects.count(), 2)
+
+    def test_purge_command_removes_only_expired_keys(self):
+        self._post('expired')
+        self._post('kept')
+        IdempotencyKeyModel.objects.filter(key=self._scoped_key('expired')).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        out = StringIO()
+        call_command('purge_idempotency_keys', '--batch-size', '1', stdout=out)
+
+        self.assertIn('1 chaves expiradas removidas', out.getvalue())
+        self.assertEqual(
+            list(IdempotencyKeyModel.objects.values_list('key', flat=True)), [self._scoped_key('kept')]
+        )
@@ -0,0 +1,298 @@
+import time
+import uuid
+from datetime import timedelta
+from unittest import skipUnless
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.utils import timezone
+from api.users.models import UserModel
+from api.products.models import ProductModel
+from api.orders.models import OrderItemModel, OrderModel
+from api.orders.repository import DjangoOrderRepository
+
+
+class OrderAPITestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = UserModel.objects.create_superuser(
+            email='admin@example.com',
+            password='password',
+            first_name='Admin',
+            last_name='Test'
+        )
+        self.user = UserModel.objects.create_user(
+            email='user@example.com', password='password', first_name='User', last_name='Test'
+        )
+        self.other = UserModel.objects.create_user(
+            email='other@example.com', password='password', first_name='Other', last_name='Test'
+        )
+        self.product = ProductModel.objects.create(name='Caneca', price=Decimal('9.90'), stock=100)
+        self.inactive = ProductModel.objects.create(name='Antigo', price=Decimal('1.00'), stock=1, is_active=False)
+
+    def _create(self, user, quantity=2, product=None):
+        self.client.force_authenticate(user=user)
+        return self.client.post(reverse('order-create'), {
+            'product_id': str((product or self.product).id), 'quantity': quantity
+        }, format='json')
+
+    def test_create_computes_subtotal(self):
+        response = self._create(self.user, quantity=3)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['subtotal'], '29.70')
+        self.assertEqual(response.data['status'], 'p')
+        self.assertEqual(response.data['owner_id'], str(self.user.id))
+
+    def test_create_rejects_inactive_product(self):
+        response = self._create(self.user, product=self.inactive)
+        self.assertEqual(response.status_code, 400)
+
+    def test_retrieve_only_owner_or_admin(self):
+        order_id = self._create(self.user).data['order_id']
+        url = reverse('order-retrieve', kwargs={'pk': order_id})
+
+        body = self.client.get(url).data
+        self.assertEqual(body['product_name'], 'Caneca')
+        self.assertEqual(body['items'], [{
+            'product_id': str(self.product.id), 'product_name': 'Caneca', 'quantity': 2, 'unit_price': '9.90'
+        }])
+        self.client.force_authenticate(user=self.other)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_authenticate(user=self.admin_user)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(reverse('order-retrieve', kwargs={'pk': uuid.uuid4()})).status_code, 404)
+
+    def test_mine_lists_only_own_orders(self):
+        self._create(self.user)
+        self._create(self.user)
+        self._create(self.other)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('order-list-mine'))
+        self.assertEqual(response.data['total_items'], 2)
+        self.assertEqual({order['owner_id'] for order in response.data['results']}, {str(self.user.id)})
+
+        self.assertEqual(self.client.get(reverse('order-list')).status_code, 403)
+        self.client.force_authenticate(user=self.admin_user)
+        self.assertEqual(self.client.get(reverse('order-list')).data['total_items'], 3)
+
+    def test_list_entries_match_retrieve_representation(self):
+        created = self._create(self.user, quantity=3).data
+
+        listed = self.client.get(reverse('order-list-mine')).data['results'][0]
+        retrieved = self.client.get(reverse('order-retrieve', kwargs={'pk': created['order_id']})).data
+
+        self.assertEqual(set(listed), set(retrieved) - {'product_id', 'items'})
+        for body in (created, retrieved):
+            self.assertEqual({key: body[key] for key in listed}, listed)
+
+    def test_batch_reports_per_order_results(self):
+        self.client.force_authenticate(user=self.admin_user)
+        payload = {'orders': [
+            {'product_id': str(self.product.id), 'quantity': 1, 'owner_id': str(self.user.id)},
+            {'product_id': str(uuid.uuid4()), 'quantity': 1},
+            {'product_id': str(self.product.id), 'quantity': 1, 'owner_id': str(uuid.uuid4())},
+            {'product_id': str(self.product.id), 'quantity': 0},
+            {'product_id': str(self.inactive.id), 'quantity': 1},
+        ]}
+        response = self.client.post(reverse('order-batch-create'), payload, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['failed']), (1, 4))
+        results = response.data['results']
+        self.assertEqual([result['index'] for result in results], [0, 1, 2, 3, 4])
+        self.assertEqual(results[0]['order']['owner_id'], str(self.user.id))
+        self.assertEqual(results[1]['errors'], 'Produto não encontrado')
+        self.assertEqual(results[2]['errors'], 'Usuário não encontrado')
+        self.assertIn('quantity', results[3]['errors'])
+        self.assertEqual(results[4]['errors'], 'Produto inativo')
+
+    def test_batch_of_5000_orders_uses_constant_queries(self):
+        products = ProductModel.objects.bulk_create([
+            ProductModel(name=f'Produto {i}', price=Decimal('2.50'), stock=1000) for i in range(50)
+        ])
+        owners = [str(self.user.id), str(self.other.id)]
+        payload = {'orders': [
+            {'product_id': str(products[i % 50].id), 'quantity': 1 + i % 3, 'owner_id': owners[i % 2]}
+            for i in range(5000)
+        ]}
+        self.client.force_authenticate(user=self.admin_user)
+
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('order-batch-create'), payload, format='json')
+        elapsed = time.perf_counter() - started
+
+        # Uma consulta para os produtos e uma para os donos; a reserva é um
+        # UPDATE por produto e o resto são INSERTs em lote.
+        selects = [query for query in queries if query['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), 2)
+        self.assertLess(len(queries), 150)
+
+        self.assertEqual(response.data['created'], 5000)
+        self.assertEqual(OrderModel.objects.count(), 5000)
+        self.assertEqual(OrderModel.objects.filter(owner=self.other).count(), 2500)
+        self.assertLess(elapsed, 30)
+
+    def test_batch_requires_admin(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('order-batch-create'), {'orders': [
+            {'product_id': str(self.product.id), 'quantity': 1}
+        ]}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+class OrderListQueryCountTestCase(TestCase):
+    """Listagens carregam dono e linhas com um número fixo de consultas."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = UserModel.objects.create_superuser(
+            email='admin@example.com', password='password', first_name='Admin', last_name='Test'
+        )
+        owners = [
+            UserModel.objects.create_user(
+                email=f'user{i}@example.com', password='password', first_name='User', last_name=str(i)
+            )
+            for i in range(5)
+        ]
+        products = ProductModel.objects.bulk_create([
+            ProductModel(name=f'Produto {i}', price=Decimal('3.00'), stock=10) for i in range(20)
+        ])
+        orders = OrderModel.objects.bulk_create([
+            OrderModel(owner=owners[i % 5], subtotal=Decimal('9.00')) for i in range(1000)
+        ])
+        OrderItemModel.objects.bulk_create([
+            OrderItemModel(order=order, product=products[(i + line) % 20], quantity=1 + line,
+                           unit_price=Decimal('3.00'))
+            for i, order in enumerate(orders) for line in range(2)
+        ])
+
+    def test_repository_lists_1000_orders_in_constant_queries(self):
+        # Contagem, pedidos com dono (JOIN) e linhas com produto (prefetch).
+        with self.assertNumQueries(3):
+            orders, total = DjangoOrderRepository().get_all_paginated_filtered(offset=0, limit=1000)
+            names = {item.product_name for order in orders for item in order.items}
+            emails = {order.owner.email for order in orders}
+
+        self.assertEqual(total, 1000)
+        self.assertEqual(len(orders), 1000)
+        self.assertEqual(len(names), 20)
+        self.assertEqual(len(emails), 5)
+        self.assertTrue(all(order.quantity == 3 for order in orders))
+
+        with self.assertNumQueries(2):
+            self.assertEqual(len(DjangoOrderRepository().get_all()), 1000)
+
+    def test_list_endpoint_query_count_does_not_grow_with_page(self):
+        client = APIClient()
+        client.force_authenticate(user=self.admin_user)
+        url = reverse('order-list')
+
+        with self.assertNumQueries(3):
+            small = client.get(url, {'limit': 5})
+        with self.assertNumQueries(3):
+            large = client.get(url, {'limit': 100, 'search': 'Produto 1'})
+
+        self.assertEqual(len(small.data['results']), 5)
+        self.assertEqual(len(large.data['results']), 100)
+        self.assertEqual(
+            large.data['total_items'],
+            OrderModel.objects.filter(items__product__name__icontains='Produto 1').distinct().count(),
+        )
+
+
+class OrderCursorListTestCase(TestCase):
+    """Listagem keyset por dono e status, do pedido mais recente ao mais antigo."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create_user(
+            email='user@example.com', password='password', first_name='User', last_name='Test'
+        )
+        cls.other = UserModel.objects.create_user(
+            email='other@example.com', password='password', first_name='Other', last_name='Test'
+        )
+        product = ProductModel.objects.create(name='Caneca', price=Decimal('9.90'), stock=100)
+        base = timezone.now()
+        orders = OrderModel.objects.bulk_create([
+            OrderModel(
+                owner=cls.user if i % 3 else cls.other,
+                subtotal=Decimal('9.90'),
+                status='p' if i % 2 else 'F',
+                # Pares com o mesmo instante exercitam o desempate por order_id.
+                created_at=base - timedelta(minutes=i // 2),
+            )
+            for i in range(60)
+        ])
+        OrderItemModel.objects.bulk_create([
+            OrderItemModel(order=order, product=product, quantity=1, unit_price=Decimal('9.90'))
+            for order in orders
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _walk(self, params):
+        seen, pages, response = [], 0, self.client.get(reverse('order-list-mine'), params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            seen.extend(response.data['results'])
+            pages += 1
+            if not response.data['next']:
+                return seen, pages, response
+            response = self.client.get(reverse('order-list-mine'), {**params, 'cursor': response.data['next']})
+
+    def test_walks_owner_and_status_newest_first(self):
+        expected = list(
+            OrderModel.objects.filter(owner=self.user, status='p')
+            .order_by('-created_at', '-order_id').values_list('order_id', flat=True)
+        )
+        seen, pages, _ = self._walk({'pagination': 'cursor', 'limit': 7, 'status': 'p'})
+
+        self.assertEqual([order['order_id'] for order in seen], [str(order_id) for order_id in expected])
+        self.assertEqual(pages, -(-len(expected) // 7))
+        self.assertTrue(all(order['status'] == 'p' for order in seen))
+
+    def test_prev_cursor_returns_previous_page(self):
+        url = reverse('order-list-mine')
+        first = self.client.get(url, {'pagination': 'cursor', 'limit': 5})
+        second = self.client.get(url, {'cursor': first.data['next'], 'limit': 5})
+        back = self.client.get(url, {'cursor': second.data['prev'], 'limit': 5})
+
+        self.assertIsNone(first.data['prev'])
+        self.assertEqual(back.data['results'], first.data['results'])
+
+    def test_regular_user_only_sees_own_orders(self):
+        seen, _, _ = self._walk({'pagination': 'cursor', 'limit': 50})
+        self.assertEqual(len(seen), OrderModel.objects.filter(owner=self.user).count())
+        self.assertEqual({order['owner_id'] for order in seen}, {str(self.user.id)})
+
+    def test_page_uses_constant_queries(self):
+        url = reverse('order-list-mine')
+        first = self.client.get(url, {'pagination': 'cursor', 'limit': 5})
+        # Pedidos com dono (JOIN) e linhas com produto; sem contagem.
+        with self.assertNumQueries(2):
+            self.client.get(url, {'cursor': first.data['next'], 'limit': 30, 'status': 'F'})
+
+    def test_invalid_cursor_and_status_are_rejected(self):
+        url = reverse('order-list-mine')
+        self.assertEqual(self.client.get(url, {'cursor': 'nao-e-um-cursor'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'status': 'x'}).status_code, 400)
+
+    @skipUnless(connection.vendor == 'sqlite', 'plano de execução específico do SQLite')
+    def test_owner_status_page_is_served_by_composite_index(self):
+        queryset = (
+            OrderModel.objects.filter(owner=self.user, status='p')
+            .order_by('-created_at', '-order_id')[:10]
+        )
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn('order_owner_status_created', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
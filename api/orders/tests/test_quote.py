@@ -0,0 +1,103 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.orders.models import OrderItemModel, OrderModel
+from api.orders.quotes import DjangoTokenSigner
+from api.products.models import ProductModel
+from api.products.repository import DjangoProductRepository
+from api.users.models import UserModel
+from core.interfaces.usecase.quote_usecase import CartLine, QuoteCartRequest, QuoteCartUseCase
+
+
+class CartQuoteTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserModel.objects.create_user(
+            email='user@example.com', password='password', first_name='User', last_name='Test'
+        )
+        self.other = UserModel.objects.create_user(
+            email='other@example.com', password='password', first_name='Other', last_name='Test'
+        )
+        self.products = ProductModel.objects.bulk_create([
+            ProductModel(name=f'Produto {i}', price=Decimal('0.10') * (i + 1), stock=100) for i in range(50)
+        ])
+        self.client.force_authenticate(user=self.user)
+
+    def _quote(self, items):
+        return self.client.post(reverse('order-quote'), {'items': items}, format='json')
+
+    def test_prices_50_line_cart_with_one_query(self):
+        use_case = QuoteCartUseCase(DjangoProductRepository(), DjangoTokenSigner())
+        lines = [CartLine(product_id=str(product.id), quantity=3) for product in self.products]
+
+        with self.assertNumQueries(1):
+            quote = use_case.execute(QuoteCartRequest(owner_id=str(self.user.id), lines=lines))
+
+        # 3 * (0.10 + 0.20 + ... + 5.00) = 3 * 127.50, sem erro de ponto flutuante.
+        self.assertEqual(quote.total, Decimal('382.50'))
+        self.assertEqual(quote.lines[2].line_total, Decimal('0.90'))
+
+    def test_checkout_snapshots_quoted_prices(self):
+        cart = [
+            {'product_id': str(self.products[0].id), 'quantity': 2},
+            {'product_id': str(self.products[1].id), 'quantity': 1},
+            {'product_id': str(self.products[0].id), 'quantity': 1},
+        ]
+        quote = self._quote(cart).data
+        self.assertEqual(quote['total'], '0.50')
+        self.assertEqual([line['quantity'] for line in quote['lines']], [3, 1])
+
+        # O preço muda depois da cotação; o pedido mantém o preço cotado.
+        ProductModel.objects.filter(pk=self.products[0].pk).update(price=Decimal('99.00'))
+        # Reserva (UPDATE por produto e INSERT das reservas) e pedido (INSERT + linhas);
+        # as outras seis são os savepoints das duas transações.
+        with self.assertNumQueries(11):
+            response = self.client.post(reverse('order-create'), {'quote_token': quote['quote_token']}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['subtotal'], '0.50')
+        order = OrderModel.objects.get(pk=response.data['order_id'])
+        self.assertEqual(
+            sorted(OrderItemModel.objects.filter(order=order).values_list('quantity', 'unit_price')),
+            [(1, Decimal('0.20')), (3, Decimal('0.10'))],
+        )
+
+    def test_quote_token_checks_out_once(self):
+        token = self._quote([{'product_id': str(self.products[0].id), 'quantity': 4}]).data['quote_token']
+        url = reverse('order-create')
+
+        self.assertEqual(self.client.post(url, {'quote_token': token}, format='json').status_code, 201)
+        response = self.client.post(url, {'quote_token': token}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['detail'], 'Cotação já utilizada')
+        self.assertEqual(OrderModel.objects.count(), 1)
+        # A reserva da repetição foi desfeita com o INSERT recusado.
+        self.products[0].refresh_from_db()
+        self.assertEqual(self.products[0].stock, 96)
+
+    def test_rejects_tampered_expired_or_foreign_token(self):
+        token = self._quote([{'product_id': str(self.products[0].id), 'quantity': 1}]).data['quote_token']
+        url = reverse('order-create')
+
+        self.assertEqual(self.client.post(url, {'quote_token': token[:-2] + 'xx'}, format='json').status_code, 400)
+
+        self.client.force_authenticate(user=self.other)
+        self.assertEqual(self.client.post(url, {'quote_token': token}, format='json').status_code, 403)
+
+        self.client.force_authenticate(user=self.user)
+        with self.settings(ORDER_QUOTE={'TTL_SECONDS': -1}):
+            expired = self._quote([{'product_id': str(self.products[0].id), 'quantity': 1}]).data['quote_token']
+        response = self.client.post(url, {'quote_token': expired}, format='json')
+        self.assertEqual(response.data['detail'], 'Cotação expirada')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(OrderModel.objects.count(), 0)
+
+    def test_rejects_unavailable_lines(self):
+        ProductModel.objects.filter(pk=self.products[1].pk).update(is_active=False)
+        self.assertEqual(self._quote([{'product_id': str(self.products[1].id), 'quantity': 1}]).status_code, 400)
+        self.assertEqual(self._quote([{'product_id': str(self.products[0].id), 'quantity': 101}]).status_code, 400)
+        self.assertEqual(self._quote([]).status_code, 400)
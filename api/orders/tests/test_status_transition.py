@@ -0,0 +1,90 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.orders.models import OrderModel
+from api.orders.repository import DjangoOrderRepository
+from api.users.models import UserModel
+
+
+class OrderStatusBulkTransitionTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = UserModel.objects.create_superuser(
+            email='admin@example.com', password='password', first_name='Admin', last_name='Test'
+        )
+        cls.user = UserModel.objects.create_user(
+            email='user@example.com', password='password', first_name='User', last_name='Test'
+        )
+        base = timezone.now()
+        OrderModel.objects.bulk_create([
+            OrderModel(
+                owner=cls.user if i % 2 else cls.admin_user,
+                subtotal=Decimal('1.00'),
+                status='c' if i % 10 == 0 else 'p',
+                created_at=base - timedelta(seconds=i),
+            )
+            for i in range(2500)
+        ], batch_size=500)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin_user)
+        self.url = reverse('order-status-bulk')
+
+    def test_moves_all_matching_orders_in_chunked_updates(self):
+        pending = OrderModel.objects.filter(status='p').count()
+
+        with mock.patch.object(DjangoOrderRepository, 'STATUS_TRANSITION_CHUNK_SIZE', 1000), \
+                CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {'from_status': 'p', 'to_status': 'F'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'updated': pending, 'chunks': 4})
+        self.assertEqual(OrderModel.objects.filter(status='p').count(), 0)
+        self.assertEqual(OrderModel.objects.filter(status='F').count(), pending)
+
+        # Um UPDATE por lote (o último não encontra nada), sem transação envolvendo os lotes.
+        statements = [query['sql'].split()[0] for query in queries]
+        self.assertEqual(statements.count('UPDATE'), 4)
+        self.assertNotIn('SAVEPOINT', statements)
+        self.assertNotIn('SELECT', statements)
+
+    def test_filter_limits_transition(self):
+        cutoff = timezone.now() - timedelta(seconds=100)
+        response = self.client.post(self.url, {
+            'from_status': 'p', 'to_status': 'c',
+            'filter': {'owner_id': str(self.user.id), 'created_after': cutoff.isoformat()},
+        }, format='json')
+
+        expected = OrderModel.objects.filter(owner=self.user, created_at__gte=cutoff, status='c').count()
+        self.assertEqual(response.data['updated'], expected)
+        self.assertTrue(OrderModel.objects.filter(owner=self.admin_user, status='p').exists())
+        self.assertFalse(OrderModel.objects.filter(owner=self.user, created_at__gte=cutoff, status='p').exists())
+
+    def test_order_ids_filter(self):
+        order_ids = list(OrderModel.objects.filter(status='p').values_list('order_id', flat=True)[:3])
+        response = self.client.post(self.url, {
+            'from_status': 'p', 'to_status': 'F', 'filter': {'order_ids': [str(pk) for pk in order_ids]},
+        }, format='json')
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(OrderModel.objects.filter(status='F').count(), 3)
+
+    def test_illegal_transition_is_rejected(self):
+        response = self.client.post(self.url, {'from_status': 'c', 'to_status': 'p'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(self.url, {'from_status': 'p', 'to_status': 'x'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(OrderModel.objects.filter(status='p').count(), 2250)
+
+    def test_requires_admin(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, {'from_status': 'p', 'to_status': 'F'}, format='json')
+        self.assertEqual(response.status_code, 403)
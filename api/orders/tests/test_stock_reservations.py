@@ -0,0 +1,187 @@
+import multiprocessing
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import IntegrityError, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.orders.models import OrderModel, StockReservationModel
+from api.orders.reservations import sweep_expired_reservations
+from api.products.models import ProductModel
+from api.users.models import UserModel
+
+
+class StockReservationTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = UserModel.objects.create_superuser(
+            email='admin@example.com', password='password', first_name='Admin', last_name='Test'
+        )
+        self.user = UserModel.objects.create_user(
+            email='user@example.com', password='password', first_name='User', last_name='Test'
+        )
+        self.product = ProductModel.objects.create(name='Caneca', price=Decimal('9.90'), stock=10)
+        self.client.force_authenticate(user=self.user)
+
+    def _create(self, quantity=2):
+        return self.client.post(reverse('order-create'), {
+            'product_id': str(self.product.id), 'quantity': quantity
+        }, format='json')
+
+    def _expire_all(self):
+        StockReservationModel.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+    def stock(self):
+        self.product.refresh_from_db()
+        return self.product.stock
+
+    def test_create_holds_stock_until_expiration(self):
+        before = timezone.now()
+        response = self._create(quantity=3)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.stock(), 7)
+        reservation = StockReservationModel.objects.get()
+        self.assertEqual(str(reservation.order_id), response.data['order_id'])
+        self.assertEqual(reservation.quantity, 3)
+        self.assertGreaterEqual(reservation.expires_at, before + timedelta(seconds=900))
+
+    def test_create_without_stock_is_rejected(self):
+        response = self._create(quantity=11)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Estoque insuficiente', response.data['detail'])
+        self.assertEqual((OrderModel.objects.count(), StockReservationModel.objects.count()), (0, 0))
+        self.assertEqual(self.stock(), 10)
+
+    def test_failed_order_insert_undoes_the_hold(self):
+        with mock.patch('api.orders.repository.OrderItemModel.objects.bulk_create',
+                        side_effect=IntegrityError('falha simulada')):
+            with self.assertRaises(IntegrityError):
+                self._create(quantity=3)
+
+        self.assertEqual((OrderModel.objects.count(), StockReservationModel.objects.count()), (0, 0))
+        self.assertEqual(self.stock(), 10)
+
+    def test_admin_batch_holds_stock_in_bulk(self):
+        other = ProductModel.objects.create(name='Mochila', price=Decimal('120.00'), stock=1)
+        self.client.force_authenticate(user=self.admin_user)
+
+        # Produtos, um UPDATE por produto, um INSERT de reservas, pedidos e linhas (+ savepoints).
+        with self.assertNumQueries(12):
+            response = self.client.post(reverse('order-batch-create'), {'orders': [
+                {'product_id': str(self.product.id), 'quantity': 4},
+                {'product_id': str(self.product.id), 'quantity': 5},
+                {'product_id': str(other.id), 'quantity': 1},
+            ]}, format='json')
+
+        self.assertEqual((response.status_code, response.data['created']), (201, 3))
+        self.assertEqual(self.stock(), 1)
+        self.assertEqual(StockReservationModel.objects.count(), 3)
+
+        # Sem estoque para o conjunto: cada pedido é tentado sozinho.
+        response = self.client.post(reverse('order-batch-create'), {'orders': [
+            {'product_id': str(self.product.id), 'quantity': 1},
+            {'product_id': str(other.id), 'quantity': 1},
+        ]}, format='json')
+        self.assertEqual((response.data['created'], response.data['failed']), (1, 1))
+        self.assertIn('Estoque insuficiente', response.data['results'][1]['errors'])
+        self.assertEqual(self.stock(), 0)
+        self.assertEqual(OrderModel.objects.count(), StockReservationModel.objects.count())
+
+    @override_settings(STOCK_RESERVATIONS={"ENABLED": False})
+    def test_disabled_reservations_do_not_touch_stock(self):
+        self.assertEqual(self._create().status_code, 201)
+        self.assertEqual(self.stock(), 10)
+        self.assertFalse(StockReservationModel.objects.exists())
+
+    def test_sweeper_expires_pending_orders_and_releases_stock(self):
+        order_id = self._create(quantity=4).data['order_id']
+        self.assertEqual(sweep_expired_reservations().processed, 0)
+
+        self._expire_all()
+        result = sweep_expired_reservations()
+
+        self.assertEqual((result.processed, result.released, result.expired_orders, result.backlog), (1, 4, 1, 0))
+        self.assertEqual(OrderModel.objects.get(order_id=order_id).status, 'e')
+        self.assertEqual(self.stock(), 10)
+        self.assertFalse(StockReservationModel.objects.exists())
+
+    def test_sweeper_keeps_stock_of_finished_orders(self):
+        order_id = self._create(quantity=4).data['order_id']
+        OrderModel.objects.filter(order_id=order_id).update(status='F')
+
+        self._expire_all()
+        result = sweep_expired_reservations()
+
+        self.assertEqual((result.processed, result.released, result.expired_orders), (1, 0, 0))
+        self.assertEqual(OrderModel.objects.get(order_id=order_id).status, 'F')
+        self.assertEqual(self.stock(), 6)
+
+    @override_settings(STOCK_RESERVATIONS={"SWEEP_BATCH_SIZE": 2, "SWEEP_MAX_BATCHES": 2})
+    def test_sweeper_work_per_run_is_bounded(self):
+        for _ in range(5):
+            self._create(quantity=1)
+        self._expire_all()
+
+        first = sweep_expired_reservations()
+        self.assertEqual((first.processed, first.batches, first.backlog), (4, 2, 1))
+        second = sweep_expired_reservations()
+        self.assertEqual((second.processed, second.batches, second.backlog), (1, 1, 0))
+        self.assertEqual(self.stock(), 10)
+
+    def test_metrics_endpoint(self):
+        self._create()
+        self._expire_all()
+        url = reverse('order-reservation-metrics')
+
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(url)
+        self.assertEqual((response.data['backlog'], response.data['active']), (1, 0))
+        self.assertGreater(response.data['oldest_expired_age_seconds'], 0)
+        self.assertIsNone(response.data['sweeper'])
+
+        call_command('sweep_stock_reservations', '--once', stdout=StringIO())
+        response = self.client.get(url)
+        self.assertEqual(response.data['backlog'], 0)
+        self.assertEqual((response.data['sweeper']['runs'], response.data['sweeper']['processed_total']), (1, 1))
+        self.assertIn('last_duration_ms', response.data['sweeper'])
+
+
+def _sweep_in_child_process():
+    connections.close_all()
+    call_command('sweep_stock_reservations', '--once', stdout=StringIO())
+    connections.close_all()
+
+
+class ReservationSweeperMetricsAcrossProcessesTestCase(TransactionTestCase):
+    def test_run_recorded_by_sweeper_process_is_served_by_the_api(self):
+        admin_user = UserModel.objects.create_superuser(
+            email='admin@example.com', password='password', first_name='Admin', last_name='Test'
+        )
+        product = ProductModel.objects.create(name='Caneca', price=Decimal('9.90'), stock=10)
+        StockReservationModel.objects.create(
+            order_id=uuid.uuid4(), product=product, quantity=3, expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        # O sweeper roda em outro processo, como `manage.py sweep_stock_reservations`.
+        connections.close_all()
+        process = multiprocessing.get_context('fork').Process(target=_sweep_in_child_process)
+        process.start()
+        process.join(timeout=30)
+        self.assertEqual(process.exitcode, 0)
+
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        sweeper = client.get(reverse('order-reservation-metrics')).data['sweeper']
+        self.assertEqual((sweeper['runs'], sweeper['processed_total'], sweeper['released_total']), (1, 1, 3))
+        self.assertEqual(sweeper['last_backlog'], 0)
+        self.assertIsNotNone(sweeper['last_run_at'])
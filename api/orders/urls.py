@@ -0,0 +1,25 @@
+from django.urls import path
+from .views import (
+    OrderCreateAPIView,
+    OrderBatchCreateAPIView,
+    OrderRetrieveAPIView,
+    OrderListAPIView,
+    MyOrderListAPIView,
+    OrderCheckoutStatusAPIView,
+    OrderStatusBulkTransitionAPIView,
+    OrderQuoteAPIView,
+    OrderReservationMetricsAPIView,
+)
+
+urlpatterns = [
+    path("orders/", OrderCreateAPIView.as_view(), name="order-create"),
+    path("orders/batch/", OrderBatchCreateAPIView.as_view(), name="order-batch-create"),
+    path("orders/list/", OrderListAPIView.as_view(), name="order-list"),
+    path("orders/mine/", MyOrderListAPIView.as_view(), name="order-list-mine"),
+    path("orders/quote/", OrderQuoteAPIView.as_view(), name="order-quote"),
+    path("orders/status/bulk/", OrderStatusBulkTransitionAPIView.as_view(), name="order-status-bulk"),
+    path("orders/reservations/metrics/", OrderReservationMetricsAPIView.as_view(),
+         name="order-reservation-metrics"),
+    path("orders/checkout/<uuid:pk>/", OrderCheckoutStatusAPIView.as_view(), name="order-checkout-status"),
+    path("orders/<uuid:pk>/", OrderRetrieveAPIView.as_view(), name="order-retrieve"),
+]
@@ -1,3 +1,390 @@
-from django.shortcuts import render
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from api.products.repository import get_product_repository
+from api.users.repository import DjangoUserRepository
+from core.domain.repositories.order_repository import OrderFilter
+from core.interfaces.usecase.checkout_usecase import (
+    EnqueueCheckoutRequest,
+    EnqueueCheckoutUseCase,
+    GetCheckoutJobUseCase,
+)
+from core.interfaces.usecase.criar_pedido_usecase import (
+    BulkTransitionOrdersRequest,
+    BulkTransitionOrdersUseCase,
+    CreateOrdersBatchRequest,
+    CreateOrdersBatchUseCase,
+    GetOrderRequest,
+    GetOrderUseCase,
+    ListOrdersRequest,
+    ListOrderUseCase,
+    OrderBatchItem,
+)
+from core.interfaces.usecase.idempotency import IdempotencyInProgress, IdempotencyKeyReused, fingerprint
+from core.interfaces.usecase.quote_usecase import (
+    CartLine,
+    CheckoutQuoteRequest,
+    CheckoutQuoteUseCase,
+    QuoteCartRequest,
+    QuoteCartUseCase,
+)
+from .checkout import async_checkout_requested
+from .quotes import DjangoTokenSigner, get_order_quote_settings
+from .reservations import get_order_stock_reserver, get_reservation_metrics
+from .repository import DjangoCheckoutJobRepository, DjangoOrderRepository, get_idempotency_guard
+from .serializers import (
+    CheckoutJobSerializer,
+    OrderBatchItemSerializer,
+    OrderCreateSerializer,
+    OrderListItemSerializer,
+    OrderReadSerializer,
+    OrderStatusTransitionSerializer,
+    QuoteRequestSerializer,
+    QuoteSerializer,
+)
+
+MAX_PAGE_SIZE = 100
+MAX_BATCH_ORDERS = 10_000
+
+
+def _page_params(params):
+    try:
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", 10))
+    except (TypeError, ValueError):
+        raise ValueError("Parâmetros de paginação inválidos")
+    if offset < 0 or not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError("Parâmetros de paginação inválidos")
+    return offset, limit
+
+
+def _idempotent_response(request, scope, action):
+    """Executa `action` (que retorna `(status, body)`) respeitando o header `Idempotency-Key`.
+
+    Sem o header, apenas executa. Com ele, repetições recebem a resposta
+    original (com `Idempotent-Replayed: true`) e repetições concorrentes
+    recebem 409 com `Retry-After`.
+    """
+    key = request.headers.get("Idempotency-Key")
+    if key is None:
+        status_code, body = action()
+        return Response(body, status=status_code)
+
+    guard = get_idempotency_guard()
+    try:
+        scoped_key = guard.scoped_key(f"{scope}:{request.user.pk}", key)
+        result = guard.run(scoped_key, fingerprint(request.data), action)
+    except IdempotencyKeyReused as e:
+        return Response({"detail": str(e)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    except IdempotencyInProgress as e:
+        return Response({"detail": str(e)}, status=status.HTTP_409_CONFLICT, headers={"Retry-After": "1"})
+    except ValueError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    headers = {"Idempotent-Replayed": "true"} if result.replayed else None
+    return Response(result.body, status=result.status_code, headers=headers)
+
+
+def _batch_use_case(stock_reserver=None):
+    return CreateOrdersBatchUseCase(
+        DjangoOrderRepository(), get_product_repository(), DjangoUserRepository(), stock_reserver
+    )
+
+
+class OrderCreateAPIView(APIView):
+    """
+    Cria um pedido para o usuário autenticado.
+
+    `POST {"product_id", "quantity"}` - o subtotal é calculado a partir do
+    preço atual do produto. Com o header `Idempotency-Key`, repetições da
+    mesma requisição devolvem o pedido já criado em vez de criar outro.
+
+    Com `STOCK_RESERVATIONS["ENABLED"]`, o pedido pendente reserva o estoque
+    por `TTL_SECONDS`; sem estoque, a resposta é 400.
+
+    Com `{"quote_token"}` (de `orders/quote/`), cria um pedido com todas as
+    linhas e preços da cotação, sem reprecificar.
+
+    Modo assíncrono (`CHECKOUT["ASYNC"]` ou header `Prefer: respond-async`):
+    o pedido é validado e colocado na fila de checkout, e a resposta é `202`
+    com `status_url` (também no header `Location`). Os workers
+    (`run_checkout_workers`) criam o pedido.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if isinstance(request.data, dict) and "quote_token" in request.data:
+            return self._checkout_quote(request)
+
+        serializer = OrderCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        product_id = str(serializer.validated_data["product_id"])
+        quantity = serializer.validated_data["quantity"]
+
+        def create():
+            item = OrderBatchItem(product_id=product_id, quantity=quantity)
+            result = _batch_use_case(get_order_stock_reserver()).execute(
+                CreateOrdersBatchRequest(items=[item]), request.user.to_domain()
+            )
+            outcome = result.results[0]
+            if outcome.error:
+                return status.HTTP_400_BAD_REQUEST, {"detail": outcome.error}
+            return status.HTTP_201_CREATED, OrderReadSerializer(outcome.order).data
+
+        def enqueue():
+            use_case = EnqueueCheckoutUseCase(DjangoCheckoutJobRepository(), get_product_repository())
+            try:
+                job = use_case.execute(EnqueueCheckoutRequest(
+                    owner_id=str(request.user.pk), product_id=product_id, quantity=quantity,
+                ))
+            except ValueError as e:
+                return status.HTTP_400_BAD_REQUEST, {"detail": str(e)}
+            return status.HTTP_202_ACCEPTED, CheckoutJobSerializer(job).data
+
+        if not async_checkout_requested(request):
+            return _idempotent_response(request, "orders:create", create)
+        response = _idempotent_response(request, "orders:checkout", enqueue)
+        if response.status_code == status.HTTP_202_ACCEPTED:
+            response["Location"] = response.data["status_url"]
+        return response
+
+    def _checkout_quote(self, request):
+        """Cria o pedido com os preços congelados na cotação (sempre síncrono)."""
+        def create():
+            use_case = CheckoutQuoteUseCase(
+                DjangoOrderRepository(), DjangoTokenSigner(), stock_reserver=get_order_stock_reserver()
+            )
+            try:
+                order = use_case.execute(
+                    CheckoutQuoteRequest(quote_token=str(request.data["quote_token"])), request.user.to_domain()
+                )
+            except ValueError as e:
+                return status.HTTP_400_BAD_REQUEST, {"detail": str(e)}
+            except PermissionError as e:
+                return status.HTTP_403_FORBIDDEN, {"detail": str(e)}
+            return status.HTTP_201_CREATED, OrderReadSerializer(order).data
+
+        return _idempotent_response(request, "orders:create", create)
+
+
+class OrderQuoteAPIView(APIView):
+    """
+    Cotação de um carrinho.
+
+    `POST {"items": [{"product_id", "quantity"}, ...]}` - preços e estoque de
+    todos os produtos em uma consulta, totais em `Decimal`. Retorna as linhas,
+    o total e um `quote_token` assinado que `POST orders/` aceita até `expires_at`.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = QuoteRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        use_case = QuoteCartUseCase(
+            get_product_repository(), DjangoTokenSigner(),
+            ttl_seconds=get_order_quote_settings()["TTL_SECONDS"],
+        )
+        try:
+            quote = use_case.execute(QuoteCartRequest(
+                owner_id=str(request.user.pk),
+                lines=[
+                    CartLine(product_id=str(item["product_id"]), quantity=item["quantity"])
+                    for item in serializer.validated_data["items"]
+                ],
+            ))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(QuoteSerializer(quote).data, status=status.HTTP_200_OK)
+
+
+class OrderBatchCreateAPIView(APIView):
+    """
+    Criação de pedidos em lote (apenas admins), p.ex. importação de marketplace.
+
+    `POST {"orders": [{"product_id", "quantity", "owner_id"?}, ...]}` - donos e
+    produtos são validados com uma consulta cada e os pedidos válidos são
+    gravados com `bulk_create` em uma transação. Retorna o resultado de cada item.
+    Aceita `Idempotency-Key`, como a criação unitária. Com `STOCK_RESERVATIONS`,
+    os pedidos pendentes reservam o estoque em lote na mesma transação;
+    itens sem estoque são rejeitados.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        raw_items = request.data.get("orders") if isinstance(request.data, dict) else None
+        if not isinstance(raw_items, list) or not raw_items:
+            return Response({"detail": "Informe a lista 'orders'"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(raw_items) > MAX_BATCH_ORDERS:
+            return Response(
+                {"detail": f"No máximo {MAX_BATCH_ORDERS} pedidos por requisição"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        items, invalid = [], {}
+        for index, raw_item in enumerate(raw_items):
+            serializer = OrderBatchItemSerializer(data=raw_item)
+            if not serializer.is_valid():
+                invalid[index] = serializer.errors
+                continue
+            data = serializer.validated_data
+            items.append((index, OrderBatchItem(
+                product_id=str(data["product_id"]),
+                quantity=data["quantity"],
+                owner_id=str(data["owner_id"]) if data.get("owner_id") else None,
+            )))
+
+        def create():
+            result = _batch_use_case(get_order_stock_reserver()).execute(
+                CreateOrdersBatchRequest(items=[item for _, item in items]), request.user.to_domain()
+            )
+
+            results = [{"index": index, "errors": errors} for index, errors in invalid.items()]
+            for (index, _), outcome in zip(items, result.results):
+                if outcome.error:
+                    results.append({"index": index, "errors": outcome.error})
+                else:
+                    results.append({"index": index, "order": OrderReadSerializer(outcome.order).data})
+            results.sort(key=lambda entry: entry["index"])
+
+            return status.HTTP_201_CREATED if result.created else status.HTTP_400_BAD_REQUEST, {
+                "created": result.created,
+                "failed": result.failed + len(invalid),
+                "results": results,
+            }
+
+        return _idempotent_response(request, "orders:batch", create)
+
+
+class OrderRetrieveAPIView(APIView):
+    """Busca um pedido pelo id (apenas o dono ou administradores)."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        use_case = GetOrderUseCase(DjangoOrderRepository())
+        try:
+            order = use_case.execute(GetOrderRequest(order_id=str(pk)), request.user.to_domain())
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except PermissionError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_403_FORBIDDEN)
+        return Response(OrderReadSerializer(order).data, status=status.HTTP_200_OK)
+
+
+class OrderListAPIView(APIView):
+    """
+    Lista pedidos, do mais recente ao mais antigo.
+
+    Paginação por offset (padrão):
+        `?offset=&limit=&search=&status=` - busca pelo nome do produto e
+        retorna `{"results", "total_items", "offset", "limit"}`.
+
+    Paginação por cursor (keyset):
+        `?pagination=cursor&limit=&status=` ou `?cursor=<cursor>` - retorna
+        `{"results", "next", "prev"}`, sem contagem. Com dono e/ou status, cada
+        página é lida direto dos índices compostos, com custo constante.
+
+    `mine=True` (rota `orders/mine/`) lista só os pedidos do usuário
+    autenticado; a rota `orders/list/` lista todos e é restrita a admins.
+    """
+    permission_classes = [IsAdminUser]
+    mine = False
+
+    def get(self, request):
+        params = request.query_params
+        current_user = request.user.to_domain()
+        try:
+            offset, limit = _page_params(params)
+            request_data = ListOrdersRequest(
+                offset=offset,
+                limit=limit,
+                search_query=params.get("search") or None,
+                owner_id=current_user.id if self.mine else None,
+                status=params.get("status") or None,
+                use_cursor=params.get("pagination") == "cursor",
+                cursor=params.get("cursor") or None,
+            )
+            response_data = ListOrderUseCase(DjangoOrderRepository()).execute(request_data, current_user)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = OrderListItemSerializer(response_data.orders, many=True).data
+        if request_data.use_cursor or request_data.cursor:
+            return Response({
+                "results": results,
+                "next": response_data.next_cursor,
+                "prev": response_data.prev_cursor,
+            }, status=status.HTTP_200_OK)
+        return Response({
+            "results": results,
+            "total_items": response_data.total_items,
+            "offset": response_data.offset,
+            "limit": response_data.limit,
+        }, status=status.HTTP_200_OK)
+
+
+class MyOrderListAPIView(OrderListAPIView):
+    permission_classes = [IsAuthenticated]
+    mine = True
+
+
+class OrderCheckoutStatusAPIView(APIView):
+    """Situação de um checkout assíncrono: queued, processing, done (com o pedido) ou failed."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        use_case = GetCheckoutJobUseCase(DjangoCheckoutJobRepository())
+        try:
+            job = use_case.execute(str(pk), request.user.to_domain())
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except PermissionError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_403_FORBIDDEN)
+        return Response(CheckoutJobSerializer(job).data, status=status.HTTP_200_OK)
+
+
+class OrderStatusBulkTransitionAPIView(APIView):
+    """
+    Transição de status em lote (apenas admins).
+
+    `POST {"from_status": "p", "to_status": "F", "filter": {"owner_id"?,
+    "order_ids"?, "created_after"?, "created_before"?}}` - valida a transição
+    (p -> F/c, F -> c) e a aplica com UPDATEs em lotes, cada um na própria
+    transação. Retorna `{"updated", "chunks"}`.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        serializer = OrderStatusTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        selection = data.get("filter", {})
+        order_filter = OrderFilter(
+            owner_id=str(selection["owner_id"]) if selection.get("owner_id") else None,
+            order_ids=[str(order_id) for order_id in selection["order_ids"]] if "order_ids" in selection else None,
+            created_after=selection.get("created_after"),
+            created_before=selection.get("created_before"),
+        )
+        use_case = BulkTransitionOrdersUseCase(DjangoOrderRepository())
+        try:
+            result = use_case.execute(BulkTransitionOrdersRequest(
+                from_status=data["from_status"], to_status=data["to_status"], order_filter=order_filter,
+            ), request.user.to_domain())
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except PermissionError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_403_FORBIDDEN)
+        return Response({"updated": result.updated, "chunks": result.chunks}, status=status.HTTP_200_OK)
+
+
+class OrderReservationMetricsAPIView(APIView):
+    """
+    Métricas das reservas de estoque (apenas administradores).
+
+    `backlog` e `oldest_expired_age_seconds` são lidos do banco na hora;
+    `sweeper` traz a duração e os totais da última execução do sweeper.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_reservation_metrics(), status=status.HTTP_200_OK)
@@ -0,0 +1,247 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.domain.entities.product import Product
+from core.domain.repositories.pagination import CursorPage, OffsetPage
+from core.domain.repositories.product_repository import ProductPatch, ProductPriceSnapshot, ProductRepository
+
+_NOT_FOUND = "__product_not_found__"
+
+DEFAULT_PRODUCT_CACHE = {
+    "ENABLED": True,
+    "MAX_ENTRIES": 10_000,
+    "TTL_SECONDS": 30,
+    "NOT_FOUND_TTL_SECONDS": 5,
+    "SHARED_CACHE_ALIAS": None,
+}
+
+
+class ProductDetailCache:
+    """
+    Cache de detalhes de produtos em dois níveis.
+
+    - Local: LRU limitado a `max_entries`, com TTL, protegido por lock.
+    - Compartilhado (opcional): um alias de `django.core.cache.caches`.
+
+    Também guarda resultados "não encontrado" (com TTL próprio) e mantém
+    contadores de acertos e falhas.
+    """
+    def __init__(self, max_entries=10_000, ttl=30, not_found_ttl=5, shared_alias=None,
+                 clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.not_found_ttl = not_found_ttl
+        self.shared_alias = shared_alias
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._counters = dict.fromkeys(
+            ["local_hits", "shared_hits", "not_found_hits", "misses", "evictions", "invalidations"], 0
+        )
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias] if self.shared_alias else None
+
+    @staticmethod
+    def _shared_key(product_id: str) -> str:
+        return f"product-detail:{product_id}"
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _store_local(self, product_id, value):
+        ttl = self.not_found_ttl if value is _NOT_FOUND else self.ttl
+        with self._lock:
+            self._entries[product_id] = (self._clock() + ttl, value)
+            self._entries.move_to_end(product_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def get(self, product_id: str) -> tuple[bool, Product | None]:
+        """Retorna (encontrado_no_cache, produto). Produto None = "não encontrado" em cache."""
+        product_id = str(product_id)
+        with self._lock:
+            entry = self._entries.get(product_id)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(product_id)
+                    self._counters["not_found_hits" if value is _NOT_FOUND else "local_hits"] += 1
+                    return True, None if value is _NOT_FOUND else value
+                del self._entries[product_id]
+
+        shared = self.shared
+        if shared is not None:
+            value = shared.get(self._shared_key(product_id))
+            if value is not None:
+                self._store_local(product_id, value)
+                self._count("not_found_hits" if value == _NOT_FOUND else "shared_hits")
+                return True, None if value == _NOT_FOUND else value
+
+        self._count("misses")
+        return False, None
+
+    def set(self, product_id: str, product: Product | None) -> None:
+        """Guarda o produto, ou a ausência dele quando `product` é None."""
+        product_id = str(product_id)
+        value = _NOT_FOUND if product is None else product
+        self._store_local(product_id, value)
+        shared = self.shared
+        if shared is not None:
+            ttl = self.not_found_ttl if product is None else self.ttl
+            shared.set(self._shared_key(product_id), value, timeout=ttl)
+
+    def invalidate(self, *product_ids: str) -> None:
+        with self._lock:
+            for product_id in product_ids:
+                self._entries.pop(str(product_id), None)
+            self._counters["invalidations"] += len(product_ids)
+        shared = self.shared
+        if shared is not None and product_ids:
+            shared.delete_many([self._shared_key(str(product_id)) for product_id in product_ids])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters, size=len(self._entries), max_entries=self.max_entries)
+        stats["hits"] = stats["local_hits"] + stats["shared_hits"] + stats["not_found_hits"]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+class CachedProductRepository(ProductRepository):
+    """
+    Decorator de `ProductRepository` com cache de leitura para `get_by_id`.
+
+    As leituras passam pelo `ProductDetailCache`; escritas são delegadas ao
+    repositório interno e invalidam as entradas afetadas.
+    """
+    def __init__(self, inner: ProductRepository, cache: ProductDetailCache):
+        self.inner = inner
+        self.cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    def create(self, product: Product) -> Product:
+        created = self.inner.create(product)
+        self.cache.invalidate(created.id)
+        return created
+
+    def bulk_create(self, products: list[Product]) -> int:
+        created = self.inner.bulk_create(products)
+        self.cache.invalidate(*(product.id for product in products))
+        return created
+
+    def delete(self, produc_id: str) -> None:
+        try:
+            return self.inner.delete(produc_id)
+        finally:
+            self.cache.invalidate(produc_id)
+
+    def update(self, product: Product) -> Product:
+        try:
+            return self.inner.update(product)
+        finally:
+            self.cache.invalidate(product.id)
+
+    def bulk_update(self, patches: list[ProductPatch]) -> tuple[int, list[str]]:
+        try:
+            return self.inner.bulk_update(patches)
+        finally:
+            self.cache.invalidate(*(patch.id for patch in patches))
+
+    def get_all(self) -> list[Product]:
+        return self.inner.get_all()
+
+    def iter_all(self, chunk_size: int = 2000):
+        return self.inner.iter_all(chunk_size)
+
+    def get_by_id(self, product_id: str) -> Product | None:
+        cached, product = self.cache.get(product_id)
+        if cached:
+            if product is None:
+                raise ValueError("Produto não encontrado")
+            return product
+        try:
+            product = self.inner.get_by_id(product_id)
+        except ValueError:
+            self.cache.set(product_id, None)
+            raise
+        self.cache.set(product_id, product)
+        return product
+
+    def get_by_ids(self, product_ids: list[str]) -> list[Product]:
+        return self.inner.get_by_ids(product_ids)
+
+    def get_price_snapshots(self, product_ids: list[str]) -> list[ProductPriceSnapshot]:
+        # Preço e estoque para precificação não passam pelo cache.
+        return self.inner.get_price_snapshots(product_ids)
+
+    def get_version(self, product_id: str) -> int | None:
+        return self.inner.get_version(product_id)
+
+    def get_catalog_version(self) -> str:
+        return self.inner.get_catalog_version()
+
+    def get_all_paginated_filtered(self, offset: int, limit: int, search_query: str | None = None,
+                                   count_strategy: str | None = None) -> OffsetPage[Product]:
+        return self.inner.get_all_paginated_filtered(offset, limit, search_query, count_strategy)
+
+    def get_all_cursor_paginated(self, limit: int, cursor: str | None = None,
+                                 search_query: str | None = None,
+                                 include_total: bool = False) -> CursorPage[Product]:
+        return self.inner.get_all_cursor_paginated(limit, cursor, search_query, include_total)
+
+    def reserve_stock(self, product_id: str, quantity: int) -> None:
+        try:
+            self.inner.reserve_stock(product_id, quantity)
+        finally:
+            self.cache.invalidate(product_id)
+
+    def release_stock(self, product_id: str, quantity: int) -> None:
+        try:
+            self.inner.release_stock(product_id, quantity)
+        finally:
+            self.cache.invalidate(product_id)
+
+    def reserve_stock_bulk(self, quantities: dict[str, int]) -> None:
+        try:
+            self.inner.reserve_stock_bulk(quantities)
+        finally:
+            self.cache.invalidate(*quantities)
+
+
+_detail_cache = None
+_detail_cache_lock = threading.Lock()
+
+
+def get_product_cache_settings() -> dict:
+    return {**DEFAULT_PRODUCT_CACHE, **getattr(settings, "PRODUCT_CACHE", {})}
+
+
+def get_product_detail_cache() -> ProductDetailCache:
+    """Instância única por processo, configurada por `settings.PRODUCT_CACHE`."""
+    global _detail_cache
+    if _detail_cache is None:
+        with _detail_cache_lock:
+            if _detail_cache is None:
+                config = get_product_cache_settings()
+                _detail_cache = ProductDetailCache(
+                    max_entries=config["MAX_ENTRIES"],
+                    ttl=config["TTL_SECONDS"],
+                    not_found_ttl=config["NOT_FOUND_TTL_SECONDS"],
+                    shared_alias=config["SHARED_CACHE_ALIAS"],
+                )
+    return _detail_cache
@@ -0,0 +1,45 @@
+"""
+Exportação do catálogo em NDJSON (um produto JSON por linha).
+
+As funções trabalham sobre iteradores e produzem blocos de bytes, então a
+memória usada não depende do tamanho do catálogo.
+"""
+import json
+import zlib
+from typing import Iterable, Iterator
+
+from core.domain.entities.product import Product
+
+BUFFER_SIZE = 64 * 1024
+
+
+def iter_ndjson(products: Iterable[Product], buffer_size: int = BUFFER_SIZE) -> Iterator[bytes]:
+    """Serializa os produtos e agrupa as linhas em blocos de ~`buffer_size` bytes."""
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    buffer, size = [], 0
+    for product in products:
+        line = encode({
+            "id": product.id,
+            "name": product.name,
+            "price": product.price,
+            "stock": product.stock,
+            "is_active": product.is_active,
+            "version": product.version,
+        }).encode() + b"\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= buffer_size:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Comprime um fluxo de blocos no formato gzip, incrementalmente."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,156 @@
+"""
+Leitura e validação de feeds de produtos (CSV ou JSONL) para importação em lote.
+
+Este módulo não depende do ORM: as funções de validação rodam em processos
+do pool sem precisar de conexão com o banco. O pool é criado no primeiro uso
+e reaproveitado pelas importações seguintes do mesmo processo.
+"""
+import csv
+import json
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, Iterator
+
+from core.domain.entities.product import Product
+
+FORMATS = ("csv", "jsonl")
+MAX_PRICE = Decimal("99999999.99")
+MAX_STOCK = 2147483647
+TRUE_VALUES = {"1", "true", "t", "yes", "sim"}
+FALSE_VALUES = {"0", "false", "f", "no", "nao", "não"}
+
+
+def iter_records(lines: Iterable[str], fmt: str) -> Iterator[tuple[int, dict | str]]:
+    """Percorre o feed linha a linha, sem carregá-lo inteiro em memória.
+
+    Produz (número da linha, registro) ou (número da linha, mensagem de erro).
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == "jsonl":
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line_number, "JSON inválido"
+                continue
+            yield line_number, record if isinstance(record, dict) else "Registro deve ser um objeto"
+    else:
+        raise ValueError("Formato não suportado")
+
+
+def validate_record(record: dict) -> Product | str:
+    """Aplica as mesmas regras do ProductSerializer/ProductModel a um registro."""
+    name = str(record.get("name") or "").strip()
+    if not name:
+        return "name: campo obrigatório"
+    if len(name) > 150:
+        return "name: máximo de 150 caracteres"
+
+    try:
+        price = Decimal(str(record.get("price", "")).strip())
+    except InvalidOperation:
+        return "price: número decimal inválido"
+    if not price.is_finite() or price < 0 or price > MAX_PRICE:
+        return "price: fora do intervalo permitido"
+    if price.as_tuple().exponent < -2:
+        return "price: no máximo 2 casas decimais"
+
+    try:
+        stock = int(str(record.get("stock", "")).strip())
+    except ValueError:
+        return "stock: inteiro inválido"
+    if stock < 0 or stock > MAX_STOCK:
+        return "stock: fora do intervalo permitido"
+
+    is_active = record.get("is_active", True)
+    if not isinstance(is_active, bool):
+        text = str(is_active).strip().lower()
+        if text in TRUE_VALUES or text == "":
+            is_active = True
+        elif text in FALSE_VALUES:
+            is_active = False
+        else:
+            return "is_active: booleano inválido"
+
+    return Product(name=name, price=price, stock=stock, is_active=is_active)
+
+
+def validate_chunk(chunk: list[tuple[int, dict | str]]) -> list[tuple[int, Product | str]]:
+    return [
+        (line, record if isinstance(record, str) else validate_record(record))
+        for line, record in chunk
+    ]
+
+
+def _chunks(records: Iterator, size: int) -> Iterator[list]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+_pools: dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_validation_pool(workers: int) -> ProcessPoolExecutor:
+    """Pool de validação com `workers` processos, um por processo web/comando."""
+    with _pools_lock:
+        executor = _pools.get(workers)
+        if executor is None:
+            executor = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return executor
+
+
+def _discard_pool(workers: int) -> None:
+    with _pools_lock:
+        executor = _pools.pop(workers, None)
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def validated_batches(lines: Iterable[str], fmt: str, batch_size: int = 1000,
+                      workers: int | None = None) -> Iterator[list[tuple[int, Product | str]]]:
+    """Valida o feed em lotes, em paralelo quando `workers` > 1.
+
+    No máximo `2 * workers` lotes ficam em trânsito, então a memória usada
+    não depende do tamanho do arquivo. Os lotes saem na ordem de entrada.
+    Usa o pool compartilhado do processo (`get_validation_pool`).
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(iter_records(lines, fmt), batch_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield validate_chunk(chunk)
+        return
+
+    executor = get_validation_pool(workers)
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(validate_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    except BrokenProcessPool:
+        # Processo do pool morto: a próxima importação cria outro.
+        _discard_pool(workers)
+        raise
+    finally:
+        # Importação interrompida: descarta os lotes ainda não iniciados.
+        for future in pending:
+            future.cancel()
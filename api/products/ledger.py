@@ -0,0 +1,241 @@
+"""
+Livro-razão de estoque: movimentações só de inserção.
+
+Com `ProductModel.stock_ledger`, cada mudança de estoque do produto (entrada,
+reserva, devolução, venda, ajuste) vira uma linha de `InventoryMovementModel`
+e nenhuma escrita altera a linha do produto. O estoque atual é o snapshot
+(`ProductModel.stock`, válido até `stock_ledger_position`) mais a soma das
+movimentações posteriores (a cauda).
+
+A compactação (`manage.py inventory_ledger compact`) leva a cauda para o
+snapshot e avança a posição; as movimentações continuam guardadas como
+histórico. `manage.py inventory_ledger reconcile` confere, em blocos de
+produtos, se cada snapshot bate com a soma das movimentações até a posição.
+"""
+import threading
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Iterator
+
+from django.db import connection
+from django.db.models import F, Max, Sum
+from django.utils import timezone
+
+from api.transactions import immediate_atomic
+from .models import InventoryMovementModel, ProductModel
+
+# Movimentações que só entram com quantidade positiva ou só com negativa.
+INBOUND_KINDS = (InventoryMovementModel.RECEIPT, InventoryMovementModel.RELEASE, InventoryMovementModel.RETURN)
+OUTBOUND_KINDS = (InventoryMovementModel.RESERVATION, InventoryMovementModel.SALE)
+
+
+@dataclass
+class LedgerMismatch:
+    """Produto cujo snapshot não bate com o livro-razão até a posição compactada."""
+    product_id: str
+    snapshot: int
+    ledger_total: int
+
+
+def validate_movement(kind: str, quantity: int) -> None:
+    """Raises:
+        ValueError: Se o tipo não existir ou o sinal da quantidade não combinar com ele.
+    """
+    if kind not in dict(InventoryMovementModel.KIND_CHOICES):
+        raise ValueError("Tipo de movimentação inválido")
+    if quantity == 0 or (kind in INBOUND_KINDS and quantity < 0) or (kind in OUTBOUND_KINDS and quantity > 0):
+        raise ValueError("Quantidade inválida")
+
+
+@contextmanager
+def ledger_lock(product_id: str):
+    """Transação que serializa as escritas no livro-razão de um produto.
+
+    Sem ela, duas reservas concorrentes poderiam ver o mesmo saldo e ambas
+    inserir, e a compactação poderia pular uma movimentação ainda não
+    confirmada. No PostgreSQL usa um advisory lock, sem travar a linha do
+    produto; no SQLite a transação (`BEGIN IMMEDIATE`) já serializa as
+    escritas; nos demais bancos trava a linha do produto com `FOR UPDATE`.
+    """
+    with immediate_atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [f"inventory-ledger:{product_id}"])
+        elif connection.vendor != "sqlite":
+            list(ProductModel.objects.select_for_update().filter(id=product_id).values_list("id"))
+        yield
+
+
+def _writer_lock(product_id: str):
+    # Um único `INSERT ... SELECT` já é serializado pela trava de escrita do SQLite.
+    return nullcontext() if connection.vendor == "sqlite" else ledger_lock(product_id)
+
+
+class InventoryLedger:
+    """
+    Escrita, leitura e compactação do livro-razão.
+
+    Guarda também quais produtos já foram vistos em modo livro-razão, para
+    que as reservas deles vão direto ao INSERT condicional.
+    """
+    COMPACT_BATCH_SIZE = 500
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._known: set[str] = set()
+
+    def is_known(self, product_id: str) -> bool:
+        with self._lock:
+            return str(product_id) in self._known
+
+    def remember(self, product_id: str, enabled: bool = True) -> None:
+        with self._lock:
+            if enabled:
+                self._known.add(str(product_id))
+            else:
+                self._known.discard(str(product_id))
+
+    def append(self, product_id: str, kind: str, quantity: int, require_available: bool = False) -> bool:
+        """Insere a movimentação se o produto estiver em modo livro-razão.
+
+        Com `require_available`, só insere se o estoque atual cobrir a saída
+        (`-quantity`). Um único `INSERT ... SELECT` condicional; retorna False
+        se nada foi inserido.
+        """
+        validate_movement(kind, quantity)
+        meta = InventoryMovementModel._meta
+        product_meta = ProductModel._meta
+        quote = connection.ops.quote_name
+        movements = quote(meta.db_table)
+        products = quote(product_meta.db_table)
+        product_pk = quote(product_meta.pk.column)
+        product_fk = quote(meta.get_field("product").column)
+        condition = ""
+        params = [kind, quantity, meta.get_field("created_at").get_db_prep_save(timezone.now(), connection)]
+        product_db_id = product_meta.pk.get_db_prep_value(product_id, connection)
+        params.append(product_db_id)
+        if require_available:
+            condition = (
+                f" AND p.{quote('stock')} + COALESCE((SELECT SUM(m.{quote('quantity')}) FROM {movements} m "
+                f"WHERE m.{product_fk} = p.{product_pk} AND m.{quote('id')} > p.{quote('stock_ledger_position')}), 0)"
+                f" >= %s"
+            )
+            params.append(-quantity)
+        sql = (
+            f"INSERT INTO {movements} ({product_fk}, {quote('kind')}, {quote('quantity')}, {quote('created_at')}) "
+            f"SELECT p.{product_pk}, %s, %s, %s FROM {products} p "
+            f"WHERE p.{product_pk} = %s AND p.{quote('stock_ledger')}{condition}"
+        )
+        with _writer_lock(product_id), connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount == 1
+
+    def tails(self, product_ids: list[str]) -> dict[str, int]:
+        """Soma das movimentações posteriores ao snapshot, em uma consulta."""
+        rows = (
+            InventoryMovementModel.objects
+            .filter(product_id__in=product_ids, id__gt=F("product__stock_ledger_position"))
+            .values_list("product_id")
+            .annotate(total=Sum("quantity"))
+            .order_by()
+        )
+        tails = dict.fromkeys(map(str, product_ids), 0)
+        tails.update({str(product_id): total for product_id, total in rows})
+        return tails
+
+    def set_available(self, product_id: str, stock: int) -> None:
+        """Registra o ajuste que leva o estoque atual a `stock`."""
+        with ledger_lock(product_id):
+            snapshot = ProductModel.objects.filter(id=product_id).values_list("stock", flat=True).get()
+            delta = stock - snapshot - self.tails([product_id])[str(product_id)]
+            if delta:
+                self.append(product_id, InventoryMovementModel.ADJUSTMENT, delta)
+
+    def open(self, product_id: str, stock: int) -> None:
+        """Início (ou retomada) do livro-razão com `stock`, já compactado.
+
+        A movimentação de abertura leva a soma do histórico do produto até
+        `stock`, o que mantém snapshot = soma das movimentações até a posição.
+        """
+        history = InventoryMovementModel.objects.filter(product_id=product_id).aggregate(
+            total=Sum("quantity"), last=Max("id")
+        )
+        position = history["last"] or 0
+        delta = stock - (history["total"] or 0)
+        if delta:
+            position = InventoryMovementModel.objects.create(
+                product_id=product_id, kind=InventoryMovementModel.OPENING, quantity=delta
+            ).id
+        ProductModel.objects.filter(id=product_id).update(
+            stock=stock, stock_ledger=True, stock_ledger_position=position,
+            version=F("version") + 1, updated_at=timezone.now(),
+        )
+        self.remember(product_id)
+
+    def compact(self, product_id: str | None = None) -> int:
+        """Leva a cauda de cada produto para o snapshot. Retorna quantos produtos mudaram.
+
+        É a única escrita na linha do produto, feita em segundo plano, uma
+        transação curta por produto.
+        """
+        queryset = ProductModel.objects.filter(stock_ledger=True).order_by("id")
+        if product_id is not None:
+            queryset = queryset.filter(id=product_id)
+        compacted = 0
+        last_id = None
+        while True:
+            page = queryset if last_id is None else queryset.filter(id__gt=last_id)
+            ids = list(page.values_list("id", flat=True)[:self.COMPACT_BATCH_SIZE])
+            if not ids:
+                return compacted
+            last_id = ids[-1]
+            for ledger_product_id in ids:
+                with ledger_lock(str(ledger_product_id)):
+                    position = ProductModel.objects.filter(
+                        id=ledger_product_id, stock_ledger=True
+                    ).values_list("stock_ledger_position", flat=True).first()
+                    if position is None:
+                        continue
+                    tail = InventoryMovementModel.objects.filter(
+                        product_id=ledger_product_id, id__gt=position
+                    ).aggregate(last=Max("id"), total=Sum("quantity"))
+                    if tail["last"] is None:
+                        continue
+                    ProductModel.objects.filter(id=ledger_product_id).update(
+                        stock=F("stock") + tail["total"], stock_ledger_position=tail["last"]
+                    )
+                compacted += 1
+
+    def iter_mismatches(self, chunk_size: int = 1000) -> Iterator[LedgerMismatch]:
+        """Confere snapshot x soma das movimentações até a posição, `chunk_size` produtos por vez.
+
+        Cada bloco é um SELECT dos produtos (keyset por id) e um agregado das
+        movimentações deles; a memória usada não depende do tamanho do livro-razão.
+        """
+        last_id = None
+        queryset = ProductModel.objects.filter(stock_ledger=True).order_by("id")
+        while True:
+            page = queryset if last_id is None else queryset.filter(id__gt=last_id)
+            rows = list(page.values_list("id", "stock")[:chunk_size])
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            totals = dict(
+                InventoryMovementModel.objects
+                .filter(product_id__in=[product_id for product_id, _ in rows],
+                        id__lte=F("product__stock_ledger_position"))
+                .values_list("product_id")
+                .annotate(total=Sum("quantity"))
+                .order_by()
+            )
+            for product_id, snapshot in rows:
+                ledger_total = totals.get(product_id, 0)
+                if ledger_total != snapshot:
+                    yield LedgerMismatch(str(product_id), snapshot, ledger_total)
+
+
+_ledger = InventoryLedger()
+
+
+def get_inventory_ledger() -> InventoryLedger:
+    return _ledger
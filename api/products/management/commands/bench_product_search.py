@@ -0,0 +1,74 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.products.models import ProductModel
+from api.products.repository import DjangoProductRepository
+from api.products.search import SEARCH_BACKENDS, get_product_search_backend
+from core.interfaces.usecase.criar_produto_usecase import ListProductsRequest, ListProductsUseCase
+
+ADJECTIVES = ["premium", "compacto", "digital", "portátil", "clássico", "turbo", "eco", "smart"]
+NOUNS = ["cadeira", "notebook", "caneca", "fone", "mochila", "lâmpada", "teclado", "relógio"]
+COLORS = ["azul", "preto", "branco", "verde", "vermelho", "cinza", "rosa", "amarelo"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara a busca de produtos via backend de busca com o caminho icontains. "
+        "Os produtos sintéticos são criados em uma transação desfeita ao final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+        parser.add_argument("--queries", type=int, default=30)
+        parser.add_argument("--backend", choices=["auto", *SEARCH_BACKENDS], default="auto")
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        if options["backend"] == "auto":
+            backend = get_product_search_backend()
+        else:
+            backend = SEARCH_BACKENDS[options["backend"]]()
+        terms = [f"{rng.choice(NOUNS)} {rng.choice(COLORS)}" for _ in range(options["queries"])]
+
+        self.stdout.write(f"backend: {type(backend).__name__}")
+        self.stdout.write(f"{'produtos':>10} {'icontains p50/p95 (ms)':>24} {'backend p50/p95 (ms)':>22}")
+        for size in options["sizes"]:
+            with transaction.atomic():
+                self._populate(size, rng)
+                backend.rebuild()
+                repo = DjangoProductRepository(search_backend=backend)
+                legacy = self._measure(ListProductsUseCase(repo), terms)
+                indexed = self._measure(ListProductsUseCase(repo, search_backend=backend), terms)
+                transaction.set_rollback(True)
+            backend.rebuild()
+            self.stdout.write(
+                f"{size:>10} {legacy[0]:>11.2f}/{legacy[1]:<12.2f} {indexed[0]:>10.2f}/{indexed[1]:<11.2f}"
+            )
+
+    def _populate(self, size, rng):
+        ProductModel.objects.all().delete()
+        batch = []
+        for index in range(size):
+            batch.append(ProductModel(
+                name=f"{rng.choice(NOUNS)} {rng.choice(ADJECTIVES)} {rng.choice(COLORS)} {index}",
+                price=rng.randint(100, 100_000) / 100,
+                stock=rng.randint(0, 500),
+            ))
+            if len(batch) == 10_000:
+                ProductModel.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            ProductModel.objects.bulk_create(batch)
+
+    def _measure(self, use_case, terms):
+        timings = []
+        for term in terms:
+            started = time.perf_counter()
+            use_case.execute(ListProductsRequest(offset=0, limit=10, search_query=term))
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
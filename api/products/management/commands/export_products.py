@@ -0,0 +1,38 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.products.export import gzip_stream, iter_ndjson
+from api.products.repository import get_product_repository
+
+
+class Command(BaseCommand):
+    help = "Exporta o catálogo de produtos em NDJSON (opcionalmente gzip), com memória constante."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", "-o", default="-", help="Arquivo de saída ('-' para stdout).")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        products = get_product_repository().iter_all(chunk_size=options["chunk_size"])
+        chunks = iter_ndjson(products)
+        if options["gzip"]:
+            chunks = gzip_stream(chunks)
+
+        started = time.perf_counter()
+        written = 0
+        output = sys.stdout.buffer if options["output"] == "-" else open(options["output"], "wb")
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+                written += len(chunk)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+            else:
+                output.flush()
+
+        elapsed = time.perf_counter() - started
+        self.stderr.write(f"{written} bytes escritos em {elapsed:.1f}s")
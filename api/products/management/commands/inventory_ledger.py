@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.products.cache import get_product_detail_cache
+from api.products.ledger import get_inventory_ledger
+from api.products.repository import DjangoProductRepository
+
+
+class Command(BaseCommand):
+    help = (
+        "Livro-razão de estoque: `enable <id>`, `disable <id>`, `compact [<id>] [--interval S]` "
+        "(com --interval, roda continuamente) ou `reconcile [--chunk-size N]`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["enable", "disable", "compact", "reconcile"])
+        parser.add_argument("product_id", nargs="?")
+        parser.add_argument("--interval", type=float, default=None,
+                            help="Segundos entre compactações; sem ele, roda uma vez.")
+        parser.add_argument("--chunk-size", type=int, default=1000,
+                            help="Produtos conferidos por consulta na reconciliação.")
+
+    def handle(self, *args, **options):
+        repo = DjangoProductRepository()
+        ledger = get_inventory_ledger()
+        action, product_id = options["action"], options["product_id"]
+        if action in ("enable", "disable") and not product_id:
+            raise CommandError(f"{action} exige o id do produto")
+
+        try:
+            if action == "enable":
+                stock = repo.enable_stock_ledger(product_id)
+                get_product_detail_cache().invalidate(product_id)
+                self.stdout.write(self.style.SUCCESS(f"Estoque de {product_id} em livro-razão ({stock} unidades)."))
+            elif action == "disable":
+                stock = repo.disable_stock_ledger(product_id)
+                get_product_detail_cache().invalidate(product_id)
+                self.stdout.write(self.style.SUCCESS(f"Estoque de {product_id} fora do livro-razão ({stock} unidades)."))
+            elif action == "compact":
+                while True:
+                    compacted = ledger.compact(product_id)
+                    self.stdout.write(f"{compacted} produtos compactados")
+                    if options["interval"] is None:
+                        break
+                    time.sleep(options["interval"])
+            else:
+                mismatches = 0
+                for mismatch in ledger.iter_mismatches(options["chunk_size"]):
+                    mismatches += 1
+                    self.stdout.write(
+                        f"{mismatch.product_id}: snapshot {mismatch.snapshot}, "
+                        f"livro-razão {mismatch.ledger_total}"
+                    )
+                if mismatches:
+                    raise CommandError(f"{mismatches} produtos com snapshot divergente do livro-razão")
+                self.stdout.write(self.style.SUCCESS("Snapshots conferem com o livro-razão."))
+        except ValueError as e:
+            raise CommandError(str(e))
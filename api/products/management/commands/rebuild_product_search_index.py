@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from api.products.search import get_product_search_backend
+
+
+class Command(BaseCommand):
+    help = "Reconstrói o índice de busca de produtos a partir do banco."
+
+    def handle(self, *args, **options):
+        backend = get_product_search_backend()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Índice reconstruído ({type(backend).__name__})."))
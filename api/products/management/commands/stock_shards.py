@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.products.cache import get_product_detail_cache
+from api.products.repository import DjangoProductRepository
+
+
+class Command(BaseCommand):
+    help = (
+        "Estoque particionado: `enable <id> [--shards N]`, `disable <id>` ou "
+        "`rebalance [<id>] [--interval S]` (com --interval, roda continuamente)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["enable", "disable", "rebalance"])
+        parser.add_argument("product_id", nargs="?")
+        parser.add_argument("--shards", type=int, default=None)
+        parser.add_argument("--interval", type=float, default=None,
+                            help="Segundos entre rebalanceamentos; sem ele, roda uma vez.")
+
+    def handle(self, *args, **options):
+        repo = DjangoProductRepository()
+        action, product_id = options["action"], options["product_id"]
+        if action != "rebalance" and not product_id:
+            raise CommandError(f"{action} exige o id do produto")
+
+        try:
+            if action == "enable":
+                stock = repo.enable_sharded_stock(product_id, options["shards"])
+                get_product_detail_cache().invalidate(product_id)
+                self.stdout.write(self.style.SUCCESS(f"Estoque de {product_id} particionado ({stock} unidades)."))
+            elif action == "disable":
+                stock = repo.disable_sharded_stock(product_id)
+                get_product_detail_cache().invalidate(product_id)
+                self.stdout.write(self.style.SUCCESS(f"Estoque de {product_id} reunido ({stock} unidades)."))
+            else:
+                while True:
+                    rebalanced = repo.rebalance_sharded_stock(product_id)
+                    self.stdout.write(f"{rebalanced} produtos rebalanceados")
+                    if options["interval"] is None:
+                        break
+                    time.sleep(options["interval"])
+        except ValueError as e:
+            raise CommandError(str(e))
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productmodel',
+            index=models.Index(fields=['name', 'id'], name='product_name_id_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+import uuid
+
+from django.db import migrations
+
+FTS_TABLE = "products_productmodel_fts"
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite":
+        ProductModel = apps.get_model("products", "ProductModel")
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "product_id UNINDEXED, name, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        rows = [
+            (uuid.UUID(str(product_id)).int >> 65, str(product_id), name)
+            for product_id, name in ProductModel.objects.values_list("id", "name")
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, product_id, name) VALUES (%s, %s, %s)", rows
+            )
+    elif connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS product_name_tsv_idx ON products_productmodel "
+            "USING GIN (to_tsvector('simple', name))"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS product_name_tsv_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_product_name_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:56
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_product_stock_shards'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productmodel',
+            name='stock_ledger',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='productmodel',
+            name='stock_ledger_position',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='InventoryMovementModel',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('receipt', 'receipt'), ('reservation', 'reservation'), ('release', 'release'), ('sale', 'sale'), ('return', 'return'), ('adjustment', 'adjustment'), ('opening', 'opening')], max_length=16)),
+                ('quantity', models.IntegerField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('product', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to='products.productmodel')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['product', 'id'], name='movement_product_id_idx')],
+            },
+        ),
+    ]
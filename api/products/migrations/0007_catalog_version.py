@@ -0,0 +1,69 @@
+from django.db import migrations, models
+
+WATCHED_MODELS = ("ProductModel", "ProductStockShardModel", "InventoryMovementModel")
+EVENTS = ("INSERT", "UPDATE", "DELETE")
+
+
+def _bump_sql(version_table):
+    # Upsert: a linha volta a existir se a tabela for esvaziada (flush dos testes).
+    return (
+        f"INSERT INTO {version_table} (id, version) VALUES (1, 1) "
+        f"ON CONFLICT (id) DO UPDATE SET version = {version_table}.version + 1"
+    )
+
+
+def create_version_triggers(apps, schema_editor):
+    version_table = apps.get_model("products", "CatalogVersionModel")._meta.db_table
+    schema_editor.execute(f"INSERT INTO {version_table} (id, version) VALUES (1, 0)")
+    tables = [apps.get_model("products", name)._meta.db_table for name in WATCHED_MODELS]
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        # SQLite só tem triggers por linha.
+        for table in tables:
+            for event in EVENTS:
+                schema_editor.execute(
+                    f"CREATE TRIGGER {table}_catalog_{event.lower()} AFTER {event} ON {table} "
+                    f"BEGIN {_bump_sql(version_table)}; END"
+                )
+    elif vendor == "postgresql":
+        # Por instrução: um `bulk_create` ou `UPDATE ... IN (...)` incrementa uma vez só.
+        schema_editor.execute(
+            "CREATE OR REPLACE FUNCTION products_bump_catalog_version() RETURNS trigger "
+            f"LANGUAGE plpgsql AS $$ BEGIN {_bump_sql(version_table)}; RETURN NULL; END $$"
+        )
+        for table in tables:
+            schema_editor.execute(
+                f"CREATE TRIGGER {table}_catalog_version AFTER {' OR '.join(EVENTS)} ON {table} "
+                "FOR EACH STATEMENT EXECUTE FUNCTION products_bump_catalog_version()"
+            )
+
+
+def drop_version_triggers(apps, schema_editor):
+    tables = [apps.get_model("products", name)._meta.db_table for name in WATCHED_MODELS]
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for table in tables:
+            for event in EVENTS:
+                schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_catalog_{event.lower()}")
+    elif vendor == "postgresql":
+        for table in tables:
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_catalog_version ON {table}")
+        schema_editor.execute("DROP FUNCTION IF EXISTS products_bump_catalog_version()")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_inventory_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogVersionModel',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_version_triggers, drop_version_triggers),
+    ]
@@ -0,0 +1,61 @@
+import importlib
+
+from django.db import migrations, models
+
+catalog_version = importlib.import_module("api.products.migrations.0007_catalog_version")
+
+
+def _version_table(apps):
+    return apps.get_model("products", "CatalogVersionModel")._meta.db_table
+
+
+def keep_only_delete_trigger(apps, schema_editor):
+    """As escritas comuns não tocam mais a linha da versão; só as remoções de produtos."""
+    catalog_version.drop_version_triggers(apps, schema_editor)
+    product_table = apps.get_model("products", "ProductModel")._meta.db_table
+    bump = catalog_version._bump_sql(_version_table(apps))
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE TRIGGER {product_table}_catalog_delete AFTER DELETE ON {product_table} BEGIN {bump}; END"
+        )
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE OR REPLACE FUNCTION products_bump_catalog_version() RETURNS trigger "
+            f"LANGUAGE plpgsql AS $$ BEGIN {bump}; RETURN NULL; END $$"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {product_table}_catalog_version AFTER DELETE ON {product_table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION products_bump_catalog_version()"
+        )
+
+
+def restore_write_triggers(apps, schema_editor):
+    product_table = apps.get_model("products", "ProductModel")._meta.db_table
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {product_table}_catalog_delete")
+    elif vendor == "postgresql":
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {product_table}_catalog_version ON {product_table}")
+        schema_editor.execute("DROP FUNCTION IF EXISTS products_bump_catalog_version()")
+    # A 0007 também insere a linha inicial.
+    schema_editor.execute(f"DELETE FROM {_version_table(apps)}")
+    catalog_version.create_version_triggers(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_catalog_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_only_delete_trigger, restore_write_triggers),
+        migrations.AddIndex(
+            model_name='productmodel',
+            index=models.Index(
+                condition=models.Q(('stock_shards__gt', 0), ('stock_ledger', True), _connector='OR'),
+                fields=['id'], name='product_live_stock_idx',
+            ),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 import uuid
 from core.domain.entities.product import Product as DomainProduct
 
@@ -10,6 +11,19 @@ class ProductModel(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     stock = models.PositiveIntegerField()
     is_active = models.BooleanField(default=True)
+    # Incrementada a cada escrita; base do ETag de detalhe.
+    version = models.PositiveIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Maior que zero: o estoque fica dividido em `ProductStockShardModel` e `stock` fica em 0.
+    stock_shards = models.PositiveSmallIntegerField(default=0)
+    # Livro-razão: `stock` é o snapshot até a movimentação `stock_ledger_position`;
+    # o estoque atual soma as movimentações posteriores (`InventoryMovementModel`).
+    stock_ledger = models.BooleanField(default=False)
+    stock_ledger_position = models.BigIntegerField(default=0)
+
+    @property
+    def is_sharded(self) -> bool:
+        return self.stock_shards > 0
     
     def to_domain(self) ->DomainProduct:
         return DomainProduct(
@@ -17,8 +31,69 @@ class ProductModel(models.Model):
             name=self.name,
             price=float(self.price),
             stock=self.stock,
-            is_active=self.is_active
+            is_active=self.is_active,
+            version=self.version
         )
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["name", "id"], name="product_name_id_idx"),
+            # Só os produtos com estoque vivo: a versão do catálogo pergunta se existe algum.
+            models.Index(fields=["id"], name="product_live_stock_idx",
+                         condition=models.Q(stock_shards__gt=0) | models.Q(stock_ledger=True)),
+        ]
+
+
+class ProductStockShardModel(models.Model):
+    """Uma parte do estoque de um produto em modo particionado."""
+    product = models.ForeignKey(ProductModel, on_delete=models.CASCADE, related_name="stock_shard_rows")
+    shard = models.PositiveSmallIntegerField()
+    stock = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["product", "shard"], name="product_stock_shard_unique"),
+        ]
+
+
+class InventoryMovementModel(models.Model):
+    """Movimentação de estoque. Só recebe inserções; `quantity` tem sinal."""
+    RECEIPT = "receipt"
+    RESERVATION = "reservation"
+    RELEASE = "release"
+    SALE = "sale"
+    RETURN = "return"
+    ADJUSTMENT = "adjustment"
+    OPENING = "opening"
+    KIND_CHOICES = [(kind, kind) for kind in (RECEIPT, RESERVATION, RELEASE, SALE, RETURN, ADJUSTMENT, OPENING)]
+
+    id = models.BigAutoField(primary_key=True)
+    product = models.ForeignKey(ProductModel, on_delete=models.CASCADE, related_name="stock_movements",
+                                db_index=False)
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES)
+    quantity = models.IntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Cauda de um produto: `product_id = ? AND id > posição`.
+            models.Index(fields=["product", "id"], name="movement_product_id_idx"),
+        ]
+
+
+class CatalogVersionModel(models.Model):
+    """
+    Contador de remoções de produtos: uma única linha (id=1).
+
+    Um trigger (migração 0008) o incrementa a cada DELETE em produtos, na
+    mesma transação. Criações e alterações já mudam o maior `updated_at`, e
+    as escritas de estoque (partições, livro-razão) não tocam esta linha.
+    """
+    SINGLETON_ID = 1
+
+    id = models.PositiveSmallIntegerField(primary_key=True, default=SINGLETON_ID)
+    version = models.BigIntegerField(default=0)
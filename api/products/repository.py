@@ -1,9 +1,87 @@
+import random
+import time
+from dataclasses import replace
+from functools import partial
 from core.domain.entities.product import Product
-from core.domain.repositories.product_repository import ProductRepository
-from .models import ProductModel
-from django.db.models import Q
+from core.domain.repositories.product_repository import ProductPatch, ProductPriceSnapshot, ProductRepository
+from core.domain.repositories.pagination import (
+    CURSOR_NEXT,
+    CURSOR_PREV,
+    CursorPage,
+    OffsetPage,
+    decode_cursor,
+    encode_cursor,
+)
+from core.interfaces.usecase.gateways import ProductSearchBackend
+from api.counting import paginate_queryset
+from .cache import CachedProductRepository, get_product_cache_settings, get_product_detail_cache
+from .ledger import InventoryLedger, get_inventory_ledger, ledger_lock
+from .models import CatalogVersionModel, InventoryMovementModel, ProductModel, ProductStockShardModel
+from .search import get_product_search_backend
+from .stock_shards import ShardedStockTotals, get_sharded_stock_totals, get_stock_shard_settings, split_stock
+from .suggest import product_name_index
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+PATCHABLE_FIELDS = ("price", "stock", "is_active")
+
 
 class DjangoProductRepository(ProductRepository):
+    BULK_UPDATE_BATCH_SIZE = 500
+
+    def __init__(self, search_backend: ProductSearchBackend | None = None,
+                 stock_totals: ShardedStockTotals | None = None, ledger: InventoryLedger | None = None):
+        self.search_backend = search_backend or get_product_search_backend()
+        self.stock_totals = stock_totals or get_sharded_stock_totals()
+        self.ledger = ledger or get_inventory_ledger()
+
+    def _live_stock(self, rows) -> dict[str, int]:
+        """Estoque atual dos produtos particionados ou em livro-razão.
+
+        `rows` são tuplas (id, stock, stock_shards, stock_ledger); produtos no
+        modo comum não aparecem no resultado.
+        """
+        sharded = [str(product_id) for product_id, _, shards, _ in rows if shards]
+        snapshots = {str(product_id): stock for product_id, stock, _, in_ledger in rows if in_ledger}
+        live = self.stock_totals.get_many(sharded) if sharded else {}
+        if snapshots:
+            tails = self.ledger.tails(list(snapshots))
+            live.update({product_id: snapshot + tails[product_id] for product_id, snapshot in snapshots.items()})
+        return live
+
+    def _to_domain_many(self, product_models) -> list[Product]:
+        """Converte para o domínio com o estoque atual de produtos particionados ou em livro-razão."""
+        products = [product_model.to_domain() for product_model in product_models]
+        live = self._live_stock([
+            (product_model.id, product_model.stock, product_model.stock_shards, product_model.stock_ledger)
+            for product_model in product_models
+            if product_model.is_sharded or product_model.stock_ledger
+        ])
+        if live:
+            for product in products:
+                if product.id in live:
+                    product.stock = live[product.id]
+        return products
+
+    def _to_domain(self, product_model: ProductModel) -> Product:
+        return self._to_domain_many([product_model])[0]
+
+    def _after_save(self, product: Product) -> None:
+        """Propaga uma criação/atualização para os índices derivados.
+
+        O índice de sugestões fica na memória do processo: só recebe a
+        escrita depois do commit, para um rollback não deixar entradas fantasmas.
+        """
+        self.search_backend.index(product)
+        transaction.on_commit(partial(product_name_index.add, product))
+
+    def _after_delete(self, product_id: str) -> None:
+        """Propaga uma remoção para os índices derivados."""
+        self.search_backend.remove(product_id)
+        transaction.on_commit(partial(product_name_index.remove, product_id))
+
     def create(self, product: Product) -> Product:
         product = ProductModel.objects.create(
             name= product.name,
@@ -11,12 +89,37 @@ class DjangoProductRepository(ProductRepository):
             stock = product.stock,
             is_active = product.is_active
         )
-        return product.to_domain()
+        created = product.to_domain()
+        self._after_save(created)
+        return created
+
+    def bulk_create(self, products: list[Product]) -> int:
+        """Insere o lote com um único `bulk_create` dentro de uma transação."""
+        models = [
+            ProductModel(
+                id=product.id,
+                name=product.name,
+                price=product.price,
+                stock=product.stock,
+                is_active=product.is_active,
+            )
+            for product in products
+        ]
+        try:
+            with transaction.atomic():
+                ProductModel.objects.bulk_create(models, batch_size=len(models) or None)
+                self.search_backend.index_many(products)
+        except DatabaseError as e:
+            raise ValueError(f"Falha ao gravar o lote: {e}")
+        for product in products:
+            transaction.on_commit(partial(product_name_index.add, product))
+        return len(models)
 
     def delete(self, produc_id: Product) -> None:
-        delete_product = ProductModel.objects.filter(id= produc_id).delete()
+        delete_product, _ = ProductModel.objects.filter(id= produc_id).delete()
         if delete_product == 0:
             raise ValueError("Produto não encontrado")
+        self._after_delete(str(produc_id))
 
 
     def update(self, product: Product) -> Product:
@@ -24,24 +127,221 @@ class DjangoProductRepository(ProductRepository):
 
         model.name = product.name
         model.price = product.price
-        model.stock = product.stock
         model.is_active = product.is_active
+        model.version = F("version") + 1
+        fields = ["name", "price", "is_active", "version", "updated_at"]
+
+        with transaction.atomic():
+            # Nos modos particionado e livro-razão, `stock` não guarda o estoque atual.
+            if model.stock_ledger:
+                self.ledger.set_available(str(model.id), product.stock)
+            elif model.is_sharded:
+                self._write_shards(model.id, model.stock_shards, product.stock)
+            else:
+                model.stock = product.stock
+                fields.append("stock")
+            model.save(update_fields=fields)
+        model.refresh_from_db(fields=["version"])
+        updated = self._to_domain(model)
+        self._after_save(updated)
+        return updated
+
+    def bulk_update(self, patches: list[ProductPatch]) -> tuple[int, list[str]]:
+        """Aplica as alterações com um único `UPDATE ... CASE` por lote de ids.
+
+        Todos os lotes rodam em uma única transação. Ids inexistentes são
+        ignorados e devolvidos na resposta.
+        """
+        patches_by_id = {str(patch.id): patch for patch in patches}
+        ids = list(patches_by_id)
+        found = []
+        stock_modes = {}
+        with transaction.atomic():
+            for start in range(0, len(ids), self.BULK_UPDATE_BATCH_SIZE):
+                chunk = ids[start:start + self.BULK_UPDATE_BATCH_SIZE]
+                existing = []
+                rows = ProductModel.objects.filter(id__in=chunk).values_list("id", "stock_shards", "stock_ledger")
+                for product_id, shards, in_ledger in rows:
+                    existing.append(str(product_id))
+                    if (shards or in_ledger) and patches_by_id[str(product_id)].stock is not None:
+                        stock_modes[str(product_id)] = (shards, in_ledger)
+                if existing:
+                    self._execute_case_update([
+                        replace(patches_by_id[product_id], stock=None) if product_id in stock_modes
+                        else patches_by_id[product_id]
+                        for product_id in existing
+                    ])
+                found.extend(existing)
+
+            # O estoque dos produtos particionados ou em livro-razão não fica em `stock`.
+            for product_id, (shards, in_ledger) in stock_modes.items():
+                if in_ledger:
+                    self.ledger.set_available(product_id, patches_by_id[product_id].stock)
+                else:
+                    self._write_shards(product_id, shards, patches_by_id[product_id].stock)
+
+        # Só o status altera os índices derivados (o nome não é alterável aqui).
+        toggled = [product_id for product_id in found if patches_by_id[product_id].is_active is not None]
+        for start in range(0, len(toggled), self.BULK_UPDATE_BATCH_SIZE):
+            chunk = toggled[start:start + self.BULK_UPDATE_BATCH_SIZE]
+            for product in self._to_domain_many(list(ProductModel.objects.filter(id__in=chunk))):
+                transaction.on_commit(partial(product_name_index.add, product))
+
+        found_ids = set(found)
+        return len(found), [product_id for product_id in ids if product_id not in found_ids]
+
+    @staticmethod
+    def _execute_case_update(patches: list[ProductPatch]) -> None:
+        """Monta `SET campo = CASE id WHEN ... THEN ... ELSE campo END` para um lote.
+
+        O SQL é gerado diretamente: com milhares de ids, compilar `Case`/`When`
+        do ORM custa mais do que o próprio UPDATE.
+        """
+        meta = ProductModel._meta
+        quote = connection.ops.quote_name
+        pk_column = quote(meta.pk.column)
+        db_ids = {patch.id: meta.pk.get_db_prep_value(patch.id, connection) for patch in patches}
 
-        model.save()
-        return model.to_domain()
+        assignments, params = [], []
+        for field_name in PATCHABLE_FIELDS:
+            changed = [patch for patch in patches if getattr(patch, field_name) is not None]
+            if not changed:
+                continue
+            field = meta.get_field(field_name)
+            column = quote(field.column)
+            assignments.append(
+                f"{column} = CASE {pk_column} {' '.join(['WHEN %s THEN %s'] * len(changed))} "
+                f"ELSE {column} END"
+            )
+            for patch in changed:
+                params.append(db_ids[patch.id])
+                params.append(field.get_db_prep_save(getattr(patch, field_name), connection))
+        if not assignments:
+            return
 
+        version_column = quote(meta.get_field("version").column)
+        updated_at = meta.get_field("updated_at")
+        assignments.append(f"{version_column} = {version_column} + 1")
+        assignments.append(f"{quote(updated_at.column)} = %s")
+        params.append(updated_at.get_db_prep_save(timezone.now(), connection))
+        params.extend(db_ids.values())
+        placeholders = ", ".join(["%s"] * len(db_ids))
+        sql = (
+            f"UPDATE {quote(meta.db_table)} SET {', '.join(assignments)} "
+            f"WHERE {pk_column} IN ({placeholders})"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
 
     def get_all(self) -> list[Product]:
-        return [product_model.to_domain() for product_model in ProductModel.objects.all()]
+        return self._to_domain_many(list(ProductModel.objects.all()))
+
+    def iter_all(self, chunk_size: int = 2000):
+        """Lê as linhas como tuplas com `iterator()` (cursor no servidor no PostgreSQL).
+
+        Não instancia `ProductModel` nem guarda o resultado no cache do queryset.
+        O estoque atual dos particionados e em livro-razão é lido uma vez por bloco.
+        """
+        rows = (
+            ProductModel.objects.order_by()
+            .values_list("id", "name", "price", "stock", "is_active", "version", "stock_shards", "stock_ledger")
+            .iterator(chunk_size=chunk_size)
+        )
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield from self._export_chunk(chunk)
+                chunk = []
+        yield from self._export_chunk(chunk)
+
+    def _export_chunk(self, rows) -> list[Product]:
+        live = self._live_stock([
+            (product_id, stock, shards, in_ledger)
+            for product_id, _, _, stock, _, _, shards, in_ledger in rows if shards or in_ledger
+        ])
+        return [
+            Product(
+                id=str(product_id), name=name, price=float(price),
+                stock=live.get(str(product_id), stock), is_active=is_active, version=version,
+            )
+            for product_id, name, price, stock, is_active, version, _, _ in rows
+        ]
 
     def get_by_id(self, product_id: str)-> Product:
         try:
             product_model = ProductModel.objects.get(id=product_id)
-            return product_model.to_domain()
         except:
             raise ValueError("Produto não encontrado")
+        return self._to_domain(product_model)
+
+    def get_by_ids(self, product_ids: list[str]) -> list[Product]:
+        products_by_id = {
+            product.id: product
+            for product in self._to_domain_many(list(ProductModel.objects.filter(id__in=product_ids)))
+        }
+        return [
+            products_by_id[str(product_id)]
+            for product_id in product_ids if str(product_id) in products_by_id
+        ]
     
-    def get_all_paginated_filtered(self, offset: int, limit: int, search_query: str = "") -> tuple[list[Product], int]:
+    def get_price_snapshots(self, product_ids: list[str]) -> list[ProductPriceSnapshot]:
+        """Um `SELECT ... WHERE id IN (...)` só com as colunas de preço e estoque.
+
+        `price` chega como `Decimal` direto do banco, sem instanciar `ProductModel`.
+        """
+        rows = list(ProductModel.objects.filter(id__in=product_ids).values_list(
+            "id", "name", "price", "stock", "is_active", "stock_shards", "stock_ledger"
+        ))
+        live = self._live_stock([
+            (product_id, stock, shards, in_ledger)
+            for product_id, _, _, stock, _, shards, in_ledger in rows if shards or in_ledger
+        ])
+        return [
+            ProductPriceSnapshot(
+                product_id=str(product_id), name=name, unit_price=price,
+                stock=live.get(str(product_id), stock), is_active=is_active,
+            )
+            for product_id, name, price, stock, is_active, _, _ in rows
+        ]
+
+    def get_version(self, product_id: str) -> int | None:
+        """None também para produtos particionados ou em livro-razão: as reservas não mudam a versão."""
+        row = ProductModel.objects.filter(id=product_id).values_list(
+            "version", "stock_shards", "stock_ledger"
+        ).first()
+        if row is None or row[1] or row[2]:
+            return None
+        return row[0]
+
+    def get_catalog_version(self) -> str:
+        """Maior `updated_at`, contador de remoções e, com estoque vivo, a janela de tempo atual.
+
+        Uma consulta com três subconsultas que só leem índices: o fim do
+        índice de `updated_at`, a linha de `CatalogVersionModel` e o índice
+        parcial dos produtos particionados ou em livro-razão. As reservas
+        desses produtos não tocam a linha do produto (nem outra linha
+        compartilhada), então, se algum existir, a versão também muda a cada
+        `PRODUCT_LIVE_STOCK_ETAG_SECONDS`.
+        """
+        parts = [
+            ProductModel.objects.order_by("-updated_at").values("updated_at")[:1],
+            CatalogVersionModel.objects.filter(id=CatalogVersionModel.SINGLETON_ID).values("version"),
+            ProductModel.objects.filter(Q(stock_shards__gt=0) | Q(stock_ledger=True)).values("id")[:1],
+        ]
+        compiled = [queryset.query.sql_with_params() for queryset in parts]
+        sql = "SELECT " + ", ".join(f"({part_sql})" for part_sql, _ in compiled)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [param for _, params in compiled for param in params])
+            last_update, deletes, live_stock = cursor.fetchone()
+        version = f"{last_update or '-'}:{deletes or 0}"
+        if live_stock is not None:
+            window = getattr(settings, "PRODUCT_LIVE_STOCK_ETAG_SECONDS", 5)
+            version += f":{int(time.time() // window)}"
+        return version
+
+    def get_all_paginated_filtered(self, offset: int, limit: int, search_query: str = "",
+                                   count_strategy: str | None = None) -> OffsetPage[Product]:
         queryset = ProductModel.objects.all()
 
         if search_query:
@@ -49,8 +349,326 @@ class DjangoProductRepository(ProductRepository):
                 Q( name__icontains=search_query)
             )
 
-        total_items = queryset.count()
-        paginated = queryset[offset:offset + limit]
-        products = [product_model.to_domain() for product_model in paginated]
+        page = paginate_queryset(queryset, offset, limit, count_strategy)
+        return replace(page, items=self._to_domain_many(page.items))
+
+    def get_all_cursor_paginated(
+        self, limit: int, cursor: str | None = None, search_query: str | None = None,
+        include_total: bool = False) -> CursorPage[Product]:
+        """Paginação keyset ordenada por (name, id).
+
+        Em vez de pular `offset` linhas, filtra a partir da última chave vista,
+        o que mantém o custo por página constante com o índice (name, id).
+        """
+        queryset = ProductModel.objects.all()
+
+        if search_query:
+            queryset = queryset.filter(
+                Q( name__icontains=search_query)
+            )
+
+        total_items = queryset.count() if include_total else None
+
+        direction = CURSOR_NEXT
+        if cursor:
+            key, direction = decode_cursor(cursor)
+            if len(key) != 2 or not all(isinstance(part, str) for part in key):
+                raise ValueError("Cursor inválido")
+            name, product_id = key
+            if direction == CURSOR_NEXT:
+                queryset = queryset.filter(Q(name__gt=name) | Q(name=name, id__gt=product_id))
+            else:
+                queryset = queryset.filter(Q(name__lt=name) | Q(name=name, id__lt=product_id))
+
+        if direction == CURSOR_NEXT:
+            queryset = queryset.order_by("name", "id")
+        else:
+            queryset = queryset.order_by("-name", "-id")
+
+        rows = list(queryset[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if direction == CURSOR_PREV:
+            rows.reverse()
+
+        next_cursor = prev_cursor = None
+        if rows:
+            first_key = [rows[0].name, str(rows[0].id)]
+            last_key = [rows[-1].name, str(rows[-1].id)]
+            if direction == CURSOR_NEXT:
+                next_cursor = encode_cursor(last_key, CURSOR_NEXT) if has_more else None
+                prev_cursor = encode_cursor(first_key, CURSOR_PREV) if cursor else None
+            else:
+                next_cursor = encode_cursor(last_key, CURSOR_NEXT)
+                prev_cursor = encode_cursor(first_key, CURSOR_PREV) if has_more else None
+
+        return CursorPage(
+            items=self._to_domain_many(rows),
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+            total_items=total_items,
+        )
+
+
+    def reserve_stock(self, product_id: str, quantity: int) -> None:
+        """Executa `UPDATE ... SET stock = stock - q WHERE id = ? AND stock >= q`.
+
+        Uma única instrução condicional: sem leitura prévia, sem perda de
+        atualizações concorrentes e com o lock da linha mantido só durante o UPDATE.
+        Produtos com estoque particionado baixam uma das partições (`_reserve_sharded`);
+        os em livro-razão inserem uma movimentação condicional.
+        """
+        if quantity <= 0:
+            raise ValueError("Quantidade inválida")
+        if self.ledger.is_known(product_id) and self.ledger.append(
+                product_id, InventoryMovementModel.RESERVATION, -quantity, require_available=True):
+            return
+        shards = self.stock_totals.known_shards(product_id)
+        if shards and self._reserve_sharded(product_id, quantity, shards):
+            return
+        updated = ProductModel.objects.filter(
+            id=product_id, stock_shards=0, stock_ledger=False, stock__gte=quantity
+        ).update(stock=F("stock") - quantity, version=F("version") + 1, updated_at=timezone.now())
+        if updated:
+            return
+        shards, in_ledger = self._stock_mode(product_id)
+        if in_ledger:
+            if self.ledger.append(product_id, InventoryMovementModel.RESERVATION, -quantity, require_available=True):
+                return
+        elif shards and self._reserve_sharded(product_id, quantity, shards):
+            return
+        raise ValueError("Estoque insuficiente")
+
+    def release_stock(self, product_id: str, quantity: int) -> None:
+        if quantity <= 0:
+            raise ValueError("Quantidade inválida")
+        if self.ledger.is_known(product_id) and self.ledger.append(
+                product_id, InventoryMovementModel.RELEASE, quantity):
+            return
+        shards = self.stock_totals.known_shards(product_id)
+        if shards and self._release_sharded(product_id, quantity, shards):
+            return
+        updated = ProductModel.objects.filter(id=product_id, stock_shards=0, stock_ledger=False).update(
+            stock=F("stock") + quantity, version=F("version") + 1, updated_at=timezone.now()
+        )
+        if updated:
+            return
+        shards, in_ledger = self._stock_mode(product_id)
+        if in_ledger:
+            if self.ledger.append(product_id, InventoryMovementModel.RELEASE, quantity):
+                return
+        elif shards and self._release_sharded(product_id, quantity, shards):
+            return
+        raise ValueError("Estoque do produto em reconfiguração, tente novamente")
+
+    def _stock_mode(self, product_id: str) -> tuple[int, bool]:
+        """Lê (stock_shards, stock_ledger) do produto e atualiza as dicas locais.
+
+        Raises:
+            ValueError: Se o produto não existir.
+        """
+        row = ProductModel.objects.filter(id=product_id).values_list("stock_shards", "stock_ledger").first()
+        if row is None:
+            raise ValueError("Produto não encontrado")
+        shards, in_ledger = row
+        if shards:
+            self.stock_totals.remember_shards(product_id, shards)
+        self.ledger.remember(product_id, in_ledger)
+        return shards, in_ledger
+
+    def _reserve_sharded(self, product_id: str, quantity: int, shards: int) -> bool:
+        """Baixa `quantity` das partições; False se o produto não estiver particionado.
+
+        Tenta primeiro uma partição sorteada (um UPDATE condicional). Se ela
+        não tiver o suficiente, lê as partições e tenta as que têm; se nenhuma
+        tiver sozinha, junta de várias com as partições travadas.
+
+        Raises:
+            ValueError: Se a soma das partições não cobrir `quantity`.
+        """
+        tried = random.randrange(shards)
+        if self._move_shard_stock(product_id, tried, -quantity):
+            self.stock_totals.adjust(product_id, -quantity)
+            return True
+
+        rows = list(
+            ProductStockShardModel.objects.filter(product_id=product_id)
+            .order_by("-stock").values_list("shard", "stock")
+        )
+        if not rows:
+            self.stock_totals.invalidate(product_id)
+            return False
+        if sum(stock for _, stock in rows) < quantity:
+            raise ValueError("Estoque insuficiente")
+        for shard, stock in rows:
+            if stock < quantity:
+                break
+            if shard != tried and self._move_shard_stock(product_id, shard, -quantity):
+                self.stock_totals.adjust(product_id, -quantity)
+                return True
+
+        with transaction.atomic():
+            locked = list(
+                ProductStockShardModel.objects.select_for_update()
+                .filter(product_id=product_id).order_by("shard")
+            )
+            if sum(row.stock for row in locked) < quantity:
+                raise ValueError("Estoque insuficiente")
+            remaining = quantity
+            for row in sorted(locked, key=lambda row: row.stock, reverse=True):
+                take = min(row.stock, remaining)
+                ProductStockShardModel.objects.filter(pk=row.pk).update(
+                    stock=F("stock") - take, updated_at=timezone.now()
+                )
+                remaining -= take
+                if not remaining:
+                    break
+        self.stock_totals.adjust(product_id, -quantity)
+        return True
+
+    def _release_sharded(self, product_id: str, quantity: int, shards: int) -> bool:
+        if self._move_shard_stock(product_id, random.randrange(shards), quantity):
+            self.stock_totals.adjust(product_id, quantity)
+            return True
+        return False
+
+    @staticmethod
+    def _move_shard_stock(product_id: str, shard: int, delta: int) -> bool:
+        """`UPDATE` condicional em uma partição; False se ela não existir ou não tiver o suficiente."""
+        queryset = ProductStockShardModel.objects.filter(product_id=product_id, shard=shard)
+        if delta < 0:
+            queryset = queryset.filter(stock__gte=-delta)
+        return bool(queryset.update(stock=F("stock") + delta, updated_at=timezone.now()))
+
+    def _write_shards(self, product_id: str, shards: int, total: int) -> None:
+        """Recria as partições com `total` dividido igualmente. Chamar dentro de uma transação."""
+        ProductStockShardModel.objects.filter(product_id=product_id).delete()
+        ProductStockShardModel.objects.bulk_create([
+            ProductStockShardModel(product_id=product_id, shard=shard, stock=stock)
+            for shard, stock in enumerate(split_stock(total, shards))
+        ])
+        self.stock_totals.invalidate(product_id)
+
+    def _locked_stock(self, product_id: str) -> tuple[int, int, bool]:
+        """Trava o produto (e as partições) e retorna (estoque atual, partições, livro-razão).
+
+        Chamar dentro de uma transação.
+        """
+        row = (
+            ProductModel.objects.select_for_update().filter(id=product_id)
+            .values_list("stock", "stock_shards", "stock_ledger").first()
+        )
+        if row is None:
+            raise ValueError("Produto não encontrado")
+        stock, shards, in_ledger = row
+        if shards:
+            stock = sum(
+                ProductStockShardModel.objects.select_for_update()
+                .filter(product_id=product_id).values_list("stock", flat=True)
+            )
+        elif in_ledger:
+            stock += self.ledger.tails([product_id])[str(product_id)]
+        return stock, shards, in_ledger
+
+    def enable_sharded_stock(self, product_id: str, shards: int | None = None) -> int:
+        """Divide o estoque do produto em `shards` partições (ou redivide, se já estiver particionado).
+
+        Retorna o estoque total, que não muda.
+        """
+        config = get_stock_shard_settings()
+        shards = shards or config["DEFAULT_SHARDS"]
+        if not 1 <= shards <= config["MAX_SHARDS"]:
+            raise ValueError(f"Número de partições deve estar entre 1 e {config['MAX_SHARDS']}")
+        with transaction.atomic():
+            stock, _, in_ledger = self._locked_stock(product_id)
+            if in_ledger:
+                raise ValueError("Produto com estoque em livro-razão")
+            self._write_shards(product_id, shards, stock)
+            ProductModel.objects.filter(id=product_id).update(
+                stock=0, stock_shards=shards, version=F("version") + 1, updated_at=timezone.now()
+            )
+        return stock
+
+    def disable_sharded_stock(self, product_id: str) -> int:
+        """Junta as partições de volta em `ProductModel.stock`. Retorna o estoque total."""
+        with transaction.atomic():
+            stock, shards, _ = self._locked_stock(product_id)
+            if not shards:
+                return stock
+            ProductStockShardModel.objects.filter(product_id=product_id).delete()
+            ProductModel.objects.filter(id=product_id).update(
+                stock=stock, stock_shards=0, version=F("version") + 1, updated_at=timezone.now()
+            )
+        self.stock_totals.invalidate(product_id)
+        return stock
+
+    def enable_stock_ledger(self, product_id: str) -> int:
+        """Passa o produto para o livro-razão. Retorna o estoque atual, que não muda."""
+        with ledger_lock(product_id):
+            stock, shards, in_ledger = self._locked_stock(product_id)
+            if shards:
+                raise ValueError("Produto com estoque particionado")
+            if not in_ledger:
+                self.ledger.open(product_id, stock)
+        return stock
+
+    def disable_stock_ledger(self, product_id: str) -> int:
+        """Volta o produto ao modo comum com o estoque atual em `stock`.
+
+        As movimentações ficam como histórico. Retorna o estoque atual.
+        """
+        with ledger_lock(product_id):
+            stock, _, in_ledger = self._locked_stock(product_id)
+            if in_ledger:
+                ProductModel.objects.filter(id=product_id).update(
+                    stock=stock, stock_ledger=False, version=F("version") + 1, updated_at=timezone.now()
+                )
+        self.ledger.remember(product_id, False)
+        return stock
+
+    def rebalance_sharded_stock(self, product_id: str | None = None) -> int:
+        """Redistribui o estoque entre as partições de cada produto particionado.
+
+        Partições zeradas fazem as reservas caírem no caminho mais lento
+        (leitura de todas as partições), então o estoque é movido para que elas
+        difiram em no máximo 1. O total não muda. Retorna quantos produtos
+        foram rebalanceados.
+        """
+        queryset = ProductModel.objects.filter(stock_shards__gt=0)
+        if product_id is not None:
+            queryset = queryset.filter(id=product_id)
+        rebalanced = 0
+        for sharded_id in queryset.values_list("id", flat=True):
+            with transaction.atomic():
+                rows = list(
+                    ProductStockShardModel.objects.select_for_update()
+                    .filter(product_id=sharded_id).order_by("shard")
+                )
+                stocks = [row.stock for row in rows]
+                if not rows or max(stocks) - min(stocks) <= 1:
+                    continue
+                now = timezone.now()
+                for row, stock in zip(rows, split_stock(sum(stocks), len(rows))):
+                    if row.stock != stock:
+                        ProductStockShardModel.objects.filter(pk=row.pk).update(stock=stock, updated_at=now)
+            rebalanced += 1
+        return rebalanced
+
+    def reserve_stock_bulk(self, quantities: dict[str, int]) -> None:
+        """Reserva tudo em uma transação; a ordem fixa dos ids evita deadlocks."""
+        with transaction.atomic():
+            for product_id in sorted(quantities, key=str):
+                self.reserve_stock(product_id, quantities[product_id])
+
+
+def get_product_repository() -> ProductRepository:
+    """
+    Repositório de produtos usado pelas views.
 
-        return products, total_items
\ No newline at end of file
+    Retorna o `DjangoProductRepository` envolto pelo `CachedProductRepository`
+    quando `PRODUCT_CACHE["ENABLED"]` estiver ativo.
+    """
+    repository = DjangoProductRepository()
+    if get_product_cache_settings()["ENABLED"]:
+        return CachedProductRepository(repository, get_product_detail_cache())
+    return repository
@@ -0,0 +1,252 @@
+import math
+import re
+import threading
+import unicodedata
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+
+from core.domain.entities.product import Product
+from core.interfaces.usecase.gateways import ProductSearchBackend
+from .models import ProductModel
+
+FTS_TABLE = "products_productmodel_fts"
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Normaliza (minúsculas, sem acentos) e quebra o texto em termos."""
+    normalized = unicodedata.normalize("NFKD", text or "")
+    normalized = "".join(char for char in normalized if not unicodedata.combining(char))
+    return _TOKEN_RE.findall(normalized.lower())
+
+
+def fts_rowid(product_id: str) -> int:
+    """Deriva um rowid inteiro estável (63 bits) a partir do UUID do produto."""
+    return uuid.UUID(str(product_id)).int >> 65
+
+
+class InMemoryProductSearchBackend(ProductSearchBackend):
+    """
+    Índice invertido em memória (termo -> {produto: frequência}).
+
+    Ranqueia por TF-IDF e exige que todos os termos da busca estejam presentes.
+    O índice é carregado do banco no primeiro uso e é local ao processo.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: dict[str, dict[str, int]] = defaultdict(dict)
+        self._documents: dict[str, tuple[str, set[str]]] = {}
+        self._loaded = False
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.rebuild()
+
+    def _add(self, product_id: str, name: str):
+        terms = tokenize(name)
+        for term in terms:
+            self._postings[term][product_id] = self._postings[term].get(product_id, 0) + 1
+        self._documents[product_id] = (name, set(terms))
+
+    def _discard(self, product_id: str):
+        document = self._documents.pop(product_id, None)
+        if document is None:
+            return
+        for term in document[1]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(product_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def index(self, product: Product) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            self._discard(str(product.id))
+            self._add(str(product.id), product.name)
+
+    def remove(self, product_id: str) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            self._discard(str(product_id))
+
+    def rebuild(self) -> None:
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._documents = {}
+            rows = ProductModel.objects.values_list("id", "name").iterator(chunk_size=5000)
+            for product_id, name in rows:
+                self._add(str(product_id), name)
+            self._loaded = True
+
+    def search(self, query: str, offset: int, limit: int,
+               with_total: bool = True) -> tuple[list[str], int | None]:
+        terms = set(tokenize(query))
+        if not terms:
+            return [], 0
+        with self._lock:
+            self._ensure_loaded()
+            postings = [self._postings.get(term) for term in terms]
+            if not all(postings):
+                return [], 0
+            postings.sort(key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+            total_documents = len(self._documents)
+            scores = {}
+            for product_id in candidates:
+                scores[product_id] = sum(
+                    frequencies[product_id] * math.log(1 + total_documents / len(frequencies))
+                    for frequencies in postings
+                )
+            ranked = sorted(
+                candidates, key=lambda pid: (-scores[pid], self._documents[pid][0], pid)
+            )
+        return ranked[offset:offset + limit], len(ranked)
+
+
+class SQLiteFTS5ProductSearchBackend(ProductSearchBackend):
+    """
+    Busca via tabela virtual FTS5 do SQLite, ranqueada por bm25.
+
+    A tabela guarda o id do produto e o nome; o rowid é derivado do UUID
+    para que atualizações e remoções sejam buscas pontuais no índice.
+    """
+    @staticmethod
+    def _match_expression(query: str) -> str:
+        return " ".join('"%s"' % term for term in tokenize(query))
+
+    def index(self, product: Product) -> None:
+        rowid = fts_rowid(product.id)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [rowid])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, product_id, name) VALUES (%s, %s, %s)",
+                [rowid, str(product.id), product.name],
+            )
+
+    def index_many(self, products: list[Product]) -> None:
+        rows = [(fts_rowid(product.id), str(product.id), product.name) for product in products]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO {FTS_TABLE} (rowid, product_id, name) VALUES (%s, %s, %s)",
+                rows,
+            )
+
+    def remove(self, product_id: str) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [fts_rowid(product_id)])
+
+    def rebuild(self) -> None:
+        rows = ProductModel.objects.values_list("id", "name").iterator(chunk_size=5000)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            batch = []
+            for product_id, name in rows:
+                batch.append((fts_rowid(product_id), str(product_id), name))
+                if len(batch) >= 5000:
+                    cursor.executemany(
+                        f"INSERT INTO {FTS_TABLE} (rowid, product_id, name) VALUES (%s, %s, %s)", batch
+                    )
+                    batch = []
+            if batch:
+                cursor.executemany(
+                    f"INSERT INTO {FTS_TABLE} (rowid, product_id, name) VALUES (%s, %s, %s)", batch
+                )
+
+    def search(self, query: str, offset: int, limit: int,
+               with_total: bool = True) -> tuple[list[str], int | None]:
+        expression = self._match_expression(query)
+        if not expression:
+            return [], 0
+        total = None
+        with connection.cursor() as cursor:
+            if with_total:
+                cursor.execute(
+                    f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression]
+                )
+                total = cursor.fetchone()[0]
+            cursor.execute(
+                f"SELECT product_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+                f"ORDER BY bm25({FTS_TABLE}), name LIMIT %s OFFSET %s",
+                [expression, limit, offset],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        return ids, total
+
+
+class PostgresProductSearchBackend(ProductSearchBackend):
+    """
+    Busca via `tsvector` do PostgreSQL, ranqueada por `ts_rank`.
+
+    Usa o índice GIN de expressão `to_tsvector('simple', name)`, que o próprio
+    banco mantém atualizado; por isso indexar e remover não fazem nada.
+    """
+    VECTOR = "to_tsvector('simple', name)"
+
+    def index(self, product: Product) -> None:
+        pass
+
+    def remove(self, product_id: str) -> None:
+        pass
+
+    def rebuild(self) -> None:
+        pass
+
+    def search(self, query: str, offset: int, limit: int,
+               with_total: bool = True) -> tuple[list[str], int | None]:
+        text = " ".join(tokenize(query))
+        if not text:
+            return [], 0
+        table = ProductModel._meta.db_table
+        total = None
+        with connection.cursor() as cursor:
+            if with_total:
+                cursor.execute(
+                    f"SELECT count(*) FROM {table} "
+                    f"WHERE {self.VECTOR} @@ plainto_tsquery('simple', %s)",
+                    [text],
+                )
+                total = cursor.fetchone()[0]
+            cursor.execute(
+                f"SELECT id FROM {table} "
+                f"WHERE {self.VECTOR} @@ plainto_tsquery('simple', %s) "
+                f"ORDER BY ts_rank({self.VECTOR}, plainto_tsquery('simple', %s)) DESC, name "
+                f"LIMIT %s OFFSET %s",
+                [text, text, limit, offset],
+            )
+            ids = [str(row[0]) for row in cursor.fetchall()]
+        return ids, total
+
+
+SEARCH_BACKENDS = {
+    "memory": InMemoryProductSearchBackend,
+    "sqlite_fts5": SQLiteFTS5ProductSearchBackend,
+    "postgres": PostgresProductSearchBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_product_search_backend() -> ProductSearchBackend:
+    """
+    Retorna o backend de busca configurado em `PRODUCT_SEARCH_BACKEND`.
+
+    Com "auto", escolhe FTS5 no SQLite, tsvector no PostgreSQL e o índice
+    em memória nos demais bancos. A instância é única por processo.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = getattr(settings, "PRODUCT_SEARCH_BACKEND", "auto")
+                if name == "auto":
+                    name = {"sqlite": "sqlite_fts5", "postgresql": "postgres"}.get(
+                        connection.vendor, "memory"
+                    )
+                _backend = SEARCH_BACKENDS[name]()
+    return _backend
@@ -20,6 +20,18 @@ class ProductSerializer(serializers.Serializer):
         return instance
 
 
+class ProductPatchSerializer(serializers.Serializer):
+    """Item do PATCH em lote: `id` e ao menos um de `price`, `stock` ou `is_active`."""
+    id = serializers.UUIDField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False)
+    stock = serializers.IntegerField(min_value=0, max_value=2147483647, required=False)
+    is_active = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        if len(attrs) == 1:
+            raise serializers.ValidationError("Informe price, stock ou is_active.")
+        return attrs
+
 
 class ProductReadSerializer(serializers.Serializer):
     id = serializers.CharField(read_only=True)
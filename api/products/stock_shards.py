@@ -0,0 +1,121 @@
+"""
+Estoque particionado para produtos muito disputados.
+
+Com `ProductModel.stock_shards = N`, o estoque do produto fica dividido em N
+linhas de `ProductStockShardModel`. Cada reserva baixa uma partição sorteada
+com um UPDATE condicional, então checkouts simultâneos no mesmo produto
+disputam linhas diferentes em vez de uma só. A leitura soma as partições; as
+somas ficam em um cache local com TTL curto (`STOCK_SHARDS["TOTALS_TTL_SECONDS"]`).
+
+O modo é ligado, desligado e rebalanceado pelo comando `manage.py stock_shards`.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Count, Sum
+
+from .models import ProductStockShardModel
+
+DEFAULT_STOCK_SHARDS = {
+    "DEFAULT_SHARDS": 8,
+    "MAX_SHARDS": 64,
+    "TOTALS_TTL_SECONDS": 1.0,
+}
+
+
+def get_stock_shard_settings() -> dict:
+    return {**DEFAULT_STOCK_SHARDS, **getattr(settings, "STOCK_SHARDS", {})}
+
+
+def split_stock(total: int, shards: int) -> list[int]:
+    """Divide `total` em `shards` partes que diferem em no máximo 1."""
+    base, extra = divmod(total, shards)
+    return [base + 1 if shard < extra else base for shard in range(shards)]
+
+
+class ShardedStockTotals:
+    """
+    Cache local das somas de estoque dos produtos particionados.
+
+    Guarda (total, partições) por produto. As reservas e devoluções feitas por
+    este processo ajustam o total em cache; as de outros processos aparecem
+    quando a entrada expira.
+    """
+    def __init__(self, ttl=1.0, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[float, int, int]] = {}
+
+    def get_many(self, product_ids: list[str]) -> dict[str, int]:
+        """Totais dos produtos; os que faltam (ou expiraram) vêm em uma consulta."""
+        now = self._clock()
+        totals, missing = {}, []
+        with self._lock:
+            for product_id in map(str, product_ids):
+                entry = self._entries.get(product_id)
+                if entry is not None and entry[0] > now:
+                    totals[product_id] = entry[1]
+                else:
+                    missing.append(product_id)
+        if missing:
+            rows = (
+                ProductStockShardModel.objects.filter(product_id__in=missing)
+                .values_list("product_id")
+                .annotate(total=Sum("stock"), shards=Count("id"))
+                .order_by()
+            )
+            loaded = {str(product_id): (total, shards) for product_id, total, shards in rows}
+            with self._lock:
+                for product_id in missing:
+                    total, shards = loaded.get(product_id, (0, 0))
+                    self._entries[product_id] = (now + self.ttl, total, shards)
+                    totals[product_id] = total
+        return totals
+
+    def get(self, product_id: str) -> int:
+        return self.get_many([product_id])[str(product_id)]
+
+    def known_shards(self, product_id: str) -> int:
+        """Número de partições já visto para o produto (mesmo expirado), ou 0."""
+        with self._lock:
+            entry = self._entries.get(str(product_id))
+        return entry[2] if entry is not None else 0
+
+    def remember_shards(self, product_id: str, shards: int) -> None:
+        """Registra o número de partições sem ler o total; a entrada já nasce expirada."""
+        with self._lock:
+            entry = self._entries.get(str(product_id))
+            if entry is None or entry[2] != shards:
+                self._entries[str(product_id)] = (float("-inf"), 0, shards)
+
+    def adjust(self, product_id: str, delta: int) -> None:
+        with self._lock:
+            entry = self._entries.get(str(product_id))
+            if entry is not None:
+                expires_at, total, shards = entry
+                self._entries[str(product_id)] = (expires_at, max(total + delta, 0), shards)
+
+    def invalidate(self, *product_ids: str) -> None:
+        with self._lock:
+            for product_id in product_ids:
+                self._entries.pop(str(product_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_totals = None
+_totals_lock = threading.Lock()
+
+
+def get_sharded_stock_totals() -> ShardedStockTotals:
+    """Instância única por processo, configurada por `settings.STOCK_SHARDS`."""
+    global _totals
+    if _totals is None:
+        with _totals_lock:
+            if _totals is None:
+                _totals = ShardedStockTotals(ttl=get_stock_shard_settings()["TOTALS_TTL_SECONDS"])
+    return _totals
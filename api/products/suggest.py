@@ -0,0 +1,164 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max
+
+from core.domain.entities.product import Product
+from .models import CatalogVersionModel, ProductModel
+from .search import tokenize
+
+DEFAULT_PRODUCT_SUGGEST = {
+    "REFRESH_SECONDS": 5,
+    "REBUILD_SECONDS": 600,
+}
+
+# Margem na releitura por `updated_at`: o valor é gerado antes do commit, então
+# uma escrita pode aparecer com `updated_at` um pouco anterior à marca já lida.
+WATERMARK_OVERLAP = timedelta(seconds=2)
+
+
+def get_product_suggest_settings() -> dict:
+    return {**DEFAULT_PRODUCT_SUGGEST, **getattr(settings, "PRODUCT_SUGGEST", {})}
+
+
+def normalize_prefix(text: str) -> str:
+    """Normaliza um nome (ou prefixo) para comparação: minúsculas, sem acentos."""
+    return " ".join(tokenize(text))
+
+
+class ProductNameIndex:
+    """
+    Índice de prefixos dos nomes de produtos ativos, em memória.
+
+    Mantém uma lista ordenada de tuplas (nome normalizado, id, nome) e resolve
+    prefixos com busca binária, sem acessar o banco. É carregado uma vez por
+    processo; o repositório de produtos aplica as escritas deste processo
+    depois do commit (`transaction.on_commit`).
+
+    As escritas de outros processos chegam por `refresh`, no máximo a cada
+    `REFRESH_SECONDS`: relê os produtos com `updated_at` a partir da última
+    marca e reconstrói tudo quando houve remoções (contador do catálogo) ou
+    a cada `REBUILD_SECONDS`.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: list[tuple[str, str, str]] = []
+        self._keys: dict[str, tuple[str, str, str]] = {}
+        self._loaded = False
+        self._watermark = None
+        self._deletes = 0
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @staticmethod
+    def _delete_count() -> int:
+        return CatalogVersionModel.objects.filter(id=CatalogVersionModel.SINGLETON_ID).values_list(
+            "version", flat=True
+        ).first() or 0
+
+    def load(self) -> None:
+        """(Re)constrói o índice com os produtos ativos do banco."""
+        # Marcas lidas antes das linhas: uma escrita no meio só é relida depois.
+        deletes = self._delete_count()
+        watermark = ProductModel.objects.aggregate(last=Max("updated_at"))["last"]
+        rows = ProductModel.objects.filter(is_active=True).values_list("id", "name")
+        entries = sorted(
+            (normalize_prefix(name), str(product_id), name)
+            for product_id, name in rows.iterator(chunk_size=5000)
+        )
+        with self._lock:
+            self._entries = entries
+            self._keys = {entry[1]: entry for entry in entries}
+            self._watermark, self._deletes = watermark, deletes
+            self._loaded_at = self._checked_at = time.monotonic()
+            self._loaded = True
+
+    def refresh(self) -> None:
+        """Aplica as escritas de outros processos, se já passou `REFRESH_SECONDS` da última checagem."""
+        config = get_product_suggest_settings()
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < config["REFRESH_SECONDS"]:
+                return
+            self._checked_at = now
+        if now - self._loaded_at >= config["REBUILD_SECONDS"] or self._delete_count() != self._deletes:
+            self.load()
+            return
+
+        changed = ProductModel.objects.order_by()
+        if self._watermark is not None:
+            changed = changed.filter(updated_at__gte=self._watermark - WATERMARK_OVERLAP)
+        rows = list(changed.values_list("id", "name", "is_active", "updated_at"))
+        with self._lock:
+            for product_id, name, is_active, updated_at in rows:
+                self._apply(str(product_id), name, is_active)
+                if self._watermark is None or updated_at > self._watermark:
+                    self._watermark = updated_at
+
+    def _discard(self, product_id: str) -> None:
+        entry = self._keys.pop(product_id, None)
+        if entry is not None:
+            position = bisect_left(self._entries, entry)
+            if position < len(self._entries) and self._entries[position] == entry:
+                del self._entries[position]
+
+    def _apply(self, product_id: str, name: str, is_active: bool) -> None:
+        self._discard(product_id)
+        if is_active:
+            entry = (normalize_prefix(name), product_id, name)
+            insort(self._entries, entry)
+            self._keys[product_id] = entry
+
+    def add(self, product: Product) -> None:
+        """Insere, atualiza ou remove o produto conforme ele esteja ativo."""
+        if not self._loaded:
+            return
+        with self._lock:
+            self._apply(str(product.id), product.name, product.is_active)
+
+    def remove(self, product_id: str) -> None:
+        if not self._loaded:
+            return
+        with self._lock:
+            self._discard(str(product_id))
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[dict]:
+        """Retorna até `limit` produtos cujo nome começa com o prefixo."""
+        normalized = normalize_prefix(prefix)
+        if not normalized:
+            return []
+        if not self._loaded:
+            self.load()
+        else:
+            self.refresh()
+        results = []
+        with self._lock:
+            position = bisect_left(self._entries, (normalized,))
+            while position < len(self._entries) and len(results) < limit:
+                key, product_id, name = self._entries[position]
+                if not key.startswith(normalized):
+                    break
+                results.append({"id": product_id, "name": name})
+                position += 1
+        return results
+
+
+product_name_index = ProductNameIndex()
+
+
+def warm_product_name_index() -> None:
+    """Carrega o índice de sugestões na inicialização do worker."""
+    from django.db.utils import DatabaseError
+
+    try:
+        product_name_index.load()
+    except DatabaseError:
+        # Banco ainda sem as tabelas (ex.: antes do migrate); carrega no primeiro uso.
+        pass
@@ -0,0 +1,78 @@
+import uuid
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.urls import reverse
+from api.users.models import UserModel
+from api.products.models import ProductModel
+from api.products.suggest import product_name_index
+
+
+class ProductBulkUpdateTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = UserModel.objects.create_superuser(
+            email='admin@example.com',
+            password='password',
+            first_name='Admin',
+            last_name='Test'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        self.products = ProductModel.objects.bulk_create([
+            ProductModel(name=f'Produto {i:04d}', price=Decimal('10.00'), stock=5)
+            for i in range(1200)
+        ])
+        self.url = reverse('product-bulk-update')
+
+    def test_updates_only_given_fields_and_reports_missing(self):
+        missing_id = str(uuid.uuid4())
+        payload = [
+            {'id': str(product.id), 'price': '12.50'} for product in self.products[:700]
+        ] + [
+            {'id': str(product.id), 'stock': 40, 'is_active': False} for product in self.products[700:]
+        ] + [{'id': missing_id, 'stock': 1}]
+
+        with self.assertNumQueries(9):
+            response = self.client.patch(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 1200)
+        self.assertEqual(response.data['missing'], [missing_id])
+
+        first = ProductModel.objects.get(id=self.products[0].id)
+        self.assertEqual((first.price, first.stock, first.is_active), (Decimal('12.50'), 5, True))
+        last = ProductModel.objects.get(id=self.products[-1].id)
+        self.assertEqual((last.price, last.stock, last.is_active), (Decimal('10.00'), 40, False))
+
+    def test_deactivation_updates_suggest_index(self):
+        product_name_index.load()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.url, [{'id': str(self.products[0].id), 'is_active': False}], format='json')
+        names = [item['name'] for item in product_name_index.suggest('Produto 000', limit=20)]
+        self.assertNotIn('Produto 0000', names)
+        self.assertIn('Produto 0001', names)
+
+    def test_invalidates_detail_cache(self):
+        product_id = self.products[0].id
+        detail_url = reverse('product-retrieve', kwargs={'pk': product_id})
+        self.assertEqual(self.client.get(detail_url).data['stock'], 5)
+        self.client.patch(self.url, [{'id': str(product_id), 'stock': 9}], format='json')
+        self.assertEqual(self.client.get(detail_url).data['stock'], 9)
+
+    def test_invalid_item_rejects_whole_request(self):
+        payload = [
+            {'id': str(self.products[0].id), 'stock': 3},
+            {'id': str(self.products[1].id), 'price': '-1'},
+            {'id': str(self.products[2].id)},
+        ]
+        response = self.client.patch(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(ProductModel.objects.get(id=self.products[0].id).stock, 5)
+
+    def test_requires_admin(self):
+        user = UserModel.objects.create_user(
+            email='user@example.com', password='password', first_name='U', last_name='T'
+        )
+        self.client.force_authenticate(user=user)
+        response = self.client.patch(self.url, [{'id': str(self.products[0].id), 'stock': 1}], format='json')
+        self.assertEqual(response.status_code, 403)
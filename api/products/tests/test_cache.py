@@ -0,0 +1,60 @@
+import uuid
+from django.test import TestCase
+from api.products.cache import CachedProductRepository, ProductDetailCache
+from api.products.repository import DjangoProductRepository
+from core.domain.entities.product import Product
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CachedProductRepositoryTestCase(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ProductDetailCache(max_entries=2, ttl=30, not_found_ttl=5, clock=self.clock)
+        self.repo = CachedProductRepository(DjangoProductRepository(), self.cache)
+        self.product = self.repo.create(Product(name="Caneca", price=10.0, stock=5))
+
+    def test_read_through_and_counters(self):
+        with self.assertNumQueries(1):
+            self.repo.get_by_id(self.product.id)
+            self.repo.get_by_id(self.product.id)
+        stats = self.cache.stats()
+        self.assertEqual((stats["misses"], stats["local_hits"]), (1, 1))
+
+    def test_ttl_expiry(self):
+        self.repo.get_by_id(self.product.id)
+        self.clock.now += 31
+        with self.assertNumQueries(1):
+            self.repo.get_by_id(self.product.id)
+
+    def test_update_and_delete_invalidate(self):
+        self.repo.get_by_id(self.product.id)
+        self.product.stock = 1
+        self.repo.update(self.product)
+        self.assertEqual(self.repo.get_by_id(self.product.id).stock, 1)
+
+        self.repo.delete(self.product.id)
+        with self.assertRaises(ValueError):
+            self.repo.get_by_id(self.product.id)
+
+    def test_not_found_is_cached(self):
+        missing_id = str(uuid.uuid4())
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                with self.assertRaises(ValueError):
+                    self.repo.get_by_id(missing_id)
+        self.assertEqual(self.cache.stats()["not_found_hits"], 2)
+
+    def test_lru_is_bounded(self):
+        others = [self.repo.create(Product(name=f"P{i}", price=1.0, stock=1)) for i in range(2)]
+        self.repo.get_by_id(self.product.id)
+        for other in others:
+            self.repo.get_by_id(other.id)
+        stats = self.cache.stats()
+        self.assertEqual((stats["size"], stats["evictions"]), (2, 1))
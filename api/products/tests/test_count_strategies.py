@@ -0,0 +1,67 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from django.urls import reverse
+from api.counting import paginate_queryset
+from api.users.models import UserModel
+from api.products.models import ProductModel
+
+
+class ProductCountStrategyTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = UserModel.objects.create_user(
+            email='user@example.com', password='password', first_name='U', last_name='T'
+        )
+        self.client.force_authenticate(user=self.user)
+        ProductModel.objects.bulk_create([
+            ProductModel(name=f'Caneca {i}' if i % 4 == 0 else f'Mochila {i}', price=Decimal('1.00'), stock=1)
+            for i in range(200)
+        ])
+        self.url = reverse('product-list')
+
+    def test_exact_is_default(self):
+        response = self.client.get(self.url, {'limit': 10})
+        self.assertEqual(response['X-Total-Count'], '200')
+        self.assertEqual(response['X-Count-Strategy'], 'exact')
+        self.assertEqual(response['X-Has-Next'], 'true')
+
+    def test_none_skips_count_query(self):
+        with self.assertNumQueries(1):
+            page = paginate_queryset(ProductModel.objects.all(), 0, 10, 'none')
+        self.assertIsNone(page.total_items)
+        self.assertTrue(page.has_next)
+
+        response = self.client.get(self.url, {'limit': 10, 'count': 'none'})
+        self.assertNotIn('X-Total-Count', response)
+        self.assertEqual(response['X-Count-Strategy'], 'none')
+
+    def test_short_page_counts_itself(self):
+        with self.assertNumQueries(1):
+            page = paginate_queryset(ProductModel.objects.all(), 195, 10, 'exact')
+        self.assertEqual(page.total_items, 200)
+        self.assertFalse(page.has_next)
+
+    def test_cached_reuses_total_per_filter(self):
+        queryset = ProductModel.objects.filter(name__icontains='caneca')
+        self.assertEqual(paginate_queryset(queryset, 0, 10, 'cached').total_items, 50)
+        ProductModel.objects.filter(name='Caneca 0').delete()
+        with self.assertNumQueries(1):
+            page = paginate_queryset(queryset, 0, 10, 'cached')
+        self.assertEqual((page.total_items, page.count_strategy), (50, 'cached'))
+        self.assertEqual(paginate_queryset(ProductModel.objects.all(), 0, 10, 'cached').total_items, 199)
+
+    @override_settings(LIST_COUNT={'SAMPLE_SIZE': 40})
+    def test_estimated_on_sqlite(self):
+        page = paginate_queryset(ProductModel.objects.filter(name__icontains='caneca'), 0, 10, 'estimated')
+        self.assertEqual(page.count_strategy, 'estimated')
+        self.assertGreaterEqual(page.total_items, 40)
+
+        small = paginate_queryset(ProductModel.objects.filter(name='Caneca 4'), 0, 0, 'estimated')
+        self.assertEqual((small.total_items, small.count_strategy), (1, 'exact'))
+
+    def test_invalid_strategy(self):
+        response = self.client.get(self.url, {'count': 'guess'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,64 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.urls import reverse
+from api.users.models import UserModel
+from api.products.models import ProductModel
+
+
+class ProductCursorPaginationTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserModel.objects.create_user(
+            email='user@example.com',
+            password='password',
+            first_name='User',
+            last_name='Test'
+        )
+        self.client.force_authenticate(user=self.user)
+        for index in range(7):
+            ProductModel.objects.create(
+                name=f'Product {index}',
+                price=10.00,
+                stock=5,
+                is_active=True
+            )
+
+    def _get(self, **params):
+        response = self.client.get(reverse('product-list'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_walks_forward_and_backward(self):
+        first = self._get(pagination='cursor', limit=3, include_total='true')
+        self.assertEqual([p['name'] for p in first['results']], ['Product 0', 'Product 1', 'Product 2'])
+        self.assertEqual(first['total_items'], 7)
+        self.assertIsNone(first['prev'])
+
+        second = self._get(cursor=first['next'], limit=3)
+        self.assertEqual([p['name'] for p in second['results']], ['Product 3', 'Product 4', 'Product 5'])
+        self.assertIsNone(second['total_items'])
+
+        last = self._get(cursor=second['next'], limit=3)
+        self.assertEqual([p['name'] for p in last['results']], ['Product 6'])
+        self.assertIsNone(last['next'])
+
+        back = self._get(cursor=last['prev'], limit=3)
+        self.assertEqual([p['name'] for p in back['results']], ['Product 3', 'Product 4', 'Product 5'])
+
+        start = self._get(cursor=back['prev'], limit=3)
+        self.assertEqual([p['name'] for p in start['results']], ['Product 0', 'Product 1', 'Product 2'])
+        self.assertIsNone(start['prev'])
+
+    def test_page_query_count_is_constant(self):
+        page = self._get(pagination='cursor', limit=2)
+        # Uma consulta para a página e uma para a versão do catálogo (ETag).
+        with self.assertNumQueries(2):
+            self.client.get(reverse('product-list'), {'cursor': page['next'], 'limit': 2})
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('product-list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_offset_mode_still_returns_list(self):
+        data = self._get()
+        self.assertEqual(len(data), 7)
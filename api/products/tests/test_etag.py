@@ -0,0 +1,111 @@
+from decimal import Decimal
+from unittest import mock
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+from api.users.models import UserModel
+from api.products.models import CatalogVersionModel, ProductModel
+from api.products.repository import DjangoProductRepository, get_product_repository
+
+
+class ProductConditionalGetTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = UserModel.objects.create_superuser(
+            email='admin@example.com',
+            password='password',
+            first_name='Admin',
+            last_name='Test'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        self.product = ProductModel.objects.create(name='Caneca', price=Decimal('9.90'), stock=10)
+        ProductModel.objects.create(name='Mochila', price=Decimal('120.00'), stock=2)
+        self.list_url = reverse('product-list')
+        self.detail_url = reverse('product-retrieve', kwargs={'pk': self.product.id})
+
+    def test_detail_returns_304_for_matching_etag(self):
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], f'"{self.product.id}-1-10"')
+        self.assertIn('max-age=', response['Cache-Control'])
+
+        # A cópia do cache responde; nenhuma consulta para o ETag.
+        with self.assertNumQueries(0):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_detail_etag_changes_after_stock_reservation(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        get_product_repository().reserve_stock(str(self.product.id), 1)
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['stock'], 9)
+        self.assertEqual(response['ETag'], f'"{self.product.id}-2-9"')
+
+    def test_detail_etag_follows_ledger_stock(self):
+        repo = get_product_repository()
+        repo.enable_stock_ledger(str(self.product.id))
+        etag = self.client.get(self.detail_url)['ETag']
+        repo.reserve_stock(str(self.product.id), 1)
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertTrue(response['ETag'].endswith('-9"'))
+
+    def test_list_returns_304_until_catalog_changes(self):
+        etag = self.client.get(self.list_url, {'limit': 5})['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url, {'limit': 5}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        other_params = self.client.get(self.list_url, {'limit': 6}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(other_params.status_code, 200)
+
+        self.client.put(self.detail_url, {
+            'name': 'Caneca', 'price': '8.90', 'stock': 10, 'is_active': True
+        }, format='json')
+        response = self.client.get(self.list_url, {'limit': 5}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_etag_changes_after_delete(self):
+        etag = self.client.get(self.list_url)['ETag']
+        ProductModel.objects.filter(name='Mochila').delete()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+
+    def test_live_stock_moves_the_list_etag_only_between_windows(self):
+        repo = DjangoProductRepository()
+        repo.enable_stock_ledger(str(self.product.id))
+        with mock.patch('api.products.repository.time.time', return_value=1000.0):
+            etag = self.client.get(self.list_url)['ETag']
+            repo.reserve_stock(str(self.product.id), 1)
+            self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with mock.patch('api.products.repository.time.time', return_value=1005.0):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['stock'], 9)
+
+    def test_stock_writes_do_not_touch_the_catalog_row(self):
+        repo = DjangoProductRepository()
+        repo.enable_stock_ledger(str(self.product.id))
+        deletes = CatalogVersionModel.objects.values_list('version', flat=True).get()
+
+        with CaptureQueriesContext(connection) as ctx:
+            repo.reserve_stock(str(self.product.id), 1)
+            repo.release_stock(str(self.product.id), 1)
+        self.assertFalse([q for q in ctx.captured_queries if 'products_catalogversionmodel' in q['sql']])
+        self.assertEqual(CatalogVersionModel.objects.values_list('version', flat=True).get(), deletes)
+
+        ProductModel.objects.filter(name='Mochila').delete()
+        self.assertEqual(CatalogVersionModel.objects.values_list('version', flat=True).get(), deletes + 1)
+
+    def test_catalog_version_is_one_query(self):
+        with self.assertNumQueries(1):
+            DjangoProductRepository().get_catalog_version()
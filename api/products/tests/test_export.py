@@ -0,0 +1,92 @@
+import gzip
+import json
+import os
+import tempfile
+from decimal import Decimal
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+from api.users.models import UserModel
+from api.products.ledger import InventoryLedger
+from api.products.models import InventoryMovementModel, ProductModel, ProductStockShardModel
+from api.products.repository import DjangoProductRepository
+from api.products.stock_shards import ShardedStockTotals
+
+
+class ProductExportTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = UserModel.objects.create_superuser(
+            email='admin@example.com',
+            password='password',
+            first_name='Admin',
+            last_name='Test'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        ProductModel.objects.bulk_create([
+            ProductModel(name=f'Produto {i}', price=Decimal('1.50'), stock=i, is_active=i % 2 == 0)
+            for i in range(2500)
+        ])
+        self.url = reverse('product-export')
+
+    def _rows(self, payload):
+        return [json.loads(line) for line in payload.decode().splitlines()]
+
+    def test_streams_every_product_as_ndjson(self):
+        response = self.client.get(self.url)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = self._rows(b''.join(response.streaming_content))
+        self.assertEqual(len(rows), 2500)
+        self.assertEqual(
+            set(rows[0]), {'id', 'name', 'price', 'stock', 'is_active', 'version'}
+        )
+        self.assertEqual(sum(not row['is_active'] for row in rows), 1250)
+
+    def test_gzip(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        rows = self._rows(gzip.decompress(b''.join(response.streaming_content)))
+        self.assertEqual(len(rows), 2500)
+
+    def test_requires_admin(self):
+        user = UserModel.objects.create_user(
+            email='user@example.com', password='password', first_name='U', last_name='T'
+        )
+        self.client.force_authenticate(user=user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_command_writes_gzip_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'products.ndjson.gz')
+            call_command('export_products', output=path, gzip=True, chunk_size=500, stderr=open(os.devnull, 'w'))
+            with gzip.open(path, 'rb') as exported:
+                self.assertEqual(len(self._rows(exported.read())), 2500)
+
+    def test_live_stock_is_read_once_per_chunk(self):
+        ids = list(ProductModel.objects.order_by('name').values_list('id', flat=True))
+        sharded, in_ledger = ids[:300], ids[300:600]
+        ProductModel.objects.filter(id__in=sharded).update(stock=0, stock_shards=2)
+        ProductStockShardModel.objects.bulk_create([
+            ProductStockShardModel(product_id=product_id, shard=shard, stock=5)
+            for product_id in sharded for shard in range(2)
+        ])
+        ProductModel.objects.filter(id__in=in_ledger).update(stock=7, stock_ledger=True)
+        InventoryMovementModel.objects.bulk_create([
+            InventoryMovementModel(product_id=product_id, kind=InventoryMovementModel.RESERVATION, quantity=-1)
+            for product_id in in_ledger
+        ])
+        repo = DjangoProductRepository(stock_totals=ShardedStockTotals(), ledger=InventoryLedger())
+
+        with CaptureQueriesContext(connection) as ctx:
+            stock = {product.id: product.stock for product in repo.iter_all(chunk_size=1000)}
+
+        # Produtos + partições e movimentações uma vez por bloco (3 blocos).
+        self.assertLessEqual(len(ctx.captured_queries), 1 + 2 * 3)
+        self.assertEqual({stock[str(product_id)] for product_id in sharded}, {10})
+        self.assertEqual({stock[str(product_id)] for product_id in in_ledger}, {6})
@@ -0,0 +1,95 @@
+import json
+from unittest import mock
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+from django.urls import reverse
+from api.users.models import UserModel
+from api.products import importer
+from api.products.models import ProductModel
+from api.transactions import relaxed_durability
+
+
+class ProductImportTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = UserModel.objects.create_superuser(
+            email='admin@example.com',
+            password='password',
+            first_name='Admin',
+            last_name='Test'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def _import(self, body, content_type):
+        return self.client.generic('POST', reverse('product-import'), body, content_type=content_type)
+
+    @override_settings(PRODUCT_IMPORT={'BATCH_SIZE': 50, 'WORKERS': 2, 'INLINE_MAX_BYTES': 0})
+    def test_csv_import_reports_row_errors_without_aborting(self):
+        rows = ["name,price,stock,is_active"]
+        rows += [f"Produto {i},{i}.50,{i},true" for i in range(120)]
+        rows.insert(10, "Sem preço,,3,true")
+        rows.insert(60, "Preço negativo,-1,3,true")
+        response = self._import("\n".join(rows) + "\n", 'text/csv')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 120)
+        self.assertEqual(response.data['failed'], 2)
+        self.assertEqual([error['line'] for error in response.data['errors']], [11, 61])
+        self.assertEqual(ProductModel.objects.count(), 120)
+
+    @override_settings(PRODUCT_IMPORT={'BATCH_SIZE': 2, 'WORKERS': 1, 'INLINE_MAX_BYTES': 0})
+    def test_jsonl_import(self):
+        lines = [
+            json.dumps({"name": "Caneca", "price": "9.90", "stock": 3}),
+            "{not json",
+            json.dumps({"name": "Mochila", "price": 120, "stock": 1, "is_active": False}),
+        ]
+        response = self._import("\n".join(lines), 'application/x-ndjson')
+
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['errors'], [{'line': 2, 'error': 'JSON inválido'}])
+        self.assertFalse(ProductModel.objects.get(name='Mochila').is_active)
+
+    @override_settings(PRODUCT_IMPORT={'BATCH_SIZE': 50, 'WORKERS': 2, 'INLINE_MAX_BYTES': 0})
+    def test_requests_share_the_worker_pool(self):
+        self._import("name,price,stock\nA,1,1\n", 'text/csv')
+        executor = importer.get_validation_pool(2)
+        with mock.patch.object(importer, 'ProcessPoolExecutor') as new_pool:
+            response = self._import("name,price,stock\nB,1,1\n", 'text/csv')
+        new_pool.assert_not_called()
+        self.assertEqual(response.data['created'], 1)
+        self.assertIs(importer.get_validation_pool(2), executor)
+
+    @override_settings(PRODUCT_IMPORT={'BATCH_SIZE': 50, 'WORKERS': 2, 'INLINE_MAX_BYTES': 1024})
+    def test_small_body_is_validated_inline(self):
+        with mock.patch.object(importer, 'get_validation_pool') as get_pool:
+            response = self._import("name,price,stock\nA,1,1\n", 'text/csv')
+        get_pool.assert_not_called()
+        self.assertEqual(response.data['created'], 1)
+
+    def test_rejects_unknown_content_type(self):
+        response = self._import('{}', 'application/json')
+        self.assertEqual(response.status_code, 415)
+
+    def test_requires_admin(self):
+        user = UserModel.objects.create_user(
+            email='user@example.com', password='password', first_name='U', last_name='T'
+        )
+        self.client.force_authenticate(user=user)
+        response = self._import("name,price,stock\nA,1,1\n", 'text/csv')
+        self.assertEqual(response.status_code, 403)
+
+
+class ImportDurabilityTestCase(TransactionTestCase):
+    def _synchronous(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            return cursor.fetchone()[0]
+
+    def test_only_the_import_relaxes_synchronous(self):
+        default = self._synchronous()
+        self.assertEqual(default, 2)
+        with relaxed_durability():
+            self.assertEqual(self._synchronous(), 1)
+        self.assertEqual(self._synchronous(), default)
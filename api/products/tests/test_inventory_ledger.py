@@ -0,0 +1,148 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from api.products.ledger import InventoryLedger, get_inventory_ledger
+from api.products.models import InventoryMovementModel, ProductModel
+from api.products.repository import DjangoProductRepository
+from core.domain.repositories.product_repository import ProductPatch
+
+
+class InventoryLedgerTestCase(TestCase):
+    def setUp(self):
+        self.ledger = InventoryLedger()
+        self.repo = DjangoProductRepository(ledger=self.ledger)
+        self.product = ProductModel.objects.create(name='Hot', price=Decimal('10.00'), stock=10)
+        self.product_id = str(self.product.id)
+        self.repo.enable_stock_ledger(self.product_id)
+
+    def movements(self):
+        return list(
+            InventoryMovementModel.objects.filter(product=self.product).order_by("id").values_list("kind", "quantity")
+        )
+
+    def test_writers_only_insert_movements(self):
+        self.product.refresh_from_db()
+        version = self.product.version
+
+        with self.assertNumQueries(1):
+            self.repo.reserve_stock(self.product_id, 3)
+        self.repo.release_stock(self.product_id, 1)
+
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.stock, self.product.version), (10, version))
+        self.assertEqual(self.movements(), [("opening", 10), ("reservation", -3), ("release", 1)])
+        # Leitura: snapshot + cauda.
+        self.assertEqual(self.repo.get_by_id(self.product_id).stock, 8)
+        self.assertEqual(self.repo.get_price_snapshots([self.product_id])[0].stock, 8)
+
+    def test_reserve_never_goes_below_zero(self):
+        self.repo.reserve_stock(self.product_id, 10)
+        with self.assertRaisesMessage(ValueError, "Estoque insuficiente"):
+            self.repo.reserve_stock(self.product_id, 1)
+        self.assertFalse(self.repo.get_by_id(self.product_id).is_available())
+
+    def test_reserve_without_local_hint_finds_the_ledger(self):
+        repo = DjangoProductRepository(ledger=InventoryLedger())
+        repo.reserve_stock(self.product_id, 2)
+        self.assertTrue(repo.ledger.is_known(self.product_id))
+        self.assertEqual(self.movements()[-1], ("reservation", -2))
+
+    def test_compaction_moves_the_tail_into_the_snapshot(self):
+        self.repo.reserve_stock(self.product_id, 4)
+        self.repo.release_stock(self.product_id, 1)
+
+        self.assertEqual(self.ledger.compact(), 1)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 7)
+        self.assertEqual(self.product.stock_ledger_position, InventoryMovementModel.objects.latest("id").id)
+        self.assertEqual(self.repo.get_by_id(self.product_id).stock, 7)
+        self.assertEqual(len(self.movements()), 3)
+        self.assertEqual(self.ledger.compact(), 0)
+
+    def test_update_and_bulk_update_record_adjustments(self):
+        product = self.repo.get_by_id(self.product_id)
+        product.stock = 15
+        self.assertEqual(self.repo.update(product).stock, 15)
+        self.repo.bulk_update([ProductPatch(id=self.product_id, stock=12, price=Decimal('11.00'))])
+
+        self.assertEqual(self.movements()[1:], [("adjustment", 5), ("adjustment", -3)])
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.stock, self.product.price), (10, Decimal('11.00')))
+        self.assertEqual(self.repo.get_by_id(self.product_id).stock, 12)
+
+    def test_disable_and_enable_again(self):
+        self.repo.reserve_stock(self.product_id, 4)
+        self.assertEqual(self.repo.disable_stock_ledger(self.product_id), 6)
+        self.repo.reserve_stock(self.product_id, 1)
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.stock, self.product.stock_ledger), (5, False))
+
+        self.repo.enable_stock_ledger(self.product_id)
+        # A abertura cobre a reserva feita fora do livro-razão.
+        self.assertEqual(self.movements()[-1], ("opening", -1))
+        self.assertEqual(list(self.ledger.iter_mismatches()), [])
+
+    def test_sharded_products_cannot_use_the_ledger(self):
+        other = ProductModel.objects.create(name='Outro', price=Decimal('1.00'), stock=4)
+        self.repo.enable_sharded_stock(str(other.id), 2)
+        with self.assertRaisesMessage(ValueError, "Produto com estoque particionado"):
+            self.repo.enable_stock_ledger(str(other.id))
+        with self.assertRaisesMessage(ValueError, "Produto com estoque em livro-razão"):
+            self.repo.enable_sharded_stock(self.product_id, 2)
+
+    def test_reconcile_command(self):
+        self.repo.reserve_stock(self.product_id, 2)
+        call_command("inventory_ledger", "compact", stdout=StringIO())
+        out = StringIO()
+        call_command("inventory_ledger", "reconcile", "--chunk-size", "1", stdout=out)
+        self.assertIn("conferem", out.getvalue())
+
+        ProductModel.objects.filter(id=self.product_id).update(stock=99)
+        out = StringIO()
+        with self.assertRaisesMessage(CommandError, "1 produtos"):
+            call_command("inventory_ledger", "reconcile", stdout=out)
+        self.assertIn(f"{self.product_id}: snapshot 99, livro-razão 8", out.getvalue())
+
+    def test_invalid_movements(self):
+        with self.assertRaisesMessage(ValueError, "Quantidade inválida"):
+            self.ledger.append(self.product_id, InventoryMovementModel.RECEIPT, -1)
+        with self.assertRaisesMessage(ValueError, "Tipo de movimentação inválido"):
+            self.ledger.append(self.product_id, "gift", 1)
+
+
+class ConcurrentInventoryLedgerTestCase(TransactionTestCase):
+    """Os checkouts simultâneos de `ConcurrentStockReservationTestCase` em modo livro-razão."""
+    checkouts = 300
+    initial_stock = 120
+
+    def test_no_oversell(self):
+        product = ProductModel.objects.create(name='Hot', price=10.00, stock=self.initial_stock)
+        DjangoProductRepository().enable_stock_ledger(str(product.id))
+        start = threading.Barrier(16)
+
+        def checkout(_):
+            try:
+                try:
+                    start.wait(timeout=5)
+                except threading.BrokenBarrierError:
+                    pass
+                DjangoProductRepository().reserve_stock(str(product.id), 1)
+                return True
+            except ValueError:
+                return False
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(checkout, range(self.checkouts)))
+
+        self.assertEqual(results.count(True), self.initial_stock)
+        self.assertEqual(get_inventory_ledger().compact(), 1)
+        product.refresh_from_db()
+        self.assertEqual(product.stock, 0)
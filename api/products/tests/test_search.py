@@ -0,0 +1,71 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from api.products.repository import DjangoProductRepository
+from api.products.search import InMemoryProductSearchBackend, SQLiteFTS5ProductSearchBackend
+from api.users.models import UserModel
+from core.domain.entities.product import Product
+
+
+class ProductSearchBackendTestCase(TestCase):
+    backends = [InMemoryProductSearchBackend, SQLiteFTS5ProductSearchBackend]
+
+    def _check_backend(self, backend):
+        repo = DjangoProductRepository(search_backend=backend)
+        cafe = repo.create(Product(name="Café Torrado Especial", price=30.0, stock=3))
+        repo.create(Product(name="Café Solúvel", price=12.0, stock=8))
+        repo.create(Product(name="Chá Verde", price=9.0, stock=8))
+
+        ids, total = backend.search("cafe", offset=0, limit=10)
+        self.assertEqual(total, 2)
+        self.assertIn(cafe.id, ids)
+
+        ids, total = backend.search("café especial", offset=0, limit=10)
+        self.assertEqual((ids, total), ([cafe.id], 1))
+
+        cafe.name = "Cappuccino"
+        repo.update(cafe)
+        self.assertEqual(backend.search("especial", offset=0, limit=10), ([], 0))
+        self.assertEqual(backend.search("cappuccino", offset=0, limit=10), ([cafe.id], 1))
+
+        repo.delete(cafe.id)
+        self.assertEqual(backend.search("cappuccino", offset=0, limit=10), ([], 0))
+
+    def test_backends_stay_in_sync(self):
+        for backend_class in self.backends:
+            with self.subTest(backend=backend_class.__name__):
+                self._check_backend(backend_class())
+
+    def test_in_memory_ranks_by_term_frequency(self):
+        backend = InMemoryProductSearchBackend()
+        repo = DjangoProductRepository(search_backend=backend)
+        single = repo.create(Product(name="Mesa", price=1.0, stock=1))
+        double = repo.create(Product(name="Mesa Mesa", price=1.0, stock=1))
+
+        ids, _ = backend.search("mesa", offset=0, limit=10)
+        self.assertEqual(ids, [double.id, single.id])
+
+
+class ProductSearchListViewTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=UserModel.objects.create_user(
+            email='user@example.com', password='password', first_name='U', last_name='T'
+        ))
+        repo = DjangoProductRepository()
+        for i in range(3):
+            repo.create(Product(name=f"Caneca {i}", price=1.0, stock=1))
+        self.url = reverse('product-list')
+
+    def test_count_strategy_is_honored_or_reported(self):
+        response = self.client.get(self.url, {'search': 'caneca', 'limit': 2, 'count': 'none'})
+        self.assertEqual(len(response.data), 2)
+        self.assertNotIn('X-Total-Count', response)
+        self.assertEqual((response['X-Count-Strategy'], response['X-Has-Next']), ('none', 'true'))
+
+        response = self.client.get(self.url, {'search': 'caneca', 'limit': 2, 'count': 'estimated'})
+        self.assertEqual((response['X-Total-Count'], response['X-Count-Strategy']), ('3', 'exact'))
+
+    def test_search_rejects_cursor_pagination(self):
+        response = self.client.get(self.url, {'search': 'caneca', 'pagination': 'cursor'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,69 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from api.products.models import ProductModel
+from api.products.repository import DjangoProductRepository
+
+
+class StockReservationTestCase(TestCase):
+    def setUp(self):
+        self.repo = DjangoProductRepository()
+        self.first = ProductModel.objects.create(name='A', price=10.00, stock=5)
+        self.second = ProductModel.objects.create(name='B', price=10.00, stock=1)
+
+    def test_reserve_and_release(self):
+        with self.assertNumQueries(1):
+            self.repo.reserve_stock(self.first.id, 3)
+        self.repo.release_stock(self.first.id, 1)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.stock, 3)
+
+    def test_reserve_insufficient_stock(self):
+        with self.assertRaisesMessage(ValueError, "Estoque insuficiente"):
+            self.repo.reserve_stock(self.second.id, 2)
+        self.second.refresh_from_db()
+        self.assertEqual(self.second.stock, 1)
+
+    def test_bulk_reservation_is_all_or_nothing(self):
+        with self.assertRaises(ValueError):
+            self.repo.reserve_stock_bulk({str(self.first.id): 2, str(self.second.id): 2})
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.stock, 5)
+
+        self.repo.reserve_stock_bulk({str(self.first.id): 2, str(self.second.id): 1})
+        self.assertEqual(
+            sorted(ProductModel.objects.values_list('stock', flat=True)), [0, 3]
+        )
+
+
+class ConcurrentStockReservationTestCase(TransactionTestCase):
+    """Centenas de checkouts simultâneos no mesmo produto."""
+    checkouts = 300
+    initial_stock = 120
+
+    def test_no_lost_updates_and_no_oversell(self):
+        product = ProductModel.objects.create(name='Hot', price=10.00, stock=self.initial_stock)
+        start = threading.Barrier(16)
+        results = []
+
+        def checkout(_):
+            try:
+                try:
+                    start.wait(timeout=5)
+                except threading.BrokenBarrierError:
+                    pass
+                DjangoProductRepository().reserve_stock(product.id, 1)
+                return True
+            except ValueError:
+                return False
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(checkout, range(self.checkouts)))
+
+        product.refresh_from_db()
+        self.assertEqual(results.count(True), self.initial_stock)
+        self.assertEqual(product.stock, 0)
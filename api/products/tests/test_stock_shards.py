@@ -0,0 +1,159 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.products.models import ProductModel, ProductStockShardModel
+from api.products.repository import DjangoProductRepository
+from api.products.stock_shards import ShardedStockTotals, get_sharded_stock_totals, split_stock
+from api.users.models import UserModel
+from core.domain.repositories.product_repository import ProductPatch
+
+
+def shard_stocks(product):
+    return list(
+        ProductStockShardModel.objects.filter(product=product).order_by("shard").values_list("stock", flat=True)
+    )
+
+
+class ShardedStockTestCase(TestCase):
+    def setUp(self):
+        get_sharded_stock_totals().clear()
+        self.repo = DjangoProductRepository(stock_totals=ShardedStockTotals(ttl=0))
+        self.product = ProductModel.objects.create(name='Hot', price=Decimal('10.00'), stock=10)
+        self.repo.enable_sharded_stock(str(self.product.id), 4)
+
+    def test_enable_splits_stock_and_reads_sum_the_shards(self):
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.stock, self.product.stock_shards), (0, 4))
+        self.assertEqual(shard_stocks(self.product), [3, 3, 2, 2])
+
+        product = self.repo.get_by_id(str(self.product.id))
+        self.assertEqual(product.stock, 10)
+        self.assertTrue(product.is_available())
+        self.assertEqual(self.repo.get_price_snapshots([str(self.product.id)])[0].stock, 10)
+        self.assertEqual([p.stock for p in self.repo.iter_all()], [10])
+
+    def test_reserve_and_release(self):
+        self.repo.reserve_stock(str(self.product.id), 2)
+        self.repo.release_stock(str(self.product.id), 1)
+        self.assertEqual(sum(shard_stocks(self.product)), 9)
+        self.assertEqual(self.repo.get_by_id(str(self.product.id)).stock, 9)
+
+    def test_reserve_takes_from_several_shards_when_needed(self):
+        self.repo.reserve_stock(str(self.product.id), 9)
+        self.assertEqual(sum(shard_stocks(self.product)), 1)
+
+        with self.assertRaisesMessage(ValueError, "Estoque insuficiente"):
+            self.repo.reserve_stock(str(self.product.id), 2)
+        self.repo.reserve_stock(str(self.product.id), 1)
+        self.assertFalse(self.repo.get_by_id(str(self.product.id)).is_available())
+
+    def test_reserve_on_known_sharded_product_is_one_update(self):
+        ProductStockShardModel.objects.filter(product=self.product).update(stock=5)
+        self.repo.get_by_id(str(self.product.id))
+        with self.assertNumQueries(1):
+            self.repo.reserve_stock(str(self.product.id), 1)
+
+    def test_update_and_bulk_update_write_the_shards(self):
+        product = self.repo.get_by_id(str(self.product.id))
+        product.stock = 7
+        self.assertEqual(self.repo.update(product).stock, 7)
+        self.assertEqual(shard_stocks(self.product), [2, 2, 2, 1])
+
+        self.repo.bulk_update([ProductPatch(id=str(self.product.id), stock=12)])
+        self.assertEqual(shard_stocks(self.product), [3, 3, 3, 3])
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 0)
+
+    def test_rebalance_evens_out_the_shards(self):
+        ProductStockShardModel.objects.filter(product=self.product, shard=0).update(stock=8)
+        ProductStockShardModel.objects.filter(product=self.product).exclude(shard=0).update(stock=0)
+
+        self.assertEqual(self.repo.rebalance_sharded_stock(), 1)
+        self.assertEqual(shard_stocks(self.product), [2, 2, 2, 2])
+        self.assertEqual(self.repo.rebalance_sharded_stock(), 0)
+
+    def test_disable_moves_stock_back(self):
+        self.repo.reserve_stock(str(self.product.id), 3)
+        call_command("stock_shards", "disable", str(self.product.id), stdout=StringIO())
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.stock, self.product.stock_shards), (7, 0))
+        self.assertFalse(ProductStockShardModel.objects.filter(product=self.product).exists())
+
+        self.repo.reserve_stock(str(self.product.id), 1)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 6)
+
+    def test_reservations_change_catalog_but_not_version(self):
+        with mock.patch('api.products.repository.time.time', return_value=1000.0):
+            catalog_version = self.repo.get_catalog_version()
+            self.repo.reserve_stock(str(self.product.id), 1)
+        # Nenhuma linha compartilhada é escrita: a versão muda com a janela de tempo.
+        with mock.patch('api.products.repository.time.time', return_value=1005.0):
+            self.assertNotEqual(self.repo.get_catalog_version(), catalog_version)
+        # A versão não acompanha o estoque particionado, então não há ETag de detalhe.
+        self.assertIsNone(self.repo.get_version(str(self.product.id)))
+
+    def test_split_stock(self):
+        self.assertEqual(split_stock(10, 4), [3, 3, 2, 2])
+        self.assertEqual(split_stock(0, 3), [0, 0, 0])
+
+
+class ShardedStockApiTestCase(TestCase):
+    def setUp(self):
+        get_sharded_stock_totals().clear()
+        self.client = APIClient()
+        admin = UserModel.objects.create_superuser(
+            email='admin@example.com', password='password', first_name='Admin', last_name='Test'
+        )
+        self.client.force_authenticate(user=admin)
+        self.product = ProductModel.objects.create(name='Hot', price=Decimal('10.00'), stock=6)
+        call_command("stock_shards", "enable", str(self.product.id), "--shards", "3", stdout=StringIO())
+
+    def test_list_and_detail_show_the_total(self):
+        response = self.client.get(reverse('product-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['stock'], 6)
+
+        response = self.client.get(reverse('product-retrieve', kwargs={'pk': self.product.id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['stock'], 6)
+
+
+class ConcurrentShardedStockTestCase(TransactionTestCase):
+    """Os mesmos checkouts simultâneos de `ConcurrentStockReservationTestCase`, em 8 partições."""
+    checkouts = 300
+    initial_stock = 120
+
+    def test_no_lost_updates_and_no_oversell(self):
+        get_sharded_stock_totals().clear()
+        product = ProductModel.objects.create(name='Hot', price=10.00, stock=self.initial_stock)
+        DjangoProductRepository().enable_sharded_stock(str(product.id), 8)
+        start = threading.Barrier(16)
+
+        def checkout(_):
+            try:
+                try:
+                    start.wait(timeout=5)
+                except threading.BrokenBarrierError:
+                    pass
+                DjangoProductRepository().reserve_stock(str(product.id), 1)
+                return True
+            except ValueError:
+                return False
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(checkout, range(self.checkouts)))
+
+        self.assertEqual(results.count(True), self.initial_stock)
+        self.assertEqual(sum(shard_stocks(product)), 0)
@@ -0,0 +1,86 @@
+from django.db import DatabaseError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from django.urls import reverse
+from api.users.models import UserModel
+from api.products.models import ProductModel
+from api.products.repository import DjangoProductRepository
+from api.products.suggest import product_name_index
+from core.domain.entities.product import Product
+
+
+class ProductSuggestTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserModel.objects.create_user(
+            email='user@example.com',
+            password='password',
+            first_name='User',
+            last_name='Test'
+        )
+        self.client.force_authenticate(user=self.user)
+        ProductModel.objects.create(name='Caneca Azul', price=10.00, stock=5, is_active=True)
+        ProductModel.objects.create(name='Canela em Pó', price=4.00, stock=5, is_active=True)
+        ProductModel.objects.create(name='Caneta Antiga', price=2.00, stock=5, is_active=False)
+        ProductModel.objects.create(name='Mochila', price=90.00, stock=5, is_active=True)
+        product_name_index.load()
+
+    def _suggest(self, q):
+        response = self.client.get(reverse('product-suggest'), {'q': q})
+        self.assertEqual(response.status_code, 200)
+        return [item['name'] for item in response.data]
+
+    def test_suggests_active_products_by_prefix(self):
+        self.assertEqual(self._suggest('can'), ['Caneca Azul', 'Canela em Pó'])
+        self.assertEqual(self._suggest('CANELA E'), ['Canela em Pó'])
+        self.assertEqual(self._suggest('x'), [])
+
+    def test_does_not_touch_database(self):
+        with self.assertNumQueries(0):
+            self.client.get(reverse('product-suggest'), {'q': 'can'})
+
+    def test_repository_updates_index_incrementally(self):
+        repo = DjangoProductRepository()
+        with self.captureOnCommitCallbacks(execute=True):
+            created = repo.create(Product(name='Canivete', price=35.0, stock=2))
+        self.assertIn('Canivete', self._suggest('cani'))
+
+        created.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            repo.update(created)
+        self.assertNotIn('Canivete', self._suggest('cani'))
+
+        created.is_active = True
+        created.name = 'Canivete Suíço'
+        with self.captureOnCommitCallbacks(execute=True):
+            repo.update(created)
+        self.assertEqual(self._suggest('canivete s'), ['Canivete Suíço'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            repo.delete(created.id)
+        self.assertEqual(self._suggest('canivete'), [])
+
+    def test_rolled_back_write_leaves_no_entry(self):
+        try:
+            with transaction.atomic():
+                DjangoProductRepository().create(Product(name='Canivete', price=35.0, stock=2))
+                raise DatabaseError('rollback')
+        except DatabaseError:
+            pass
+        self.assertEqual(self._suggest('cani'), [])
+
+    @override_settings(PRODUCT_SUGGEST={'REFRESH_SECONDS': 0})
+    def test_refresh_picks_up_writes_from_other_processes(self):
+        # Escritas diretas no banco, sem passar pelo índice deste processo.
+        knife = ProductModel.objects.create(name='Canivete', price=35.0, stock=2)
+        ProductModel.objects.filter(name='Caneca Azul').update(is_active=False, updated_at=timezone.now())
+        self.assertEqual(self._suggest('can'), ['Canela em Pó', 'Canivete'])
+
+        knife.delete()
+        self.assertEqual(self._suggest('can'), ['Canela em Pó'])
+
+    def test_refresh_waits_for_the_interval(self):
+        ProductModel.objects.create(name='Canivete', price=35.0, stock=2)
+        with self.assertNumQueries(0):
+            self.assertNotIn('Canivete', self._suggest('cani'))
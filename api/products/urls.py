@@ -1,8 +1,22 @@
 from django.urls import path
-from .views import ProductCreateAPIView, RetrieveUpdateDestroyAPIView, ProductListAPIView
+from .views import (
+    ProductCreateAPIView,
+    RetrieveUpdateDestroyAPIView,
+    ProductListAPIView,
+    ProductSuggestAPIView,
+    ProductCacheStatsAPIView,
+    ProductImportAPIView,
+    ProductBulkUpdateAPIView,
+    ProductExportAPIView,
+)
 
 urlpatterns = [
     path("products/", ProductCreateAPIView.as_view(), name="product-list-create"),
     path("products/list/", ProductListAPIView.as_view(), name="product-list"),
+    path("products/suggest/", ProductSuggestAPIView.as_view(), name="product-suggest"),
+    path("products/import/", ProductImportAPIView.as_view(), name="product-import"),
+    path("products/export/", ProductExportAPIView.as_view(), name="product-export"),
+    path("products/bulk/", ProductBulkUpdateAPIView.as_view(), name="product-bulk-update"),
+    path("products/cache/stats/", ProductCacheStatsAPIView.as_view(), name="product-cache-stats"),
     path("products/<uuid:pk>/", RetrieveUpdateDestroyAPIView.as_view(), name="product-retrieve"),
 ]
@@ -1,20 +1,101 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
-from .repository import DjangoProductRepository
-from .serializers import ProductSerializer, ProductReadSerializer
+from .repository import DjangoProductRepository, get_product_repository
+from .cache import get_product_detail_cache
+from .serializers import ProductSerializer, ProductReadSerializer, ProductPatchSerializer
+from .suggest import product_name_index
+from rest_framework.views import APIView
 from .models import ProductModel
 from  core.domain.entities.product import Product
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from core.interfaces.usecase.criar_produto_usecase import(
     CreateProductUseCase,
+    CreateProductRequest,
     ListProductsUseCase,
     GetProductByIdUseCase,
     GetProductByIdRequest,
-    ListProductsRequest
+    ListProductsRequest,
+    ImportProductsUseCase,
+    ImportProductsRequest,
+    BulkUpdateProductsUseCase,
+    BulkUpdateProductsRequest
 )
+from core.domain.repositories.product_repository import ProductPatch
+import codecs
+import hashlib
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from .importer import validated_batches
+from .export import gzip_stream, iter_ndjson
+from api.counting import set_pagination_headers
+from api.transactions import relaxed_durability
+
+
+MAX_PAGE_SIZE = 100
+MAX_BULK_UPDATE_ITEMS = 10_000
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _query_int(params, name, default, minimum=0, maximum=None):
+    try:
+        value = int(params.get(name, default))
+    except (TypeError, ValueError):
+        raise ValueError(f"Parâmetro '{name}' inválido")
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ValueError(f"Parâmetro '{name}' inválido")
+    return value
+
+
+def _query_bool(params, name):
+    return params.get(name, "").lower() in ("1", "true", "yes")
+
+
+def _list_etag(request, catalog_version):
+    """ETag forte da listagem: versão do catálogo + parâmetros da consulta."""
+    params = sorted((key, value) for key, values in request.query_params.lists() for value in values)
+    digest = hashlib.sha1(repr((catalog_version, request.path, params)).encode()).hexdigest()
+    return quote_etag(digest)
+
+
+def _not_modified(request, etag):
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return "*" in etags or etag in etags
+
+
+def _conditional_response(data, etag, status_code=status.HTTP_200_OK):
+    """Resposta com ETag e `Cache-Control` (privado: os endpoints exigem autenticação)."""
+    response = Response(data, status=status_code)
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, max_age=settings.PRODUCT_HTTP_MAX_AGE)
+    return response
 
 
 class ProductListAPIView(generics.ListAPIView):
+    """
+    Lista produtos.
+
+    Paginação por offset (padrão):
+        `?offset=&limit=&search=&count=` - retorna a lista de produtos. Com `search`,
+        os resultados vêm do backend de busca, ordenados por relevância.
+        `count` escolhe como o total é obtido (exact, cached, estimated ou none);
+        o total, `has_next` e a estratégia usada vêm nos cabeçalhos
+        `X-Total-Count`, `X-Has-Next` e `X-Count-Strategy`. Com `search`, o
+        total é exato ou, com `count=none`, omitido.
+
+    Paginação por cursor (keyset):
+        `?pagination=cursor&limit=` ou `?cursor=<cursor>` - retorna
+        `{"results", "next", "prev", "total_items"}`. O total só é calculado
+        com `include_total=true`, e o custo por página não cresce com a profundidade.
+        Não aceita `search` quando há backend de busca (400).
+
+    Respostas levam um ETag derivado da versão do catálogo e dos parâmetros;
+    com `If-None-Match` correspondente, retorna 304 sem consultar os produtos.
+    """
     queryset = ProductModel.objects.all()
     permission_classes = [IsAuthenticated]
     
@@ -24,15 +105,59 @@ class ProductListAPIView(generics.ListAPIView):
         return True
     
     def get(self, request):
+        params = request.query_params
         repo = DjangoProductRepository()
-        use_case = ListProductsUseCase(repo)
-        
-        request_data = ListProductsRequest(offset=0, limit=10)
-        response_data = use_case.execute(request_data)
+        etag = _list_etag(request, repo.get_catalog_version())
+        if _not_modified(request, etag):
+            return _conditional_response(None, etag, status.HTTP_304_NOT_MODIFIED)
+
+        try:
+            request_data = ListProductsRequest(
+                offset=_query_int(params, "offset", 0),
+                limit=_query_int(params, "limit", 10, minimum=1, maximum=MAX_PAGE_SIZE),
+                search_query=params.get("search") or None,
+                use_cursor=params.get("pagination") == "cursor",
+                cursor=params.get("cursor") or None,
+                include_total=_query_bool(params, "include_total"),
+                count_strategy=params.get("count") or None,
+            )
+            use_case = ListProductsUseCase(repo, search_backend=repo.search_backend)
+            response_data = use_case.execute(request_data)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         serializer = self.get_serializer(response_data.products, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        if not (request_data.use_cursor or request_data.cursor):
+            return set_pagination_headers(
+                _conditional_response(serializer.data, etag),
+                response_data.total_items, response_data.has_next, response_data.count_strategy,
+            )
+
+        return _conditional_response({
+            "results": serializer.data,
+            "next": response_data.next_cursor,
+            "prev": response_data.prev_cursor,
+            "total_items": response_data.total_items,
+        }, etag)
+
+
 
+class ProductSuggestAPIView(APIView):
+    """
+    Sugestões de nomes de produtos ativos para autocomplete.
+
+    `GET ?q=<prefixo>&limit=` - responde a partir do índice de prefixos em
+    memória (`ProductNameIndex`), sem consultar o banco.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            limit = _query_int(request.query_params, "limit", 10, minimum=1, maximum=50)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        suggestions = product_name_index.suggest(request.query_params.get("q", ""), limit=limit)
+        return Response(suggestions, status=status.HTTP_200_OK)
 
 
 class ProductCreateAPIView(generics.CreateAPIView):
@@ -49,10 +174,10 @@ class ProductCreateAPIView(generics.CreateAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        repo = DjangoProductRepository()
+        repo = get_product_repository()
         use_case = CreateProductUseCase(repo)
 
-        request_data = serializer.to_internal_value(request.data)
+        request_data = CreateProductRequest(**serializer.validated_data)
         domain_user = request.user.to_domain()
         product = use_case.execute(request_data, current_user=domain_user)
 
@@ -60,9 +185,126 @@ class ProductCreateAPIView(generics.CreateAPIView):
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
 
+IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+}
+
+
+class ProductImportAPIView(APIView):
+    """
+    Importação de produtos em lote a partir de um feed CSV ou JSONL.
+
+    O corpo da requisição é lido como stream (`Content-Type: text/csv` ou
+    `application/x-ndjson`), validado no pool de processos do worker (ou na
+    própria requisição, até `PRODUCT_IMPORT["INLINE_MAX_BYTES"]`) e gravado
+    em lotes de `PRODUCT_IMPORT["BATCH_SIZE"]` produtos. Linhas inválidas são
+    reportadas sem interromper a importação.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        content_type = request.content_type.split(";")[0].strip().lower()
+        fmt = IMPORT_CONTENT_TYPES.get(content_type)
+        if fmt is None:
+            return Response(
+                {"detail": "Content-Type deve ser text/csv ou application/x-ndjson"},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        if request.stream is None:
+            return Response({"detail": "Arquivo vazio"}, status=status.HTTP_400_BAD_REQUEST)
+
+        config = settings.PRODUCT_IMPORT
+        workers = config["WORKERS"]
+        content_length = request.META.get("CONTENT_LENGTH")
+        if content_length and int(content_length) <= config["INLINE_MAX_BYTES"]:
+            workers = 1
+        lines = codecs.iterdecode(request.stream, "utf-8-sig")
+        batches = validated_batches(lines, fmt, batch_size=config["BATCH_SIZE"], workers=workers)
+        use_case = ImportProductsUseCase(get_product_repository())
+        try:
+            with relaxed_durability():
+                result = use_case.execute(ImportProductsRequest(batches=batches), request.user.to_domain())
+        except UnicodeDecodeError:
+            return Response({"detail": "O arquivo deve estar em UTF-8"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "created": result.created,
+            "failed": result.failed,
+            "errors": [{"line": error.line, "error": error.error} for error in result.errors],
+            "errors_truncated": result.errors_truncated,
+        }, status=status.HTTP_200_OK)
+
+
+class ProductExportAPIView(APIView):
+    """
+    Exporta o catálogo inteiro em NDJSON (apenas admins).
+
+    A resposta é um `StreamingHttpResponse`: as linhas são lidas em blocos
+    de `EXPORT_CHUNK_SIZE` e escritas conforme são lidas. Com
+    `Accept-Encoding: gzip` ou `?gzip=true`, o fluxo é comprimido.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        chunks = iter_ndjson(get_product_repository().iter_all(chunk_size=EXPORT_CHUNK_SIZE))
+        compress = (_query_bool(request.query_params, "gzip")
+                    or "gzip" in request.headers.get("Accept-Encoding", ""))
+        if compress:
+            chunks = gzip_stream(chunks)
+
+        response = StreamingHttpResponse(chunks, content_type="application/x-ndjson")
+        response["Content-Disposition"] = 'attachment; filename="products.ndjson"'
+        if compress:
+            response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ["Accept-Encoding"])
+        return response
+
+
+class ProductBulkUpdateAPIView(APIView):
+    """
+    Atualização parcial de produtos em lote (apenas admins).
+
+    `PATCH` com uma lista de `{"id", "price"?, "stock"?, "is_active"?}` -
+    aplica tudo em uma transação, com um `UPDATE ... CASE` por lote de ids,
+    e retorna `{"updated", "missing"}`.
+    """
+    permission_classes = [IsAdminUser]
+
+    def patch(self, request):
+        if not isinstance(request.data, list):
+            return Response({"detail": "O corpo deve ser uma lista"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(request.data) > MAX_BULK_UPDATE_ITEMS:
+            return Response(
+                {"detail": f"No máximo {MAX_BULK_UPDATE_ITEMS} itens por requisição"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        serializer = ProductPatchSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        patches = [
+            ProductPatch(
+                id=str(item["id"]),
+                price=item.get("price"),
+                stock=item.get("stock"),
+                is_active=item.get("is_active"),
+            )
+            for item in serializer.validated_data
+        ]
+        use_case = BulkUpdateProductsUseCase(get_product_repository())
+        try:
+            result = use_case.execute(BulkUpdateProductsRequest(patches=patches), request.user.to_domain())
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"updated": result.updated, "missing": result.missing}, status=status.HTTP_200_OK)
+
+
 class RetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
     """ Retrive:
-            Busca um único produto por ID.
+            Busca um único produto por ID. A resposta leva o ETag `"<id>-<versão>"`;
+            com `If-None-Match` correspondente, retorna 304 sem montar o produto.
         
         Update:
             Atualiza um produto existente.
@@ -80,19 +322,25 @@ class RetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
 
     def retrieve(self, request, *args, **kwargs):
         product_id = kwargs['pk']
-        repo = DjangoProductRepository()
-        use_case = GetProductByIdUseCase(repo)
+        use_case = GetProductByIdUseCase(get_product_repository())
 
         try:
+            # Vem do cache de detalhe, que as escritas invalidam; nenhuma consulta
+            # extra só para o ETag.
             product = use_case.execute(GetProductByIdRequest(product_id=str(product_id)))
-            serializer = ProductReadSerializer(product)
-            return Response(serializer.data, status=status.HTTP_200_OK)
         except ValueError as e:
             return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
 
+        # O estoque entra no ETag: reservas em partições e no livro-razão não
+        # mudam a versão.
+        etag = quote_etag(f"{product_id}-{product.version}-{product.stock}")
+        if _not_modified(request, etag):
+            return _conditional_response(None, etag, status.HTTP_304_NOT_MODIFIED)
+        return _conditional_response(ProductReadSerializer(product).data, etag)
+
     def update(self, request, *args, **kwargs):
         product_id = kwargs['pk']
-        repo = DjangoProductRepository()
+        repo = get_product_repository()
 
         # Busca o produto atual.
         get_product_use_case = GetProductByIdUseCase(repo)
@@ -118,10 +366,18 @@ class RetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
 
     def destroy(self, request, *args, **kwargs):
         product_id = kwargs['pk']
-        repo = DjangoProductRepository()
+        repo = get_product_repository()
 
         try:
             repo.delete(product_id)
             return Response(status=status.HTTP_204_NO_CONTENT)
         except ValueError as e:
             return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+
+class ProductCacheStatsAPIView(APIView):
+    """Contadores de acerto/falha do cache de detalhes de produtos (apenas admins)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_product_detail_cache().stats(), status=status.HTTP_200_OK)
@@ -0,0 +1,61 @@
+"""
+Ajustes de transação para escritas específicas, sem mudar o padrão da conexão.
+
+No SQLite, `transaction.atomic()` abre com `BEGIN` (DEFERRED): o lock de
+escrita só é pedido na primeira escrita e, se outro processo escreveu no
+meio, a transação falha com "database is locked" sem respeitar o timeout.
+Quem lê para depois escrever (retirada de lotes da fila, sweeper, livro-razão)
+usa `immediate_atomic`; o resto continua com transações DEFERRED.
+
+`relaxed_durability` troca o fsync por commit pelo fsync no checkpoint
+apenas enquanto uma importação em lote roda na conexão.
+"""
+from contextlib import ExitStack, contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+@contextmanager
+def immediate_atomic(using: str | None = None):
+    """`transaction.atomic()` que, no SQLite, abre com `BEGIN IMMEDIATE`.
+
+    Dentro de outra transação vira um savepoint comum (o modo vale para a
+    transação externa). Nos outros bancos é apenas `atomic()`.
+    """
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    with ExitStack() as stack:
+        if connection.vendor == "sqlite" and not connection.in_atomic_block:
+            # `transaction_mode` é relido ao conectar: conecta antes de trocá-lo.
+            connection.ensure_connection()
+            previous, connection.transaction_mode = connection.transaction_mode, "IMMEDIATE"
+            try:
+                stack.enter_context(transaction.atomic(using=using))
+            finally:
+                connection.transaction_mode = previous
+        else:
+            stack.enter_context(transaction.atomic(using=using))
+        yield
+
+
+@contextmanager
+def relaxed_durability(using: str | None = None):
+    """No SQLite (WAL), `PRAGMA synchronous=NORMAL` só nesta conexão, durante o bloco.
+
+    Os commits do bloco deixam de esperar o fsync; numa queda do sistema,
+    os últimos podem se perder (o arquivo é reimportado), mas o banco não
+    corrompe. Ao sair, o nível anterior volta. Dentro de uma transação o
+    nível não pode mudar e o bloco roda como está.
+    """
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    if connection.vendor != "sqlite" or connection.in_atomic_block:
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        previous = cursor.fetchone()[0]
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA synchronous={int(previous)}")
@@ -0,0 +1,240 @@
+"""
+Tokens de acesso assinados (JWT), verificados no processo sem consultar o banco.
+
+Opt-in por `STATELESS_ACCESS_TOKENS["ENABLED"]`: o login passa a emitir o
+token de acesso como JWT (nenhuma linha em `AccessToken`); o refresh token
+continua sendo uma linha do oauth2_provider. `SignedAccessTokenAuthentication`
+vem antes de `OAuth2Authentication` e só trata tokens no formato JWT; tokens
+opacos continuam com o OAuth2. Com o modo desligado, JWTs são recusados.
+
+O usuário da requisição é montado a partir das claims (id, e-mail, nome,
+is_staff, is_superuser) no momento da emissão; mudanças nesses campos só
+valem para tokens novos, a não ser que os tokens do usuário sejam revogados.
+
+Revogação: `RevokedAccessTokenModel` (um `jti` ou todos os tokens de um
+usuário). Cada processo mantém a deny-list em memória e a atualiza a cada
+`DENYLIST_REFRESH_SECONDS` lendo só as revogações recentes; uma revogação
+feita em outro processo vale aqui em até esse intervalo.
+"""
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import jwt
+from django.conf import settings
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+from core.domain.entities.user import User
+from .models import RevokedAccessTokenModel, UserModel
+
+DEFAULT_STATELESS_ACCESS_TOKENS = {
+    "ENABLED": False,
+    "ALGORITHM": "HS256",
+    "SIGNING_KEY": None,
+    "ISSUER": "api",
+    "LIFETIME_SECONDS": None,
+    "DENYLIST_REFRESH_SECONDS": 5,
+    "DENYLIST_OVERLAP_SECONDS": 30,
+}
+
+
+def get_stateless_token_settings() -> dict:
+    """SIGNING_KEY None usa a SECRET_KEY; LIFETIME_SECONDS None usa o
+    ACCESS_TOKEN_EXPIRE_SECONDS do OAUTH2_PROVIDER."""
+    config = {**DEFAULT_STATELESS_ACCESS_TOKENS, **getattr(settings, "STATELESS_ACCESS_TOKENS", {})}
+    if config["SIGNING_KEY"] is None:
+        config["SIGNING_KEY"] = settings.SECRET_KEY
+    if config["LIFETIME_SECONDS"] is None:
+        config["LIFETIME_SECONDS"] = settings.OAUTH2_PROVIDER["ACCESS_TOKEN_EXPIRE_SECONDS"]
+    return config
+
+
+def stateless_tokens_enabled() -> bool:
+    return bool(get_stateless_token_settings()["ENABLED"])
+
+
+def issue_access_token(user: User) -> str:
+    """Assina um token de acesso para o usuário já carregado."""
+    config = get_stateless_token_settings()
+    now = time.time()
+    claims = {
+        "iss": config["ISSUER"],
+        "sub": str(user.id),
+        "jti": uuid.uuid4().hex,
+        # iat fracionário: revogar os tokens do usuário não pega um token
+        # emitido logo depois, no mesmo segundo.
+        "iat": round(now, 6),
+        "exp": int(now) + config["LIFETIME_SECONDS"],
+        "scope": "read write",
+        "email": user.email,
+        "given_name": user.first_name,
+        "family_name": user.last_name,
+        "staff": user.is_staff,
+        "superuser": user.is_superuser,
+    }
+    return jwt.encode(claims, config["SIGNING_KEY"], algorithm=config["ALGORITHM"])
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Raises:
+        ValueError: Se a assinatura, o emissor ou a validade não conferirem.
+    """
+    config = get_stateless_token_settings()
+    try:
+        return jwt.decode(
+            token, config["SIGNING_KEY"], algorithms=[config["ALGORITHM"]], issuer=config["ISSUER"],
+            options={"require": ["exp", "iat", "sub", "jti"]},
+        )
+    except jwt.InvalidTokenError:
+        raise ValueError("Token de acesso inválido ou expirado")
+
+
+class AccessTokenDenyList:
+    """
+    Revogações ainda vigentes, em memória: `jti -> exp` e
+    `user_id -> (revogado_em, exp)`, ambos em timestamps.
+
+    A primeira consulta carrega todas as linhas não expiradas; as seguintes,
+    no máximo uma a cada `refresh_seconds`, só as com `revoked_at` a partir
+    da consulta anterior menos `overlap_seconds` (margem para transações que
+    gravaram com um `revoked_at` anterior e fizeram commit depois). Entradas
+    expiradas saem da memória a cada atualização.
+    """
+    def __init__(self, refresh_seconds: float | None = None, overlap_seconds: float | None = None,
+                 clock=time.time):
+        config = get_stateless_token_settings()
+        self.refresh_seconds = config["DENYLIST_REFRESH_SECONDS"] if refresh_seconds is None else refresh_seconds
+        self.overlap_seconds = config["DENYLIST_OVERLAP_SECONDS"] if overlap_seconds is None else overlap_seconds
+        self._clock = clock
+        self._tokens: dict[str, float] = {}
+        self._users: dict[str, tuple[float, float]] = {}
+        self._watermark: float | None = None
+        self._refreshed_at: float | None = None
+        self._lock = threading.Lock()
+
+    def is_revoked(self, claims: dict) -> bool:
+        self._maybe_refresh()
+        if claims["jti"] in self._tokens:
+            return True
+        revoked = self._users.get(claims["sub"])
+        return revoked is not None and claims["iat"] <= revoked[0]
+
+    def _maybe_refresh(self) -> None:
+        now = self._clock()
+        if self._refreshed_at is not None and now - self._refreshed_at < self.refresh_seconds:
+            return
+        # Só a carga inicial espera; depois, quem não pegou o lock usa a lista atual.
+        if not self._lock.acquire(blocking=self._refreshed_at is None):
+            return
+        try:
+            if self._refreshed_at is None or now - self._refreshed_at >= self.refresh_seconds:
+                self.refresh()
+        finally:
+            self._lock.release()
+
+    def refresh(self) -> None:
+        now = self._clock()
+        rows = RevokedAccessTokenModel.objects.filter(expires_at__gt=_to_datetime(now))
+        if self._watermark is not None:
+            rows = rows.filter(revoked_at__gte=_to_datetime(self._watermark - self.overlap_seconds))
+        for jti, user_id, revoked_at, expires_at in rows.values_list("jti", "user_id", "revoked_at", "expires_at"):
+            self._add(jti, str(user_id), revoked_at.timestamp(), expires_at.timestamp())
+        self._prune(now)
+        self._watermark = self._refreshed_at = now
+
+    def _add(self, jti: str | None, user_id: str, revoked_at: float, expires_at: float) -> None:
+        if jti:
+            self._tokens[jti] = expires_at
+            return
+        current = self._users.get(user_id)
+        if current is None or current[0] < revoked_at:
+            self._users[user_id] = (revoked_at, max(expires_at, current[1] if current else 0))
+
+    def _prune(self, now: float) -> None:
+        self._tokens = {jti: exp for jti, exp in self._tokens.items() if exp > now}
+        self._users = {user_id: entry for user_id, entry in self._users.items() if entry[1] > now}
+
+    def revoke_token(self, claims: dict) -> None:
+        """Revoga um token; vale imediatamente neste processo."""
+        self._revoke(claims["sub"], claims["jti"], float(claims["exp"]))
+
+    def revoke_user(self, user_id: str) -> None:
+        """Revoga todos os tokens do usuário emitidos até agora."""
+        lifetime = get_stateless_token_settings()["LIFETIME_SECONDS"]
+        self._revoke(str(user_id), None, self._clock() + lifetime)
+
+    def _revoke(self, user_id: str, jti: str | None, expires_at: float) -> None:
+        now = self._clock()
+        RevokedAccessTokenModel.objects.create(
+            jti=jti, user_id=user_id, revoked_at=_to_datetime(now), expires_at=_to_datetime(expires_at),
+        )
+        # Revogações são raras: a limpeza das linhas vencidas vai junto.
+        RevokedAccessTokenModel.objects.filter(expires_at__lte=_to_datetime(now)).delete()
+        with self._lock:
+            self._add(jti, user_id, now, expires_at)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens, self._users = {}, {}
+            self._watermark = self._refreshed_at = None
+
+
+def _to_datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+_deny_list = AccessTokenDenyList()
+
+
+def get_access_token_deny_list() -> AccessTokenDenyList:
+    return _deny_list
+
+
+def revoke_user_access_tokens(user_id: str) -> None:
+    """Revoga os tokens assinados do usuário (troca de senha, remoção). Sem
+    efeito com o modo desligado: os tokens opacos ficam no banco."""
+    if stateless_tokens_enabled():
+        get_access_token_deny_list().revoke_user(user_id)
+
+
+class SignedAccessTokenAuthentication(BaseAuthentication):
+    """
+    Autenticação DRF para os tokens de acesso assinados.
+
+    Não consulta o banco (fora a atualização periódica da deny-list): o
+    usuário é montado a partir das claims e não deve ser salvo. Tokens que
+    não são JWT ficam para as próximas classes de autenticação.
+    """
+    www_authenticate_realm = "api"
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if len(auth) != 2 or auth[0].lower() != b"bearer" or auth[1].count(b".") != 2:
+            return None
+        if not stateless_tokens_enabled():
+            return None
+        try:
+            claims = decode_access_token(auth[1].decode("latin-1"))
+        except ValueError as e:
+            raise AuthenticationFailed(str(e))
+        if get_access_token_deny_list().is_revoked(claims):
+            raise AuthenticationFailed("Token de acesso revogado")
+        return _user_from_claims(claims), claims
+
+    def authenticate_header(self, request):
+        return f'Bearer realm="{self.www_authenticate_realm}"'
+
+
+def _user_from_claims(claims: dict) -> UserModel:
+    return UserModel(
+        id=uuid.UUID(claims["sub"]),
+        email=claims.get("email", ""),
+        first_name=claims.get("given_name", ""),
+        last_name=claims.get("family_name", ""),
+        is_active=True,
+        is_staff=bool(claims.get("staff")),
+        is_superuser=bool(claims.get("superuser")),
+    )
@@ -1,10 +1,13 @@
-from .serializers import LoginRequestSerializer, LoginResponseSerializer
+from .serializers import LoginRequestSerializer, LoginResponseSerializer, TokenRefreshRequestSerializer
 from core.interfaces.usecase.criar_user_usecase import(
     LoginUserRequest,
-    LoginUserUseCase
+    LoginUserUseCase,
+    RefreshTokenRequest,
+    RefreshTokenUseCase
 )
 from .repository import DjangoUserRepository
 from .auth_gateway_dj import DjangoAuthGateway
+from .hashing import PasswordHashingBusy
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -32,6 +35,7 @@ class LoginAPIView(APIView):
 
     Tratamento de erros:
     - Se as credenciais forem inválidas, retorna HTTP 401 com mensagem de erro.
+    - Se a fila do pool de hash de senhas estiver cheia, retorna HTTP 503 com `Retry-After`.
     """
     permission_classes = [AllowAny]
     def post(self, request, *args, **kwargs):
@@ -51,4 +55,40 @@ class LoginAPIView(APIView):
             response_serializer = LoginResponseSerializer(response_data)
             return Response(response_serializer.data, status=status.HTTP_200_OK)
         except ValueError as e:
-            return Response({"detail": str(e)}, status=status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+            return Response({"detail": str(e)}, status=status.HTTP_401_UNAUTHORIZED)
+        except PasswordHashingBusy as e:
+            return Response({"detail": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            headers={"Retry-After": str(e.retry_after)})
+
+
+class TokenRefreshAPIView(APIView):
+    """
+    API view que troca o refresh token por um novo par de tokens.
+
+    Método:
+    - POST: Recebe o `refresh_token` e retorna tokens novos no mesmo formato do login.
+
+    Permissões:
+    - Acesso liberado (AllowAny): o refresh token é a credencial.
+
+    Fluxo:
+    1. Valida os dados via `TokenRefreshRequestSerializer`.
+    2. Executa `RefreshTokenUseCase`, que via `DjangoAuthGateway.refresh_tokens`:
+    - Busca o refresh token (e o usuário) em uma consulta indexada.
+    - Apaga o par antigo e emite um novo, sem verificar senha.
+    3. Retorna os tokens com `LoginResponseSerializer`.
+
+    Tratamento de erros:
+    - Refresh token inexistente, expirado, já usado ou de usuário inativo: HTTP 401.
+    """
+    permission_classes = [AllowAny]
+    def post(self, request, *args, **kwargs):
+        serializer = TokenRefreshRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        use_case = RefreshTokenUseCase(DjangoAuthGateway())
+        try:
+            response_data = use_case.execute(RefreshTokenRequest(refresh_token=serializer.validated_data["refresh_token"]))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_401_UNAUTHORIZED)
+        return Response(LoginResponseSerializer(response_data).data, status=status.HTTP_200_OK)
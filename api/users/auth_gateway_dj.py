@@ -1,14 +1,91 @@
 import os
+import threading
+import time
 from datetime import timedelta
-from typing import Tuple
+from typing import Optional, Tuple
 
+from core.domain.entities.user import User
 from core.interfaces.usecase.gateways import AuthGateway
+from .access_tokens import issue_access_token, revoke_user_access_tokens, stateless_tokens_enabled
+from .hashing import get_password_hasher_pool, hash_password
 from .models import UserModel
+from .token_cache import invalidate_user_access_tokens
 from django.conf import settings
-from django.contrib.auth import authenticate, get_user_model
+from django.db import IntegrityError, connection, transaction
 from django.utils import timezone
 from oauth2_provider.models import AccessToken, Application, RefreshToken
 
+DEFAULT_APPLICATION_NAME = "Default Application"
+
+
+class OAuthApplicationCache:
+    """
+    Id das `Application` OAuth por nome, guardado no processo.
+
+    O id só entra no cache depois do commit da transação que o leu (ou
+    criou): uma application criada em uma transação desfeita nunca fica em
+    cache. Se a application for removida, o INSERT dos tokens falha por FK
+    e `DjangoAuthGateway.create_tokens` invalida a entrada e tenta de novo;
+    `refresh_tokens` usa `reresolve` quando não encontra o refresh token.
+    """
+    # Tokens desconhecidos ou forjados não podem forçar uma releitura por requisição.
+    RERESOLVE_INTERVAL_SECONDS = 5
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._reresolved_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get_id(self, name: str = DEFAULT_APPLICATION_NAME) -> int:
+        application_id = self._ids.get(name)
+        if application_id is not None:
+            return application_id
+        application, _ = Application.objects.get_or_create(
+            name=name,
+            defaults={"client_type": "public", "authorization_grant_type": "password"},
+        )
+        transaction.on_commit(lambda: self._remember(name, application.id))
+        return application.id
+
+    def _remember(self, name: str, application_id: int) -> None:
+        with self._lock:
+            self._ids[name] = application_id
+
+    def invalidate(self, name: str = DEFAULT_APPLICATION_NAME) -> None:
+        with self._lock:
+            self._ids.pop(name, None)
+
+    def reresolve(self, name: str = DEFAULT_APPLICATION_NAME) -> Optional[int]:
+        """Relê o id no banco (sem criar a application), no máximo uma vez a
+        cada `RERESOLVE_INTERVAL_SECONDS` por nome; None se não releu ou se
+        a application não existe.
+        """
+        now = time.monotonic()
+        with self._lock:
+            last = self._reresolved_at.get(name)
+            if last is not None and now - last < self.RERESOLVE_INTERVAL_SECONDS:
+                return None
+            self._reresolved_at[name] = now
+        application_id = Application.objects.filter(name=name).values_list("id", flat=True).first()
+        # Só lê uma linha existente: nada a desfazer num rollback.
+        if application_id is None:
+            self.invalidate(name)
+        else:
+            self._remember(name, application_id)
+        return application_id
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+            self._reresolved_at.clear()
+
+
+_application_cache = OAuthApplicationCache()
+
+
+def get_oauth_application_cache() -> OAuthApplicationCache:
+    return _application_cache
+
 
 class DjangoAuthGateway(AuthGateway):
     """
@@ -20,65 +97,171 @@ com os mecanismos de segurança e geração de tokens do Django e OAuth2.
     - Alterar senhas.
     - Gerar tokens de acesso e refresh para autenticação via OAuth2.
     """
+    def __init__(self, applications: OAuthApplicationCache | None = None):
+        self.applications = applications or get_oauth_application_cache()
+
     def check_password(self, user_id: str, password: str) -> bool:
         try:
             user = UserModel.objects.get(id=user_id)
-            result = user.check_password(password)
-            return result
         except UserModel.DoesNotExist:
             return False
+        return self.verify_password(user.to_domain(), password)
+
+    def verify_password(self, user: User, password: str) -> bool:
+        """Confere contra o hash já carregado, no pool de hash; só volta ao
+        banco para regravar o hash quando o hasher configurado mudou.
+
+        Raises:
+            PasswordHashingBusy: Se a fila do pool de hash estiver cheia.
+        """
+        valid, must_update = get_password_hasher_pool().verify(password, user.password)
+        if valid and must_update:
+            UserModel.objects.filter(id=user.id).update(password=hash_password(password))
+        return valid
     
     def set_password(self, user_id: str, new_password: str) -> None:
         try:
             user = UserModel.objects.get(id=user_id)
-            user.set_password(new_password)
-            user.save()
-        except:
+        except UserModel.DoesNotExist:
             raise ValueError("Usuário não encontrado")
+        user.password = hash_password(new_password)
+        user.save(update_fields=["password"])
+        revoke_user_access_tokens(user_id)
         
-    def create_tokens(self, user_id: str) -> Tuple[str, str]:
+    def create_tokens(self, user_id: str, user: Optional[User] = None) -> Tuple[str, str]:
+        """
+        Remove os tokens anteriores do usuário na application padrão e emite
+        um novo par, em uma transação. Sem `user`, só busca o usuário no
+        modo de tokens assinados (as claims precisam dos dados dele).
 
+        Com `STATELESS_ACCESS_TOKENS` ligado, o token de acesso é um JWT e
+        só o refresh token é gravado; JWTs emitidos antes continuam válidos
+        até expirar.
+        """
+        signed_user = None
+        if stateless_tokens_enabled():
+            try:
+                signed_user = user or UserModel.objects.get(id=user_id).to_domain()
+            except UserModel.DoesNotExist:
+                raise ValueError("Usuário não encontrado")
         try:
-            user = UserModel.objects.get(id=user_id)
-        except UserModel.DoesNotExist:
-            raise ValueError("Usuário não encontrado")
-            
-        try:
-            application = Application.objects.get(name="Default Application")
-        except Application.DoesNotExist:
-            application = Application.objects.create(
-                name="Default Application",
-                client_type ="public",
-                authorization_grant_type="password",
+            tokens = self._issue_tokens(user_id, signed_user)
+        except IntegrityError:
+            # Application em cache removida: resolve de novo pelo nome.
+            self.applications.invalidate()
+            try:
+                tokens = self._issue_tokens(user_id, signed_user)
+            except IntegrityError:
+                raise ValueError("Usuário não encontrado")
+        # Os tokens anteriores foram apagados: saem também do cache de validação.
+        invalidate_user_access_tokens(user_id)
+        return tokens
+
+    def _issue_tokens(self, user_id: str, signed_user: Optional[User]) -> Tuple[str, str]:
+        with transaction.atomic():
+            application_id = self.applications.get_id()
+            self._delete_tokens(user_id, application_id)
+            return self._insert_tokens(user_id, application_id, signed_user)
+
+    def _insert_tokens(self, user_id: str, application_id: int, signed_user: Optional[User]) -> Tuple[str, str]:
+        if signed_user is not None:
+            refresh_token = RefreshToken.objects.create(
+                user_id=user_id,
+                application_id=application_id,
+                token="refresh_token_" + str(user_id) + "_" + os.urandom(30).hex(),
             )
-                
-            #Remove quaisquer tokens para usuário e aplicação
-        AccessToken.objects.filter(user=user, application=application).delete()
-        RefreshToken.objects.filter(user=user, application=application).delete()
-            
+            return issue_access_token(signed_user), refresh_token.token
+
         access_token = AccessToken.objects.create(
-            user=user,
-            application=application,
+            user_id=user_id,
+            application_id=application_id,
             token="access_token_"
             + str(user_id)
             + "_"
             + os.urandom(30).hex(),  # Gerar um token real
             scope="read write",
             expires=timezone.now()
-            + timedelta(
-            seconds=settings.OAUTH2_PROVIDER["ACCESS_TOKEN_EXPIRE_SECONDS"]
-        ),
-    )
+            + timedelta(seconds=settings.OAUTH2_PROVIDER["ACCESS_TOKEN_EXPIRE_SECONDS"]),
+        )
 
         # Crie um novo refresh token
         refresh_token = RefreshToken.objects.create(
-            user=user,
-            application=application,
+            user_id=user_id,
+            application_id=application_id,
             token="refresh_token_"
             + str(user_id)
             + "_"
             + os.urandom(30).hex(),  # Gerar um token real
             access_token=access_token,
         )
-            
         return access_token.token, refresh_token.token
+
+    def refresh_tokens(self, refresh_token: str) -> Tuple[User, str, str]:
+        """
+        Uma leitura pelo índice de `token` (com o usuário no JOIN), o DELETE
+        do par antigo e o INSERT do novo, em uma transação; sem hash de senha.
+
+        O DELETE é pelo id lido e conferido: com duas requisições usando o
+        mesmo refresh token ao mesmo tempo, só uma recebe tokens novos.
+        Se o token não for encontrado, a application em cache pode ter sido
+        recriada: o id é relido (no máximo uma vez a cada
+        `RERESOLVE_INTERVAL_SECONDS`) e, se mudou, a leitura é refeita.
+        """
+        application_id = self.applications.get_id()
+        rotated = self._rotate_tokens(refresh_token, application_id)
+        if rotated is None:
+            current_id = self.applications.reresolve()
+            if current_id is not None and current_id != application_id:
+                rotated = self._rotate_tokens(refresh_token, current_id)
+        if rotated is None:
+            raise ValueError("Refresh token inválido ou expirado")
+        user, tokens = rotated
+        invalidate_user_access_tokens(user.id)
+        return (user, *tokens)
+
+    def _rotate_tokens(self, refresh_token: str, application_id: int) -> Optional[Tuple[User, Tuple[str, str]]]:
+        """Troca o par do refresh token na application; None se ele não existir (ou tiver expirado)."""
+        lifetime = settings.OAUTH2_PROVIDER.get("REFRESH_TOKEN_EXPIRE_SECONDS")
+        with transaction.atomic():
+            rows = RefreshToken.objects.select_related("user").filter(
+                token=refresh_token, revoked__isnull=True, application_id=application_id
+            )
+            if lifetime:
+                rows = rows.filter(created__gt=timezone.now() - timedelta(seconds=lifetime))
+            row = next(iter(rows[:1]), None)
+            if row is None:
+                return None
+            if not row.user.is_active:
+                raise ValueError("Refresh token inválido ou expirado")
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {connection.ops.quote_name(RefreshToken._meta.db_table)} WHERE id = %s", [row.id]
+                )
+                if cursor.rowcount != 1:
+                    raise ValueError("Refresh token inválido ou expirado")
+                if row.access_token_id is not None:
+                    cursor.execute(
+                        f"DELETE FROM {connection.ops.quote_name(AccessToken._meta.db_table)} WHERE id = %s",
+                        [row.access_token_id],
+                    )
+
+            user = row.user.to_domain()
+            return user, self._insert_tokens(user.id, application_id, user if stateless_tokens_enabled() else None)
+
+    @staticmethod
+    def _delete_tokens(user_id: str, application_id: int) -> None:
+        """
+        Um DELETE por tabela. O `delete()` do ORM buscaria os tokens e
+        anularia as referências cruzadas (`access_token`,
+        `source_refresh_token`) antes de apagar; essas FKs só apontam para
+        tokens do mesmo usuário e application, apagados juntos aqui, e são
+        conferidas no commit.
+        """
+        with connection.cursor() as cursor:
+            for model in (RefreshToken, AccessToken):
+                cursor.execute(
+                    f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)} "
+                    "WHERE user_id = %s AND application_id = %s",
+                    [UserModel._meta.pk.get_db_prep_value(user_id, connection), application_id],
+                )
@@ -0,0 +1,204 @@
+"""
+Hash de senhas fora da thread da requisição.
+
+O PBKDF2 (e os outros hashers do Django) custa centenas de milissegundos de
+CPU por senha; em uma rajada de logins, isso ocupava as threads do worker e
+atrasava as demais rotas. `PasswordHasherPool` roda `verify_password` e
+`make_password` em um pool de processos com fila limitada: acima dela, a
+chamada falha na hora com `PasswordHashingBusy` e as views respondem 503 com
+`Retry-After`, em vez de enfileirar sem limite.
+
+Cada processo web tem o seu pool. Para que o host não rode mais hashes que
+núcleos, os núcleos e `MAX_QUEUE` são divididos entre os `WEB_WORKERS`
+processos web (padrão: `WEB_CONCURRENCY`, a mesma variável do gunicorn).
+As métricas (fila, rejeições, latência com espera) também são por processo
+e ficam em `GET users/password-hashing/metrics/`, com o `pid` de quem respondeu.
+"""
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+DEFAULT_PASSWORD_HASHING = {
+    "ENABLED": True,
+    "WEB_WORKERS": None,
+    "WORKERS": None,
+    "MAX_QUEUE": 32,
+    "RETRY_AFTER_SECONDS": 1,
+    "LATENCY_SAMPLES": 1000,
+}
+
+
+def get_password_hashing_settings() -> dict:
+    """Configuração de um processo web.
+
+    WEB_WORKERS None lê `WEB_CONCURRENCY` (1 se ausente). WORKERS None usa a
+    parte do processo nos núcleos; `MAX_QUEUE` é o total do host, dividido
+    entre os processos (arredondado para cima). Com um único processo de hash
+    o pool só acrescenta a ida e volta entre processos (no host de 1 núcleo,
+    metade da vazão de login): ENABLED vira False e o hash roda na thread.
+    """
+    config = {**DEFAULT_PASSWORD_HASHING, **getattr(settings, "PASSWORD_HASHING", {})}
+    if config["WEB_WORKERS"] is None:
+        config["WEB_WORKERS"] = int(os.environ.get("WEB_CONCURRENCY") or 1)
+    web_workers = max(1, config["WEB_WORKERS"])
+    if config["WORKERS"] is None:
+        config["WORKERS"] = max(1, (os.cpu_count() or 1) // web_workers)
+    config["MAX_QUEUE"] = -(-config["MAX_QUEUE"] // web_workers)
+    if config["WORKERS"] <= 1:
+        config["ENABLED"] = False
+    return config
+
+
+class PasswordHashingBusy(Exception):
+    """Fila de hash cheia; `retry_after` em segundos."""
+    def __init__(self, retry_after: int):
+        super().__init__("Muitas autenticações em andamento; tente novamente em instantes")
+        self.retry_after = retry_after
+
+
+def _init_worker(password_hashers: list[str]) -> None:
+    # Processo novo (spawn): só os hashers precisam de configuração.
+    if not settings.configured:
+        settings.configure(PASSWORD_HASHERS=password_hashers)
+
+
+def _verify(password: str, encoded: str) -> tuple[bool, bool]:
+    return hashers.verify_password(password, encoded)
+
+
+def _make(password: str) -> str:
+    return hashers.make_password(password)
+
+
+class PasswordHasherPool:
+    """
+    Pool de processos para hash de senhas com controle de admissão.
+
+    No máximo `workers + max_queue` tarefas ficam pendentes; as demais são
+    recusadas com `PasswordHashingBusy`. Com `enabled=False`, o hash roda na
+    própria thread (sem admissão), como antes.
+    """
+    def __init__(self, workers: int, max_queue: int, retry_after: int = 1, latency_samples: int = 1000,
+                 enabled: bool = True):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.enabled = enabled
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self._latencies: deque[float] = deque(maxlen=latency_samples)
+        self._counters = dict.fromkeys(["completed", "rejected", "failed"], 0)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=get_context("spawn"),
+                    initializer=_init_worker, initargs=(list(settings.PASSWORD_HASHERS),),
+                )
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self.enabled:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._counters["rejected"] += 1
+            raise PasswordHashingBusy(self.retry_after)
+        started = time.perf_counter()
+        with self._lock:
+            self._pending += 1
+        try:
+            result = self._get_executor().submit(fn, *args).result()
+        except BrokenProcessPool:
+            # Worker morto: o próximo uso cria um pool novo.
+            self._reset()
+            with self._lock:
+                self._counters["failed"] += 1
+            raise PasswordHashingBusy(self.retry_after)
+        except Exception:
+            with self._lock:
+                self._counters["failed"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+        with self._lock:
+            self._counters["completed"] += 1
+            self._latencies.append((time.perf_counter() - started) * 1000)
+        return result
+
+    def verify(self, password: str, encoded: str) -> tuple[bool, bool]:
+        """(senha correta, hash precisa ser regravado com o hasher atual)"""
+        return self._run(_verify, password, encoded)
+
+    def make(self, password: str) -> str:
+        return self._run(_make, password)
+
+    def _reset(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        self._reset()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            pending = self._pending
+            latencies = sorted(self._latencies)
+            counters = dict(self._counters)
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 2) if latencies else None
+
+        return {
+            **counters,
+            "pid": os.getpid(),
+            "enabled": self.enabled,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": pending,
+            "queue_depth": max(0, pending - self.workers),
+            "latency_ms": {"p50": percentile(0.5), "p95": percentile(0.95),
+                           "max": round(latencies[-1], 2) if latencies else None},
+        }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_password_hasher_pool() -> PasswordHasherPool:
+    """Instância única por processo, configurada por `settings.PASSWORD_HASHING`."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = get_password_hashing_settings()
+                _pool = PasswordHasherPool(
+                    workers=config["WORKERS"],
+                    max_queue=config["MAX_QUEUE"],
+                    retry_after=config["RETRY_AFTER_SECONDS"],
+                    latency_samples=config["LATENCY_SAMPLES"],
+                    enabled=config["ENABLED"],
+                )
+    return _pool
+
+
+def hash_password(password: str | None) -> str:
+    """`make_password` pelo pool; sem senha, o hash inutilizável do Django (sem custo)."""
+    if password is None:
+        return hashers.make_password(None)
+    return get_password_hasher_pool().make(password)
@@ -0,0 +1,66 @@
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.users.auth_gateway_dj import DjangoAuthGateway
+from api.users.models import UserModel
+from api.users.repository import DjangoUserRepository
+from core.interfaces.usecase.criar_user_usecase import (
+    LoginUserRequest,
+    LoginUserUseCase,
+    RefreshTokenRequest,
+    RefreshTokenUseCase,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara o custo de renovar os tokens (token/refresh/) com o de um login completo. "
+        "Usa um usuário sintético, removido ao final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+
+    def handle(self, *args, **options):
+        password = uuid.uuid4().hex
+        user = UserModel.objects.create_user(
+            email=f"bench-refresh-{uuid.uuid4().hex[:8]}@example.com", password=password,
+            first_name="Bench", last_name="Refresh",
+        )
+        gateway = DjangoAuthGateway()
+        login = LoginUserUseCase(DjangoUserRepository(), gateway)
+        refresh = RefreshTokenUseCase(gateway)
+        try:
+            # Aquece o pool de hash e o cache da application.
+            refresh_token = login.execute(LoginUserRequest(email=user.email, password=password)).refresh_token
+
+            def do_login():
+                return login.execute(LoginUserRequest(email=user.email, password=password)).refresh_token
+
+            def do_refresh():
+                nonlocal refresh_token
+                refresh_token = refresh.execute(RefreshTokenRequest(refresh_token=refresh_token)).refresh_token
+
+            self.stdout.write(f"{'fluxo':>10} {'p50 (ms)':>10} {'p95 (ms)':>10} {'consultas':>10}")
+            for name, action in (("login", do_login), ("refresh", do_refresh)):
+                p50, p95, queries = self._measure(action, options["iterations"])
+                self.stdout.write(f"{name:>10} {p50:>10.2f} {p95:>10.2f} {queries:>10}")
+                if name == "login":
+                    refresh_token = do_login()
+        finally:
+            user.delete()
+
+    def _measure(self, action, iterations):
+        timings = []
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                action()
+                timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        return statistics.median(timings), timings[int(len(timings) * 0.95) - 1], len(queries)
@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 import uuid
 from core.domain.entities.user import User as DomainUser
+from .hashing import hash_password
 # Create your models here.
 
 class UserManager(BaseUserManager):
@@ -25,12 +26,14 @@ class UserManager(BaseUserManager):
 
         Levanta:
         - ValueError: Se o e-mail não for fornecido.
+        - PasswordHashingBusy: Se a fila do pool de hash estiver cheia.
         """
         if not email:
             raise ValueError("Email é obrigatrio")
         email = self.normalize_email(email)
         user = self.model(email=email, **extra_fields)
-        user.set_password(password)
+        # Hash no pool de processos (api.users.hashing), fora da thread da requisição.
+        user.password = hash_password(password)
         user.save(using=self._db)
         return user
     
@@ -121,3 +124,27 @@ class UserModel(AbstractBaseUser, PermissionsMixin):
         """
         verbose_name = "Usuário"
         verbose_name_plural = "Usuários"
+
+
+class RevokedAccessTokenModel(models.Model):
+    """
+    Revogação de tokens de acesso assinados (api.users.access_tokens).
+
+    Com `jti`, revoga um token; sem ele, todos os tokens do usuário emitidos
+    até `revoked_at`. A linha só é necessária até `expires_at`: depois disso
+    nenhum token coberto por ela ainda é aceito.
+
+    Campos:
+    - jti (str | None): Identificador do token revogado.
+    - user_id (UUID): Dono do(s) token(s); sem FK, a revogação sobrevive à remoção do usuário.
+    - revoked_at (datetime): Momento da revogação (a deny-list é atualizada por ele).
+    - expires_at (datetime): Validade máxima dos tokens cobertos.
+    """
+    jti = models.CharField(max_length=64, null=True, blank=True)
+    user_id = models.UUIDField()
+    revoked_at = models.DateTimeField(db_index=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = "Token revogado"
+        verbose_name_plural = "Tokens revogados"
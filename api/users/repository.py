@@ -1,7 +1,13 @@
+from dataclasses import replace
 from core.domain.entities.user import User
+from core.domain.repositories.pagination import OffsetPage
 from core.domain.repositories.user_repository import UserRepository
+from api.users.access_tokens import revoke_user_access_tokens
+from api.users.hashing import hash_password
 from api.users.models import UserModel
+from api.users.token_cache import invalidate_user_access_tokens
 from django.db.models import Q
+from api.counting import paginate_queryset
 
 class DjangoUserRepository(UserRepository):
     """
@@ -12,7 +18,7 @@ class DjangoUserRepository(UserRepository):
     def create(self, user: User) -> User:
         """create(user: User) -> User
         Cria um novo usuário no banco de dados. Verifica se o e-mail já está em uso.
-        A senha é criptografada com `set_password()` antes de salvar."""
+        A senha é criptografada no pool de hash (`hash_password`) antes do INSERT."""
         if UserModel.objects.filter(email=user.email).exists():
             raise ValueError("Email já está em uso")
 
@@ -21,12 +27,11 @@ class DjangoUserRepository(UserRepository):
             email=user.email,
             first_name=user.first_name,
             last_name=user.last_name,
+            password=hash_password(user.password),
             is_active=user.is_active,
             is_staff=user.is_staff,
             is_superuser=user.is_superuser
         )
-        model.set_password(user.password) 
-        model.save()
         return model.to_domain()
 
     def delete(self, user_id: str) -> None:
@@ -36,16 +41,24 @@ class DjangoUserRepository(UserRepository):
         delete_count, _ = UserModel.objects.filter(id= user_id).delete()
         if delete_count == 0:
             raise ValueError("Usúario não encontrado")
+        revoke_user_access_tokens(user_id)
+        invalidate_user_access_tokens(user_id)
     
     def update(self, user:User ) ->User:
         """ update(user: User) -> User
         Atualiza os dados de um usuário existente (exceto a senha). Retorna a entidade atualizada.
+        Ao desativar o usuário, os tokens dele deixam de valer (cache de validação e tokens assinados).
         """
         model = UserModel.objects.get(id=user.id)
+        deactivated = model.is_active and not user.is_active
         model.email = user.email
         model.first_name = user.first_name
         model.last_name = user.last_name
+        model.is_active = user.is_active
         model.save()
+        if deactivated:
+            revoke_user_access_tokens(user.id)
+            invalidate_user_access_tokens(user.id)
         return model.to_domain()                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                
     
     def get_all(self) -> list[User]:
@@ -66,6 +79,12 @@ class DjangoUserRepository(UserRepository):
         except:
             raise ValueError("Usuário não encontrado com este Id")
         
+    def get_by_ids(self, user_ids: list[str]) -> list[User]:
+        """get_by_ids(user_ids: list[str]) -> list[User]
+        Busca vários usuários com uma única consulta. Ids inexistentes são ignorados.
+        """
+        return [user_model.to_domain() for user_model in UserModel.objects.filter(id__in=user_ids)]
+
     def get_by_email(self, user_email: str) -> User:
         """get_by_email(user_email: str) -> User
         Busca um usuário pelo e-mail. Lança erro se não for encontrado.
@@ -76,10 +95,11 @@ class DjangoUserRepository(UserRepository):
         except UserModel.DoesNotExist:
             raise ValueError("Usuário não encontrado com este e-mail")
 
-    def get_all_paginated_filtered(self, offset: int, limit: int, search_query: str = "") -> tuple[list[User], int]:
-        """get_all_paginated_filtered(offset: int, limit: int, search_query: str = "") -> tuple[list[User], int]
-        Retorna uma lista paginada e filtrada de usuários com base em nome ou e-mail.
-        Também retorna o total de itens encontrados.
+    def get_all_paginated_filtered(self, offset: int, limit: int, search_query: str = "",
+                                   count_strategy: str | None = None) -> OffsetPage[User]:
+        """get_all_paginated_filtered(offset: int, limit: int, search_query: str = "", count_strategy: str | None = None) -> OffsetPage[User]
+        Retorna uma página filtrada de usuários com base em nome ou e-mail.
+        O total é obtido conforme `count_strategy` (ver `api.counting`).
         """
         queryset = UserModel.objects.all()
 
@@ -90,8 +110,5 @@ class DjangoUserRepository(UserRepository):
                 Q(last_name__icontains=search_query)
         )
 
-        total_items = queryset.count()
-        paginated = queryset[offset:offset + limit]
-        users = [user.to_domain() for user in paginated]
-
-        return users, total_items
\ No newline at end of file
+        page = paginate_queryset(queryset, offset, limit, count_strategy)
+        return replace(page, items=[user.to_domain() for user in page.items])
@@ -118,6 +118,15 @@ class LoginRequestSerializer(serializers.Serializer):
     def validate(self, attrs: LoginUserRequest) -> LoginUserResponse:
         return  attrs
 
+class TokenRefreshRequestSerializer(serializers.Serializer):
+    """
+    Serializer utilizado para renovar os tokens.
+
+    Campos:
+    - refresh_token: Refresh token recebido no login ou na última renovação (obrigatório).
+    """
+    refresh_token = serializers.CharField(write_only=True, required=True)
+
 class LoginResponseSerializer(serializers.Serializer):
     """
     Serializer utilizado para retornar os dados de autenticação bem-sucedida.
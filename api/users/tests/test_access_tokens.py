@@ -0,0 +1,128 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from oauth2_provider.models import AccessToken, RefreshToken
+from rest_framework.test import APIClient
+
+from api.users.access_tokens import AccessTokenDenyList, decode_access_token, get_access_token_deny_list
+from api.users.auth_gateway_dj import DjangoAuthGateway
+from api.users.models import RevokedAccessTokenModel, UserModel
+
+
+@override_settings(STATELESS_ACCESS_TOKENS={"ENABLED": True})
+class SignedAccessTokenTestCase(TestCase):
+    def setUp(self):
+        get_access_token_deny_list().clear()
+        self.addCleanup(get_access_token_deny_list().clear)
+        self.client = APIClient()
+        self.user = UserModel.objects.create_user(
+            email='user@example.com', password='password', first_name='User', last_name='Test'
+        )
+        self.admin_user = UserModel.objects.create_superuser(
+            email='admin@example.com', password='password', first_name='Admin', last_name='Test'
+        )
+
+    def _login(self, email='user@example.com'):
+        self.client.credentials()
+        response = self.client.post(reverse('login'), {'email': email, 'password': 'password'})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def _get(self, token, url_name='order-list-mine'):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return self.client.get(reverse(url_name))
+
+    def test_login_issues_jwt_and_stores_only_the_refresh_token(self):
+        data = self._login()
+
+        claims = decode_access_token(data['access_token'])
+        self.assertEqual((claims['sub'], claims['email'], claims['staff']), (str(self.user.id), self.user.email, False))
+        self.assertFalse(AccessToken.objects.exists())
+        refresh = RefreshToken.objects.get(user=self.user)
+        self.assertEqual((refresh.token, refresh.access_token), (data['refresh_token'], None))
+
+    def test_authenticated_request_does_not_query_users_or_tokens(self):
+        token = self._login()['access_token']
+        self.assertEqual(self._get(token).status_code, 200)  # carga inicial da deny-list
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self._get(token)
+
+        self.assertEqual(response.status_code, 200)
+        # Só as consultas da própria listagem (contagem e página, com o JOIN do dono).
+        self.assertEqual(len(ctx.captured_queries), 2)
+        sql = " ".join(query['sql'] for query in ctx.captured_queries)
+        self.assertNotIn('FROM "users_usermodel"', sql)
+        self.assertNotIn('oauth2_provider_accesstoken', sql)
+        self.assertNotIn('users_revokedaccesstokenmodel', sql)
+
+    def test_admin_claims_grant_admin_endpoints(self):
+        self.assertEqual(self._get(self._login()['access_token'], 'user-list-create').status_code, 403)
+        self.assertEqual(self._get(self._login('admin@example.com')['access_token'], 'user-list-create').status_code, 200)
+
+    def test_rejects_tampered_and_expired_tokens(self):
+        token = self._login()['access_token']
+        header, payload, signature = token.split('.')
+        self.assertEqual(self._get(f"{header}.{payload}.{signature[::-1]}").status_code, 401)
+
+        expired = jwt.encode(
+            {**decode_access_token(token), 'exp': int(time.time()) - 1}, 'secret-errado', algorithm='HS256'
+        )
+        self.assertEqual(self._get(expired).status_code, 401)
+
+    def test_password_change_revokes_previous_tokens(self):
+        token = self._login()['access_token']
+        self.assertEqual(self._get(token).status_code, 200)
+
+        DjangoAuthGateway().set_password(str(self.user.id), 'password')
+
+        self.assertEqual(self._get(token).status_code, 401)
+        self.assertEqual(RevokedAccessTokenModel.objects.get().user_id, self.user.id)
+        # Token emitido depois da revogação continua valendo.
+        self.assertEqual(self._get(self._login()['access_token']).status_code, 200)
+
+    def test_revocations_from_other_processes_are_loaded_incrementally(self):
+        now = [1_000_000.0]
+        deny_list = AccessTokenDenyList(refresh_seconds=5, overlap_seconds=30, clock=lambda: now[0])
+        claims = decode_access_token(self._login()['access_token'])
+        self.assertFalse(deny_list.is_revoked(claims))
+
+        # Outro processo revoga o token.
+        other = AccessTokenDenyList(clock=lambda: now[0])
+        other.revoke_token(claims)
+
+        self.assertFalse(deny_list.is_revoked(claims))  # ainda dentro do intervalo
+        now[0] += 5
+        with self.assertNumQueries(1):
+            self.assertTrue(deny_list.is_revoked(claims))
+        with self.assertNumQueries(0):
+            self.assertTrue(deny_list.is_revoked(claims))
+
+        # Depois de expirar, a entrada sai da memória.
+        now[0] = claims['exp'] + 1
+        deny_list.refresh()
+        self.assertEqual(deny_list._tokens, {})
+
+    def test_expired_revocations_are_pruned(self):
+        RevokedAccessTokenModel.objects.create(
+            jti='antigo', user_id=self.user.id,
+            revoked_at=datetime.now(timezone.utc) - timedelta(days=2),
+            expires_at=datetime.now(timezone.utc) - timedelta(days=1),
+        )
+        get_access_token_deny_list().revoke_user(str(self.user.id))
+        self.assertEqual(list(RevokedAccessTokenModel.objects.values_list('jti', flat=True)), [None])
+
+    @override_settings(STATELESS_ACCESS_TOKENS={"ENABLED": False})
+    def test_disabled_mode_rejects_jwts_and_issues_opaque_tokens(self):
+        with override_settings(STATELESS_ACCESS_TOKENS={"ENABLED": True}):
+            token = self._login()['access_token']
+        self.assertEqual(self._get(token).status_code, 401)
+
+        opaque = self._login()['access_token']
+        self.assertTrue(AccessToken.objects.filter(token=opaque).exists())
+        self.assertEqual(self._get(opaque).status_code, 200)
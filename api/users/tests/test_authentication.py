@@ -1,6 +1,9 @@
 from django.test import TestCase
 from rest_framework.test import APIClient
 from django.urls import reverse
+from oauth2_provider.models import AccessToken, Application, RefreshToken
+
+from api.users.auth_gateway_dj import get_oauth_application_cache
 from api.users.models import UserModel
 
 class AuthenticationTestCase(TestCase):
@@ -38,3 +41,29 @@ class AuthenticationTestCase(TestCase):
         }
         response = self.client.post(reverse('login'), data)
         self.assertEqual(response.status_code, 401)
+
+    def test_login_query_budget(self):
+        data = {'email': 'user@example.com', 'password': 'password'}
+        get_oauth_application_cache().clear()
+        self.addCleanup(get_oauth_application_cache().clear)
+        # Primeiro login: cria a application padrão, que entra no cache no commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.client.post(reverse('login'), data)
+
+        # Usuário (1 SELECT), tokens anteriores (2 DELETE), novos tokens
+        # (2 INSERT) e o savepoint da transação (2).
+        with self.assertNumQueries(7):
+            response = self.client.post(reverse('login'), data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Application.objects.count(), 1)
+        self.assertEqual(
+            list(AccessToken.objects.filter(user=self.user).values_list('token', flat=True)),
+            [response.data['access_token']],
+        )
+        refresh = RefreshToken.objects.get(user=self.user)
+        self.assertEqual(refresh.access_token.token, response.data['access_token'])
+        self.assertNotEqual(first.data['access_token'], response.data['access_token'])
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access_token']}")
+        self.assertEqual(self.client.get(reverse('order-list-mine')).status_code, 200)
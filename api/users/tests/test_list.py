@@ -0,0 +1,33 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.urls import reverse
+from api.users.models import UserModel
+
+
+class UserListCountStrategyTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = UserModel.objects.create_superuser(
+            email='admin@example.com',
+            password='password',
+            first_name='Admin',
+            last_name='Test'
+        )
+        for i in range(12):
+            UserModel.objects.create(email=f'user{i}@example.com', first_name='User', last_name=str(i))
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_exact_total_in_headers(self):
+        response = self.client.get(reverse('user-list-create'))
+        self.assertEqual(len(response.data), 10)
+        self.assertEqual(response['X-Total-Count'], '13')
+        self.assertEqual(response['X-Count-Strategy'], 'exact')
+
+    def test_none_reports_only_has_next(self):
+        response = self.client.get(reverse('user-list-create'), {'count': 'none'})
+        self.assertNotIn('X-Total-Count', response)
+        self.assertEqual(response['X-Has-Next'], 'true')
+
+    def test_invalid_strategy(self):
+        response = self.client.get(reverse('user-list-create'), {'count': 'guess'})
+        self.assertEqual(response.status_code, 400)
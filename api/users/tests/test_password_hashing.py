@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.contrib.auth.hashers import check_password
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.users import hashing
+from api.users.hashing import PasswordHasherPool, PasswordHashingBusy, get_password_hashing_settings
+from api.users.models import UserModel
+
+
+class PasswordHashingAPITestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = UserModel.objects.create_superuser(
+            email='admin@example.com', password='password', first_name='Admin', last_name='Test'
+        )
+        # Pool sem vagas: um hash "em andamento" ocupa o único worker e a fila é zero.
+        self.full_pool = PasswordHasherPool(workers=1, max_queue=0, retry_after=2)
+        self.full_pool._slots.acquire()
+
+    def test_login_returns_503_when_queue_is_full(self):
+        with mock.patch.object(hashing, '_pool', self.full_pool):
+            response = self.client.post(reverse('login'), {'email': 'admin@example.com', 'password': 'password'})
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '2')
+        self.assertEqual(self.full_pool.metrics()['rejected'], 1)
+
+    def test_user_creation_returns_503_when_queue_is_full(self):
+        self.client.force_authenticate(user=self.admin_user)
+        with mock.patch.object(hashing, '_pool', self.full_pool):
+            response = self.client.post(reverse('user-list-create'), {
+                'email': 'new@example.com', 'first_name': 'New', 'last_name': 'User', 'password': 'secret123',
+            })
+
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(UserModel.objects.filter(email='new@example.com').exists())
+
+    def test_metrics_endpoint(self):
+        # Pool ligado mesmo num host de um núcleo (lá o padrão é o hash na thread).
+        pool = PasswordHasherPool(workers=2, max_queue=1)
+        self.addCleanup(pool.shutdown)
+        url = reverse('password-hashing-metrics')
+        with mock.patch.object(hashing, '_pool', pool):
+            self.client.post(reverse('login'), {'email': 'admin@example.com', 'password': 'password'})
+            self.assertEqual(self.client.get(url).status_code, 401)
+
+            self.client.force_authenticate(user=self.admin_user)
+            metrics = self.client.get(url).data
+        self.assertEqual(metrics['queue_depth'], 0)
+        self.assertGreaterEqual(metrics['completed'], 1)
+        self.assertIsNotNone(metrics['latency_ms']['p50'])
+
+
+class PasswordHasherPoolTestCase(SimpleTestCase):
+    def test_hashes_in_worker_process(self):
+        pool = PasswordHasherPool(workers=1, max_queue=1)
+        self.addCleanup(pool.shutdown)
+
+        encoded = pool.make('secret')
+
+        self.assertTrue(check_password('secret', encoded))
+        self.assertEqual(pool.verify('secret', encoded), (True, False))
+        self.assertEqual(pool.verify('wrong', encoded), (False, False))
+        self.assertEqual(pool.metrics()['completed'], 3)
+
+    def test_errors_in_worker_are_counted_as_failed(self):
+        pool = PasswordHasherPool(workers=1, max_queue=1)
+        self.addCleanup(pool.shutdown)
+
+        with self.assertRaises(AttributeError):
+            pool.verify('secret', 123)
+        self.assertEqual((pool.metrics()['failed'], pool.metrics()['completed']), (1, 0))
+        self.assertEqual(pool.metrics()['in_flight'], 0)
+
+    def test_full_queue_fails_fast(self):
+        pool = PasswordHasherPool(workers=1, max_queue=0)
+        pool._slots.acquire()
+        with self.assertRaises(PasswordHashingBusy):
+            pool.make('secret')
+        self.assertEqual(pool.metrics()['rejected'], 1)
+
+
+class PasswordHashingSettingsTestCase(SimpleTestCase):
+    @mock.patch('os.cpu_count', return_value=8)
+    def test_cores_and_queue_are_split_between_web_workers(self, _):
+        with override_settings(PASSWORD_HASHING={'WEB_WORKERS': 4, 'MAX_QUEUE': 30}):
+            config = get_password_hashing_settings()
+        self.assertEqual((config['WORKERS'], config['MAX_QUEUE']), (2, 8))
+
+        with override_settings(PASSWORD_HASHING={'WEB_WORKERS': 16}):
+            config = get_password_hashing_settings()
+        self.assertEqual((config['WORKERS'], config['ENABLED']), (1, False))
+
+        with mock.patch.dict('os.environ', {'WEB_CONCURRENCY': '2'}), override_settings(PASSWORD_HASHING={}):
+            config = get_password_hashing_settings()
+        self.assertEqual((config['WEB_WORKERS'], config['WORKERS'], config['MAX_QUEUE']), (2, 4, 16))
+
+    @mock.patch('os.cpu_count', return_value=8)
+    def test_single_process_uses_every_core(self, _):
+        with mock.patch.dict('os.environ', {}, clear=True), override_settings(PASSWORD_HASHING={'WORKERS': 3}):
+            config = get_password_hashing_settings()
+        self.assertEqual((config['WEB_WORKERS'], config['WORKERS'], config['MAX_QUEUE']), (1, 3, 32))
+        self.assertTrue(config['ENABLED'])
+
+    @mock.patch('os.cpu_count', return_value=1)
+    def test_single_core_hashes_inline(self, _):
+        with mock.patch.dict('os.environ', {}, clear=True), override_settings(PASSWORD_HASHING={'ENABLED': True}):
+            config = get_password_hashing_settings()
+        self.assertEqual((config['WORKERS'], config['ENABLED']), (1, False))
@@ -0,0 +1,107 @@
+from dataclasses import replace
+from datetime import timedelta
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.users.models import UserModel
+from api.users.repository import DjangoUserRepository
+from api.users.token_cache import AccessTokenCache, CachedAccessToken, get_access_token_cache
+
+
+class CachedOAuth2AuthenticationTestCase(TestCase):
+    def setUp(self):
+        get_access_token_cache().clear()
+        self.addCleanup(get_access_token_cache().clear)
+        self.client = APIClient()
+        self.user = UserModel.objects.create_user(
+            email='user@example.com', password='password', first_name='User', last_name='Test'
+        )
+
+    def _login(self):
+        self.client.credentials()
+        response = self.client.post(reverse('login'), {'email': 'user@example.com', 'password': 'password'})
+        return response.data['access_token']
+
+    def _get(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('order-list-mine'))
+        return response, " ".join(query['sql'] for query in ctx.captured_queries)
+
+    def test_second_request_skips_token_and_user_lookup(self):
+        token = self._login()
+
+        response, sql = self._get(token)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('oauth2_provider_accesstoken', sql)
+
+        response, sql = self._get(token)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('oauth2_provider_accesstoken', sql)
+        self.assertNotIn('FROM "users_usermodel"', sql)
+        self.assertEqual(get_access_token_cache().stats()['hits'], 1)
+
+    def test_new_login_evicts_previous_token(self):
+        token = self._login()
+        self.assertEqual(self._get(token)[0].status_code, 200)
+
+        new_token = self._login()
+
+        self.assertEqual(self._get(token)[0].status_code, 401)
+        self.assertEqual(self._get(new_token)[0].status_code, 200)
+
+    def test_deactivation_through_repository_evicts_and_rejects(self):
+        token = self._login()
+        self.assertEqual(self._get(token)[0].status_code, 200)
+
+        repo = DjangoUserRepository()
+        repo.update(replace(repo.get_by_id(str(self.user.id)), is_active=False))
+
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        response = self._get(token)[0]
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data['detail'], 'Usuário inativo')
+
+    @override_settings(ACCESS_TOKEN_CACHE={"ENABLED": False})
+    def test_disabled_cache_always_reads_the_token(self):
+        token = self._login()
+        self._get(token)
+        self.assertIn('oauth2_provider_accesstoken', self._get(token)[1])
+
+
+class AccessTokenCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        self.now = [0.0]
+        self.cache = AccessTokenCache(max_entries=2, ttl=10, clock=lambda: self.now[0])
+
+    def entry(self, user_id='u1', expires_in=3600):
+        return CachedAccessToken(
+            token_id=1, application_id=1, expires=timezone.now() + timedelta(seconds=expires_in), scope='read write',
+            user_id=user_id, email='u@example.com', first_name='U', last_name='X', is_staff=False, is_superuser=False,
+        )
+
+    def test_entries_expire_after_ttl_or_token_expiry(self):
+        self.cache.set('a', self.entry())
+        self.cache.set('short', self.entry(expires_in=2))
+        self.now[0] = 5
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertIsNone(self.cache.get('short'))
+        self.now[0] = 11
+        self.assertIsNone(self.cache.get('a'))
+
+    def test_bounded_and_invalidated_by_user(self):
+        self.cache.set('a', self.entry('u1'))
+        self.cache.set('b', self.entry('u2'))
+        self.cache.set('c', self.entry('u1'))
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+        self.assertIsNone(self.cache.get('a'))
+
+        self.cache.invalidate_user('u1')
+        self.assertIsNone(self.cache.get('c'))
+        self.assertIsNotNone(self.cache.get('b'))
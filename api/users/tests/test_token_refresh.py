@@ -0,0 +1,120 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from oauth2_provider.models import AccessToken, Application, RefreshToken
+from rest_framework.test import APIClient
+
+from api.users.access_tokens import decode_access_token, get_access_token_deny_list
+from api.users.auth_gateway_dj import DEFAULT_APPLICATION_NAME, get_oauth_application_cache
+from api.users.hashing import get_password_hasher_pool
+from api.users.models import UserModel
+from api.users.token_cache import get_access_token_cache
+
+
+class TokenRefreshTestCase(TestCase):
+    def setUp(self):
+        for cache in (get_oauth_application_cache(), get_access_token_cache(), get_access_token_deny_list()):
+            cache.clear()
+            self.addCleanup(cache.clear)
+        self.client = APIClient()
+        self.user = UserModel.objects.create_user(
+            email='user@example.com', password='password', first_name='User', last_name='Test'
+        )
+
+    def _login(self):
+        return self.client.post(reverse('login'), {'email': 'user@example.com', 'password': 'password'}).data
+
+    def _refresh(self, refresh_token):
+        return self.client.post(reverse('token-refresh'), {'refresh_token': refresh_token})
+
+    def _get(self, access_token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        response = self.client.get(reverse('order-list-mine'))
+        self.client.credentials()
+        return response
+
+    def test_rotates_the_token_pair(self):
+        tokens = self._login()
+
+        response = self._refresh(tokens['refresh_token'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['id'], response.data['email']), (str(self.user.id), self.user.email))
+        self.assertNotEqual(response.data['refresh_token'], tokens['refresh_token'])
+        self.assertEqual(self._get(response.data['access_token']).status_code, 200)
+        self.assertEqual(self._get(tokens['access_token']).status_code, 401)
+        self.assertEqual((AccessToken.objects.count(), RefreshToken.objects.count()), (1, 1))
+
+        # O refresh token antigo não serve de novo.
+        self.assertEqual(self._refresh(tokens['refresh_token']).status_code, 401)
+
+    def test_refresh_query_budget_and_no_password_hashing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh_token = self._login()['refresh_token']
+        hashed = get_password_hasher_pool().metrics()['completed']
+
+        # Refresh token + usuário (1 SELECT), par antigo (2 DELETE), par
+        # novo (2 INSERT) e o savepoint da transação (2).
+        with self.assertNumQueries(7):
+            response = self._refresh(refresh_token)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_password_hasher_pool().metrics()['completed'], hashed)
+
+    def test_rejects_expired_unknown_and_inactive(self):
+        refresh_token = self._login()['refresh_token']
+        RefreshToken.objects.update(created=timezone.now() - timedelta(days=2))
+        self.assertEqual(self._refresh(refresh_token).status_code, 401)
+
+        refresh_token = self._login()['refresh_token']
+        UserModel.objects.filter(id=self.user.id).update(is_active=False)
+        self.assertEqual(self._refresh(refresh_token).status_code, 401)
+
+        response = self._refresh('refresh_token_inexistente')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data['detail'], 'Refresh token inválido ou expirado')
+        self.assertEqual(self.client.post(reverse('token-refresh'), {}).status_code, 400)
+
+    def test_refresh_after_application_is_recreated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh_token = self._login()['refresh_token']
+        stale = Application.objects.get(name=DEFAULT_APPLICATION_NAME)
+
+        # Outro worker recriou a application; este ainda tem o id antigo em cache.
+        recreated = Application.objects.create(
+            name='recriada', client_type=stale.client_type, authorization_grant_type=stale.authorization_grant_type
+        )
+        RefreshToken.objects.update(application=recreated)
+        AccessToken.objects.update(application=recreated)
+        stale.delete()
+        Application.objects.filter(id=recreated.id).update(name=DEFAULT_APPLICATION_NAME)
+
+        response = self._refresh(refresh_token)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_oauth_application_cache().get_id(), recreated.id)
+        self.assertEqual(RefreshToken.objects.get().application_id, recreated.id)
+
+    def test_unknown_tokens_reresolve_the_application_at_most_once_per_interval(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._login()
+
+        # Refresh token (1) + releitura da application (1) + savepoints (2).
+        with self.assertNumQueries(4):
+            self.assertEqual(self._refresh('forjado-1').status_code, 401)
+        # Depois, só a busca do refresh token (e o savepoint) em cada um.
+        with self.assertNumQueries(9):
+            for token in ('forjado-2', 'forjado-3', 'forjado-4'):
+                self.assertEqual(self._refresh(token).status_code, 401)
+        self.assertEqual(Application.objects.count(), 1)
+
+    @override_settings(STATELESS_ACCESS_TOKENS={"ENABLED": True})
+    def test_stateless_mode_issues_signed_access_token(self):
+        response = self._refresh(self._login()['refresh_token'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(decode_access_token(response.data['access_token'])['sub'], str(self.user.id))
+        self.assertFalse(AccessToken.objects.exists())
+        self.assertEqual(RefreshToken.objects.get().token, response.data['refresh_token'])
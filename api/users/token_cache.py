@@ -0,0 +1,209 @@
+"""
+Cache de validação de tokens de acesso opacos (oauth2_provider).
+
+`CachedOAuth2Authentication` substitui `OAuth2Authentication` no DRF: um
+token já validado é aceito a partir do cache local (validade, escopo e um
+retrato enxuto do usuário) por até `TTL_SECONDS`, sem ler `AccessToken` e
+`UserModel` a cada requisição.
+
+As entradas de um usuário saem do cache quando `create_tokens` troca os
+tokens dele e quando ele é desativado ou removido pelo repositório. O cache
+é por processo: nos outros processos, a mudança vale em até `TTL_SECONDS`
+(o mesmo vale para tokens revogados direto pelo oauth2_provider).
+"""
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django.utils import timezone
+from oauth2_provider.contrib.rest_framework import OAuth2Authentication
+from oauth2_provider.models import AccessToken
+from rest_framework.authentication import get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+from .models import UserModel
+
+DEFAULT_ACCESS_TOKEN_CACHE = {
+    "ENABLED": True,
+    "MAX_ENTRIES": 10_000,
+    "TTL_SECONDS": 10,
+}
+
+
+def get_access_token_cache_settings() -> dict:
+    return {**DEFAULT_ACCESS_TOKEN_CACHE, **getattr(settings, "ACCESS_TOKEN_CACHE", {})}
+
+
+@dataclass(frozen=True)
+class CachedAccessToken:
+    """Token validado: o necessário para montar `request.user` e `request.auth`."""
+    token_id: int
+    application_id: int | None
+    expires: datetime
+    scope: str
+    user_id: str
+    email: str
+    first_name: str
+    last_name: str
+    is_staff: bool
+    is_superuser: bool
+
+    @classmethod
+    def from_token(cls, access_token: AccessToken, user: UserModel) -> "CachedAccessToken":
+        return cls(
+            token_id=access_token.id, application_id=access_token.application_id, expires=access_token.expires,
+            scope=access_token.scope, user_id=str(user.id), email=user.email, first_name=user.first_name,
+            last_name=user.last_name, is_staff=user.is_staff, is_superuser=user.is_superuser,
+        )
+
+    def to_user(self) -> UserModel:
+        """Usuário não persistido montado do retrato; não deve ser salvo."""
+        return UserModel(
+            id=uuid.UUID(self.user_id), email=self.email, first_name=self.first_name, last_name=self.last_name,
+            is_active=True, is_staff=self.is_staff, is_superuser=self.is_superuser,
+        )
+
+    def to_access_token(self, user: UserModel) -> AccessToken:
+        return AccessToken(
+            id=self.token_id, user=user, application_id=self.application_id, expires=self.expires, scope=self.scope,
+        )
+
+
+class AccessTokenCache:
+    """
+    LRU limitado a `max_entries`, com TTL, protegido por lock.
+
+    A chave é o SHA-256 do token (o token em si não fica em memória); um
+    índice por usuário permite invalidar todas as entradas dele. A entrada
+    nunca vive além da validade do próprio token.
+    """
+    def __init__(self, max_entries=10_000, ttl=10, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, CachedAccessToken]] = OrderedDict()
+        self._by_user: dict[str, set[str]] = {}
+        self._counters = dict.fromkeys(["hits", "misses", "evictions", "invalidations"], 0)
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> CachedAccessToken | None:
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return value
+                self._remove(key)
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, token: str, value: CachedAccessToken) -> None:
+        key = self.key(token)
+        token_ttl = (value.expires - timezone.now()).total_seconds()
+        if token_ttl <= 0:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (self._clock() + min(self.ttl, token_ttl), value)
+            self._by_user.setdefault(value.user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry[1].user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry[1].user_id]
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            for key in list(self._by_user.get(str(user_id), ())):
+                self._remove(key)
+            self._counters["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters, size=len(self._entries), max_entries=self.max_entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_access_token_cache() -> AccessTokenCache:
+    """Instância única por processo, configurada por `settings.ACCESS_TOKEN_CACHE`."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = get_access_token_cache_settings()
+                _cache = AccessTokenCache(max_entries=config["MAX_ENTRIES"], ttl=config["TTL_SECONDS"])
+    return _cache
+
+
+def invalidate_user_access_tokens(user_id: str) -> None:
+    get_access_token_cache().invalidate_user(user_id)
+
+
+class CachedOAuth2Authentication(OAuth2Authentication):
+    """
+    `OAuth2Authentication` com o cache de validação na frente.
+
+    Só tokens do header `Authorization: Bearer` passam pelo cache; o resto
+    (e tudo com `ACCESS_TOKEN_CACHE["ENABLED"]` desligado) segue direto para
+    o oauth2_provider. Usuários inativos são recusados.
+    """
+    def authenticate(self, request):
+        token = self._bearer_token(request)
+        if token is None or not get_access_token_cache_settings()["ENABLED"]:
+            return self._check_active(super().authenticate(request))
+
+        cache = get_access_token_cache()
+        cached = cache.get(token)
+        if cached is not None:
+            user = cached.to_user()
+            return user, cached.to_access_token(user)
+
+        result = self._check_active(super().authenticate(request))
+        if result is not None:
+            user, access_token = result
+            cache.set(token, CachedAccessToken.from_token(access_token, user))
+        return result
+
+    @staticmethod
+    def _bearer_token(request) -> str | None:
+        auth = get_authorization_header(request).split()
+        if len(auth) != 2 or auth[0].lower() != b"bearer":
+            return None
+        return auth[1].decode("latin-1")
+
+    @staticmethod
+    def _check_active(result):
+        if result is not None and not result[0].is_active:
+            raise AuthenticationFailed("Usuário inativo")
+        return result
@@ -1,8 +1,11 @@
 from django.urls import path
-from .views import UserListCreateAPIView, RetrieveUpdateDestroyAPIView
-from .auth import LoginAPIView
+from .views import PasswordHashingMetricsAPIView, UserListCreateAPIView, RetrieveUpdateDestroyAPIView
+from .auth import LoginAPIView, TokenRefreshAPIView
 urlpatterns = [
     path("users/", UserListCreateAPIView.as_view(), name="user-list-create"),
     path("users/<uuid:pk>/", RetrieveUpdateDestroyAPIView.as_view(), name="user-retrieve"),
     path("login/", LoginAPIView.as_view(), name="login"),
+    path("token/refresh/", TokenRefreshAPIView.as_view(), name="token-refresh"),
+    path("users/password-hashing/metrics/", PasswordHashingMetricsAPIView.as_view(),
+         name="password-hashing-metrics"),
 ]
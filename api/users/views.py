@@ -4,8 +4,11 @@ from rest_framework.response import Response
 from .repository import DjangoUserRepository
 from .serializers import UserSerializer, UserReadSerializer
 from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
 from core.domain.entities.user import User
+from .hashing import PasswordHashingBusy, get_password_hasher_pool
 from .models import UserModel
+from api.counting import set_pagination_headers
 from core.interfaces.usecase.criar_user_usecase import(
     CreateUserUseCase,
     ListUsersUseCase,
@@ -34,6 +37,8 @@ class UserListCreateAPIView(generics.ListCreateAPIView):
     Regras de negócio:
     - A criação de usuário é delegada ao caso de uso `CreateUserUseCase`.
     - A listagem é feita via `ListUsersUseCase`, com paginação fixa (offset=0, limit=10).
+      `?count=` escolhe a estratégia de contagem (exact, cached, estimated ou none);
+      o total e a estratégia usada vêm nos cabeçalhos `X-Total-Count` e `X-Count-Strategy`.
     """
     queryset = UserModel.objects.all()
     permission_classes = [IsAdminUser]
@@ -47,11 +52,19 @@ class UserListCreateAPIView(generics.ListCreateAPIView):
         repo = DjangoUserRepository()
         use_case = ListUsersUseCase(repo)
 
-        request_data = ListUsersRequest(offset=0, limit=10)
-        response_data = use_case.execute(request_data)
+        request_data = ListUsersRequest(
+            offset=0, limit=10, count_strategy=request.query_params.get("count") or None
+        )
+        try:
+            response_data = use_case.execute(request_data)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         serializer = self.get_serializer(response_data.users, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return set_pagination_headers(
+            Response(serializer.data, status=status.HTTP_200_OK),
+            response_data.total_items, response_data.has_next, response_data.count_strategy,
+        )
 
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
@@ -70,7 +83,11 @@ class UserListCreateAPIView(generics.ListCreateAPIView):
             password=serializer.validated_data['password']
         )
 
-        user = use_case.execute(request_data)
+        try:
+            user = use_case.execute(request_data)
+        except PasswordHashingBusy as e:
+            return Response({"detail": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            headers={"Retry-After": str(e.retry_after)})
         response_serializer = UserReadSerializer(user)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
@@ -140,4 +157,18 @@ class RetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
         updated_user = repo.update(updated_user)
 
         response_serializer = UserReadSerializer(updated_user)
-        return Response(response_serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(response_serializer.data, status=status.HTTP_200_OK)
+
+
+class PasswordHashingMetricsAPIView(APIView):
+    """
+    Métricas do pool de hash de senhas deste processo (apenas administradores).
+
+    Cada processo web tem o seu pool; `pid` identifica o que respondeu.
+    `queue_depth` conta as tarefas esperando por um worker; `latency_ms`
+    inclui a espera na fila. `rejected` são as requisições que receberam 503.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_password_hasher_pool().metrics(), status=status.HTTP_200_OK)
@@ -0,0 +1,40 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+import uuid
+
+CHECKOUT_QUEUED = "q"
+CHECKOUT_PROCESSING = "r"
+CHECKOUT_DONE = "d"
+CHECKOUT_FAILED = "f"
+
+@dataclass
+class CheckoutJob:
+    """
+    Pedido aceito para criação assíncrona, na fila de checkout.
+
+    `order_id` é preenchido quando o pedido é criado; `error`, quando a
+    criação é rejeitada.
+    """
+    owner_id: str
+    product_id: str
+    quantity: int
+    status: str = CHECKOUT_QUEUED
+    job_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    order_id: Optional[str] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (CHECKOUT_DONE, CHECKOUT_FAILED)
+
+    def complete(self, order_id: str) -> None:
+        self.status = CHECKOUT_DONE
+        self.order_id = order_id
+        self.error = None
+
+    def fail(self, error: str) -> None:
+        self.status = CHECKOUT_FAILED
+        self.error = error
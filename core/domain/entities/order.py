@@ -1,17 +1,79 @@
 from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
 import uuid
 from core.domain.entities.product import Product
 from core.domain.entities.user import User
 
+ORDER_PENDING = "p"
+ORDER_FINISHED = "F"
+ORDER_CONCLUDED = "c"
+# Pendente cuja reserva de estoque expirou; só o sweeper de reservas move para cá.
+ORDER_EXPIRED = "e"
+ORDER_STATUSES = (ORDER_PENDING, ORDER_FINISHED, ORDER_CONCLUDED, ORDER_EXPIRED)
+
+# Transições permitidas: pendente -> finalizado/concluído, finalizado -> concluído.
+ORDER_TRANSITIONS = {
+    ORDER_PENDING: (ORDER_FINISHED, ORDER_CONCLUDED),
+    ORDER_FINISHED: (ORDER_CONCLUDED,),
+    ORDER_CONCLUDED: (),
+    ORDER_EXPIRED: (),
+}
+
+def validate_status_transition(from_status: str, to_status: str) -> None:
+    """Raises:
+        ValueError: Se algum status não existir ou a transição não for permitida.
+    """
+    if from_status not in ORDER_STATUSES or to_status not in ORDER_STATUSES:
+        raise ValueError("Status inválido")
+    if to_status not in ORDER_TRANSITIONS[from_status]:
+        raise ValueError(f"Transição de status não permitida: {from_status} -> {to_status}")
+
+@dataclass
+class OrderItem:
+    """Linha do pedido: produto, quantidade e preço unitário no momento da compra"""
+    product_id: str
+    quantity: int
+    unit_price: float
+    product_name: Optional[str] = None
+
+    @property
+    def total(self) -> float:
+        return self.unit_price * self.quantity
+
 @dataclass
 class Order:
+    """
+    Pedido com uma ou mais linhas (`items`).
+
+    `product` e `quantity` são um atalho para pedidos de um único produto:
+    quando `items` não é informado, a linha é criada a partir deles.
+    """
     owner: User
-    product: Product
-    quantity: int
-    subtotal: float
-    status: str
+    product: Optional[Product] = None
+    quantity: int = 0
+    subtotal: float = 0
+    status: str = ORDER_PENDING
     order_id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    
+    items: List[OrderItem] = field(default_factory=list)
+    created_at: Optional[datetime] = None
+    # Id (`jti`) da cotação de origem; cada cotação gera no máximo um pedido.
+    quote_id: Optional[str] = None
+
+    def __post_init__(self):
+        if not self.items and self.product is not None:
+            self.items = [OrderItem(
+                product_id=self.product.id,
+                quantity=self.quantity,
+                unit_price=self.product.price,
+                product_name=self.product.name,
+            )]
+
     @property
     def get_subtotal(self) -> float:
-       return self.product.price * self.quantity
\ No newline at end of file
+       return sum(item.total for item in self.items)
+
+    @property
+    def owner_id(self) -> str:
+        """Id do dono, seja `owner` a entidade User ou apenas o id"""
+        return self.owner.id if isinstance(self.owner, User) else str(self.owner)
@@ -8,6 +8,7 @@ class Product:
     stock: int = field(compare=False)
     is_active: bool = field(default=True, compare=False)
     id: str = field(default_factory=lambda: str(uuid.uuid4()), compare=True)
+    version: int = field(default=1, compare=False)
     
     def is_available(self) -> bool:
         return self.is_active and self.stock >0
@@ -0,0 +1,31 @@
+from core.domain.entities.checkout import CheckoutJob
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+class CheckoutJobRepository(ABC):
+    """
+    Fila durável de checkout.
+
+    `claim_batch` deve ser seguro entre workers concorrentes: um job nunca é
+    entregue a dois workers ao mesmo tempo.
+    """
+
+    @abstractmethod
+    def enqueue(self, job: CheckoutJob) -> CheckoutJob:
+        """Coloca um job na fila"""
+        pass
+
+    @abstractmethod
+    def claim_batch(self, limit: int) -> List[CheckoutJob]:
+        """Retira da fila até `limit` jobs, dos mais antigos aos mais novos"""
+        pass
+
+    @abstractmethod
+    def finish(self, jobs: List[CheckoutJob]) -> None:
+        """Grava o resultado (status, pedido ou erro) dos jobs processados"""
+        pass
+
+    @abstractmethod
+    def get_by_id(self, job_id: str) -> Optional[CheckoutJob]:
+        """Busca um job pelo id"""
+        pass
@@ -1,12 +1,63 @@
 from core.domain.entities.order import Order
+from core.domain.repositories.pagination import CursorPage
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class OrderFilter:
+    """
+    Seleção de pedidos para operações em lote. Campos None não filtram.
+
+    Attributes:
+        owner_id (str | None): Apenas pedidos deste dono.
+        order_ids (list[str] | None): Apenas estes pedidos.
+        created_after (datetime | None): Criados a partir deste instante (inclusive).
+        created_before (datetime | None): Criados antes deste instante.
+    """
+    owner_id: Optional[str] = None
+    order_ids: Optional[List[str]] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+
+@dataclass
+class StatusTransitionResult:
+    """
+    Resultado de uma transição de status em lote.
+
+    Attributes:
+        updated (int): Pedidos que mudaram de status.
+        chunks (int): Instruções UPDATE executadas.
+    """
+    updated: int = 0
+    chunks: int = 0
 
 class OrderRepository(ABC):
     
     @abstractmethod
-    def create(self, order : Order) -> Order:
-        """Cria um novo pedido"""
+    def create(self, order : Order, reserve: Optional[Callable[[Order], None]] = None) -> Order:
+        """Cria um novo pedido.
+
+        `reserve` (a reserva de estoque) roda na mesma transação, antes do
+        INSERT: se ela falhar, nada é gravado; se o INSERT falhar, a reserva
+        é desfeita.
+
+        Raises:
+            ValueError: Se já existir um pedido com o mesmo `quote_id`.
+        """
+        pass
+
+    @abstractmethod
+    def create_many(self, orders: List[Order],
+                    reserve: Optional[Callable[[List[Order]], Dict[str, str]]] = None) -> List[Order]:
+        """Cria vários pedidos em uma única transação.
+
+        `reserve` roda na mesma transação e retorna `{order_id: erro}` dos
+        pedidos sem estoque, que não são gravados. Retorna os pedidos gravados.
+        """
         pass
 
     @abstractmethod
@@ -15,11 +66,31 @@ class OrderRepository(ABC):
         pass
 
     @abstractmethod
-    def get_by_owner_id(self, owner_id: str) -> Optional[Order]:
+    def get_by_owner_id(self, owner_id: str) -> List[Order]:
         """Lista os pedidos por id dos usuários"""
         pass
 
     @abstractmethod
     def get_by_order_id(self, order_id: str) -> Optional[Order]:
         """Lista os pedidos por id"""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_all_paginated_filtered(
+        self, offset: int, limit: int, search_query: str | None = None,
+        owner_id: str | None = None, status: str | None = None) -> Tuple[List[Order], int]:
+        """Lista pedidos com paginação, filtro opcional e, se informados, apenas os de um dono e/ou status"""
+        pass
+
+    @abstractmethod
+    def get_all_cursor_paginated(
+        self, limit: int, cursor: str | None = None, owner_id: str | None = None,
+        status: str | None = None) -> CursorPage[Order]:
+        """Lista pedidos do mais recente ao mais antigo com paginação keyset (cursor)"""
+        pass
+
+    @abstractmethod
+    def bulk_transition_status(
+        self, order_filter: OrderFilter, from_status: str, to_status: str) -> StatusTransitionResult:
+        """Move os pedidos selecionados de `from_status` para `to_status`, em lotes"""
+        pass
@@ -0,0 +1,82 @@
+import base64
+import json
+from dataclasses import dataclass, field
+from typing import Any, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+CURSOR_NEXT = "n"
+CURSOR_PREV = "p"
+
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATED = "estimated"
+COUNT_NONE = "none"
+COUNT_STRATEGIES = (COUNT_EXACT, COUNT_CACHED, COUNT_ESTIMATED, COUNT_NONE)
+
+
+@dataclass
+class CursorPage(Generic[T]):
+    """
+    Página de resultados obtida por paginação keyset (cursor).
+
+    Attributes:
+        items (list): Itens da página, já na ordem de exibição.
+        next_cursor (str | None): Cursor opaco para a próxima página.
+        prev_cursor (str | None): Cursor opaco para a página anterior.
+        total_items (int | None): Total de itens, apenas quando solicitado.
+    """
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    total_items: Optional[int] = None
+
+
+@dataclass
+class OffsetPage(Generic[T]):
+    """
+    Página de resultados obtida por paginação por offset.
+
+    Attributes:
+        items (list): Itens da página.
+        total_items (int | None): Total de itens; None com a estratégia "none".
+        has_next (bool): Indica se há itens depois desta página.
+        count_strategy (str): Estratégia que produziu o total ("exact",
+            "cached", "estimated" ou "none").
+    """
+    items: List[T] = field(default_factory=list)
+    total_items: Optional[int] = None
+    has_next: bool = False
+    count_strategy: str = COUNT_EXACT
+
+
+def validate_count_strategy(strategy: str) -> str:
+    """Raises:
+        ValueError: Se a estratégia não for uma de COUNT_STRATEGIES.
+    """
+    if strategy not in COUNT_STRATEGIES:
+        raise ValueError("Estratégia de contagem inválida")
+    return strategy
+
+
+def encode_cursor(key: List[Any], direction: str = CURSOR_NEXT) -> str:
+    """Codifica a chave de ordenação e a direção em um cursor opaco."""
+    payload = json.dumps({"k": key, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[List[Any], str]:
+    """Decodifica um cursor opaco.
+
+    Raises:
+        ValueError: Se o cursor estiver malformado.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key, direction = payload["k"], payload["d"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Cursor inválido")
+    if not isinstance(key, list) or direction not in (CURSOR_NEXT, CURSOR_PREV):
+        raise ValueError("Cursor inválido")
+    return key, direction
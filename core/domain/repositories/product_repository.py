@@ -1,6 +1,46 @@
 from core.domain.entities.product import Product
+from core.domain.repositories.pagination import CursorPage, OffsetPage
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+@dataclass
+class ProductPatch:
+    """
+    Alteração parcial de um produto. Campos None não são alterados.
+
+    Attributes:
+        id (str): Identificador do produto.
+        price (Decimal | None): Novo preço.
+        stock (int | None): Novo estoque.
+        is_active (bool | None): Novo status no catálogo.
+    """
+    id: str
+    price: Optional[Decimal] = None
+    stock: Optional[int] = None
+    is_active: Optional[bool] = None
+
+
+@dataclass
+class ProductPriceSnapshot:
+    """
+    Preço e disponibilidade de um produto lidos para precificar um carrinho.
+
+    Attributes:
+        product_id (str): Identificador do produto.
+        name (str): Nome do produto.
+        unit_price (Decimal): Preço unitário exato (sem passar por float).
+        stock (int): Estoque disponível.
+        is_active (bool): Se o produto está ativo no catálogo.
+    """
+    product_id: str
+    name: str
+    unit_price: Decimal
+    stock: int
+    is_active: bool
+
 
 class ProductRepository(ABC):
     
@@ -9,6 +49,11 @@ class ProductRepository(ABC):
         """Cria um novo produto"""
         pass
     
+    @abstractmethod
+    def bulk_create(self, products: List[Product]) -> int:
+        """Cria vários produtos de uma vez, em uma transação. Retorna quantos foram criados"""
+        pass
+    
     @abstractmethod
     def delete(self, produc_id: str) -> Product:
         """Deleta um Produto.
@@ -23,18 +68,77 @@ class ProductRepository(ABC):
         """
         pass
     
+    @abstractmethod
+    def bulk_update(self, patches: List[ProductPatch]) -> Tuple[int, List[str]]:
+        """Aplica alterações parciais em lote, em uma transação.
+        -  retorna (quantidade atualizada, ids não encontrados)
+        """
+        pass
+    
     @abstractmethod
     def get_all(self) -> List[Product]:
         """Lista todos os produtos"""
         pass
     
+    @abstractmethod
+    def iter_all(self, chunk_size: int = 2000) -> Iterator[Product]:
+        """Percorre todos os produtos em blocos, sem carregar o catálogo inteiro em memória"""
+        pass
+    
     @abstractmethod
     def get_by_id(self, product_id: str) -> Optional[Product]:
         """Busca produtos por id"""
         pass
     
+    @abstractmethod
+    def get_by_ids(self, product_ids: List[str]) -> List[Product]:
+        """Busca vários produtos em uma consulta, preservando a ordem dos ids"""
+        pass
+
+    @abstractmethod
+    def get_price_snapshots(self, product_ids: List[str]) -> List[ProductPriceSnapshot]:
+        """Lê preço, estoque e status de vários produtos em uma consulta, sempre do banco"""
+        pass
+    
+    @abstractmethod
+    def get_version(self, product_id: str) -> Optional[int]:
+        """Versão atual do produto (incrementada a cada escrita), ou None se não existir"""
+        pass
+    
+    @abstractmethod
+    def get_catalog_version(self) -> str:
+        """Identificador opaco que muda sempre que algum produto é criado, alterado ou removido"""
+        pass
+    
     @abstractmethod
     def get_all_paginated_filtered(
-        self, offset: int, limit: int, search_query: str | None = None) ->Tuple[List[Product], int]:
-        """Lista produtos com paginação e filtro opcional"""
-        pass
\ No newline at end of file
+        self, offset: int, limit: int, search_query: str | None = None,
+        count_strategy: str | None = None) -> OffsetPage[Product]:
+        """Lista produtos com paginação e filtro opcional.
+        -  `count_strategy` define como o total é obtido (None usa o padrão configurado)
+        """
+        pass
+    
+    @abstractmethod
+    def get_all_cursor_paginated(
+        self, limit: int, cursor: str | None = None, search_query: str | None = None,
+        include_total: bool = False) -> CursorPage[Product]:
+        """Lista produtos com paginação por cursor (keyset), ordenados por nome e id"""
+        pass
+    
+    @abstractmethod
+    def reserve_stock(self, product_id: str, quantity: int) -> None:
+        """Baixa `quantity` do estoque de forma atômica.
+        -  falha com ValueError se o estoque for insuficiente
+        """
+        pass
+    
+    @abstractmethod
+    def release_stock(self, product_id: str, quantity: int) -> None:
+        """Devolve `quantity` ao estoque de forma atômica"""
+        pass
+    
+    @abstractmethod
+    def reserve_stock_bulk(self, quantities: Dict[str, int]) -> None:
+        """Reserva estoque de vários produtos: ou todos são reservados, ou nenhum"""
+        pass
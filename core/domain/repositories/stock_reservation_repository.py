@@ -0,0 +1,66 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+
+@dataclass
+class ReservationSweepResult:
+    """
+    Resultado de uma passada do sweeper de reservas expiradas.
+
+    Attributes:
+        processed (int): Reservas expiradas removidas.
+        released (int): Unidades devolvidas ao estoque (pedidos não finalizados).
+        expired_orders (int): Pedidos pendentes marcados como expirados.
+        batches (int): Lotes (transações) executados.
+        backlog (int | None): Reservas expiradas ainda por processar ao final.
+    """
+    processed: int = 0
+    released: int = 0
+    expired_orders: int = 0
+    batches: int = 0
+    backlog: Optional[int] = None
+
+
+class StockReservationRepository(ABC):
+    """
+    Estoque retido por pedidos pendentes até uma data de expiração.
+
+    A reserva é gravada na mesma transação que o pedido (ver
+    `OrderRepository.create`); uma reserva cujo pedido foi removido depois
+    apenas expira e tem o estoque devolvido pelo sweeper.
+    """
+
+    @abstractmethod
+    def hold(self, order_id: str, quantities: Dict[str, int], expires_at: datetime) -> None:
+        """Baixa o estoque e registra a reserva do pedido: ou tudo, ou nada.
+
+        Raises:
+            ValueError: Se algum produto não existir ou não tiver estoque.
+        """
+        pass
+
+    @abstractmethod
+    def hold_many(self, holds: Dict[str, Dict[str, int]], expires_at: datetime) -> None:
+        """Reserva vários pedidos (`{order_id: quantidades}`) de uma vez: ou todos, ou nenhum.
+
+        Raises:
+            ValueError: Se algum produto não existir ou não tiver estoque.
+        """
+        pass
+
+    @abstractmethod
+    def sweep_expired(self, now: datetime, limit: int) -> ReservationSweepResult:
+        """Processa até `limit` reservas expiradas em uma transação.
+
+        Pedidos ainda pendentes passam a expirados e o estoque volta ao
+        produto; reservas de pedidos já finalizados só são removidas.
+        Seguro entre sweepers concorrentes.
+        """
+        pass
+
+    @abstractmethod
+    def count_expired(self, now: datetime) -> int:
+        """Quantas reservas já expiraram e ainda não foram processadas"""
+        pass
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from core.domain.entities.user import User
+from core.domain.repositories.pagination import OffsetPage
 from typing import List, Optional, Tuple
 
 class UserRepository(ABC):
@@ -31,6 +32,11 @@ class UserRepository(ABC):
         """Busca usuários por id"""
         pass
     
+    @abstractmethod
+    def get_by_ids(self, user_ids: List[str]) -> List[User]:
+        """Busca vários usuários em uma consulta; ids inexistentes são ignorados"""
+        pass
+
     @abstractmethod
     def get_by_email(self, user: User) -> Optional[User]:
         """Busca usuários por email"""
@@ -38,6 +44,9 @@ class UserRepository(ABC):
 
     @abstractmethod
     def get_all_paginated_filtered(
-        self, offset: int, limit: int, search_query: str | None = None) ->Tuple[List[User], int]:
-        """Lista usuarios com paginação e filtro opcional"""
+        self, offset: int, limit: int, search_query: str | None = None,
+        count_strategy: str | None = None) -> OffsetPage[User]:
+        """Lista usuarios com paginação e filtro opcional.
+        -  `count_strategy` define como o total é obtido (None usa o padrão configurado)
+        """
         pass
\ No newline at end of file
@@ -0,0 +1,151 @@
+from core.domain.entities.checkout import CheckoutJob
+from core.domain.entities.user import User
+from core.domain.repositories.checkout_repository import CheckoutJobRepository
+from core.domain.repositories.order_repository import OrderRepository
+from core.domain.repositories.product_repository import ProductRepository
+from core.interfaces.usecase.criar_pedido_usecase import CreateOrderRequest, CreateOrderUseCase
+from core.interfaces.usecase.reservation_usecase import OrderStockReserver
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional
+
+
+def _validation_error(product, quantity: int) -> Optional[str]:
+    if product is None:
+        return "Produto não encontrado"
+    if not product.is_active:
+        return "Produto inativo"
+    if quantity <= 0:
+        return "Quantidade inválida"
+    return None
+
+
+@dataclass
+class EnqueueCheckoutRequest:
+    """
+    DTO de entrada do checkout assíncrono.
+
+    Attributes:
+        owner_id (str): Dono do pedido.
+        product_id (str): Produto do pedido.
+        quantity (int): Quantidade.
+    """
+    owner_id: str
+    product_id: str
+    quantity: int
+
+class EnqueueCheckoutUseCase:
+    """
+    Caso de uso responsável por aceitar um pedido para criação assíncrona.
+
+    Valida o pedido (produto existente e ativo, quantidade positiva) e o
+    coloca na fila; a criação fica com `ProcessCheckoutBatchUseCase`.
+    """
+    def __init__(self, checkout_repository: CheckoutJobRepository, product_repository: ProductRepository):
+        """
+        Args:
+            checkout_repository (CheckoutJobRepository): Fila de checkout.
+            product_repository (ProductRepository): Repositório de produtos.
+        """
+        self.checkout_repository = checkout_repository
+        self.product_repository = product_repository
+
+    def execute(self, request: EnqueueCheckoutRequest) -> CheckoutJob:
+        """
+        Raises:
+            ValueError: Se o pedido for inválido.
+        """
+        products = self.product_repository.get_by_ids([request.product_id])
+        error = _validation_error(products[0] if products else None, request.quantity)
+        if error:
+            raise ValueError(error)
+        return self.checkout_repository.enqueue(CheckoutJob(
+            owner_id=request.owner_id,
+            product_id=request.product_id,
+            quantity=request.quantity,
+        ))
+
+
+class GetCheckoutJobUseCase:
+    """
+    Caso de uso responsável por consultar um job de checkout (dono ou administradores).
+    """
+    def __init__(self, checkout_repository: CheckoutJobRepository):
+        self.checkout_repository = checkout_repository
+
+    def execute(self, job_id: str, current_user: User) -> CheckoutJob:
+        """
+        Raises:
+            ValueError: Se o job não existir.
+            PermissionError: Se o usuário não for o dono nem administrador.
+        """
+        job = self.checkout_repository.get_by_id(job_id)
+        if job is None:
+            raise ValueError("Checkout não encontrado")
+        if not current_user.can_view_orders(job.owner_id):
+            raise PermissionError("Você não tem permissão para ver este checkout.")
+        return job
+
+
+@dataclass
+class ProcessCheckoutBatchResponse:
+    """
+    DTO de saída do processamento de um lote da fila.
+
+    Attributes:
+        claimed (int): Jobs retirados da fila.
+        created (int): Pedidos criados.
+        failed (int): Jobs rejeitados.
+    """
+    claimed: int = 0
+    created: int = 0
+    failed: int = 0
+
+class ProcessCheckoutBatchUseCase:
+    """
+    Caso de uso executado pelos workers: retira um lote da fila e cria os
+    pedidos com `CreateOrderUseCase`.
+
+    Os produtos do lote são buscados com uma consulta, e o subtotal usa o
+    preço do momento do processamento. Um job rejeitado (produto removido ou
+    desativado depois de aceito, ou sem estoque) não impede os demais. Outros
+    erros (p.ex. do banco) sobem e desfazem o lote inteiro, que volta à fila.
+    """
+    def __init__(self, checkout_repository: CheckoutJobRepository, order_repository: OrderRepository,
+                 product_repository: ProductRepository, stock_reserver: Optional[OrderStockReserver] = None):
+        self.checkout_repository = checkout_repository
+        self.product_repository = product_repository
+        self.create_order = CreateOrderUseCase(order_repository, stock_reserver=stock_reserver)
+
+    def execute(self, limit: int) -> ProcessCheckoutBatchResponse:
+        jobs = self.checkout_repository.claim_batch(limit)
+        if not jobs:
+            return ProcessCheckoutBatchResponse()
+
+        products = {
+            product.id: product
+            for product in self.product_repository.get_by_ids(list({job.product_id for job in jobs}))
+        }
+        response = ProcessCheckoutBatchResponse(claimed=len(jobs))
+        for job in jobs:
+            product = products.get(job.product_id)
+            error = _validation_error(product, job.quantity)
+            if error is None:
+                try:
+                    order = self.create_order.execute(CreateOrderRequest(
+                        owner=job.owner_id,
+                        product=product,
+                        quantity=job.quantity,
+                        subtotal=(Decimal(str(product.price)) * job.quantity).quantize(Decimal("0.01")),
+                    ))
+                except (ValueError, PermissionError) as e:
+                    error = f"Falha ao criar o pedido: {e}"
+                else:
+                    job.complete(order.order_id)
+                    response.created += 1
+            if error is not None:
+                job.fail(error)
+                response.failed += 1
+
+        self.checkout_repository.finish(jobs)
+        return response
@@ -1,9 +1,15 @@
-from core.domain.entities.order import Order
-from core.domain.repositories.order_repository import OrderRepository
+from core.domain.entities.order import ORDER_PENDING, ORDER_STATUSES, Order, OrderItem, validate_status_transition
+from core.domain.repositories.order_repository import OrderFilter, OrderRepository, StatusTransitionResult
+from core.domain.repositories.pagination import CursorPage
+from core.domain.repositories.product_repository import ProductRepository
+from core.domain.repositories.user_repository import UserRepository
+from core.interfaces.usecase.reservation_usecase import OrderStockReserver
 from core.domain.entities.product import Product
 from core.domain.entities.user import User
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
 
 @dataclass
 class CreateOrderRequest:
@@ -11,7 +17,7 @@ class CreateOrderRequest:
     product: Product
     quantity: int
     subtotal: float
-    status: str
+    status: str = ORDER_PENDING
 
 @dataclass
 class CreateOrderResponse:
@@ -21,27 +27,44 @@ class CreateOrderResponse:
     quantity: int
     subtotal: float
     status: str
+    created_at: Optional[datetime] = None
     
 class CreateOrderUseCase:
-    def __init__(self, order_repository: OrderRepository):
+    """
+    Caso de uso responsável por criar um pedido.
+
+    Com um `OrderStockReserver`, o estoque do pedido pendente é reservado na
+    mesma transação da gravação.
+    A idempotência (`Idempotency-Key`) fica na camada HTTP, que guarda a resposta inteira.
+    """
+    def __init__(self, order_repository: OrderRepository, stock_reserver: Optional[OrderStockReserver] = None):
         self.order_repository = order_repository
+        self.stock_reserver = stock_reserver
     
     def execute(self, request: CreateOrderRequest) -> CreateOrderResponse:
+        """
+        Raises:
+            ValueError: Se não houver estoque para reservar.
+        """
         order = Order(
             owner=request.owner,
             product=request.product,
             quantity=request.quantity,
-            subtotal=request.subtotal
+            subtotal=request.subtotal,
+            status=request.status
         )
-        create_order = self.order_repository.create(order)
-        
+        if self.stock_reserver is not None:
+            create_order = self.order_repository.create(order, reserve=self.stock_reserver.hold)
+        else:
+            create_order = self.order_repository.create(order)
         return CreateOrderResponse(
             order_id=create_order.order_id,
-            owner=create_order.owner,
+            owner=create_order.owner_id,
             product=create_order.product,
             quantity=create_order.quantity,
             subtotal=create_order.subtotal,
             status = create_order.status,
+            created_at=create_order.created_at,
         )
 
 
@@ -54,10 +77,19 @@ class ListOrdersRequest:
         offset (int): Posição inicial da listagem.
         limit (int): Quantidade máxima de pedidos a retornar.
         search_query (str | None): Termo de busca opcional.
+        owner_id (str | None): Lista apenas os pedidos deste usuário. Para quem
+            não é administrador, é sempre o próprio usuário.
+        status (str | None): Lista apenas os pedidos neste status.
+        use_cursor (bool): Usa paginação por cursor (keyset) em vez de offset.
+        cursor (str | None): Cursor opaco retornado por uma página anterior.
     """
     offset: int = 0
     limit: int = 10
     search_query: str | None = None
+    owner_id: str | None = None
+    status: str | None = None
+    use_cursor: bool = False
+    cursor: str | None = None
 
 @dataclass
 class ListOrdersResponse:
@@ -66,14 +98,18 @@ class ListOrdersResponse:
 
     Attributes:
         orders (list[CreateOrderResponse]): Lista de pedidos encontrados.
-        total_items (int): Total de pedidos disponíveis.
+        total_items (int | None): Total de pedidos disponíveis; None na paginação por cursor.
         offset (int): Posição inicial da listagem.
         limit (int): Quantidade máxima de pedidos retornados.
+        next_cursor (str | None): Cursor da próxima página (paginação por cursor).
+        prev_cursor (str | None): Cursor da página anterior (paginação por cursor).
     """
     orders: List[CreateOrderResponse]
-    total_items: int
+    total_items: int | None
     offset: int
     limit: int
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
 
 class ListOrderUseCase:
     """
@@ -104,33 +140,296 @@ class ListOrderUseCase:
 
     Raises:
         PermissionError: Se o usuário tentar acessar pedidos que não tem permissão para ver.
+        ValueError: Se o status ou o cursor forem inválidos.
         """
+        owner_id = request.owner_id
+        if not current_user.is_admin():
+            owner_id = current_user.id
+        if request.status is not None and request.status not in ORDER_STATUSES:
+            raise ValueError("Status inválido")
+        if request.use_cursor or request.cursor:
+            return self._execute_cursor(request, owner_id, current_user)
+
         orders_domain, total_items = self.order_repository.get_all_paginated_filtered(
             offset=request.offset,
             limit=request.limit,
-            search_query=request.search_query
+            search_query=request.search_query,
+            owner_id=owner_id,
+            status=request.status
         )
         
         visible_orders = [
             order for order in orders_domain
-            if current_user.can_view_orders(order.owner)
+            if current_user.can_view_orders(order.owner_id)
 ]
-        
-        orders_response = [
-            CreateOrderResponse(
-                order_id=order.order_id,
-                owner=order.owner,
-                product=order.product.name,
-                quantity=order.quantity,
-                subtotal=order.get_subtotal,
-                status = order.status,
-            ) for order in visible_orders
-        ]
 
         return ListOrdersResponse(
-            orders=orders_response,
-            total_items=len (visible_orders),
+            orders=[self._to_response(order) for order in visible_orders],
+            total_items=total_items - (len(orders_domain) - len(visible_orders)),
             offset=request.offset,
             limit=request.limit
         )
 
+    def _execute_cursor(self, request: ListOrdersRequest, owner_id: str | None,
+                        current_user: User) -> ListOrdersResponse:
+        """Listagem por cursor, do pedido mais recente ao mais antigo, sem contagem."""
+        page: CursorPage[Order] = self.order_repository.get_all_cursor_paginated(
+            limit=request.limit,
+            cursor=request.cursor,
+            owner_id=owner_id,
+            status=request.status
+        )
+        return ListOrdersResponse(
+            orders=[
+                self._to_response(order) for order in page.items
+                if current_user.can_view_orders(order.owner_id)
+            ],
+            total_items=None,
+            offset=0,
+            limit=request.limit,
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor
+        )
+
+    @staticmethod
+    def _to_response(order: Order) -> CreateOrderResponse:
+        return CreateOrderResponse(
+            order_id=order.order_id,
+            owner=order.owner_id,
+            product=", ".join(item.product_name or item.product_id for item in order.items),
+            quantity=sum(item.quantity for item in order.items),
+            subtotal=order.get_subtotal,
+            status = order.status,
+            created_at=order.created_at,
+        )
+
+
+@dataclass
+class GetOrderRequest:
+    """
+    DTO de entrada para busca de um pedido.
+
+    Attributes:
+        order_id (str): Identificador do pedido.
+    """
+    order_id: str
+
+class GetOrderUseCase:
+    """
+    Caso de uso responsável por buscar um pedido, visível apenas ao dono e a administradores.
+    """
+    def __init__(self, order_repository: OrderRepository):
+        """
+        Inicializa o caso de uso com a dependência do repositório de pedidos.
+
+        Args:
+            order_repository (OrderRepository): Repositório de pedidos.
+        """
+        self.order_repository = order_repository
+
+    def execute(self, request: GetOrderRequest, current_user: User) -> Order:
+        """
+        Executa a busca do pedido.
+
+        Raises:
+            ValueError: Se o pedido não existir.
+            PermissionError: Se o usuário não for o dono nem administrador.
+        """
+        order = self.order_repository.get_by_order_id(request.order_id)
+        if not current_user.can_view_orders(order.owner_id):
+            raise PermissionError("Você não tem permissão para ver este pedido.")
+        return order
+
+
+@dataclass
+class OrderBatchItem:
+    """
+    Item de uma criação de pedidos em lote.
+
+    Attributes:
+        product_id (str): Produto do pedido.
+        quantity (int): Quantidade.
+        owner_id (str | None): Dono do pedido; None usa o usuário atual.
+    """
+    product_id: str
+    quantity: int
+    owner_id: Optional[str] = None
+
+@dataclass
+class CreateOrdersBatchRequest:
+    """
+    DTO de entrada para criação de pedidos em lote.
+
+    Attributes:
+        items (list[OrderBatchItem]): Pedidos a criar, na ordem de entrada.
+    """
+    items: List[OrderBatchItem]
+
+@dataclass
+class OrderBatchResult:
+    """
+    Resultado de um item do lote: o pedido criado ou o motivo da rejeição.
+
+    Attributes:
+        index (int): Posição do item na requisição.
+        order (Order | None): Pedido criado.
+        error (str | None): Motivo da rejeição.
+    """
+    index: int
+    order: Optional[Order] = None
+    error: Optional[str] = None
+
+@dataclass
+class CreateOrdersBatchResponse:
+    """
+    DTO de saída da criação de pedidos em lote.
+
+    Attributes:
+        created (int): Quantidade de pedidos criados.
+        failed (int): Quantidade de itens rejeitados.
+        results (list[OrderBatchResult]): Resultado de cada item, na ordem de entrada.
+    """
+    created: int = 0
+    failed: int = 0
+    results: List[OrderBatchResult] = field(default_factory=list)
+
+class CreateOrdersBatchUseCase:
+    """
+    Caso de uso responsável por criar vários pedidos de uma vez.
+
+    Donos e produtos são buscados com uma consulta cada, o subtotal é
+    calculado a partir do preço atual e todos os pedidos válidos são gravados
+    em uma única transação. Itens inválidos são reportados sem impedir os demais.
+    """
+    def __init__(self, order_repository: OrderRepository, product_repository: ProductRepository,
+                 user_repository: UserRepository, stock_reserver: Optional[OrderStockReserver] = None):
+        """
+        Inicializa o caso de uso com as dependências dos repositórios.
+
+        Args:
+            order_repository (OrderRepository): Repositório de pedidos.
+            product_repository (ProductRepository): Repositório de produtos.
+            user_repository (UserRepository): Repositório de usuários.
+            stock_reserver (OrderStockReserver | None): Reserva o estoque de cada
+                pedido; itens sem estoque são rejeitados.
+        """
+        self.order_repository = order_repository
+        self.product_repository = product_repository
+        self.user_repository = user_repository
+        self.stock_reserver = stock_reserver
+
+    def execute(self, request: CreateOrdersBatchRequest, current_user: User) -> CreateOrdersBatchResponse:
+        """
+        Executa a criação em lote.
+
+        Args:
+            request (CreateOrdersBatchRequest): Pedidos a criar.
+            current_user (User): Usuário que está realizando a operação.
+
+        Returns:
+            CreateOrdersBatchResponse: Totais e resultado de cada item.
+
+        Raises:
+            PermissionError: Se um usuário comum tentar criar pedidos para outro dono.
+        """
+        owner_ids = {item.owner_id or current_user.id for item in request.items}
+        if not current_user.is_admin() and owner_ids - {current_user.id}:
+            raise PermissionError("Apenas administradores podem criar pedidos para outros usuários.")
+
+        products = {
+            product.id: product
+            for product in self.product_repository.get_by_ids(list({item.product_id for item in request.items}))
+        }
+        known_owners = {current_user.id} if owner_ids == {current_user.id} else {
+            user.id for user in self.user_repository.get_by_ids(list(owner_ids))
+        }
+
+        response = CreateOrdersBatchResponse()
+        orders = []
+        for index, item in enumerate(request.items):
+            owner_id = item.owner_id or current_user.id
+            product = products.get(item.product_id)
+            if owner_id not in known_owners:
+                error = "Usuário não encontrado"
+            elif product is None:
+                error = "Produto não encontrado"
+            elif not product.is_active:
+                error = "Produto inativo"
+            elif item.quantity <= 0:
+                error = "Quantidade inválida"
+            else:
+                error = None
+
+            if error:
+                response.results.append(OrderBatchResult(index=index, error=error))
+                continue
+            unit_price = Decimal(str(product.price))
+            order = Order(
+                owner=owner_id,
+                product=product,
+                quantity=item.quantity,
+                subtotal=(unit_price * item.quantity).quantize(Decimal("0.01")),
+                items=[OrderItem(
+                    product_id=product.id,
+                    quantity=item.quantity,
+                    unit_price=unit_price,
+                    product_name=product.name,
+                )],
+            )
+            orders.append(order)
+            response.results.append(OrderBatchResult(index=index, order=order))
+
+        if orders and self.stock_reserver is not None:
+            # Reserva e INSERT na mesma transação; pedidos sem estoque não são gravados.
+            stock_errors = {}
+
+            def reserve(batch):
+                stock_errors.update(self.stock_reserver.hold_many(batch))
+                return stock_errors
+
+            orders = self.order_repository.create_many(orders, reserve=reserve)
+            for result in response.results:
+                if result.order is not None and result.order.order_id in stock_errors:
+                    result.error, result.order = stock_errors[result.order.order_id], None
+        elif orders:
+            self.order_repository.create_many(orders)
+        response.created = len(orders)
+        response.failed = len(request.items) - len(orders)
+        return response
+
+
+
+@dataclass
+class BulkTransitionOrdersRequest:
+    """
+    DTO de entrada para a transição de status em lote.
+
+    Attributes:
+        from_status (str): Status atual dos pedidos a mover.
+        to_status (str): Novo status.
+        order_filter (OrderFilter): Seleção dos pedidos.
+    """
+    from_status: str
+    to_status: str
+    order_filter: OrderFilter = field(default_factory=OrderFilter)
+
+class BulkTransitionOrdersUseCase:
+    """
+    Caso de uso responsável por mover pedidos de um status para outro em lote
+    (apenas administradores).
+    """
+    def __init__(self, order_repository: OrderRepository):
+        self.order_repository = order_repository
+
+    def execute(self, request: BulkTransitionOrdersRequest, current_user: User) -> StatusTransitionResult:
+        """
+        Raises:
+            PermissionError: Se o usuário não for administrador.
+            ValueError: Se a transição não for permitida.
+        """
+        if not current_user.is_admin():
+            raise PermissionError("Apenas administradores podem alterar o status de pedidos em lote.")
+        validate_status_transition(request.from_status, request.to_status)
+        return self.order_repository.bulk_transition_status(
+            request.order_filter, request.from_status, request.to_status
+        )
@@ -1,7 +1,14 @@
 from core.domain.entities.product import Product
 from core.domain.entities.user import User
-from core.domain.repositories.product_repository import ProductRepository
-from dataclasses import dataclass
+from core.domain.repositories.product_repository import ProductPatch, ProductRepository
+from core.domain.repositories.pagination import (
+    COUNT_EXACT,
+    COUNT_NONE,
+    validate_count_strategy,
+)
+from core.interfaces.usecase.gateways import ProductSearchBackend
+from dataclasses import dataclass, field
+from typing import Iterable, List, Tuple
 from builtins import PermissionError
 
 
@@ -32,12 +39,14 @@ class CreateProductResponse:
         price (float): Preço do produto.
         stock (int): Quantidade disponível em estoque.
         is_active (bool): Indica se o produto está ativo no catálogo.
+        version (int): Versão do produto, incrementada a cada escrita.
     """
     id: str
     name: str
     price: float
     stock: int
     is_active: bool 
+    version: int = 1
 
 class CreateProductUseCase:
     """
@@ -99,10 +108,19 @@ class ListProductsRequest:
         offset (int): Posição inicial da listagem.
         limit (int): Quantidade máxima de produtos a retornar.
         search_query (str | None): Termo de busca opcional.
+        use_cursor (bool): Usa paginação por cursor (keyset) em vez de offset.
+        cursor (str | None): Cursor opaco retornado por uma página anterior.
+        include_total (bool): Na paginação por cursor, também conta o total de itens.
+        count_strategy (str | None): Na paginação por offset, como obter o total
+            ("exact", "cached", "estimated" ou "none"). None usa o padrão configurado.
     """
     offset: int = 0
     limit: int = 10
     search_query: str | None = None
+    use_cursor: bool = False
+    cursor: str | None = None
+    include_total: bool = False
+    count_strategy: str | None = None
 
 
 @dataclass
@@ -112,14 +130,22 @@ class ListProductsResponse:
 
     Attributes:
         products (list[CreateProductResponse]): Lista de produtos encontrados.
-        total_items (int): Total de produtos disponíveis.
+        total_items (int | None): Total de produtos disponíveis, quando calculado.
         offset (int): Posição inicial da listagem.
         limit (int): Quantidade máxima de produtos retornados.
+        next_cursor (str | None): Cursor da próxima página (paginação por cursor).
+        prev_cursor (str | None): Cursor da página anterior (paginação por cursor).
+        has_next (bool): Indica se há produtos depois desta página.
+        count_strategy (str): Estratégia que produziu `total_items`.
     """
     products: list[CreateProductResponse]
-    total_items: int
+    total_items: int | None
     offset: int
     limit: int
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    has_next: bool = False
+    count_strategy: str = COUNT_EXACT
 
 class ListProductsUseCase:
     """
@@ -127,15 +153,23 @@ class ListProductsUseCase:
 
     Utiliza os parâmetros fornecidos em ListProductsRequest para buscar os produtos
 no repositório e retorna os resultados em ListProductsResponse.
+    Quando há um backend de busca, o termo de busca é resolvido por ele e os
+    produtos são retornados na ordem de relevância. A relevância não tem
+    cursor estável, então busca com paginação por cursor é recusada. O backend
+    conta os resultados de forma exata: com "none" a contagem é pulada, e
+    "cached" ou "estimated" viram "exact" (informado em `count_strategy`).
     """
-    def __init__(self, product_repository: ProductRepository):
+    def __init__(self, product_repository: ProductRepository,
+                 search_backend: ProductSearchBackend | None = None):
         """
         Inicializa o caso de uso com a dependência do repositório de produtos.
 
         Args:
             product_repository (ProductRepository): Repositório de produtos.
+            search_backend (ProductSearchBackend | None): Backend de busca textual opcional.
         """
         self.product_repository = product_repository
+        self.search_backend = search_backend
     
     def execute(self, request: ListProductsRequest) -> ListProductsResponse:
         """
@@ -146,12 +180,44 @@ no repositório e retorna os resultados em ListProductsResponse.
 
         Returns:
             ListProductsResponse: Lista de produtos e metadados de paginação.
+
+        Raises:
+            ValueError: Se o cursor ou a estratégia de contagem forem inválidos,
+                ou se houver busca por relevância com paginação por cursor.
         """
-        product_domain, total_items = self.product_repository.get_all_paginated_filtered(
-            offset=request.offset,
-            limit=request.limit,
-            search_query=request.search_query
-        )
+        ranked_search = bool(request.search_query) and self.search_backend is not None
+        if request.use_cursor or request.cursor:
+            if ranked_search:
+                raise ValueError("Busca não suporta paginação por cursor; use offset e limit")
+            return self._execute_cursor(request)
+        if request.count_strategy is not None:
+            validate_count_strategy(request.count_strategy)
+
+        if ranked_search:
+            with_total = request.count_strategy != COUNT_NONE
+            # Sem total, um item a mais indica se há próxima página.
+            product_ids, total_items = self.search_backend.search(
+                request.search_query, offset=request.offset,
+                limit=request.limit if with_total else request.limit + 1,
+                with_total=with_total
+            )
+            if with_total:
+                has_next = request.offset + len(product_ids) < total_items
+                count_strategy = COUNT_EXACT
+            else:
+                has_next = len(product_ids) > request.limit
+                product_ids, total_items = product_ids[:request.limit], None
+                count_strategy = COUNT_NONE
+            product_domain = self.product_repository.get_by_ids(product_ids)
+        else:
+            page = self.product_repository.get_all_paginated_filtered(
+                offset=request.offset,
+                limit=request.limit,
+                search_query=request.search_query,
+                count_strategy=request.count_strategy
+            )
+            product_domain, total_items = page.items, page.total_items
+            has_next, count_strategy = page.has_next, page.count_strategy
         product_response = [
             CreateProductResponse(
                 id=product.id,
@@ -166,7 +232,38 @@ no repositório e retorna os resultados em ListProductsResponse.
             products=product_response,
             total_items=total_items,
             offset=request.offset,
-            limit=request.limit
+            limit=request.limit,
+            has_next=has_next,
+            count_strategy=count_strategy
+        )
+
+    def _execute_cursor(self, request: ListProductsRequest) -> ListProductsResponse:
+        """Listagem por cursor: custo constante por página, total apenas se pedido."""
+        page = self.product_repository.get_all_cursor_paginated(
+            limit=request.limit,
+            cursor=request.cursor,
+            search_query=request.search_query,
+            include_total=request.include_total
+        )
+        product_response = [
+            CreateProductResponse(
+                id=product.id,
+                name=product.name,
+                price=product.price,
+                stock=product.stock,
+                is_active=product.is_active
+            ) for product in page.items
+        ]
+
+        return ListProductsResponse(
+            products=product_response,
+            total_items=page.total_items,
+            offset=0,
+            limit=request.limit,
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+            has_next=page.next_cursor is not None,
+            count_strategy=COUNT_EXACT if request.include_total else COUNT_NONE
         )
 
 @dataclass
@@ -218,5 +315,168 @@ class GetProductByIdUseCase:
                 name=product.name,
                 price=product.price,
                 stock=product.stock,
-                is_active=product.is_active
-    )
\ No newline at end of file
+                is_active=product.is_active,
+                version=product.version
+    )
+
+
+@dataclass
+class BulkUpdateProductsRequest:
+    """
+    DTO de entrada para atualização parcial de produtos em lote.
+
+    Attributes:
+        patches (list[ProductPatch]): Alterações a aplicar. Para ids repetidos,
+            os campos do item mais recente prevalecem.
+    """
+    patches: List[ProductPatch]
+
+@dataclass
+class BulkUpdateProductsResponse:
+    """
+    DTO de saída da atualização em lote.
+
+    Attributes:
+        updated (int): Quantidade de produtos atualizados.
+        missing (list[str]): Ids que não correspondem a nenhum produto.
+    """
+    updated: int
+    missing: List[str]
+
+class BulkUpdateProductsUseCase:
+    """
+    Caso de uso responsável por alterar preço, estoque e status de vários
+    produtos de uma vez, em uma única transação.
+    """
+    def __init__(self, product_repository: ProductRepository):
+        """
+        Inicializa o caso de uso com a dependência do repositório de produtos.
+
+        Args:
+            product_repository (ProductRepository): Repositório de produtos.
+        """
+        self.product_repository = product_repository
+
+    def execute(self, request: BulkUpdateProductsRequest, current_user: User) -> BulkUpdateProductsResponse:
+        """
+        Executa a atualização em lote.
+
+        Args:
+            request (BulkUpdateProductsRequest): Alterações a aplicar.
+            current_user (User): Usuário que está realizando a operação (somente administradores).
+
+        Returns:
+            BulkUpdateProductsResponse: Total atualizado e ids não encontrados.
+
+        Raises:
+            PermissionError: Se o usuário não tiver permissão para gerenciar produtos.
+            ValueError: Se nenhuma alteração for informada.
+        """
+        if not current_user.can_manager_products():
+            raise PermissionError("Apenas administradores podem atualizar produtos.")
+        if not request.patches:
+            raise ValueError("Nenhuma alteração informada")
+
+        merged: dict[str, ProductPatch] = {}
+        for patch in request.patches:
+            product_id = str(patch.id)
+            current = merged.setdefault(product_id, ProductPatch(id=product_id))
+            for field_name in ("price", "stock", "is_active"):
+                value = getattr(patch, field_name)
+                if value is not None:
+                    setattr(current, field_name, value)
+
+        updated, missing = self.product_repository.bulk_update(list(merged.values()))
+        return BulkUpdateProductsResponse(updated=updated, missing=missing)
+
+
+@dataclass
+class ProductImportError:
+    """
+    Erro de uma linha do arquivo importado.
+
+    Attributes:
+        line (int): Número da linha no arquivo de origem.
+        error (str): Motivo da rejeição.
+    """
+    line: int
+    error: str
+
+@dataclass
+class ImportProductsRequest:
+    """
+    DTO de entrada para importação de produtos em lote.
+
+    Attributes:
+        batches (Iterable[list[tuple[int, Product | str]]]): Lotes já validados.
+            Cada item é (linha, Product) ou (linha, mensagem de erro).
+    """
+    batches: Iterable[List[Tuple[int, Product | str]]]
+
+@dataclass
+class ImportProductsResponse:
+    """
+    DTO de saída da importação de produtos em lote.
+
+    Attributes:
+        created (int): Quantidade de produtos criados.
+        failed (int): Quantidade de linhas rejeitadas.
+        errors (list[ProductImportError]): Erros por linha (limitados a MAX_REPORTED_ERRORS).
+        errors_truncated (bool): Indica se há mais erros do que os listados.
+    """
+    created: int = 0
+    failed: int = 0
+    errors: List[ProductImportError] = field(default_factory=list)
+    errors_truncated: bool = False
+
+class ImportProductsUseCase:
+    """
+    Caso de uso responsável por importar produtos em lote.
+
+    Consome os lotes em sequência, grava cada um com `bulk_create` e acumula
+    os erros por linha sem interromper a importação.
+    """
+    MAX_REPORTED_ERRORS = 1000
+
+    def __init__(self, product_repository: ProductRepository):
+        """
+        Inicializa o caso de uso com a dependência do repositório de produtos.
+
+        Args:
+            product_repository (ProductRepository): Repositório de produtos.
+        """
+        self.product_repository = product_repository
+
+    def execute(self, request: ImportProductsRequest, current_user: User) -> ImportProductsResponse:
+        """
+        Executa a importação.
+
+        Args:
+            request (ImportProductsRequest): Lotes validados a importar.
+            current_user (User): Usuário que está realizando a operação (somente administradores).
+
+        Returns:
+            ImportProductsResponse: Totais e erros por linha.
+
+        Raises:
+            PermissionError: Se o usuário não tiver permissão para criar produtos.
+        """
+        if not current_user.can_manager_products():
+            raise PermissionError("Apenas administradores podem criar produtos.")
+
+        response = ImportProductsResponse()
+        for batch in request.batches:
+            products = [item for _, item in batch if isinstance(item, Product)]
+            errors = [(line, item) for line, item in batch if not isinstance(item, Product)]
+            if products:
+                try:
+                    response.created += self.product_repository.bulk_create(products)
+                except ValueError as e:
+                    errors.extend((line, str(e)) for line, item in batch if isinstance(item, Product))
+            response.failed += len(errors)
+            for line, error in sorted(errors):
+                if len(response.errors) < self.MAX_REPORTED_ERRORS:
+                    response.errors.append(ProductImportError(line=line, error=error))
+                else:
+                    response.errors_truncated = True
+        return response
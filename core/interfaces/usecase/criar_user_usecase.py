@@ -1,5 +1,6 @@
 from core.domain.entities.user import User
 from core.domain.repositories.user_repository import UserRepository
+from core.domain.repositories.pagination import COUNT_EXACT, validate_count_strategy
 from dataclasses import dataclass
 from core.interfaces.usecase.gateways import AuthGateway
 
@@ -77,13 +78,17 @@ class ListUsersRequest:
     offset: int = 0
     limit: int = 10
     search_query: str | None = None
+    # "exact", "cached", "estimated" ou "none"; None usa o padrão configurado.
+    count_strategy: str | None = None
     
 @dataclass
 class ListUsersResponse:
     users: list[CreateUserResponse]
-    total_items: int
+    total_items: int | None
     offset: int
     limit: int
+    has_next: bool = False
+    count_strategy: str = COUNT_EXACT
 
 
 class ListUsersUseCase:
@@ -108,11 +113,17 @@ class ListUsersUseCase:
 
         Returns:
             ListUsersResponse: Lista de usuários e metadados de paginação.
+
+        Raises:
+            ValueError: Se a estratégia de contagem for inválida.
         """
-        users_domain, total_items = self.user_repository.get_all_paginated_filtered(
+        if request.count_strategy is not None:
+            validate_count_strategy(request.count_strategy)
+        page = self.user_repository.get_all_paginated_filtered(
             offset=request.offset,
             limit=request.limit,
-            search_query=request.search_query
+            search_query=request.search_query,
+            count_strategy=request.count_strategy
         )
 
         users_response = [
@@ -125,14 +136,16 @@ class ListUsersUseCase:
                 is_staff=user.is_staff,
                 is_superuser=user.is_superuser
             )
-            for user in users_domain
+            for user in page.items
         ]
 
         return ListUsersResponse(
             users=users_response,
-            total_items=total_items,
+            total_items=page.total_items,
             offset=request.offset,
-            limit=request.limit
+            limit=request.limit,
+            has_next=page.has_next,
+            count_strategy=page.count_strategy
         )
 
 @dataclass
@@ -224,6 +237,12 @@ class LoginUserResponse:
 
 
 class LoginUserUseCase:
+    """
+    Autentica por e-mail e senha e emite os tokens.
+
+    O usuário é carregado uma única vez: a senha é conferida contra o hash
+    já lido (`verify_password`) e os tokens são emitidos pelo id.
+    """
     def __init__(self, user_repository: UserRepository, auth_gateway: AuthGateway):
         self.user_repository = user_repository
         self.auth_gateway = auth_gateway
@@ -234,10 +253,10 @@ class LoginUserUseCase:
         if not user:
             raise ValueError("Credenciais inválidas")
 
-        if not self.auth_gateway.check_password(user.id, request.password):
+        if not self.auth_gateway.verify_password(user, request.password):
             raise ValueError("Credenciais inválidas")
         
-        access_token, refresh_token = self.auth_gateway.create_tokens(user.id)
+        access_token, refresh_token = self.auth_gateway.create_tokens(user.id, user)
         
         return LoginUserResponse(
             id=user.id,
@@ -246,6 +265,32 @@ class LoginUserUseCase:
             refresh_token=refresh_token
         )
         
+@dataclass
+class RefreshTokenRequest:
+    refresh_token: str
+
+
+class RefreshTokenUseCase:
+    """
+    Renova os tokens a partir do refresh token emitido no login.
+
+    Sem verificação de senha (e sem o custo do hash): o refresh token é
+    trocado por um novo par e não pode ser usado de novo.
+    """
+    def __init__(self, auth_gateway: AuthGateway):
+        self.auth_gateway = auth_gateway
+
+    def execute(self, request: RefreshTokenRequest) -> LoginUserResponse:
+        if not request.refresh_token:
+            raise ValueError("Refresh token inválido ou expirado")
+        user, access_token, refresh_token = self.auth_gateway.refresh_tokens(request.refresh_token)
+        return LoginUserResponse(
+            id=user.id,
+            email=user.email,
+            access_token=access_token,
+            refresh_token=refresh_token
+        )
+
 @dataclass
 class ChangeUserPasswordRequest:
     user_id: str
@@ -1,11 +1,23 @@
 from abc import ABC, abstractmethod
-from typing import Tuple
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+from core.domain.entities.product import Product
+from core.domain.entities.user import User
 
 class AuthGateway (ABC):
     @abstractmethod
     def check_password(self, user_id: str, password: str) -> bool:
         """Verifica se a senha está correta"""
         pass
+
+    def verify_password(self, user: User, password: str) -> bool:
+        """Verifica a senha de um usuário já carregado.
+
+        Implementações podem conferir direto contra `user.password` (o hash)
+        sem buscar o usuário de novo; o padrão delega a `check_password`.
+        """
+        return self.check_password(user.id, password)
     
     @abstractmethod
     def set_password(self, user_id: str, new_password: str) -> None:
@@ -13,6 +25,146 @@ class AuthGateway (ABC):
         pass
     
     @abstractmethod
-    def create_tokens(self, user_id: str) -> Tuple[str, str]:
-        """Cria tokens de acesso e refresh"""
-        pass
\ No newline at end of file
+    def create_tokens(self, user_id: str, user: Optional[User] = None) -> Tuple[str, str]:
+        """Cria tokens de acesso e refresh (substituindo os anteriores do usuário).
+
+        `user`, quando o chamador já o carregou, evita uma nova leitura.
+        """
+        pass
+
+    @abstractmethod
+    def refresh_tokens(self, refresh_token: str) -> Tuple[User, str, str]:
+        """Troca um refresh token válido por um novo par (o antigo deixa de valer).
+
+        Não verifica senha: o refresh token é a credencial.
+
+        Raises:
+            ValueError: Se o refresh token não existir, tiver expirado ou já
+                tiver sido usado, ou se o usuário estiver inativo.
+        """
+        pass
+
+
+class ProductSearchBackend(ABC):
+    """
+    Porta de busca textual de produtos.
+
+    As implementações mantêm um índice próprio (ou delegam ao banco) e devem
+    ser notificadas pelo repositório a cada criação, atualização e remoção.
+    """
+    @abstractmethod
+    def index(self, product: Product) -> None:
+        """Indexa (ou reindexa) um produto"""
+        pass
+
+    def index_many(self, products: List[Product]) -> None:
+        """Indexa vários produtos; implementações podem otimizar em lote"""
+        for product in products:
+            self.index(product)
+
+    @abstractmethod
+    def remove(self, product_id: str) -> None:
+        """Remove um produto do índice"""
+        pass
+
+    @abstractmethod
+    def rebuild(self) -> None:
+        """Reconstrói o índice inteiro a partir da fonte de dados"""
+        pass
+
+    @abstractmethod
+    def search(self, query: str, offset: int, limit: int,
+               with_total: bool = True) -> Tuple[List[str], Optional[int]]:
+        """
+        Retorna os ids ordenados por relevância e o total de resultados.
+        Com `with_total=False` o total não é contado e pode vir None.
+        """
+        pass
+
+
+@dataclass
+class IdempotencyRecord:
+    """
+    Registro de uma chave de idempotência.
+
+    Attributes:
+        key (str): Hash da chave (escopo + `Idempotency-Key`).
+        fingerprint (str): Hash da requisição original.
+        locked_at (datetime): Início da execução que detém a chave.
+        expires_at (datetime): A partir de quando a chave pode ser descartada.
+        status_code (int | None): Status do resultado; None enquanto em execução.
+        body (Any): Corpo do resultado guardado.
+    """
+    key: str
+    fingerprint: str
+    locked_at: datetime
+    expires_at: datetime
+    status_code: Optional[int] = None
+    body: Any = None
+
+    @property
+    def completed(self) -> bool:
+        return self.status_code is not None
+
+
+class IdempotencyStore(ABC):
+    """
+    Porta de armazenamento das chaves de idempotência.
+
+    `acquire` precisa ser atômico: entre execuções concorrentes com a mesma
+    chave, apenas uma recebe None.
+    """
+    @abstractmethod
+    def acquire(self, key: str, fingerprint: str, now: datetime, expires_at: datetime,
+                stale_before: datetime) -> Optional[IdempotencyRecord]:
+        """Reserva a chave; retorna None se reservou ou o registro existente.
+
+        Registros expirados ou em execução desde antes de `stale_before`
+        (execução abandonada) são tomados pela nova execução.
+        """
+        pass
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[IdempotencyRecord]:
+        """Busca o registro de uma chave"""
+        pass
+
+    @abstractmethod
+    def run_and_complete(self, key: str, action: Callable[[], Tuple[int, Any]]) -> Tuple[int, Any]:
+        """Executa `action` e guarda o resultado na chave na mesma transação.
+
+        As escritas da ação e o resultado são gravados juntos: uma falha entre
+        os dois não deixa a ação feita com a chave ainda sem resultado.
+        """
+        pass
+
+    @abstractmethod
+    def release(self, key: str) -> None:
+        """Libera a chave sem resultado, p.ex. quando a execução falhou"""
+        pass
+
+    @abstractmethod
+    def purge_expired(self, now: datetime) -> int:
+        """Remove registros expirados e retorna quantos foram removidos"""
+        pass
+
+
+class TokenSigner(ABC):
+    """
+    Porta de assinatura de tokens opacos (p.ex. cotações de carrinho).
+
+    O conteúdo não é secreto, mas não pode ser alterado pelo cliente.
+    """
+    @abstractmethod
+    def sign(self, payload: dict) -> str:
+        """Serializa e assina o conteúdo"""
+        pass
+
+    @abstractmethod
+    def unsign(self, token: str) -> dict:
+        """Verifica a assinatura e retorna o conteúdo.
+
+        Raises:
+            ValueError: Se o token for inválido ou tiver sido alterado.
+        """
+        pass
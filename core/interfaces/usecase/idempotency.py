@@ -0,0 +1,103 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Tuple
+
+from core.interfaces.usecase.gateways import IdempotencyStore
+
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+class IdempotencyInProgress(Exception):
+    """A mesma chave ainda está em execução."""
+
+
+class IdempotencyKeyReused(ValueError):
+    """A chave já foi usada com uma requisição diferente."""
+
+
+@dataclass
+class IdempotentResult:
+    """
+    Resultado de uma execução idempotente.
+
+    Attributes:
+        status_code (int): Status do resultado.
+        body (Any): Corpo do resultado.
+        replayed (bool): True quando veio do registro de uma execução anterior.
+    """
+    status_code: int
+    body: Any
+    replayed: bool = False
+
+
+def fingerprint(payload: Any) -> str:
+    """Hash estável da requisição (JSON com chaves ordenadas)."""
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class IdempotencyGuard:
+    """
+    Executa uma ação no máximo uma vez por chave de idempotência.
+
+    A primeira execução reserva a chave e guarda o resultado na mesma
+    transação da ação; repetições recebem o resultado guardado sem executar a
+    ação de novo. Repetições que chegam enquanto a primeira ainda executa
+    recebem `IdempotencyInProgress` na hora (o cliente tenta de novo depois).
+    """
+    def __init__(self, store: IdempotencyStore, ttl_seconds: int = 86_400, lock_timeout_seconds: int = 60,
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        """
+        Args:
+            store (IdempotencyStore): Armazenamento das chaves.
+            ttl_seconds (int): Por quanto tempo um resultado é reaproveitado.
+            lock_timeout_seconds (int): Depois disso, uma execução sem resultado é
+                considerada abandonada e a chave pode ser tomada.
+        """
+        self.store = store
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.lock_timeout = timedelta(seconds=lock_timeout_seconds)
+        self._clock = clock
+
+    @staticmethod
+    def scoped_key(scope: str, key: str) -> str:
+        """Hash de tamanho fixo para a chave, isolada por escopo (p.ex. usuário e operação).
+
+        Raises:
+            ValueError: Se a chave for vazia ou longa demais.
+        """
+        if not key or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            raise ValueError("Idempotency-Key inválida")
+        return hashlib.sha256(f"{scope}\0{key}".encode()).hexdigest()
+
+    def run(self, key: str, request_fingerprint: str,
+            action: Callable[[], Tuple[int, Any]]) -> IdempotentResult:
+        """
+        Executa `action` (que retorna `(status_code, body)`) ou devolve o resultado guardado.
+
+        Se `action` levantar uma exceção, a chave é liberada e nada é guardado.
+
+        Raises:
+            IdempotencyKeyReused: Se a chave já foi usada com outra requisição.
+            IdempotencyInProgress: Se a execução original ainda não terminou.
+        """
+        now = self._clock()
+        record = self.store.acquire(
+            key, request_fingerprint, now=now, expires_at=now + self.ttl,
+            stale_before=now - self.lock_timeout,
+        )
+        if record is not None:
+            if record.fingerprint != request_fingerprint:
+                raise IdempotencyKeyReused("Idempotency-Key já usada com outra requisição")
+            if record.completed:
+                return IdempotentResult(record.status_code, record.body, replayed=True)
+            raise IdempotencyInProgress("Requisição com esta Idempotency-Key ainda em processamento")
+
+        try:
+            status_code, body = self.store.run_and_complete(key, action)
+        except BaseException:
+            self.store.release(key)
+            raise
+        return IdempotentResult(status_code, body)
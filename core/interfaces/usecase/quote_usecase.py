@@ -0,0 +1,201 @@
+from core.domain.entities.order import Order, OrderItem
+from core.domain.entities.user import User
+from core.domain.repositories.order_repository import OrderRepository
+from core.domain.repositories.product_repository import ProductRepository
+from core.interfaces.usecase.gateways import TokenSigner
+from core.interfaces.usecase.reservation_usecase import OrderStockReserver
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, List, Optional
+import uuid
+
+CENT = Decimal("0.01")
+
+
+@dataclass
+class CartLine:
+    """
+    Linha do carrinho enviada pelo cliente.
+
+    Attributes:
+        product_id (str): Produto.
+        quantity (int): Quantidade.
+    """
+    product_id: str
+    quantity: int
+
+@dataclass
+class QuoteCartRequest:
+    """
+    DTO de entrada da cotação de um carrinho.
+
+    Attributes:
+        owner_id (str): Usuário dono do carrinho.
+        lines (list[CartLine]): Linhas do carrinho; produtos repetidos são somados.
+    """
+    owner_id: str
+    lines: List[CartLine]
+
+@dataclass
+class QuoteLine:
+    """
+    Linha cotada: preço unitário congelado e total da linha.
+
+    Attributes:
+        product_id (str): Produto.
+        product_name (str): Nome do produto no momento da cotação.
+        quantity (int): Quantidade.
+        unit_price (Decimal): Preço unitário no momento da cotação.
+        line_total (Decimal): `unit_price * quantity`, arredondado ao centavo.
+    """
+    product_id: str
+    product_name: str
+    quantity: int
+    unit_price: Decimal
+    line_total: Decimal
+
+@dataclass
+class CartQuote:
+    """
+    DTO de saída da cotação.
+
+    Attributes:
+        lines (list[QuoteLine]): Linhas cotadas, na ordem do carrinho.
+        total (Decimal): Soma das linhas.
+        token (str): Token assinado com a cotação, aceito pelo checkout até `expires_at`.
+        expires_at (datetime): Validade da cotação.
+    """
+    lines: List[QuoteLine] = field(default_factory=list)
+    total: Decimal = Decimal("0.00")
+    token: str = ""
+    expires_at: datetime | None = None
+
+
+class QuoteCartUseCase:
+    """
+    Caso de uso responsável por precificar um carrinho.
+
+    Preços, estoque e status de todos os produtos vêm de uma única consulta
+    (`get_price_snapshots`); os totais são calculados com `Decimal`. O
+    resultado é assinado em um token para que o checkout reaproveite os
+    preços sem recalcular nem confiar em valores enviados pelo cliente.
+    """
+    def __init__(self, product_repository: ProductRepository, signer: TokenSigner, ttl_seconds: int = 900,
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        """
+        Args:
+            product_repository (ProductRepository): Repositório de produtos.
+            signer (TokenSigner): Assinatura do token da cotação.
+            ttl_seconds (int): Validade da cotação.
+        """
+        self.product_repository = product_repository
+        self.signer = signer
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._clock = clock
+
+    def execute(self, request: QuoteCartRequest) -> CartQuote:
+        """
+        Raises:
+            ValueError: Se o carrinho estiver vazio ou alguma linha for inválida
+                (produto inexistente ou inativo, quantidade inválida ou acima do estoque).
+        """
+        quantities: dict[str, int] = {}
+        for line in request.lines:
+            if line.quantity <= 0:
+                raise ValueError(f"Quantidade inválida para o produto {line.product_id}")
+            quantities[str(line.product_id)] = quantities.get(str(line.product_id), 0) + line.quantity
+        if not quantities:
+            raise ValueError("Carrinho vazio")
+
+        snapshots = {
+            snapshot.product_id: snapshot
+            for snapshot in self.product_repository.get_price_snapshots(list(quantities))
+        }
+        quote = CartQuote()
+        for product_id, quantity in quantities.items():
+            snapshot = snapshots.get(product_id)
+            if snapshot is None:
+                raise ValueError(f"Produto não encontrado: {product_id}")
+            if not snapshot.is_active:
+                raise ValueError(f"Produto inativo: {product_id}")
+            if snapshot.stock < quantity:
+                raise ValueError(f"Estoque insuficiente: {product_id}")
+            unit_price = Decimal(snapshot.unit_price).quantize(CENT)
+            quote.lines.append(QuoteLine(
+                product_id=product_id,
+                product_name=snapshot.name,
+                quantity=quantity,
+                unit_price=unit_price,
+                line_total=(unit_price * quantity).quantize(CENT),
+            ))
+        quote.total = sum((line.line_total for line in quote.lines), Decimal("0.00"))
+        quote.expires_at = self._clock() + self.ttl
+        quote.token = self.signer.sign({
+            "owner": str(request.owner_id),
+            "lines": [
+                [line.product_id, line.quantity, str(line.unit_price), line.product_name]
+                for line in quote.lines
+            ],
+            "total": str(quote.total),
+            "expires": quote.expires_at.timestamp(),
+            "jti": uuid.uuid4().hex,
+        })
+        return quote
+
+
+@dataclass
+class CheckoutQuoteRequest:
+    """
+    DTO de entrada do checkout a partir de uma cotação.
+
+    Attributes:
+        quote_token (str): Token retornado por `QuoteCartUseCase`.
+    """
+    quote_token: str
+
+class CheckoutQuoteUseCase:
+    """
+    Caso de uso responsável por criar o pedido a partir de uma cotação.
+
+    As linhas do pedido recebem os preços unitários congelados na cotação e o
+    subtotal é o total cotado; nenhum produto é relido. O `jti` da cotação vai
+    para o pedido (`quote_id`, único): o mesmo token não gera dois pedidos.
+    """
+    def __init__(self, order_repository: OrderRepository, signer: TokenSigner,
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+                 stock_reserver: Optional[OrderStockReserver] = None):
+        self.order_repository = order_repository
+        self.signer = signer
+        self._clock = clock
+        self.stock_reserver = stock_reserver
+
+    def execute(self, request: CheckoutQuoteRequest, current_user: User) -> Order:
+        """
+        Raises:
+            ValueError: Se o token for inválido, a cotação tiver expirado ou
+                já tiver sido usada, ou não houver estoque para reservar.
+            PermissionError: Se a cotação for de outro usuário.
+        """
+        payload = self.signer.unsign(request.quote_token)
+        if payload["expires"] < self._clock().timestamp():
+            raise ValueError("Cotação expirada")
+        if payload["owner"] != str(current_user.id):
+            raise PermissionError("A cotação pertence a outro usuário.")
+        if not payload.get("jti"):
+            raise ValueError("Cotação inválida")
+
+        order = Order(
+            owner=payload["owner"],
+            subtotal=Decimal(payload["total"]),
+            items=[
+                OrderItem(product_id=product_id, quantity=quantity, unit_price=Decimal(unit_price),
+                          product_name=product_name)
+                for product_id, quantity, unit_price, product_name in payload["lines"]
+            ],
+            quote_id=payload["jti"],
+        )
+        order.quantity = sum(item.quantity for item in order.items)
+        if self.stock_reserver is not None:
+            return self.order_repository.create(order, reserve=self.stock_reserver.hold)
+        return self.order_repository.create(order)
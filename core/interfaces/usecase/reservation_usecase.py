@@ -0,0 +1,93 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+from core.domain.entities.order import ORDER_PENDING, Order
+from core.domain.repositories.stock_reservation_repository import ReservationSweepResult, StockReservationRepository
+
+
+class OrderStockReserver:
+    """
+    Reserva o estoque de pedidos pendentes por `ttl`.
+
+    Os casos de uso de criação passam `hold`/`hold_many` como `reserve` do
+    `OrderRepository`, que os executa na mesma transação do INSERT do pedido.
+    Se o pedido não for finalizado até a expiração, o sweeper devolve o estoque.
+    """
+    def __init__(self, repository: StockReservationRepository, ttl: timedelta,
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        self.repository = repository
+        self.ttl = ttl
+        self._clock = clock
+
+    def hold(self, order: Order) -> None:
+        """
+        Raises:
+            ValueError: Se algum produto do pedido não tiver estoque.
+        """
+        if order.status != ORDER_PENDING:
+            return
+        self.repository.hold(order.order_id, _quantities(order), self._clock() + self.ttl)
+
+    def hold_many(self, orders: List[Order]) -> Dict[str, str]:
+        """
+        Reserva os pedidos pendentes com um `hold_many` do repositório. Se
+        faltar estoque para o conjunto, tenta pedido a pedido para descobrir
+        quais não cabem.
+
+        Returns:
+            dict[str, str]: `{order_id: erro}` dos pedidos sem estoque.
+        """
+        pending = [order for order in orders if order.status == ORDER_PENDING]
+        if len(pending) > 1:
+            try:
+                self.repository.hold_many(
+                    {order.order_id: _quantities(order) for order in pending}, self._clock() + self.ttl
+                )
+                return {}
+            except ValueError:
+                pass
+        errors = {}
+        for order in pending:
+            try:
+                self.hold(order)
+            except ValueError as e:
+                errors[order.order_id] = str(e)
+        return errors
+
+
+def _quantities(order: Order) -> Dict[str, int]:
+    quantities = Counter()
+    for item in order.items:
+        quantities[item.product_id] += item.quantity
+    return dict(quantities)
+
+
+class SweepExpiredReservationsUseCase:
+    """
+    Caso de uso executado periodicamente: processa as reservas expiradas.
+
+    Cada execução roda no máximo `max_batches` lotes de `batch_size`
+    reservas, o que limita o trabalho (e o tempo de lock) por execução; o
+    que sobrar fica no `backlog` para a próxima.
+    """
+    def __init__(self, repository: StockReservationRepository, batch_size: int, max_batches: int,
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        self.repository = repository
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self._clock = clock
+
+    def execute(self) -> ReservationSweepResult:
+        now = self._clock()
+        result = ReservationSweepResult()
+        for _ in range(self.max_batches):
+            batch = self.repository.sweep_expired(now, self.batch_size)
+            result.batches += 1
+            result.processed += batch.processed
+            result.released += batch.released
+            result.expired_orders += batch.expired_orders
+            if batch.processed < self.batch_size:
+                break
+        result.backlog = self.repository.count_expired(now)
+        return result
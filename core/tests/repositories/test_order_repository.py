@@ -4,7 +4,7 @@ from core.domain.repositories.order_repository import OrderRepository
 class TestOrderRepository(unittest.TestCase):
     def setUp(self):
         class ConcreteOrderRepository(OrderRepository):
-            def create(self, order):
+            def create(self, order, reserve=None):
                 raise NotImplementedError
 
             def get_all(self):
@@ -16,6 +16,18 @@ class TestOrderRepository(unittest.TestCase):
             def get_by_order_id(self, order_id):
                 raise NotImplementedError
 
+            def create_many(self, orders, reserve=None):
+                raise NotImplementedError
+
+            def get_all_paginated_filtered(self, offset, limit, search_query=None, owner_id=None, status=None):
+                raise NotImplementedError
+
+            def get_all_cursor_paginated(self, limit, cursor=None, owner_id=None, status=None):
+                raise NotImplementedError
+
+            def bulk_transition_status(self, order_filter, from_status, to_status):
+                raise NotImplementedError
+
         self.repo = ConcreteOrderRepository()
 
     def test_create_raises_not_implemented(self):
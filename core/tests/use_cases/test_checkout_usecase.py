@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import Mock
+
+from core.domain.entities.checkout import CHECKOUT_DONE, CHECKOUT_FAILED, CheckoutJob
+from core.domain.entities.product import Product
+from core.domain.entities.user import User
+from core.interfaces.usecase.checkout_usecase import (
+    EnqueueCheckoutRequest,
+    EnqueueCheckoutUseCase,
+    GetCheckoutJobUseCase,
+    ProcessCheckoutBatchUseCase,
+)
+
+
+class TestEnqueueCheckoutUseCase(unittest.TestCase):
+    def setUp(self):
+        self.queue = Mock()
+        self.queue.enqueue.side_effect = lambda job: job
+        self.products = Mock()
+        self.use_case = EnqueueCheckoutUseCase(self.queue, self.products)
+
+    def test_enqueues_valid_request(self):
+        product = Product(name="Caneca", price=10.0, stock=5)
+        self.products.get_by_ids.return_value = [product]
+
+        job = self.use_case.execute(EnqueueCheckoutRequest(owner_id="u1", product_id=product.id, quantity=2))
+
+        self.assertEqual((job.owner_id, job.product_id, job.quantity), ("u1", product.id, 2))
+        self.queue.enqueue.assert_called_once()
+
+    def test_rejects_missing_product(self):
+        self.products.get_by_ids.return_value = []
+        with self.assertRaises(ValueError):
+            self.use_case.execute(EnqueueCheckoutRequest(owner_id="u1", product_id="x", quantity=1))
+        self.queue.enqueue.assert_not_called()
+
+
+class TestProcessCheckoutBatchUseCase(unittest.TestCase):
+    def test_creates_orders_and_records_failures(self):
+        active = Product(name="Caneca", price=10.0, stock=5)
+        inactive = Product(name="Antigo", price=1.0, stock=5, is_active=False)
+        jobs = [
+            CheckoutJob(owner_id="u1", product_id=active.id, quantity=2),
+            CheckoutJob(owner_id="u1", product_id=inactive.id, quantity=1),
+            CheckoutJob(owner_id="u1", product_id="removido", quantity=1),
+        ]
+        queue, orders, products = Mock(), Mock(), Mock()
+        queue.claim_batch.return_value = jobs
+        products.get_by_ids.return_value = [active, inactive]
+        orders.create.side_effect = lambda order: order
+
+        response = ProcessCheckoutBatchUseCase(queue, orders, products).execute(10)
+
+        self.assertEqual((response.claimed, response.created, response.failed), (3, 1, 2))
+        self.assertEqual([job.status for job in jobs], [CHECKOUT_DONE, CHECKOUT_FAILED, CHECKOUT_FAILED])
+        self.assertEqual(orders.create.call_args.args[0].subtotal, 20)
+        queue.finish.assert_called_once_with(jobs)
+        products.get_by_ids.assert_called_once()
+
+    def test_unexpected_errors_abort_the_batch(self):
+        product = Product(name="Caneca", price=10.0, stock=5)
+        queue, orders, products = Mock(), Mock(), Mock()
+        queue.claim_batch.return_value = [CheckoutJob(owner_id="u1", product_id=product.id, quantity=1)]
+        products.get_by_ids.return_value = [product]
+        orders.create.side_effect = RuntimeError("database is locked")
+
+        with self.assertRaises(RuntimeError):
+            ProcessCheckoutBatchUseCase(queue, orders, products).execute(10)
+        queue.finish.assert_not_called()
+
+    def test_empty_queue_does_nothing(self):
+        queue, orders, products = Mock(), Mock(), Mock()
+        queue.claim_batch.return_value = []
+
+        response = ProcessCheckoutBatchUseCase(queue, orders, products).execute(10)
+
+        self.assertEqual(response.claimed, 0)
+        queue.finish.assert_not_called()
+        products.get_by_ids.assert_not_called()
+
+
+class TestGetCheckoutJobUseCase(unittest.TestCase):
+    def test_only_owner_or_admin(self):
+        owner = User(email="a@example.com", first_name="A", last_name="B")
+        other = User(email="c@example.com", first_name="C", last_name="D")
+        queue = Mock()
+        queue.get_by_id.return_value = CheckoutJob(owner_id=owner.id, product_id="p", quantity=1)
+        use_case = GetCheckoutJobUseCase(queue)
+
+        self.assertEqual(use_case.execute("j", owner).owner_id, owner.id)
+        with self.assertRaises(PermissionError):
+            use_case.execute("j", other)
+        queue.get_by_id.return_value = None
+        with self.assertRaises(ValueError):
+            use_case.execute("j", owner)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,11 +2,13 @@ import unittest
 from unittest.mock import Mock, MagicMock
 from core.interfaces.usecase.criar_pedido_usecase import (
     CreateOrderUseCase, CreateOrderRequest, CreateOrderResponse,
-    ListOrderUseCase, ListOrdersRequest, ListOrdersResponse
+    ListOrderUseCase, ListOrdersRequest, ListOrdersResponse,
+    BulkTransitionOrdersRequest, BulkTransitionOrdersUseCase
 )
 from core.domain.entities.order import Order
 from core.domain.entities.product import Product
 from core.domain.entities.user import User
+from core.domain.repositories.pagination import CursorPage
 
 class TestCreateOrderUseCase(unittest.TestCase):
     def setUp(self):
@@ -62,7 +64,9 @@ class TestListOrderUseCase(unittest.TestCase):
         self.assertEqual(response.orders[0].order_id, "1")
         self.assertEqual(response.orders[0].product, "Prod1")  # name
         self.assertEqual(response.orders[0].subtotal, 10.0)  # get_subtotal
-        self.mock_repo.get_all_paginated_filtered.assert_called_once_with(offset=0, limit=10, search_query=None)
+        self.mock_repo.get_all_paginated_filtered.assert_called_once_with(
+            offset=0, limit=10, search_query=None, owner_id=None, status=None
+        )
 
     def test_execute_with_regular_user_filters_orders(self):
         request = ListOrdersRequest(offset=0, limit=10, search_query=None)
@@ -77,6 +81,49 @@ class TestListOrderUseCase(unittest.TestCase):
         self.assertEqual(len(response.orders), 1)  # Only own order
         self.assertEqual(response.orders[0].order_id, "1")
         self.assertEqual(response.total_items, 1)  # Filtered count
+        # Usuário comum sempre lista apenas os próprios pedidos, já no repositório.
+        self.mock_repo.get_all_paginated_filtered.assert_called_once_with(
+            offset=0, limit=10, search_query=None, owner_id=self.regular_user.id, status=None
+        )
+    def test_cursor_listing_is_scoped_to_regular_user(self):
+        request = ListOrdersRequest(limit=1, use_cursor=True, status="p")
+        orders = [
+            Order(order_id="1", owner=self.regular_user.id, product=Product(name="Prod1", price=10.0, stock=10), quantity=1, subtotal=10.0),
+        ]
+        self.mock_repo.get_all_cursor_paginated.return_value = CursorPage(items=orders, next_cursor="abc")
+
+        response = self.use_case.execute(request, self.regular_user)
+
+        self.assertEqual([order.order_id for order in response.orders], ["1"])
+        self.assertEqual(response.next_cursor, "abc")
+        self.assertIsNone(response.total_items)
+        self.mock_repo.get_all_cursor_paginated.assert_called_once_with(
+            limit=1, cursor=None, owner_id=self.regular_user.id, status="p"
+        )
+        self.mock_repo.get_all_paginated_filtered.assert_not_called()
+
+    def test_invalid_status_raises(self):
+        with self.assertRaises(ValueError):
+            self.use_case.execute(ListOrdersRequest(status="x"), self.admin_user)
+
+class TestBulkTransitionOrdersUseCase(unittest.TestCase):
+    def setUp(self):
+        self.mock_repo = Mock()
+        self.use_case = BulkTransitionOrdersUseCase(self.mock_repo)
+        self.admin_user = User(email="admin@example.com", first_name="Admin", last_name="User", is_staff=True, is_superuser=True)
+        self.regular_user = User(email="user@example.com", first_name="User", last_name="Test")
+
+    def test_allowed_transition_reaches_repository(self):
+        request = BulkTransitionOrdersRequest(from_status="p", to_status="F")
+        self.use_case.execute(request, self.admin_user)
+        self.mock_repo.bulk_transition_status.assert_called_once_with(request.order_filter, "p", "F")
+
+    def test_rejects_illegal_transition_and_regular_user(self):
+        with self.assertRaises(ValueError):
+            self.use_case.execute(BulkTransitionOrdersRequest(from_status="F", to_status="p"), self.admin_user)
+        with self.assertRaises(PermissionError):
+            self.use_case.execute(BulkTransitionOrdersRequest(from_status="p", to_status="F"), self.regular_user)
+        self.mock_repo.bulk_transition_status.assert_not_called()
 
 if __name__ == '__main__':
     unittest.main()
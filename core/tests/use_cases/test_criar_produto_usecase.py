@@ -3,10 +3,14 @@ from unittest.mock import Mock
 from core.interfaces.usecase.criar_produto_usecase import (
     CreateProductUseCase, CreateProductRequest, CreateProductResponse,
     ListProductsUseCase, ListProductsRequest, ListProductsResponse,
-    GetProductByIdUseCase, GetProductByIdRequest
+    GetProductByIdUseCase, GetProductByIdRequest,
+    ImportProductsUseCase, ImportProductsRequest,
+    BulkUpdateProductsUseCase, BulkUpdateProductsRequest
 )
 from core.domain.entities.product import Product
 from core.domain.entities.user import User, PermissionError
+from core.domain.repositories.pagination import CursorPage, OffsetPage
+from core.domain.repositories.product_repository import ProductPatch
 
 class TestCreateProductUseCase(unittest.TestCase):
     def setUp(self):
@@ -38,6 +42,52 @@ class TestCreateProductUseCase(unittest.TestCase):
         self.assertIn("Apenas administradores podem gerenciar produtos", str(context.exception))
         self.mock_repo.create.assert_not_called()
 
+class TestImportProductsUseCase(unittest.TestCase):
+    def setUp(self):
+        self.mock_repo = Mock()
+        self.use_case = ImportProductsUseCase(self.mock_repo)
+        self.admin_user = User(email="admin@example.com", first_name="Admin", last_name="User", is_staff=True, is_superuser=True)
+
+    def test_execute_writes_batches_and_collects_errors(self):
+        first = [(2, Product(name="A", price=1.0, stock=1)), (3, "price: número decimal inválido")]
+        second = [(4, Product(name="B", price=2.0, stock=2))]
+        self.mock_repo.bulk_create.side_effect = [1, ValueError("Falha ao gravar o lote")]
+
+        response = self.use_case.execute(ImportProductsRequest(batches=[first, second]), self.admin_user)
+
+        self.assertEqual(response.created, 1)
+        self.assertEqual(response.failed, 2)
+        self.assertEqual([error.line for error in response.errors], [3, 4])
+        self.assertEqual(self.mock_repo.bulk_create.call_count, 2)
+
+class TestBulkUpdateProductsUseCase(unittest.TestCase):
+    def setUp(self):
+        self.mock_repo = Mock()
+        self.use_case = BulkUpdateProductsUseCase(self.mock_repo)
+        self.admin_user = User(email="admin@example.com", first_name="Admin", last_name="User", is_staff=True, is_superuser=True)
+
+    def test_execute_merges_duplicate_ids(self):
+        self.mock_repo.bulk_update.return_value = (1, ["missing"])
+        request = BulkUpdateProductsRequest(patches=[
+            ProductPatch(id="p1", price=10),
+            ProductPatch(id="missing", stock=1),
+            ProductPatch(id="p1", stock=3),
+        ])
+
+        response = self.use_case.execute(request, self.admin_user)
+
+        self.mock_repo.bulk_update.assert_called_once_with([
+            ProductPatch(id="p1", price=10, stock=3),
+            ProductPatch(id="missing", stock=1),
+        ])
+        self.assertEqual(response.updated, 1)
+        self.assertEqual(response.missing, ["missing"])
+
+    def test_execute_empty_raises(self):
+        with self.assertRaises(ValueError):
+            self.use_case.execute(BulkUpdateProductsRequest(patches=[]), self.admin_user)
+
+
 class TestListProductsUseCase(unittest.TestCase):
     def setUp(self):
         self.mock_repo = Mock()
@@ -49,7 +99,7 @@ class TestListProductsUseCase(unittest.TestCase):
             Product(id="1", name="Prod1", price=10.0, stock=10, is_active=True),
             Product(id="2", name="Prod2", price=20.0, stock=20, is_active=True)
         ]
-        self.mock_repo.get_all_paginated_filtered.return_value = (products, 2)
+        self.mock_repo.get_all_paginated_filtered.return_value = OffsetPage(items=products, total_items=2)
 
         response = self.use_case.execute(request)
 
@@ -57,7 +107,102 @@ class TestListProductsUseCase(unittest.TestCase):
         self.assertEqual(len(response.products), 2)
         self.assertEqual(response.total_items, 2)
         self.assertEqual(response.products[0].id, "1")
-        self.mock_repo.get_all_paginated_filtered.assert_called_once_with(offset=0, limit=10, search_query="test")
+        self.mock_repo.get_all_paginated_filtered.assert_called_once_with(
+            offset=0, limit=10, search_query="test", count_strategy=None
+        )
+
+    def test_execute_count_strategy_none(self):
+        products = [Product(id="1", name="Prod1", price=10.0, stock=10, is_active=True)]
+        self.mock_repo.get_all_paginated_filtered.return_value = OffsetPage(
+            items=products, total_items=None, has_next=True, count_strategy="none"
+        )
+
+        response = self.use_case.execute(ListProductsRequest(limit=1, count_strategy="none"))
+
+        self.assertIsNone(response.total_items)
+        self.assertTrue(response.has_next)
+        self.assertEqual(response.count_strategy, "none")
+
+    def test_execute_invalid_count_strategy(self):
+        with self.assertRaises(ValueError):
+            self.use_case.execute(ListProductsRequest(count_strategy="guess"))
+        self.mock_repo.get_all_paginated_filtered.assert_not_called()
+
+    def test_execute_search_uses_backend_ranking(self):
+        search_backend = Mock()
+        search_backend.search.return_value = (["2", "1"], 2)
+        products = [
+            Product(id="2", name="Prod2", price=20.0, stock=20, is_active=True),
+            Product(id="1", name="Prod1", price=10.0, stock=10, is_active=True)
+        ]
+        self.mock_repo.get_by_ids.return_value = products
+        use_case = ListProductsUseCase(self.mock_repo, search_backend=search_backend)
+
+        response = use_case.execute(ListProductsRequest(offset=0, limit=10, search_query="prod"))
+
+        self.assertEqual([product.id for product in response.products], ["2", "1"])
+        self.assertEqual(response.total_items, 2)
+        search_backend.search.assert_called_once_with("prod", offset=0, limit=10, with_total=True)
+        self.mock_repo.get_by_ids.assert_called_once_with(["2", "1"])
+        self.mock_repo.get_all_paginated_filtered.assert_not_called()
+
+    def test_execute_search_without_count(self):
+        search_backend = Mock()
+        search_backend.search.return_value = (["2", "1", "3"], None)
+        self.mock_repo.get_by_ids.return_value = [
+            Product(id="2", name="Prod2", price=20.0, stock=20, is_active=True),
+            Product(id="1", name="Prod1", price=10.0, stock=10, is_active=True)
+        ]
+        use_case = ListProductsUseCase(self.mock_repo, search_backend=search_backend)
+
+        response = use_case.execute(
+            ListProductsRequest(offset=0, limit=2, search_query="prod", count_strategy="none")
+        )
+
+        self.assertIsNone(response.total_items)
+        self.assertTrue(response.has_next)
+        self.assertEqual(response.count_strategy, "none")
+        search_backend.search.assert_called_once_with("prod", offset=0, limit=3, with_total=False)
+        self.mock_repo.get_by_ids.assert_called_once_with(["2", "1"])
+
+    def test_execute_search_reports_exact_count_strategy(self):
+        search_backend = Mock()
+        search_backend.search.return_value = ([], 0)
+        self.mock_repo.get_by_ids.return_value = []
+        use_case = ListProductsUseCase(self.mock_repo, search_backend=search_backend)
+
+        response = use_case.execute(
+            ListProductsRequest(search_query="prod", count_strategy="estimated")
+        )
+
+        self.assertEqual((response.total_items, response.count_strategy), (0, "exact"))
+
+    def test_execute_search_rejects_cursor(self):
+        search_backend = Mock()
+        use_case = ListProductsUseCase(self.mock_repo, search_backend=search_backend)
+
+        with self.assertRaises(ValueError):
+            use_case.execute(ListProductsRequest(search_query="prod", use_cursor=True))
+        search_backend.search.assert_not_called()
+        self.mock_repo.get_all_cursor_paginated.assert_not_called()
+
+    def test_execute_cursor_mode(self):
+        request = ListProductsRequest(limit=2, use_cursor=True, cursor="abc")
+        products = [Product(id="3", name="Prod3", price=30.0, stock=5, is_active=True)]
+        self.mock_repo.get_all_cursor_paginated.return_value = CursorPage(
+            items=products, next_cursor="next", prev_cursor="prev", total_items=None
+        )
+
+        response = self.use_case.execute(request)
+
+        self.assertEqual(response.products[0].id, "3")
+        self.assertEqual(response.next_cursor, "next")
+        self.assertEqual(response.prev_cursor, "prev")
+        self.assertIsNone(response.total_items)
+        self.mock_repo.get_all_paginated_filtered.assert_not_called()
+        self.mock_repo.get_all_cursor_paginated.assert_called_once_with(
+            limit=2, cursor="abc", search_query=None, include_total=False
+        )
 
 class TestGetProductByIdUseCase(unittest.TestCase):
     def setUp(self):
@@ -4,9 +4,12 @@ from core.interfaces.usecase.criar_user_usecase import (
     CreateUserUseCase, CreateUserRequest, CreateUserResponse,
     ListUsersUseCase, ListUsersRequest, ListUsersResponse,
     GetUserByIdUseCase, GetUserByIdRequest,
-    GetUserByEmailUseCase, GetUserByEmailRequest
+    GetUserByEmailUseCase, GetUserByEmailRequest,
+    LoginUserUseCase, LoginUserRequest,
+    RefreshTokenUseCase, RefreshTokenRequest
 )
 from core.domain.entities.user import User
+from core.domain.repositories.pagination import OffsetPage
 
 class TestCreateUserUseCase(unittest.TestCase):
     def setUp(self):
@@ -56,7 +59,7 @@ class TestListUsersUseCase(unittest.TestCase):
             User(id="1", email="user1@example.com", first_name="User1", last_name="Test", is_active=True, is_staff=False, is_superuser=False),
             User(id="2", email="user2@example.com", first_name="User2", last_name="Test", is_active=True, is_staff=False, is_superuser=False)
         ]
-        self.mock_repo.get_all_paginated_filtered.return_value = (users, 2)
+        self.mock_repo.get_all_paginated_filtered.return_value = OffsetPage(items=users, total_items=2)
 
         response = self.use_case.execute(request)
 
@@ -64,7 +67,9 @@ class TestListUsersUseCase(unittest.TestCase):
         self.assertEqual(len(response.users), 2)
         self.assertEqual(response.total_items, 2)
         self.assertEqual(response.users[0].id, "1")
-        self.mock_repo.get_all_paginated_filtered.assert_called_once_with(offset=0, limit=10, search_query="test")
+        self.mock_repo.get_all_paginated_filtered.assert_called_once_with(
+            offset=0, limit=10, search_query="test", count_strategy=None
+        )
 
 class TestGetUserByIdUseCase(unittest.TestCase):
     def setUp(self):
@@ -109,5 +114,53 @@ class TestGetUserByEmailUseCase(unittest.TestCase):
         self.assertIn("Usuário não encontrado", str(context.exception))
         self.mock_repo.get_by_email.assert_called_once()
 
+
+class TestLoginUserUseCase(unittest.TestCase):
+    def setUp(self):
+        self.mock_repo = Mock()
+        self.mock_gateway = Mock()
+        self.user = User(id="user123", email="user@example.com", first_name="U", last_name="X", password="hash")
+        self.mock_repo.get_by_email.return_value = self.user
+        self.use_case = LoginUserUseCase(self.mock_repo, self.mock_gateway)
+
+    def test_execute_checks_the_loaded_user(self):
+        self.mock_gateway.verify_password.return_value = True
+        self.mock_gateway.create_tokens.return_value = ("access", "refresh")
+
+        response = self.use_case.execute(LoginUserRequest(email="user@example.com", password="secret"))
+
+        self.assertEqual((response.id, response.access_token, response.refresh_token), ("user123", "access", "refresh"))
+        self.mock_gateway.verify_password.assert_called_once_with(self.user, "secret")
+        self.mock_gateway.check_password.assert_not_called()
+        self.mock_repo.get_by_email.assert_called_once_with("user@example.com")
+
+    def test_execute_invalid_password(self):
+        self.mock_gateway.verify_password.return_value = False
+        with self.assertRaisesRegex(ValueError, "Credenciais inválidas"):
+            self.use_case.execute(LoginUserRequest(email="user@example.com", password="wrong"))
+        self.mock_gateway.create_tokens.assert_not_called()
+
+
+class TestRefreshTokenUseCase(unittest.TestCase):
+    def setUp(self):
+        self.mock_gateway = Mock()
+        self.use_case = RefreshTokenUseCase(self.mock_gateway)
+
+    def test_execute_returns_new_pair(self):
+        user = User(id="user123", email="user@example.com", first_name="U", last_name="X")
+        self.mock_gateway.refresh_tokens.return_value = (user, "access2", "refresh2")
+
+        response = self.use_case.execute(RefreshTokenRequest(refresh_token="refresh1"))
+
+        self.assertEqual((response.id, response.access_token, response.refresh_token), ("user123", "access2", "refresh2"))
+        self.mock_gateway.refresh_tokens.assert_called_once_with("refresh1")
+        self.mock_gateway.verify_password.assert_not_called()
+
+    def test_execute_rejects_empty_token(self):
+        with self.assertRaises(ValueError):
+            self.use_case.execute(RefreshTokenRequest(refresh_token=""))
+        self.mock_gateway.refresh_tokens.assert_not_called()
+
+
 if __name__ == '__main__':
     unittest.main()
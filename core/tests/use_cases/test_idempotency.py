@@ -0,0 +1,125 @@
+import threading
+import time
+import unittest
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+from core.interfaces.usecase.gateways import IdempotencyRecord, IdempotencyStore
+from core.interfaces.usecase.idempotency import (
+    IdempotencyGuard,
+    IdempotencyInProgress,
+    IdempotencyKeyReused,
+    fingerprint,
+)
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    def __init__(self):
+        self.records = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, key, fingerprint, now, expires_at, stale_before):
+        with self.lock:
+            record = self.records.get(key)
+            if record is None or record.expires_at <= now or (
+                    not record.completed and record.locked_at < stale_before):
+                self.records[key] = IdempotencyRecord(key, fingerprint, now, expires_at)
+                return None
+            return replace(record)
+
+    def get(self, key):
+        return self.records.get(key)
+
+    def run_and_complete(self, key, action):
+        status_code, body = action()
+        with self.lock:
+            self.records[key] = replace(self.records[key], status_code=status_code, body=body)
+        return status_code, body
+
+    def release(self, key):
+        with self.lock:
+            if key in self.records and not self.records[key].completed:
+                del self.records[key]
+
+    def purge_expired(self, now):
+        expired = [key for key, record in self.records.items() if record.expires_at <= now]
+        for key in expired:
+            del self.records[key]
+        return len(expired)
+
+
+class TestIdempotencyGuard(unittest.TestCase):
+    def setUp(self):
+        self.store = InMemoryIdempotencyStore()
+        self.guard = IdempotencyGuard(self.store, ttl_seconds=60)
+        self.key = IdempotencyGuard.scoped_key("orders:user-1", "abc")
+
+    def test_replay_returns_stored_result_without_running_again(self):
+        calls = []
+        action = lambda: calls.append(1) or (201, {"order_id": "1"})
+
+        first = self.guard.run(self.key, fingerprint({"q": 1}), action)
+        second = self.guard.run(self.key, fingerprint({"q": 1}), action)
+
+        self.assertEqual(len(calls), 1)
+        self.assertFalse(first.replayed)
+        self.assertTrue(second.replayed)
+        self.assertEqual((second.status_code, second.body), (201, {"order_id": "1"}))
+
+    def test_reused_key_with_other_request_is_rejected(self):
+        self.guard.run(self.key, fingerprint({"q": 1}), lambda: (201, {}))
+        with self.assertRaises(IdempotencyKeyReused):
+            self.guard.run(self.key, fingerprint({"q": 2}), lambda: (201, {}))
+
+    def test_concurrent_duplicates_run_once_and_get_in_progress(self):
+        calls, results = [], []
+        started = threading.Event()
+
+        def action():
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            return 201, {"order_id": "1"}
+
+        first = threading.Thread(target=lambda: results.append(self.guard.run(self.key, fingerprint({"q": 1}), action)))
+        first.start()
+        started.wait()
+        for _ in range(3):
+            with self.assertRaises(IdempotencyInProgress):
+                self.guard.run(self.key, fingerprint({"q": 1}), action)
+        first.join()
+
+        self.assertEqual(len(calls), 1)
+        replay = self.guard.run(self.key, fingerprint({"q": 1}), action)
+        self.assertTrue(replay.replayed)
+        self.assertEqual(replay.body, results[0].body)
+
+    def test_failed_action_releases_key(self):
+        def fail():
+            raise RuntimeError("falhou")
+
+        with self.assertRaises(RuntimeError):
+            self.guard.run(self.key, fingerprint({"q": 1}), fail)
+        result = self.guard.run(self.key, fingerprint({"q": 1}), lambda: (201, {"ok": True}))
+        self.assertFalse(result.replayed)
+
+    def test_abandoned_execution_is_taken_over(self):
+        old = datetime.now(timezone.utc) - timedelta(minutes=5)
+        self.store.acquire(self.key, fingerprint({"q": 1}), old, old + timedelta(days=1), old - timedelta(minutes=1))
+
+        result = self.guard.run(self.key, fingerprint({"q": 1}), lambda: (201, {"ok": True}))
+        self.assertFalse(result.replayed)
+
+    def test_scoped_key_rejects_empty_or_long_keys(self):
+        with self.assertRaises(ValueError):
+            IdempotencyGuard.scoped_key("orders", "")
+        with self.assertRaises(ValueError):
+            IdempotencyGuard.scoped_key("orders", "x" * 256)
+        self.assertNotEqual(
+            IdempotencyGuard.scoped_key("orders:user-1", "abc"),
+            IdempotencyGuard.scoped_key("orders:user-2", "abc"),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import json
+import unittest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import Mock
+
+from core.domain.entities.user import User
+from core.domain.repositories.product_repository import ProductPriceSnapshot
+from core.interfaces.usecase.gateways import TokenSigner
+from core.interfaces.usecase.quote_usecase import (
+    CartLine,
+    CheckoutQuoteRequest,
+    CheckoutQuoteUseCase,
+    QuoteCartRequest,
+    QuoteCartUseCase,
+)
+
+
+class JsonSigner(TokenSigner):
+    def sign(self, payload):
+        return json.dumps(payload)
+
+    def unsign(self, token):
+        return json.loads(token)
+
+
+class TestQuoteCartUseCase(unittest.TestCase):
+    def setUp(self):
+        self.products = Mock()
+        self.products.get_price_snapshots.return_value = [
+            ProductPriceSnapshot("a", "Caneca", Decimal("19.99"), 10, True),
+            ProductPriceSnapshot("b", "Copo", Decimal("0.10"), 1, True),
+            ProductPriceSnapshot("c", "Antigo", Decimal("5.00"), 10, False),
+        ]
+        self.now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.use_case = QuoteCartUseCase(self.products, JsonSigner(), ttl_seconds=60, clock=lambda: self.now)
+
+    def test_totals_are_exact_and_lines_merged(self):
+        quote = self.use_case.execute(QuoteCartRequest(owner_id="u1", lines=[
+            CartLine("a", 2), CartLine("b", 1), CartLine("a", 1),
+        ]))
+
+        self.assertEqual([(line.product_id, line.quantity) for line in quote.lines], [("a", 3), ("b", 1)])
+        self.assertEqual(quote.lines[0].line_total, Decimal("59.97"))
+        self.assertEqual(quote.total, Decimal("60.07"))
+        self.assertEqual(quote.expires_at, self.now + timedelta(seconds=60))
+        self.products.get_price_snapshots.assert_called_once()
+
+    def test_invalid_lines_raise(self):
+        for lines in ([CartLine("c", 1)], [CartLine("b", 2)], [CartLine("x", 1)], [CartLine("a", 0)], []):
+            with self.assertRaises(ValueError):
+                self.use_case.execute(QuoteCartRequest(owner_id="u1", lines=lines))
+
+
+class TestCheckoutQuoteUseCase(unittest.TestCase):
+    def setUp(self):
+        self.user = User(email="a@example.com", first_name="A", last_name="B")
+        products = Mock()
+        products.get_price_snapshots.return_value = [ProductPriceSnapshot("a", "Caneca", Decimal("19.99"), 10, True)]
+        self.now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.token = QuoteCartUseCase(products, JsonSigner(), ttl_seconds=60, clock=lambda: self.now).execute(
+            QuoteCartRequest(owner_id=self.user.id, lines=[CartLine("a", 2)])
+        ).token
+        self.orders = Mock()
+        self.orders.create.side_effect = lambda order: order
+
+    def _use_case(self, now):
+        return CheckoutQuoteUseCase(self.orders, JsonSigner(), clock=lambda: now)
+
+    def test_creates_order_with_quoted_prices(self):
+        order = self._use_case(self.now).execute(CheckoutQuoteRequest(self.token), self.user)
+
+        self.assertEqual(order.subtotal, Decimal("39.98"))
+        self.assertEqual(order.items[0].unit_price, Decimal("19.99"))
+        self.assertEqual(order.quantity, 2)
+        self.assertEqual(order.get_subtotal, Decimal("39.98"))
+        self.assertEqual(order.quote_id, JsonSigner().unsign(self.token)["jti"])
+
+    def test_token_without_jti_is_rejected(self):
+        payload = JsonSigner().unsign(self.token)
+        del payload["jti"]
+        with self.assertRaises(ValueError):
+            self._use_case(self.now).execute(CheckoutQuoteRequest(JsonSigner().sign(payload)), self.user)
+        self.orders.create.assert_not_called()
+
+    def test_expired_or_foreign_quote_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self._use_case(self.now + timedelta(seconds=61)).execute(CheckoutQuoteRequest(self.token), self.user)
+        other = User(email="c@example.com", first_name="C", last_name="D")
+        with self.assertRaises(PermissionError):
+            self._use_case(self.now).execute(CheckoutQuoteRequest(self.token), other)
+        self.orders.create.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
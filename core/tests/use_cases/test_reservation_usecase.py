@@ -0,0 +1,70 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+from core.domain.entities.order import ORDER_FINISHED, Order, OrderItem
+from core.domain.entities.user import User
+from core.domain.repositories.stock_reservation_repository import ReservationSweepResult
+from core.interfaces.usecase.reservation_usecase import OrderStockReserver, SweepExpiredReservationsUseCase
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class TestOrderStockReserver(unittest.TestCase):
+    def setUp(self):
+        self.repository = Mock()
+        self.reserver = OrderStockReserver(self.repository, timedelta(minutes=15), clock=lambda: NOW)
+
+    def test_holds_quantities_per_product(self):
+        order = Order(owner=User(email="u@x.com", first_name="U", last_name="X"), items=[
+            OrderItem(product_id="a", quantity=2, unit_price=1.0),
+            OrderItem(product_id="b", quantity=1, unit_price=1.0),
+            OrderItem(product_id="a", quantity=3, unit_price=1.0),
+        ])
+
+        self.reserver.hold(order)
+
+        self.repository.hold.assert_called_once_with(order.order_id, {"a": 5, "b": 1}, NOW + timedelta(minutes=15))
+
+    def test_ignores_orders_that_are_not_pending(self):
+        order = Order(owner=User(email="u@x.com", first_name="U", last_name="X"), status=ORDER_FINISHED,
+                      items=[OrderItem(product_id="a", quantity=1, unit_price=1.0)])
+        self.reserver.hold(order)
+        self.repository.hold.assert_not_called()
+
+    def test_hold_many_falls_back_to_single_orders_when_the_set_does_not_fit(self):
+        owner = User(email="u@x.com", first_name="U", last_name="X")
+        first, second = (Order(owner=owner, items=[OrderItem(product_id="a", quantity=1, unit_price=1.0)])
+                         for _ in range(2))
+        self.repository.hold_many.side_effect = ValueError("Estoque insuficiente")
+        self.repository.hold.side_effect = [None, ValueError("Estoque insuficiente")]
+
+        errors = self.reserver.hold_many([first, second])
+
+        self.repository.hold_many.assert_called_once_with(
+            {first.order_id: {"a": 1}, second.order_id: {"a": 1}}, NOW + timedelta(minutes=15)
+        )
+        self.assertEqual(errors, {second.order_id: "Estoque insuficiente"})
+
+
+class TestSweepExpiredReservationsUseCase(unittest.TestCase):
+    def test_stops_at_max_batches_and_reports_backlog(self):
+        repository = Mock()
+        repository.sweep_expired.return_value = ReservationSweepResult(processed=10, released=12, batches=1)
+        repository.count_expired.return_value = 7
+
+        result = SweepExpiredReservationsUseCase(repository, batch_size=10, max_batches=3, clock=lambda: NOW).execute()
+
+        self.assertEqual((result.batches, result.processed, result.released, result.backlog), (3, 30, 36, 7))
+        repository.sweep_expired.assert_called_with(NOW, 10)
+
+    def test_stops_on_partial_batch(self):
+        repository = Mock()
+        repository.sweep_expired.side_effect = [
+            ReservationSweepResult(processed=10, batches=1), ReservationSweepResult(processed=4, batches=1),
+        ]
+        repository.count_expired.return_value = 0
+
+        result = SweepExpiredReservationsUseCase(repository, batch_size=10, max_batches=5, clock=lambda: NOW).execute()
+
+        self.assertEqual((result.batches, result.processed, result.backlog), (2, 14, 0))
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
 
 application = get_asgi_application()
+
+# Constrói o índice de sugestões de produtos antes de atender requisições.
+from api.products.suggest import warm_product_name_index  # noqa: E402
+
+warm_product_name_index()
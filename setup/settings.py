@@ -41,9 +41,131 @@ OAUTH2_PROVIDER = {
     'REFRESH_TOKEN_EXPIRE_SECONDS': 86400,  # 1 dia (opcional)
 }
 
+# Cache de validação de tokens opacos (api.users.token_cache), por processo.
+# Tokens trocados no login ou de usuários desativados saem na hora neste
+# processo; nos outros, em até TTL_SECONDS.
+ACCESS_TOKEN_CACHE = {
+    'ENABLED': True,
+    'MAX_ENTRIES': 10000,
+    'TTL_SECONDS': 10,
+}
+
+# Pool de processos para hash de senhas (api.users.hashing). Cada processo web
+# tem o seu pool: WEB_WORKERS (None lê WEB_CONCURRENCY) divide os núcleos
+# (WORKERS None) e a fila MAX_QUEUE do host entre eles. Com a fila do processo
+# cheia, login e cadastro respondem 503 com Retry-After (RETRY_AFTER_SECONDS).
+# As métricas em users/password-hashing/metrics/ são do processo que responder.
+# Se WORKERS resultar em 1, o pool fica desligado e o hash roda na requisição.
+PASSWORD_HASHING = {
+    'ENABLED': True,
+    'WEB_WORKERS': None,
+    'WORKERS': None,
+    'MAX_QUEUE': 32,
+    'RETRY_AFTER_SECONDS': 1,
+}
+
+# Tokens de acesso assinados (api.users.access_tokens): JWT verificado sem
+# consultar o banco; o refresh token continua no banco. SIGNING_KEY None usa a
+# SECRET_KEY e LIFETIME_SECONDS None, o ACCESS_TOKEN_EXPIRE_SECONDS acima.
+# Revogações feitas em outro processo valem em até DENYLIST_REFRESH_SECONDS.
+STATELESS_ACCESS_TOKENS = {
+    'ENABLED': False,
+    'ALGORITHM': 'HS256',
+    'SIGNING_KEY': None,
+    'LIFETIME_SECONDS': None,
+    'DENYLIST_REFRESH_SECONDS': 5,
+}
+
+# Cache de leitura dos detalhes de produtos (api.products.cache).
+# SHARED_CACHE_ALIAS aponta para um alias de CACHES para compartilhar entre workers.
+PRODUCT_CACHE = {
+    'ENABLED': True,
+    'MAX_ENTRIES': 10000,
+    'TTL_SECONDS': 30,
+    'NOT_FOUND_TTL_SECONDS': 5,
+    'SHARED_CACHE_ALIAS': None,
+}
+
+# Contagem do total nas listagens por offset (api.counting).
+# DEFAULT_STRATEGY: exact, cached, estimated ou none.
+LIST_COUNT = {
+    'DEFAULT_STRATEGY': 'exact',
+    'CACHE_ALIAS': 'default',
+    'CACHE_TTL_SECONDS': 60,
+    'SAMPLE_SIZE': 10000,
+}
+
+# max-age (segundos) do Cache-Control das respostas de produtos com ETag.
+PRODUCT_HTTP_MAX_AGE = 30
+
+# Com produtos em estoque particionado ou livro-razão, cujas reservas não mudam
+# a versão do catálogo, o ETag da listagem também muda a cada N segundos.
+PRODUCT_LIVE_STOCK_ETAG_SECONDS = 5
+
+# Índice de sugestões em memória (api.products.suggest). Escritas de outros
+# workers entram a cada REFRESH_SECONDS; reconstrução completa a cada REBUILD_SECONDS.
+PRODUCT_SUGGEST = {
+    'REFRESH_SECONDS': 5,
+    'REBUILD_SECONDS': 600,
+}
+
+# Importação de produtos em lote (api.products.importer).
+# WORKERS None usa um processo de validação por núcleo. Corpos de até
+# INLINE_MAX_BYTES são validados na própria requisição, sem o pool.
+PRODUCT_IMPORT = {
+    'BATCH_SIZE': 1000,
+    'WORKERS': None,
+    'INLINE_MAX_BYTES': 1048576,
+}
+
+# Chaves de idempotência na criação de pedidos (header Idempotency-Key).
+# Uma repetição que chega durante a execução original recebe 409 na hora.
+# LOCK_TIMEOUT_SECONDS: depois disso, uma execução sem resultado é tida como abandonada.
+IDEMPOTENCY = {
+    'TTL_SECONDS': 86400,
+    'LOCK_TIMEOUT_SECONDS': 60,
+}
+
+# Checkout assíncrono (api.orders.checkout). Com ASYNC, POST orders/ enfileira o
+# pedido e responde 202; sem ele, só com o header `Prefer: respond-async`.
+# Os pedidos são criados por `manage.py run_checkout_workers`.
+CHECKOUT = {
+    'ASYNC': False,
+    'BATCH_SIZE': 100,
+    'POLL_INTERVAL_SECONDS': 0.2,
+}
+
+# Estoque particionado de produtos muito disputados (api.products.stock_shards).
+# Ligado por produto com `manage.py stock_shards enable <id>`; as somas das
+# partições ficam em cache local por TOTALS_TTL_SECONDS.
+STOCK_SHARDS = {
+    'DEFAULT_SHARDS': 8,
+    'MAX_SHARDS': 64,
+    'TOTALS_TTL_SECONDS': 1.0,
+}
+
+# Reserva de estoque dos pedidos pendentes (api.orders.reservations). O estoque
+# volta ao produto depois de TTL_SECONDS pelo `manage.py sweep_stock_reservations`,
+# que processa no máximo SWEEP_MAX_BATCHES lotes de SWEEP_BATCH_SIZE por execução.
+STOCK_RESERVATIONS = {
+    'ENABLED': True,
+    'TTL_SECONDS': 900,
+    'SWEEP_INTERVAL_SECONDS': 5,
+    'SWEEP_BATCH_SIZE': 500,
+    'SWEEP_MAX_BATCHES': 20,
+}
+
+# Cotação de carrinho (POST orders/quote/): validade do quote_token.
+ORDER_QUOTE = {
+    'TTL_SECONDS': 900,
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'oauth2_provider.contrib.rest_framework.OAuth2Authentication',
+        # Só trata tokens JWT (STATELESS_ACCESS_TOKENS); os opacos seguem para o OAuth2.
+        'api.users.access_tokens.SignedAccessTokenAuthentication',
+        # OAuth2Authentication com cache de validação (ACCESS_TOKEN_CACHE).
+        'api.users.token_cache.CachedOAuth2Authentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -88,6 +210,20 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # WAL permite leituras concorrentes com uma escrita em andamento. O
+        # synchronous fica no padrão (FULL); as importações em lote usam NORMAL
+        # só na própria conexão (api.transactions.relaxed_durability). Com vários processos escrevendo (workers de checkout), a espera pelo
+        # lock vai até o timeout (20s, acima dos 5s padrão); quem lê para depois
+        # escrever usa api.transactions.immediate_atomic (BEGIN IMMEDIATE).
+        'OPTIONS': {
+            'init_command': 'PRAGMA journal_mode=WAL;',
+            'timeout': 20,
+        },
+        # Banco de testes em arquivo: conexões de threads diferentes usam o
+        # lock de arquivo do SQLite (com espera), e não o cache compartilhado.
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
@@ -7,4 +7,5 @@ urlpatterns = [
     path('o/', include('oauth2_provider.urls', namespace='oauth2_provider')),
     path("api/v1/", include("api.users.urls")),
     path("api/v1/", include("api.products.urls")),
+    path("api/v1/", include("api.orders.urls")),
 ]
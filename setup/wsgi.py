@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
 
 application = get_wsgi_application()
+
+# Constrói o índice de sugestões de produtos antes de atender requisições.
+from api.products.suggest import warm_product_name_index  # noqa: E402
+
+warm_product_name_index()